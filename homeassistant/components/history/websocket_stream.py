@@ -0,0 +1,434 @@
+"""Websocket API to stream history."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable, MutableMapping
+from dataclasses import dataclass
+from datetime import datetime as dt, timedelta
+import logging
+from typing import Any, cast
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.components.recorder import get_instance, history
+from homeassistant.components.websocket_api import messages
+from homeassistant.components.websocket_api.connection import ActiveConnection
+from homeassistant.components.websocket_api.const import (
+    COMPRESSED_STATE_ATTRIBUTES,
+    COMPRESSED_STATE_LAST_CHANGED,
+    COMPRESSED_STATE_LAST_UPDATED,
+    COMPRESSED_STATE_STATE,
+    JSON_DUMP,
+)
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import (
+    async_track_point_in_utc_time,
+    async_track_state_change_event,
+)
+import homeassistant.util.dt as dt_util
+
+MAX_PENDING_HISTORY_STATES = 2048
+STATE_COALESCE_TIME = 0.35
+MAX_RECORDER_WAIT = 10
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class HistoryLiveStream:
+    """Track a history live stream."""
+
+    stream_queue: asyncio.Queue[Event]
+    subscriptions: list[CALLBACK_TYPE]
+    end_time_unsub: CALLBACK_TYPE | None = None
+    task: asyncio.Task | None = None
+
+
+@callback
+def async_setup(hass: HomeAssistant) -> None:
+    """Set up the history websocket API."""
+    websocket_api.async_register_command(hass, ws_stream)
+
+
+async def _async_wait_for_recorder_sync(hass: HomeAssistant) -> None:
+    """Wait for the recorder to sync."""
+    try:
+        await asyncio.wait_for(
+            get_instance(hass).async_block_till_done(), MAX_RECORDER_WAIT
+        )
+    except asyncio.TimeoutError:
+        _LOGGER.debug(
+            "Recorder is behind more than %s seconds, starting live stream; Some results may be missing",
+            MAX_RECORDER_WAIT,
+        )
+
+
+def _newest_state_time(states: MutableMapping[str, list[dict[str, Any]]]) -> dt | None:
+    """Return the time of the newest state in a compressed history result."""
+    if not states:
+        return None
+    return dt_util.utc_from_timestamp(
+        max(
+            entity_states[-1][COMPRESSED_STATE_LAST_UPDATED]
+            for entity_states in states.values()
+        )
+    )
+
+
+def _ws_stream_get_states(
+    hass: HomeAssistant,
+    msg_id: int,
+    start_time: dt,
+    end_time: dt,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+    partial: bool,
+) -> tuple[str, MutableMapping[str, list[dict[str, Any]]]]:
+    """Fetch significant states and convert them to json in the executor."""
+    states = cast(
+        MutableMapping[str, list[dict[str, Any]]],
+        history.get_significant_states(
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            None,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            True,
+        ),
+    )
+    message: dict[str, Any] = {
+        "states": states,
+        "start_time": dt_util.utc_to_timestamp(start_time),
+        "end_time": dt_util.utc_to_timestamp(end_time),
+    }
+    if partial:
+        # This is a hint to consumers of the api that
+        # we are about to send a another block of historical
+        # data in case the UI needs to show that historical
+        # data is still loading in the future
+        message["partial"] = True
+    return JSON_DUMP(messages.event_message(msg_id, message)), states
+
+
+async def _async_send_historical_states(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg_id: int,
+    start_time: dt,
+    end_time: dt,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+    partial: bool,
+    last_states: dict[str, str],
+) -> dt | None:
+    """Select historical states from the database and deliver them to the websocket.
+
+    The last state sent for each entity is recorded in last_states.
+
+    This function returns the time of the most recent state we sent to the
+    websocket.
+    """
+    message, states = await get_instance(hass).async_add_executor_job(
+        _ws_stream_get_states,
+        hass,
+        msg_id,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+        partial,
+    )
+    # If there are no states, we still send an empty message
+    # if its the last one (not partial) so consumers of the
+    # api know their request was answered but there were no results
+    if states or not partial:
+        connection.send_message(message)
+    for entity_id, entity_states in states.items():
+        last_states[entity_id] = entity_states[-1][COMPRESSED_STATE_STATE]
+    return _newest_state_time(states)
+
+
+def _state_to_compressed_history_state(
+    state: State, no_attributes: bool
+) -> dict[str, Any]:
+    """Convert a state to the compressed format used by the history api."""
+    comp_state: dict[str, Any] = {
+        COMPRESSED_STATE_STATE: state.state,
+        COMPRESSED_STATE_ATTRIBUTES: {} if no_attributes else state.attributes,
+        COMPRESSED_STATE_LAST_UPDATED: state.last_updated.timestamp(),
+    }
+    if state.last_changed != state.last_updated:
+        comp_state[COMPRESSED_STATE_LAST_CHANGED] = state.last_changed.timestamp()
+    return comp_state
+
+
+def _events_to_compressed_states(
+    events: Iterable[Event],
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+    last_states: dict[str, str],
+) -> dict[str, list[dict[str, Any]]]:
+    """Convert state changed events to compressed history states.
+
+    Applies the same rules as the database queries so that the live
+    states match what a history query would return.
+    """
+    states: dict[str, list[dict[str, Any]]] = {}
+    for event in events:
+        new_state: State | None = event.data["new_state"]
+        if new_state is None:
+            continue
+        domain = new_state.domain
+        if (
+            significant_changes_only
+            and domain not in history.SIGNIFICANT_DOMAINS
+            and new_state.last_changed != new_state.last_updated
+        ):
+            continue
+        entity_id = new_state.entity_id
+        if (
+            minimal_response
+            and domain not in history.NEED_ATTRIBUTE_DOMAINS
+            and (last_state := last_states.get(entity_id)) is not None
+        ):
+            # With minimal response we do not care about attribute
+            # changes so we can filter out duplicate states. The
+            # first state of an entity is always a full state.
+            if last_state == new_state.state:
+                continue
+            comp_state: dict[str, Any] = {
+                COMPRESSED_STATE_STATE: new_state.state,
+                COMPRESSED_STATE_LAST_UPDATED: new_state.last_updated.timestamp(),
+            }
+        else:
+            comp_state = _state_to_compressed_history_state(new_state, no_attributes)
+        last_states[entity_id] = new_state.state
+        states.setdefault(entity_id, []).append(comp_state)
+    return states
+
+
+async def _async_events_consumer(
+    subscriptions_setup_complete_time: dt,
+    connection: ActiveConnection,
+    msg_id: int,
+    stream_queue: asyncio.Queue[Event],
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+    last_states: dict[str, str],
+) -> None:
+    """Stream state changes from the queue."""
+    while True:
+        events: list[Event] = [await stream_queue.get()]
+        # If the state is older than the end of the db
+        # query we already sent it so we skip it.
+        if events[0].time_fired < subscriptions_setup_complete_time:
+            continue
+        # We sleep for the STATE_COALESCE_TIME so
+        # we can group states together to minimize
+        # the number of websocket messages when the
+        # system is overloaded with a state change storm
+        await asyncio.sleep(STATE_COALESCE_TIME)
+        while not stream_queue.empty():
+            events.append(stream_queue.get_nowait())
+
+        if states := _events_to_compressed_states(
+            events,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            last_states,
+        ):
+            connection.send_message(
+                JSON_DUMP(messages.event_message(msg_id, {"states": states}))
+            )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "history/stream",
+        vol.Required("start_time"): str,
+        vol.Optional("end_time"): str,
+        vol.Required("entity_ids"): [str],
+        vol.Optional("include_start_time_state", default=True): bool,
+        vol.Optional("significant_changes_only", default=True): bool,
+        vol.Optional("minimal_response", default=False): bool,
+        vol.Optional("no_attributes", default=False): bool,
+    }
+)
+@websocket_api.async_response
+async def ws_stream(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Handle history stream websocket command."""
+    start_time_str = msg["start_time"]
+    msg_id: int = msg["id"]
+    utc_now = dt_util.utcnow()
+
+    if start_time := dt_util.parse_datetime(start_time_str):
+        start_time = dt_util.as_utc(start_time)
+
+    if not start_time or start_time > utc_now:
+        connection.send_error(msg_id, "invalid_start_time", "Invalid start_time")
+        return
+
+    end_time_str = msg.get("end_time")
+    end_time: dt | None = None
+    if end_time_str:
+        if not (end_time := dt_util.parse_datetime(end_time_str)):
+            connection.send_error(msg_id, "invalid_end_time", "Invalid end_time")
+            return
+        end_time = dt_util.as_utc(end_time)
+        if end_time < start_time:
+            connection.send_error(msg_id, "invalid_end_time", "Invalid end_time")
+            return
+
+    entity_ids: list[str] = msg["entity_ids"]
+    include_start_time_state: bool = msg["include_start_time_state"]
+    significant_changes_only: bool = msg["significant_changes_only"]
+    minimal_response: bool = msg["minimal_response"]
+    no_attributes: bool = msg["no_attributes"]
+    last_states: dict[str, str] = {}
+
+    if end_time and end_time <= utc_now:
+        # Not a live stream, everything is in the database
+        connection.subscriptions[msg_id] = callback(lambda: None)
+        connection.send_result(msg_id)
+        await _async_send_historical_states(
+            hass,
+            connection,
+            msg_id,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            False,
+            last_states,
+        )
+        return
+
+    subscriptions: list[CALLBACK_TYPE] = []
+    stream_queue: asyncio.Queue[Event] = asyncio.Queue(MAX_PENDING_HISTORY_STATES)
+    live_stream = HistoryLiveStream(
+        subscriptions=subscriptions, stream_queue=stream_queue
+    )
+
+    @callback
+    def _unsub(*time: Any) -> None:
+        """Unsubscribe from all state changes."""
+        for subscription in subscriptions:
+            subscription()
+        subscriptions.clear()
+        if live_stream.task:
+            live_stream.task.cancel()
+        if live_stream.end_time_unsub:
+            live_stream.end_time_unsub()
+
+    if end_time:
+        live_stream.end_time_unsub = async_track_point_in_utc_time(
+            hass, _unsub, end_time
+        )
+
+    @callback
+    def _queue_or_cancel(event: Event) -> None:
+        """Queue a state change to be processed or cancel."""
+        try:
+            stream_queue.put_nowait(event)
+        except asyncio.QueueFull:
+            _LOGGER.debug(
+                "Client exceeded max pending messages of %s",
+                MAX_PENDING_HISTORY_STATES,
+            )
+            _unsub()
+
+    subscriptions.append(
+        async_track_state_change_event(hass, entity_ids, _queue_or_cancel)
+    )
+    subscriptions_setup_complete_time = dt_util.utcnow()
+    connection.subscriptions[msg_id] = _unsub
+    connection.send_result(msg_id)
+    # Fetch everything from history
+    last_state_time = await _async_send_historical_states(
+        hass,
+        connection,
+        msg_id,
+        start_time,
+        subscriptions_setup_complete_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+        True,
+        last_states,
+    )
+
+    await _async_wait_for_recorder_sync(hass)
+    if not subscriptions:
+        # Unsubscribe happened while waiting for recorder
+        return
+
+    #
+    # Fetch any states from the database that had
+    # not been committed at the time of the first fetch
+    # so we can switch over to using the subscriptions
+    #
+    # We only want states that happened after the last state
+    # we had from the last database query or the maximum
+    # time we allow the recorder to be behind
+    #
+    max_recorder_behind = subscriptions_setup_complete_time - timedelta(
+        seconds=MAX_RECORDER_WAIT
+    )
+    second_fetch_start_time = max(
+        last_state_time or max_recorder_behind, max_recorder_behind, start_time
+    )
+    await _async_send_historical_states(
+        hass,
+        connection,
+        msg_id,
+        second_fetch_start_time,
+        subscriptions_setup_complete_time,
+        entity_ids,
+        False,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+        False,
+        last_states,
+    )
+
+    if not subscriptions:
+        # Unsubscribe happened while waiting for the states
+        return
+
+    live_stream.task = asyncio.create_task(
+        _async_events_consumer(
+            subscriptions_setup_complete_time,
+            connection,
+            msg_id,
+            stream_queue,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            last_states,
+        )
+    )
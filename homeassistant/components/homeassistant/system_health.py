@@ -1,7 +1,7 @@
 """Provide info to system health."""
 from homeassistant.components import system_health
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers import system_info
+from homeassistant.helpers import system_info, template
 
 
 @callback
@@ -29,4 +29,5 @@ async def system_health_info(hass):
         "os_version": info.get("os_version"),
         "arch": info.get("arch"),
         "timezone": info.get("timezone"),
+        **template.async_get_bytecode_cache_info(hass),
     }
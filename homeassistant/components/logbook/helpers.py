@@ -21,7 +21,6 @@ from homeassistant.core import (
     is_callback,
 )
 from homeassistant.helpers import device_registry as dr, entity_registry as er
-from homeassistant.helpers.event import async_track_state_change_event
 
 from .const import (
     ALL_EVENT_TYPES_EXCEPT_STATE_CHANGED,
@@ -105,23 +104,31 @@ def async_subscribe_events(
     assert is_callback(target), "target must be a callback"
     event_forwarder = target
 
-    if entity_ids or device_ids:
+    # Without device_ids the event bus only runs the
+    # forwarder for the events of the entity_ids
+    listen_entity_ids = entity_ids if entity_ids and not device_ids else None
+    if device_ids:
         entity_ids_set = set(entity_ids) if entity_ids else set()
-        device_ids_set = set(device_ids) if device_ids else set()
+        device_ids_set = set(device_ids)
 
         @callback
         def _forward_events_filtered(event: Event) -> None:
             event_data = event.data
             if (
                 entity_ids_set and event_data.get(ATTR_ENTITY_ID) in entity_ids_set
-            ) or (device_ids_set and event_data.get(ATTR_DEVICE_ID) in device_ids_set):
+            ) or event_data.get(ATTR_DEVICE_ID) in device_ids_set:
                 target(event)
 
         event_forwarder = _forward_events_filtered
 
     for event_type in event_types:
         subscriptions.append(
-            hass.bus.async_listen(event_type, event_forwarder, run_immediately=True)
+            hass.bus.async_listen(
+                event_type,
+                event_forwarder,
+                run_immediately=True,
+                entity_ids=listen_entity_ids,
+            )
         )
 
     @callback
@@ -132,20 +139,13 @@ def async_subscribe_events(
         if not _is_state_filtered(ent_reg, state):
             target(event)
 
-    if entity_ids:
-        subscriptions.append(
-            async_track_state_change_event(
-                hass, entity_ids, _forward_state_events_filtered
-            )
-        )
-        return
-
-    # We want the firehose
+    # Without entity_ids we want the firehose
     subscriptions.append(
         hass.bus.async_listen(
             EVENT_STATE_CHANGED,
             _forward_state_events_filtered,
             run_immediately=True,
+            entity_ids=entity_ids or None,
         )
     )
 
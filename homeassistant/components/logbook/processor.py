@@ -7,16 +7,14 @@ from dataclasses import dataclass
 from datetime import datetime as dt
 import logging
 import re
+import time
 from typing import Any
 
 from sqlalchemy.engine.row import Row
 from sqlalchemy.orm.query import Query
 
 from homeassistant.components.recorder.filters import Filters
-from homeassistant.components.recorder.models import (
-    process_datetime_to_timestamp,
-    process_timestamp_to_utc_isoformat,
-)
+from homeassistant.components.recorder.models import bytes_to_uuid_hex_or_none
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
 from homeassistant.const import (
@@ -173,7 +171,7 @@ class EventProcessor:
             self.filters,
             self.context_id,
         )
-        with session_scope(hass=self.hass) as session:
+        with session_scope(hass=self.hass, read_only=True) as session:
             return self.humanify(yield_rows(session.execute(stmt)))
 
     def humanify(
@@ -221,7 +219,7 @@ def _humanify(
 
     # Process rows
     for row in rows:
-        context_id = context_lookup.memorize(row)
+        context_id_bin = context_lookup.memorize(row)
         if row.context_only:
             continue
         event_type = row.event_type
@@ -254,7 +252,7 @@ def _humanify(
             if icon := row.icon or row.old_format_icon:
                 data[LOGBOOK_ENTRY_ICON] = icon
 
-            context_augmenter.augment(data, row, context_id)
+            context_augmenter.augment(data, row, context_id_bin)
             yield data
 
         elif event_type in external_events:
@@ -262,7 +260,7 @@ def _humanify(
             data = describe_event(event_cache.get(row))
             data[LOGBOOK_ENTRY_WHEN] = format_time(row)
             data[LOGBOOK_ENTRY_DOMAIN] = domain
-            context_augmenter.augment(data, row, context_id)
+            context_augmenter.augment(data, row, context_id_bin)
             yield data
 
         elif event_type == EVENT_LOGBOOK_ENTRY:
@@ -281,7 +279,7 @@ def _humanify(
                 LOGBOOK_ENTRY_DOMAIN: entry_domain,
                 LOGBOOK_ENTRY_ENTITY_ID: entry_entity_id,
             }
-            context_augmenter.augment(data, row, context_id)
+            context_augmenter.augment(data, row, context_id_bin)
             yield data
 
 
@@ -292,14 +290,14 @@ class ContextLookup:
         """Memorize context origin."""
         self.hass = hass
         self._memorize_new = True
-        self._lookup: dict[str | None, Row | EventAsRow | None] = {None: None}
+        self._lookup: dict[bytes | None, Row | EventAsRow | None] = {None: None}
 
-    def memorize(self, row: Row) -> str | None:
+    def memorize(self, row: Row | EventAsRow) -> bytes | None:
         """Memorize a context from the database."""
         if self._memorize_new:
-            context_id: str = row.context_id
-            self._lookup.setdefault(context_id, row)
-            return context_id
+            context_id_bin: bytes | None = row.context_id_bin
+            self._lookup.setdefault(context_id_bin, row)
+            return context_id_bin
         return None
 
     def clear(self) -> None:
@@ -307,9 +305,9 @@ class ContextLookup:
         self._lookup.clear()
         self._memorize_new = False
 
-    def get(self, context_id: str) -> Row | None:
+    def get(self, context_id_bin: bytes) -> Row | EventAsRow | None:
         """Get the context origin."""
-        return self._lookup.get(context_id)
+        return self._lookup.get(context_id_bin)
 
 
 class ContextAugmenter:
@@ -324,11 +322,11 @@ class ContextAugmenter:
         self.include_entity_name = logbook_run.include_entity_name
 
     def _get_context_row(
-        self, context_id: str | None, row: Row | EventAsRow
+        self, context_id_bin: bytes | None, row: Row | EventAsRow
     ) -> Row | EventAsRow:
         """Get the context row from the id or row context."""
-        if context_id:
-            return self.context_lookup.get(context_id)
+        if context_id_bin:
+            return self.context_lookup.get(context_id_bin)
         if (context := getattr(row, "context", None)) is not None and (
             origin_event := context.origin_event
         ) is not None:
@@ -336,23 +334,26 @@ class ContextAugmenter:
         return None
 
     def augment(
-        self, data: dict[str, Any], row: Row | EventAsRow, context_id: str | None
+        self,
+        data: dict[str, Any],
+        row: Row | EventAsRow,
+        context_id_bin: bytes | None,
     ) -> None:
         """Augment data from the row and cache."""
-        if context_user_id := row.context_user_id:
-            data[CONTEXT_USER_ID] = context_user_id
+        if context_user_id_bin := row.context_user_id_bin:
+            data[CONTEXT_USER_ID] = bytes_to_uuid_hex_or_none(context_user_id_bin)
 
-        if not (context_row := self._get_context_row(context_id, row)):
+        if not (context_row := self._get_context_row(context_id_bin, row)):
             return
 
         if _rows_match(row, context_row):
             # This is the first event with the given ID. Was it directly caused by
             # a parent event?
             if (
-                not row.context_parent_id
+                not row.context_parent_id_bin
                 or (
                     context_row := self._get_context_row(
-                        row.context_parent_id, context_row
+                        row.context_parent_id_bin, context_row
                     )
                 )
                 is None
@@ -424,12 +425,13 @@ def _row_event_data_extract(row: Row | EventAsRow, extractor: re.Pattern) -> str
 
 def _row_time_fired_isoformat(row: Row | EventAsRow) -> str:
     """Convert the row timed_fired to isoformat."""
-    return process_timestamp_to_utc_isoformat(row.time_fired or dt_util.utcnow())
+    return dt_util.utc_from_timestamp(row.time_fired_ts or time.time()).isoformat()
 
 
 def _row_time_fired_timestamp(row: Row | EventAsRow) -> float:
     """Convert the row timed_fired to timestamp."""
-    return process_datetime_to_timestamp(row.time_fired or dt_util.utcnow())
+    time_fired_ts: float | None = row.time_fired_ts
+    return time_fired_ts or time.time()
 
 
 class EntityNameCache:
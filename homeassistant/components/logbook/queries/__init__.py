@@ -6,6 +6,7 @@ from datetime import datetime as dt
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from homeassistant.components.recorder.filters import Filters
+from homeassistant.components.recorder.models import context_id_to_bytes_or_none
 
 from .all import all_stmt
 from .devices import devices_stmt
@@ -14,8 +15,8 @@ from .entities_and_devices import entities_devices_stmt
 
 
 def statement_for_request(
-    start_day: dt,
-    end_day: dt,
+    start_day_dt: dt,
+    end_day_dt: dt,
     event_types: tuple[str, ...],
     entity_ids: list[str] | None = None,
     device_ids: list[str] | None = None,
@@ -23,10 +24,17 @@ def statement_for_request(
     context_id: str | None = None,
 ) -> StatementLambdaElement:
     """Generate the logbook statement for a logbook request."""
+    start_day = start_day_dt.timestamp()
+    end_day = end_day_dt.timestamp()
 
     # No entities: logbook sends everything for the timeframe
     # limited by the context_id and the yaml configured filter
     if not entity_ids and not device_ids:
+        context_id_bin = None
+        if context_id is not None:
+            # A context id that can not be converted is never in the
+            # database, the empty value makes sure nothing matches
+            context_id_bin = context_id_to_bytes_or_none(context_id) or b""
         states_entity_filter = filters.states_entity_filter() if filters else None
         events_entity_filter = filters.events_entity_filter() if filters else None
         return all_stmt(
@@ -35,7 +43,7 @@ def statement_for_request(
             event_types,
             states_entity_filter,
             events_entity_filter,
-            context_id,
+            context_id_bin,
         )
 
     # sqlalchemy caches object quoting, the
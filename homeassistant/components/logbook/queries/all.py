@@ -1,14 +1,17 @@
 """All queries for logbook."""
 from __future__ import annotations
 
-from datetime import datetime as dt
 
 from sqlalchemy import lambda_stmt
 from sqlalchemy.orm import Query
 from sqlalchemy.sql.elements import ClauseList
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 
-from homeassistant.components.recorder.models import LAST_UPDATED_INDEX, Events, States
+from homeassistant.components.recorder.models import (
+    LAST_UPDATED_INDEX_TS,
+    Events,
+    States,
+)
 
 from .common import (
     apply_states_filters,
@@ -19,24 +22,24 @@ from .common import (
 
 
 def all_stmt(
-    start_day: dt,
-    end_day: dt,
+    start_day: float,
+    end_day: float,
     event_types: tuple[str, ...],
     states_entity_filter: ClauseList | None = None,
     events_entity_filter: ClauseList | None = None,
-    context_id: str | None = None,
+    context_id_bin: bytes | None = None,
 ) -> StatementLambdaElement:
     """Generate a logbook query for all entities."""
     stmt = lambda_stmt(
         lambda: select_events_without_states(start_day, end_day, event_types)
     )
-    if context_id is not None:
+    if context_id_bin is not None:
         # Once all the old `state_changed` events
         # are gone from the database remove the
         # _legacy_select_events_context_id()
-        stmt += lambda s: s.where(Events.context_id == context_id).union_all(
-            _states_query_for_context_id(start_day, end_day, context_id),
-            legacy_select_events_context_id(start_day, end_day, context_id),
+        stmt += lambda s: s.where(Events.context_id_bin == context_id_bin).union_all(
+            _states_query_for_context_id(start_day, end_day, context_id_bin),
+            legacy_select_events_context_id(start_day, end_day, context_id_bin),
         )
     else:
         if events_entity_filter is not None:
@@ -49,22 +52,24 @@ def all_stmt(
         else:
             stmt += lambda s: s.union_all(_states_query_for_all(start_day, end_day))
 
-    stmt += lambda s: s.order_by(Events.time_fired)
+    stmt += lambda s: s.order_by(Events.time_fired_ts)
     return stmt
 
 
-def _states_query_for_all(start_day: dt, end_day: dt) -> Query:
+def _states_query_for_all(start_day: float, end_day: float) -> Query:
     return apply_states_filters(_apply_all_hints(select_states()), start_day, end_day)
 
 
 def _apply_all_hints(query: Query) -> Query:
     """Force mysql to use the right index on large selects."""
     return query.with_hint(
-        States, f"FORCE INDEX ({LAST_UPDATED_INDEX})", dialect_name="mysql"
+        States, f"FORCE INDEX ({LAST_UPDATED_INDEX_TS})", dialect_name="mysql"
     )
 
 
-def _states_query_for_context_id(start_day: dt, end_day: dt, context_id: str) -> Query:
+def _states_query_for_context_id(
+    start_day: float, end_day: float, context_id_bin: bytes
+) -> Query:
     return apply_states_filters(select_states(), start_day, end_day).where(
-        States.context_id == context_id
+        States.context_id_bin == context_id_bin
     )
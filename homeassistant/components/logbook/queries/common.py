@@ -1,17 +1,17 @@
 """Queries for logbook."""
 from __future__ import annotations
 
-from datetime import datetime as dt
 
 import sqlalchemy
-from sqlalchemy import select
-from sqlalchemy.orm import Query
+from sqlalchemy import JSON, select, type_coerce
+from sqlalchemy.orm import Query, aliased
 from sqlalchemy.sql.elements import ClauseList
 from sqlalchemy.sql.expression import literal
 from sqlalchemy.sql.selectable import Select
 
 from homeassistant.components.proximity import DOMAIN as PROXIMITY_DOMAIN
 from homeassistant.components.recorder.models import (
+    JSON_VARIENT_CAST,
     OLD_FORMAT_ATTRS_JSON,
     OLD_STATE,
     SHARED_ATTRS_JSON,
@@ -19,6 +19,7 @@ from homeassistant.components.recorder.models import (
     Events,
     StateAttributes,
     States,
+    StatesMeta,
 )
 from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
 
@@ -41,24 +42,40 @@ EVENT_COLUMNS = (
     Events.event_id.label("event_id"),
     Events.event_type.label("event_type"),
     Events.event_data.label("event_data"),
-    Events.time_fired.label("time_fired"),
-    Events.context_id.label("context_id"),
-    Events.context_user_id.label("context_user_id"),
-    Events.context_parent_id.label("context_parent_id"),
+    Events.time_fired_ts.label("time_fired_ts"),
+    Events.context_id_bin.label("context_id_bin"),
+    Events.context_user_id_bin.label("context_user_id_bin"),
+    Events.context_parent_id_bin.label("context_parent_id_bin"),
+)
+
+_StaticStateAttributes = aliased(StateAttributes)
+# The icon is one of the static attributes, which are in their own
+# row when split_static_attributes is enabled
+STATIC_SHARED_ATTRS_ICON = (
+    select(
+        type_coerce(
+            _StaticStateAttributes.shared_attrs.cast(JSON_VARIENT_CAST),
+            JSON(none_as_null=True),
+        )["icon"].as_string()
+    )
+    .where(_StaticStateAttributes.attributes_id == States.static_attributes_id)
+    .scalar_subquery()
 )
 
 STATE_COLUMNS = (
     States.state_id.label("state_id"),
     States.state.label("state"),
-    States.entity_id.label("entity_id"),
-    SHARED_ATTRS_JSON["icon"].as_string().label("icon"),
+    StatesMeta.entity_id.label("entity_id"),
+    sqlalchemy.func.coalesce(
+        SHARED_ATTRS_JSON["icon"].as_string(), STATIC_SHARED_ATTRS_ICON
+    ).label("icon"),
     OLD_FORMAT_ATTRS_JSON["icon"].as_string().label("old_format_icon"),
 )
 
 STATE_CONTEXT_ONLY_COLUMNS = (
     States.state_id.label("state_id"),
     States.state.label("state"),
-    States.entity_id.label("entity_id"),
+    StatesMeta.entity_id.label("entity_id"),
     literal(value=None, type_=sqlalchemy.String).label("icon"),
     literal(value=None, type_=sqlalchemy.String).label("old_format_icon"),
 )
@@ -73,10 +90,10 @@ EVENT_COLUMNS_FOR_STATE_SELECT = [
         "event_type"
     ),
     literal(value=None, type_=sqlalchemy.Text).label("event_data"),
-    States.last_updated.label("time_fired"),
-    States.context_id.label("context_id"),
-    States.context_user_id.label("context_user_id"),
-    States.context_parent_id.label("context_parent_id"),
+    States.last_updated_ts.label("time_fired_ts"),
+    States.context_id_bin.label("context_id_bin"),
+    States.context_user_id_bin.label("context_user_id_bin"),
+    States.context_parent_id_bin.label("context_parent_id_bin"),
     literal(value=None, type_=sqlalchemy.Text).label("shared_data"),
 ]
 
@@ -102,14 +119,14 @@ NOT_CONTEXT_ONLY = literal(None).label("context_only")
 
 
 def select_events_context_id_subquery(
-    start_day: dt,
-    end_day: dt,
+    start_day: float,
+    end_day: float,
     event_types: tuple[str, ...],
 ) -> Select:
     """Generate the select for a context_id subquery."""
     return (
-        select(Events.context_id)
-        .where((Events.time_fired > start_day) & (Events.time_fired < end_day))
+        select(Events.context_id_bin)
+        .where((Events.time_fired_ts > start_day) & (Events.time_fired_ts < end_day))
         .where(Events.event_type.in_(event_types))
         .outerjoin(EventData, (Events.data_id == EventData.data_id))
     )
@@ -134,16 +151,16 @@ def select_states_context_only() -> Select:
     """
     return select(
         *EVENT_COLUMNS_FOR_STATE_SELECT, *STATE_CONTEXT_ONLY_COLUMNS, CONTEXT_ONLY
-    )
+    ).outerjoin(StatesMeta, (States.metadata_id == StatesMeta.metadata_id))
 
 
 def select_events_without_states(
-    start_day: dt, end_day: dt, event_types: tuple[str, ...]
+    start_day: float, end_day: float, event_types: tuple[str, ...]
 ) -> Select:
     """Generate an events select that does not join states."""
     return (
         select(*EVENT_ROWS_NO_STATES, NOT_CONTEXT_ONLY)
-        .where((Events.time_fired > start_day) & (Events.time_fired < end_day))
+        .where((Events.time_fired_ts > start_day) & (Events.time_fired_ts < end_day))
         .where(Events.event_type.in_(event_types))
         .outerjoin(EventData, (Events.data_id == EventData.data_id))
     )
@@ -155,11 +172,24 @@ def select_states() -> Select:
         *EVENT_COLUMNS_FOR_STATE_SELECT,
         *STATE_COLUMNS,
         NOT_CONTEXT_ONLY,
+    ).outerjoin(StatesMeta, (States.metadata_id == StatesMeta.metadata_id))
+
+
+def select_metadata_ids(entity_ids: list[str]) -> Select:
+    """Generate a select for the metadata_ids of entity_ids.
+
+    The select is not correlated to the states_meta table
+    that the states selects join.
+    """
+    return (
+        select(StatesMeta.metadata_id)
+        .where(StatesMeta.entity_id.in_(entity_ids))
+        .correlate(None)
     )
 
 
 def legacy_select_events_context_id(
-    start_day: dt, end_day: dt, context_id: str
+    start_day: float, end_day: float, context_id_bin: bytes
 ) -> Select:
     """Generate a legacy events context id select that also joins states."""
     # This can be removed once we no longer have event_ids in the states table
@@ -171,19 +201,21 @@ def legacy_select_events_context_id(
             NOT_CONTEXT_ONLY,
         )
         .outerjoin(States, (Events.event_id == States.event_id))
+        .outerjoin(StatesMeta, (States.metadata_id == StatesMeta.metadata_id))
         .where(
-            (States.last_updated == States.last_changed) | States.last_changed.is_(None)
+            (States.last_updated_ts == States.last_changed_ts)
+            | States.last_changed_ts.is_(None)
         )
         .where(_not_continuous_entity_matcher())
         .outerjoin(
             StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
         )
-        .where((Events.time_fired > start_day) & (Events.time_fired < end_day))
-        .where(Events.context_id == context_id)
+        .where((Events.time_fired_ts > start_day) & (Events.time_fired_ts < end_day))
+        .where(Events.context_id_bin == context_id_bin)
     )
 
 
-def apply_states_filters(query: Query, start_day: dt, end_day: dt) -> Query:
+def apply_states_filters(query: Query, start_day: float, end_day: float) -> Query:
     """Filter states by time range.
 
     Filters states that do not have an old state or new state (added / removed)
@@ -192,13 +224,14 @@ def apply_states_filters(query: Query, start_day: dt, end_day: dt) -> Query:
     """
     return (
         query.filter(
-            (States.last_updated > start_day) & (States.last_updated < end_day)
+            (States.last_updated_ts > start_day) & (States.last_updated_ts < end_day)
         )
         .outerjoin(OLD_STATE, (States.old_state_id == OLD_STATE.state_id))
         .where(_missing_state_matcher())
         .where(_not_continuous_entity_matcher())
         .where(
-            (States.last_updated == States.last_changed) | States.last_changed.is_(None)
+            (States.last_updated_ts == States.last_changed_ts)
+            | States.last_changed_ts.is_(None)
         )
         .outerjoin(
             StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
@@ -231,7 +264,7 @@ def _not_continuous_domain_matcher() -> sqlalchemy.and_:
     """Match not continuous domains."""
     return sqlalchemy.and_(
         *[
-            ~States.entity_id.like(entity_domain)
+            ~StatesMeta.entity_id.like(entity_domain)
             for entity_domain in CONTINUOUS_ENTITY_ID_LIKE
         ],
     ).self_group()
@@ -241,7 +274,7 @@ def _continuous_domain_matcher() -> sqlalchemy.or_:
     """Match continuous domains."""
     return sqlalchemy.or_(
         *[
-            States.entity_id.like(entity_domain)
+            StatesMeta.entity_id.like(entity_domain)
             for entity_domain in CONTINUOUS_ENTITY_ID_LIKE
         ],
     ).self_group()
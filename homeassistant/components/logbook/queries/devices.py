@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
-from datetime import datetime as dt
 
 from sqlalchemy import lambda_stmt, select, union_all
 from sqlalchemy.orm import Query
@@ -21,8 +20,8 @@ from .common import (
 
 
 def _select_device_id_context_ids_sub_query(
-    start_day: dt,
-    end_day: dt,
+    start_day: float,
+    end_day: float,
     event_types: tuple[str, ...],
     json_quotable_device_ids: list[str],
 ) -> CompoundSelect:
@@ -32,14 +31,14 @@ def _select_device_id_context_ids_sub_query(
             select_events_context_id_subquery(start_day, end_day, event_types).where(
                 apply_event_device_id_matchers(json_quotable_device_ids)
             ),
-        ).c.context_id
+        ).c.context_id_bin
     )
 
 
 def _apply_devices_context_union(
     query: Query,
-    start_day: dt,
-    end_day: dt,
+    start_day: float,
+    end_day: float,
     event_types: tuple[str, ...],
     json_quotable_device_ids: list[str],
 ) -> CompoundSelect:
@@ -51,14 +50,18 @@ def _apply_devices_context_union(
         json_quotable_device_ids,
     ).cte()
     return query.union_all(
-        select_events_context_only().where(Events.context_id.in_(devices_cte.select())),
-        select_states_context_only().where(States.context_id.in_(devices_cte.select())),
+        select_events_context_only().where(
+            Events.context_id_bin.in_(devices_cte.select())
+        ),
+        select_states_context_only().where(
+            States.context_id_bin.in_(devices_cte.select())
+        ),
     )
 
 
 def devices_stmt(
-    start_day: dt,
-    end_day: dt,
+    start_day: float,
+    end_day: float,
     event_types: tuple[str, ...],
     json_quotable_device_ids: list[str],
 ) -> StatementLambdaElement:
@@ -72,7 +75,7 @@ def devices_stmt(
             end_day,
             event_types,
             json_quotable_device_ids,
-        ).order_by(Events.time_fired)
+        ).order_by(Events.time_fired_ts)
     )
     return stmt
 
@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
-from datetime import datetime as dt
 
 import sqlalchemy
 from sqlalchemy import lambda_stmt, select, union_all
@@ -12,7 +11,7 @@ from sqlalchemy.sql.selectable import CTE, CompoundSelect
 
 from homeassistant.components.recorder.models import (
     ENTITY_ID_IN_EVENT,
-    ENTITY_ID_LAST_UPDATED_INDEX,
+    METADATA_ID_LAST_UPDATED_INDEX_TS,
     OLD_ENTITY_ID_IN_EVENT,
     Events,
     States,
@@ -23,14 +22,15 @@ from .common import (
     select_events_context_id_subquery,
     select_events_context_only,
     select_events_without_states,
+    select_metadata_ids,
     select_states,
     select_states_context_only,
 )
 
 
 def _select_entities_context_ids_sub_query(
-    start_day: dt,
-    end_day: dt,
+    start_day: float,
+    end_day: float,
     event_types: tuple[str, ...],
     entity_ids: list[str],
     json_quotable_entity_ids: list[str],
@@ -41,17 +41,20 @@ def _select_entities_context_ids_sub_query(
             select_events_context_id_subquery(start_day, end_day, event_types).where(
                 apply_event_entity_id_matchers(json_quotable_entity_ids)
             ),
-            apply_entities_hints(select(States.context_id))
-            .filter((States.last_updated > start_day) & (States.last_updated < end_day))
-            .where(States.entity_id.in_(entity_ids)),
-        ).c.context_id
+            apply_entities_hints(select(States.context_id_bin))
+            .filter(
+                (States.last_updated_ts > start_day)
+                & (States.last_updated_ts < end_day)
+            )
+            .where(States.metadata_id.in_(select_metadata_ids(entity_ids))),
+        ).c.context_id_bin
     )
 
 
 def _apply_entities_context_union(
     query: Query,
-    start_day: dt,
-    end_day: dt,
+    start_day: float,
+    end_day: float,
     event_types: tuple[str, ...],
     entity_ids: list[str],
     json_quotable_entity_ids: list[str],
@@ -67,17 +70,17 @@ def _apply_entities_context_union(
     return query.union_all(
         states_query_for_entity_ids(start_day, end_day, entity_ids),
         select_events_context_only().where(
-            Events.context_id.in_(entities_cte.select())
+            Events.context_id_bin.in_(entities_cte.select())
         ),
         select_states_context_only()
-        .where(States.entity_id.not_in(entity_ids))
-        .where(States.context_id.in_(entities_cte.select())),
+        .where(States.metadata_id.not_in(select_metadata_ids(entity_ids)))
+        .where(States.context_id_bin.in_(entities_cte.select())),
     )
 
 
 def entities_stmt(
-    start_day: dt,
-    end_day: dt,
+    start_day: float,
+    end_day: float,
     event_types: tuple[str, ...],
     entity_ids: list[str],
     json_quotable_entity_ids: list[str],
@@ -93,17 +96,17 @@ def entities_stmt(
             event_types,
             entity_ids,
             json_quotable_entity_ids,
-        ).order_by(Events.time_fired)
+        ).order_by(Events.time_fired_ts)
     )
 
 
 def states_query_for_entity_ids(
-    start_day: dt, end_day: dt, entity_ids: list[str]
+    start_day: float, end_day: float, entity_ids: list[str]
 ) -> Query:
     """Generate a select for states from the States table for specific entities."""
     return apply_states_filters(
         apply_entities_hints(select_states()), start_day, end_day
-    ).where(States.entity_id.in_(entity_ids))
+    ).where(States.metadata_id.in_(select_metadata_ids(entity_ids)))
 
 
 def apply_event_entity_id_matchers(
@@ -118,5 +121,7 @@ def apply_event_entity_id_matchers(
 def apply_entities_hints(query: Query) -> Query:
     """Force mysql to use the right index on large selects."""
     return query.with_hint(
-        States, f"FORCE INDEX ({ENTITY_ID_LAST_UPDATED_INDEX})", dialect_name="mysql"
+        States,
+        f"FORCE INDEX ({METADATA_ID_LAST_UPDATED_INDEX_TS})",
+        dialect_name="mysql",
     )
@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
-from datetime import datetime as dt
 
 import sqlalchemy
 from sqlalchemy import lambda_stmt, select, union_all
@@ -16,6 +15,7 @@ from .common import (
     select_events_context_id_subquery,
     select_events_context_only,
     select_events_without_states,
+    select_metadata_ids,
     select_states_context_only,
 )
 from .devices import apply_event_device_id_matchers
@@ -27,8 +27,8 @@ from .entities import (
 
 
 def _select_entities_device_id_context_ids_sub_query(
-    start_day: dt,
-    end_day: dt,
+    start_day: float,
+    end_day: float,
     event_types: tuple[str, ...],
     entity_ids: list[str],
     json_quotable_entity_ids: list[str],
@@ -42,17 +42,20 @@ def _select_entities_device_id_context_ids_sub_query(
                     json_quotable_entity_ids, json_quotable_device_ids
                 )
             ),
-            apply_entities_hints(select(States.context_id))
-            .filter((States.last_updated > start_day) & (States.last_updated < end_day))
-            .where(States.entity_id.in_(entity_ids)),
-        ).c.context_id
+            apply_entities_hints(select(States.context_id_bin))
+            .filter(
+                (States.last_updated_ts > start_day)
+                & (States.last_updated_ts < end_day)
+            )
+            .where(States.metadata_id.in_(select_metadata_ids(entity_ids))),
+        ).c.context_id_bin
     )
 
 
 def _apply_entities_devices_context_union(
     query: Query,
-    start_day: dt,
-    end_day: dt,
+    start_day: float,
+    end_day: float,
     event_types: tuple[str, ...],
     entity_ids: list[str],
     json_quotable_entity_ids: list[str],
@@ -69,17 +72,17 @@ def _apply_entities_devices_context_union(
     return query.union_all(
         states_query_for_entity_ids(start_day, end_day, entity_ids),
         select_events_context_only().where(
-            Events.context_id.in_(devices_entities_cte.select())
+            Events.context_id_bin.in_(devices_entities_cte.select())
         ),
         select_states_context_only()
-        .where(States.entity_id.not_in(entity_ids))
-        .where(States.context_id.in_(devices_entities_cte.select())),
+        .where(States.metadata_id.not_in(select_metadata_ids(entity_ids)))
+        .where(States.context_id_bin.in_(devices_entities_cte.select())),
     )
 
 
 def entities_devices_stmt(
-    start_day: dt,
-    end_day: dt,
+    start_day: float,
+    end_day: float,
     event_types: tuple[str, ...],
     entity_ids: list[str],
     json_quotable_entity_ids: list[str],
@@ -99,7 +102,7 @@ def entities_devices_stmt(
             entity_ids,
             json_quotable_entity_ids,
             json_quotable_device_ids,
-        ).order_by(Events.time_fired)
+        ).order_by(Events.time_fired_ts)
     )
     return stmt
 
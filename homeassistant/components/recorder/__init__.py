@@ -51,6 +51,9 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_BULK_INSERT = "bulk_insert"
+CONF_SPOOL = "spool"
+CONF_SPLIT_STATIC_ATTRIBUTES = "split_static_attributes"
 
 
 EXCLUDE_SCHEMA = INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER.extend(
@@ -91,6 +94,11 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL
                     ): cv.positive_int,
+                    vol.Optional(CONF_BULK_INSERT, default=False): cv.boolean,
+                    vol.Optional(CONF_SPOOL, default=False): cv.boolean,
+                    vol.Optional(
+                        CONF_SPLIT_STATIC_ATTRIBUTES, default=False
+                    ): cv.boolean,
                     vol.Optional(
                         CONF_DB_MAX_RETRIES, default=DEFAULT_DB_MAX_RETRIES
                     ): cv.positive_int,
@@ -161,6 +169,9 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         entity_filter=entity_filter,
         exclude_t=exclude_t,
         exclude_attributes_by_domain=exclude_attributes_by_domain,
+        bulk_insert=conf[CONF_BULK_INSERT],
+        spool=conf[CONF_SPOOL],
+        split_static_attributes=conf[CONF_SPLIT_STATIC_ATTRIBUTES],
     )
     instance.async_initialize()
     instance.async_register()
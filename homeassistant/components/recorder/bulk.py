@@ -0,0 +1,347 @@
+"""Bulk insert write path for the recorder."""
+from __future__ import annotations
+
+from collections.abc import Callable, MutableMapping
+from typing import Any, NamedTuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+from homeassistant.core import Event, State
+
+from .models import (
+    EVENT_ORIGIN_TO_IDX,
+    EventData,
+    Events,
+    StateAttributes,
+    States,
+    StatesMeta,
+    context_id_to_bytes_or_none,
+    uuid_hex_to_bytes_or_none,
+)
+from .queries import (
+    find_event_data_inserted_after,
+    find_max_attributes_id,
+    find_max_data_id,
+    find_max_state_id,
+    find_max_states_meta_id,
+    find_state_attributes_inserted_after,
+    find_states_inserted_after,
+    find_states_meta_inserted_after,
+)
+
+
+class PendingState(NamedTuple):
+    """A states row waiting to be inserted.
+
+    Either attributes_id is known, or shared_attrs refers to
+    attributes that will be inserted in the same batch. The
+    same goes for metadata_id and the states_meta of entity_id,
+    and for static_attributes_id when static attributes are
+    stored apart.
+    """
+
+    entity_id: str
+    state: str | None
+    last_changed_ts: float | None
+    last_updated_ts: float
+    context_id_bin: bytes | None
+    context_user_id_bin: bytes | None
+    context_parent_id_bin: bytes | None
+    origin_idx: int | None
+    attributes_id: int | None
+    shared_attrs: str | None
+    metadata_id: int | None
+    static_attributes_id: int | None = None
+    static_shared_attrs: str | None = None
+
+    @classmethod
+    def from_event(
+        cls,
+        event: Event,
+        attributes_id: int | None,
+        shared_attrs: str | None,
+        metadata_id: int | None,
+        static_attributes_id: int | None = None,
+        static_shared_attrs: str | None = None,
+    ) -> PendingState:
+        """Create a pending row from a state_changed event.
+
+        Mirrors States.from_event without creating an ORM object.
+        """
+        state: State | None = event.data.get("new_state")
+        context = event.context
+        # None state means the state was removed from the state machine
+        if state is None:
+            state_value = None
+            last_updated_ts = event.time_fired.timestamp()
+            last_changed_ts = None
+        else:
+            state_value = state.state
+            last_updated_ts = state.last_updated.timestamp()
+            last_changed_ts = (
+                None
+                if state.last_updated == state.last_changed
+                else state.last_changed.timestamp()
+            )
+        return cls(
+            event.data["entity_id"],
+            state_value,
+            last_changed_ts,
+            last_updated_ts,
+            context_id_to_bytes_or_none(context.id),
+            uuid_hex_to_bytes_or_none(context.user_id),
+            context_id_to_bytes_or_none(context.parent_id),
+            EVENT_ORIGIN_TO_IDX.get(event.origin),
+            attributes_id,
+            shared_attrs,
+            metadata_id,
+            static_attributes_id,
+            static_shared_attrs,
+        )
+
+
+class PendingEvent(NamedTuple):
+    """An events row waiting to be inserted.
+
+    Either data_id is known, or shared_data refers to
+    event data that will be inserted in the same batch.
+    """
+
+    event_type: str
+    origin_idx: int | None
+    time_fired_ts: float
+    context_id_bin: bytes | None
+    context_user_id_bin: bytes | None
+    context_parent_id_bin: bytes | None
+    data_id: int | None
+    shared_data: str | None
+
+    @classmethod
+    def from_event(
+        cls, event: Event, data_id: int | None, shared_data: str | None
+    ) -> PendingEvent:
+        """Create a pending row from an event.
+
+        Mirrors Events.from_event without creating an ORM object.
+        """
+        context = event.context
+        return cls(
+            event.event_type,
+            EVENT_ORIGIN_TO_IDX.get(event.origin),
+            event.time_fired.timestamp(),
+            context_id_to_bytes_or_none(context.id),
+            uuid_hex_to_bytes_or_none(context.user_id),
+            context_id_to_bytes_or_none(context.parent_id),
+            data_id,
+            shared_data,
+        )
+
+
+def _insert_shared_rows(
+    session: Session,
+    table: type[StateAttributes] | type[EventData] | type[StatesMeta],
+    rows: list[dict[str, Any]],
+    find_max_id: StatementLambdaElement,
+    find_inserted_after: Callable[[int], StatementLambdaElement],
+) -> dict[str, int]:
+    """Insert shared rows with executemany and return their ids.
+
+    The recorder thread is the only writer, so every row with an id
+    above the highest id before the insert is one we just wrote.
+    """
+    max_id = session.execute(find_max_id).scalar() or 0
+    session.execute(insert(table), rows)
+    return {shared: id_ for id_, shared in session.execute(find_inserted_after(max_id))}
+
+
+class BulkInsertBuffer:
+    """Buffer recorder rows as tuples and insert them with executemany.
+
+    States are grouped into generations so that each entity appears at
+    most once per generation. Inserting generation by generation allows
+    old_state_id to be resolved for entities that changed more than once
+    since the last commit without inserting one row at a time.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the buffer."""
+        self.pending_attributes: dict[str, int] = {}
+        self.pending_data: dict[str, int] = {}
+        self.pending_states_meta: set[str] = set()
+        self._states: list[list[PendingState]] = []
+        self._state_generations: dict[str, int] = {}
+        self._events: list[PendingEvent] = []
+        self._inserted_attributes_ids: dict[str, int] = {}
+        self._inserted_data_ids: dict[str, int] = {}
+        self._inserted_metadata_ids: dict[str, int] = {}
+        self._inserted_state_ids: dict[str, int | None] = {}
+
+    @property
+    def has_pending_writes(self) -> bool:
+        """Return if there are rows waiting to be inserted."""
+        return bool(self._states or self._events)
+
+    def add_state(self, row: PendingState) -> None:
+        """Add a states row to the buffer."""
+        generation = self._state_generations.get(row.entity_id, 0)
+        self._state_generations[row.entity_id] = generation + 1
+        if generation == len(self._states):
+            self._states.append([])
+        self._states[generation].append(row)
+
+    def add_event(self, row: PendingEvent) -> None:
+        """Add an events row to the buffer."""
+        self._events.append(row)
+
+    def clear(self) -> None:
+        """Drop all buffered rows."""
+        self.pending_attributes = {}
+        self.pending_data = {}
+        self.pending_states_meta = set()
+        self._states = []
+        self._state_generations = {}
+        self._events = []
+        self._inserted_attributes_ids = {}
+        self._inserted_data_ids = {}
+        self._inserted_metadata_ids = {}
+        self._inserted_state_ids = {}
+
+    def write(self, session: Session, old_state_ids: MutableMapping[str, int]) -> None:
+        """Insert the buffered rows in the current transaction of the session.
+
+        The caches are not updated until committed is called since the
+        transaction may still be rolled back.
+        """
+        attributes_ids = self._inserted_attributes_ids = (
+            _insert_shared_rows(
+                session,
+                StateAttributes,
+                [
+                    {"hash": attr_hash, "shared_attrs": shared_attrs}
+                    for shared_attrs, attr_hash in self.pending_attributes.items()
+                ],
+                find_max_attributes_id(),
+                find_state_attributes_inserted_after,
+            )
+            if self.pending_attributes
+            else {}
+        )
+        data_ids = self._inserted_data_ids = (
+            _insert_shared_rows(
+                session,
+                EventData,
+                [
+                    {"hash": data_hash, "shared_data": shared_data}
+                    for shared_data, data_hash in self.pending_data.items()
+                ],
+                find_max_data_id(),
+                find_event_data_inserted_after,
+            )
+            if self.pending_data
+            else {}
+        )
+
+        if self._events:
+            session.execute(
+                insert(Events),
+                [
+                    {
+                        "event_type": row.event_type,
+                        "origin_idx": row.origin_idx,
+                        "time_fired_ts": row.time_fired_ts,
+                        "context_id_bin": row.context_id_bin,
+                        "context_user_id_bin": row.context_user_id_bin,
+                        "context_parent_id_bin": row.context_parent_id_bin,
+                        "data_id": row.data_id
+                        if row.shared_data is None
+                        else data_ids[row.shared_data],
+                    }
+                    for row in self._events
+                ],
+            )
+
+        state_ids: dict[str, int | None] = {}
+        self._inserted_state_ids = state_ids
+        if not self._states:
+            return
+        metadata_ids = self._inserted_metadata_ids = (
+            _insert_shared_rows(
+                session,
+                StatesMeta,
+                [{"entity_id": entity_id} for entity_id in self.pending_states_meta],
+                find_max_states_meta_id(),
+                find_states_meta_inserted_after,
+            )
+            if self.pending_states_meta
+            else {}
+        )
+        max_state_id: int = session.execute(find_max_state_id()).scalar() or 0
+        for generation in self._states:
+            generation_metadata_ids = [
+                row.metadata_id
+                if row.metadata_id is not None
+                else metadata_ids[row.entity_id]
+                for row in generation
+            ]
+            session.execute(
+                insert(States),
+                [
+                    {
+                        "metadata_id": metadata_id,
+                        "state": row.state,
+                        "last_changed_ts": row.last_changed_ts,
+                        "last_updated_ts": row.last_updated_ts,
+                        "context_id_bin": row.context_id_bin,
+                        "context_user_id_bin": row.context_user_id_bin,
+                        "context_parent_id_bin": row.context_parent_id_bin,
+                        "origin_idx": row.origin_idx,
+                        "attributes_id": row.attributes_id
+                        if row.shared_attrs is None
+                        else attributes_ids[row.shared_attrs],
+                        "static_attributes_id": row.static_attributes_id
+                        if row.static_shared_attrs is None
+                        else attributes_ids[row.static_shared_attrs],
+                        "old_state_id": state_ids[row.entity_id]
+                        if row.entity_id in state_ids
+                        else old_state_ids.get(row.entity_id),
+                    }
+                    for metadata_id, row in zip(generation_metadata_ids, generation)
+                ],
+            )
+            # Each entity_id appears only once per generation
+            entity_ids = dict(
+                zip(generation_metadata_ids, (row.entity_id for row in generation))
+            )
+            for state_id, metadata_id in session.execute(
+                find_states_inserted_after(max_state_id)
+            ):
+                state_ids[entity_ids[metadata_id]] = state_id
+                max_state_id = max(max_state_id, state_id)
+            for row in generation:
+                # None state means the state was removed from the state machine
+                # and it must not become the old state of the next row
+                if row.state is None:
+                    state_ids[row.entity_id] = None
+
+    def committed(
+        self,
+        state_attributes_ids: MutableMapping[str, int],
+        event_data_ids: MutableMapping[str, int],
+        states_meta_ids: MutableMapping[str, int],
+        old_state_ids: MutableMapping[str, int],
+    ) -> None:
+        """Update the caches with the ids of the committed rows and clear the buffer."""
+        for shared_attrs, attributes_id in self._inserted_attributes_ids.items():
+            state_attributes_ids[shared_attrs] = attributes_id
+        for shared_data, data_id in self._inserted_data_ids.items():
+            event_data_ids[shared_data] = data_id
+        for entity_id, metadata_id in self._inserted_metadata_ids.items():
+            states_meta_ids[entity_id] = metadata_id
+        for entity_id, state_id in self._inserted_state_ids.items():
+            if state_id is None:
+                old_state_ids.pop(entity_id, None)
+            else:
+                old_state_ids[entity_id] = state_id
+        self.clear()
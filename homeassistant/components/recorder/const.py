@@ -5,7 +5,14 @@ import json
 from typing import Final
 
 from homeassistant.backports.enum import StrEnum
-from homeassistant.const import ATTR_ATTRIBUTION, ATTR_RESTORED, ATTR_SUPPORTED_FEATURES
+from homeassistant.const import (
+    ATTR_ATTRIBUTION,
+    ATTR_DEVICE_CLASS,
+    ATTR_FRIENDLY_NAME,
+    ATTR_ICON,
+    ATTR_RESTORED,
+    ATTR_SUPPORTED_FEATURES,
+)
 from homeassistant.helpers.json import JSONEncoder
 
 DATA_INSTANCE = "recorder_instance"
@@ -25,12 +32,20 @@ MAX_QUEUE_BACKLOG = 40000
 # have upgraded their sqlite version
 MAX_ROWS_TO_PURGE = 998
 
+# Rows are updated with executemany so the
+# batch size is not limited by the bind vars
+MAX_ROWS_TO_MIGRATE = 10000
+
 DB_WORKER_PREFIX = "DbWorker"
 
 JSON_DUMP: Final = partial(json.dumps, cls=JSONEncoder, separators=(",", ":"))
 
 ALL_DOMAIN_EXCLUDE_ATTRS = {ATTR_ATTRIBUTION, ATTR_RESTORED, ATTR_SUPPORTED_FEATURES}
 
+# Attributes that rarely change, they are stored apart from the
+# other attributes when split_static_attributes is enabled
+STATIC_ATTRIBUTES = {ATTR_DEVICE_CLASS, ATTR_FRIENDLY_NAME, ATTR_ICON}
+
 ATTR_KEEP_DAYS = "keep_days"
 ATTR_REPACK = "repack"
 ATTR_APPLY_FILTER = "apply_filter"
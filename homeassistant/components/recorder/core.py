@@ -23,6 +23,7 @@ from sqlalchemy.orm.session import Session
 from homeassistant.components import persistent_notification
 from homeassistant.const import (
     ATTR_ENTITY_ID,
+    EVENT_CORE_CONFIG_UPDATE,
     EVENT_HOMEASSISTANT_FINAL_WRITE,
     EVENT_HOMEASSISTANT_STARTED,
     EVENT_HOMEASSISTANT_STOP,
@@ -39,6 +40,7 @@ from homeassistant.helpers.typing import UNDEFINED, UndefinedType
 import homeassistant.util.dt as dt_util
 
 from . import migration, statistics
+from .bulk import BulkInsertBuffer, PendingEvent, PendingState
 from .const import (
     DB_WORKER_PREFIX,
     KEEPALIVE_TIME,
@@ -47,7 +49,8 @@ from .const import (
     SQLITE_URL_PREFIX,
     SupportedDialect,
 )
-from .executor import DBInterruptibleThreadPoolExecutor
+from .executor import DBExecutorQueueStats, DBInterruptibleThreadPoolExecutor
+from .id_cache import SharedIdCache
 from .models import (
     SCHEMA_VERSION,
     Base,
@@ -55,6 +58,7 @@ from .models import (
     Events,
     StateAttributes,
     States,
+    StatesMeta,
     StatisticData,
     StatisticMetaData,
     StatisticsRuns,
@@ -62,19 +66,34 @@ from .models import (
     process_timestamp,
 )
 from .pool import POOL_SIZE, MutexPool, RecorderPool
-from .queries import find_shared_attributes_id, find_shared_data_id
+from .purge import PurgeProgress
+from .queries import (
+    find_recent_shared_attributes,
+    find_recent_shared_data,
+    find_shared_attributes_id,
+    find_shared_data_id,
+    find_states_metadata_id,
+    find_unfinished_purge_run,
+    has_events_context_ids_to_migrate,
+    has_states_context_ids_to_migrate,
+)
 from .run_history import RunHistory
+from .spool import SPOOL_FILE, EventSpool
 from .tasks import (
+    AdjustIdCacheSizesTask,
     AdjustStatisticsTask,
     ClearStatisticsTask,
     CommitTask,
+    ContextIDMigrationTask,
     DatabaseLockTask,
     EventTask,
     ExternalStatisticsTask,
     KeepAliveTask,
     PerodicCleanupTask,
     PurgeTask,
+    RebuildStatisticsRollupsTask,
     RecorderTask,
+    ReplaySpoolTask,
     StatisticsTask,
     StopTask,
     SynchronizeTask,
@@ -89,6 +108,7 @@ from .util import (
     move_away_broken_database,
     session_scope,
     setup_connection_for_dialect,
+    setup_read_only_connection_for_dialect,
     validate_or_move_away_sqlite_database,
     write_lock_db_sqlite,
 )
@@ -111,6 +131,14 @@ EXPIRE_AFTER_COMMITS = 120
 # - How much memory our low end hardware has
 STATE_ATTRIBUTES_ID_CACHE_SIZE = 2048
 EVENT_DATA_ID_CACHE_SIZE = 2048
+# The caches grow with the number of entities up to the max size
+STATE_ATTRIBUTES_ID_CACHE_PER_ENTITY = 2
+EVENT_DATA_ID_CACHE_PER_ENTITY = 1
+STATE_ATTRIBUTES_ID_CACHE_MAX_SIZE = 32768
+EVENT_DATA_ID_CACHE_MAX_SIZE = 16384
+# Every entity_id needs a metadata_id so this should
+# be larger than the number of entities that are recorded
+STATES_META_ID_CACHE_SIZE = 8192
 
 SHUTDOWN_TASK = object()
 
@@ -128,6 +156,13 @@ CONNECTIVITY_ERR = "Error in database connectivity during commit"
 # Pool size must accommodate Recorder thread + All db executors
 MAX_DB_EXECUTOR_WORKERS = POOL_SIZE - 1
 
+# Events are spooled to disk once the backlog reaches the threshold
+# and replayed once the recorder has worked it down to the resume size
+SPOOL_BACKLOG_THRESHOLD = MAX_QUEUE_BACKLOG // 4
+SPOOL_BACKLOG_RESUME = SPOOL_BACKLOG_THRESHOLD // 10
+SPOOL_FLUSH_INTERVAL = timedelta(seconds=1)
+SPOOL_REPLAY_COMMIT_SIZE = 1000
+
 
 class Recorder(threading.Thread):
     """A threaded recorder class."""
@@ -147,6 +182,9 @@ class Recorder(threading.Thread):
         entity_filter: Callable[[str], bool],
         exclude_t: list[str],
         exclude_attributes_by_domain: dict[str, set[str]],
+        bulk_insert: bool,
+        spool: bool,
+        split_static_attributes: bool,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -166,6 +204,7 @@ class Recorder(threading.Thread):
         self.async_recorder_ready = asyncio.Event()
         self._queue_watch = threading.Event()
         self.engine: Engine | None = None
+        self._read_engine: Engine | None = None
         self.run_history = RunHistory()
 
         self.entity_filter = entity_filter
@@ -174,18 +213,39 @@ class Recorder(threading.Thread):
         self.schema_version = 0
         self._commits_without_expire = 0
         self._old_states: dict[str, States] = {}
-        self._state_attributes_ids: LRU = LRU(STATE_ATTRIBUTES_ID_CACHE_SIZE)
-        self._event_data_ids: LRU = LRU(EVENT_DATA_ID_CACHE_SIZE)
+        self._state_attributes_ids = SharedIdCache(
+            STATE_ATTRIBUTES_ID_CACHE_SIZE,
+            STATE_ATTRIBUTES_ID_CACHE_MAX_SIZE,
+            STATE_ATTRIBUTES_ID_CACHE_PER_ENTITY,
+        )
+        self._event_data_ids = SharedIdCache(
+            EVENT_DATA_ID_CACHE_SIZE,
+            EVENT_DATA_ID_CACHE_MAX_SIZE,
+            EVENT_DATA_ID_CACHE_PER_ENTITY,
+        )
+        self._states_meta_ids: LRU = LRU(STATES_META_ID_CACHE_SIZE)
         self._pending_state_attributes: dict[str, StateAttributes] = {}
         self._pending_event_data: dict[str, EventData] = {}
+        self._pending_states_meta: dict[str, StatesMeta] = {}
         self._pending_expunge: list[States] = []
+        self._old_state_ids: dict[str, int] = {}
+        self._bulk_insert = BulkInsertBuffer() if bulk_insert else None
+        self._spool = EventSpool(hass.config.path(SPOOL_FILE)) if spool else None
+        self._spooling = False
+        self._tasks_after_spool: list[RecorderTask] = []
+        self._split_static_attributes = split_static_attributes
         self.event_session: Session | None = None
         self._get_session: Callable[[], Session] | None = None
+        self._get_read_session: Callable[[], Session] | None = None
         self._completed_first_database_setup: bool | None = None
         self.async_migration_event = asyncio.Event()
         self.migration_in_progress = False
+        self.purge_progress: PurgeProgress | None = None
+        self.statistics_query_cache = statistics.StatisticsQueryCache()
+        self.state_changed_processors: list[Callable[[HomeAssistant, Event], None]] = []
         self._database_lock_task: DatabaseLockTask | None = None
         self._db_executor: DBInterruptibleThreadPoolExecutor | None = None
+        self.executor_queue_stats = DBExecutorQueueStats()
         self._exclude_attributes_by_domain = exclude_attributes_by_domain
 
         self._event_listener: CALLBACK_TYPE | None = None
@@ -193,6 +253,7 @@ class Recorder(threading.Thread):
         self._keep_alive_listener: CALLBACK_TYPE | None = None
         self._commit_listener: CALLBACK_TYPE | None = None
         self._periodic_listener: CALLBACK_TYPE | None = None
+        self._spool_flush_listener: CALLBACK_TYPE | None = None
         self._nightly_listener: CALLBACK_TYPE | None = None
         self.enabled = True
 
@@ -201,6 +262,16 @@ class Recorder(threading.Thread):
         """Return the number of items in the recorder backlog."""
         return self._queue.qsize()
 
+    @property
+    def state_attributes_id_cache(self) -> SharedIdCache:
+        """Return the cache of state attributes ids."""
+        return self._state_attributes_ids
+
+    @property
+    def event_data_id_cache(self) -> SharedIdCache:
+        """Return the cache of event data ids."""
+        return self._event_data_ids
+
     @property
     def dialect_name(self) -> SupportedDialect | None:
         """Return the dialect the recorder uses."""
@@ -226,10 +297,33 @@ class Recorder(threading.Thread):
             raise RuntimeError("The database connection has not been established")
         return self._get_session()
 
+    def get_read_session(self) -> Session:
+        """Get a new sqlalchemy session for read-only queries.
+
+        Falls back to a regular session when the database cannot be
+        shared between connections.
+        """
+        if self._get_read_session is None:
+            return self.get_session()
+        return self._get_read_session()
+
     def queue_task(self, task: RecorderTask) -> None:
         """Add a task to the recorder queue."""
         self._queue.put(task)
 
+    @callback
+    def async_queue_task_after_spool(self, task: RecorderTask) -> None:
+        """Add a task to the recorder queue behind the spooled events.
+
+        Statistics and purge runs must see the events fired before them,
+        while events are spooled the task is held back until the spool
+        is replayed.
+        """
+        if self._spooling:
+            self._tasks_after_spool.append(task)
+            return
+        self.queue_task(task)
+
     def set_enable(self, enable: bool) -> None:
         """Enable or disable recording events and states."""
         self.enabled = enable
@@ -245,8 +339,9 @@ class Recorder(threading.Thread):
 
     def _shutdown_pool(self) -> None:
         """Close the dbpool connections in the current thread."""
-        if self.engine and hasattr(self.engine.pool, "shutdown"):
-            self.engine.pool.shutdown()
+        for engine in (self.engine, self._read_engine):
+            if engine and hasattr(engine.pool, "shutdown"):
+                engine.pool.shutdown()
 
     @callback
     def async_initialize(self) -> None:
@@ -281,7 +376,9 @@ class Recorder(threading.Thread):
         self, target: Callable[..., T], *args: Any
     ) -> asyncio.Future[T]:
         """Add an executor job from within the event loop."""
-        return self.hass.loop.run_in_executor(self._db_executor, target, *args)
+        return self.hass.loop.run_in_executor(
+            self._db_executor, self.executor_queue_stats.wrap_job(target, *args)
+        )
 
     def _stop_executor(self) -> None:
         """Stop the executor."""
@@ -334,6 +431,9 @@ class Recorder(threading.Thread):
         if self._periodic_listener:
             self._periodic_listener()
             self._periodic_listener = None
+        if self._spool_flush_listener:
+            self._spool_flush_listener()
+            self._spool_flush_listener = None
 
     @callback
     def _async_event_filter(self, event: Event) -> bool:
@@ -398,11 +498,18 @@ class Recorder(threading.Thread):
         bus = self.hass.bus
         bus.async_listen_once(EVENT_HOMEASSISTANT_FINAL_WRITE, self._empty_queue)
         bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_shutdown)
+        bus.async_listen(EVENT_CORE_CONFIG_UPDATE, self._async_core_config_updated)
         if self.hass.state == CoreState.running:
             self._hass_started.set_result(None)
             return
         bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, self._async_hass_started)
 
+    @callback
+    def _async_core_config_updated(self, event: Event) -> None:
+        """Rebuild the statistics rollups if the time zone was changed."""
+        if "time_zone" in event.data:
+            self.queue_task(RebuildStatisticsRollupsTask())
+
     @callback
     def async_connection_failed(self) -> None:
         """Connect failed tasks."""
@@ -424,8 +531,16 @@ class Recorder(threading.Thread):
     def _async_recorder_ready(self) -> None:
         """Finish start and mark recorder ready."""
         self._async_setup_periodic_tasks()
+        self._async_adjust_id_cache_sizes()
         self.async_recorder_ready.set()
 
+    @callback
+    def _async_adjust_id_cache_sizes(self) -> None:
+        """Resize the shared id caches for the current number of entities."""
+        self.queue_task(
+            AdjustIdCacheSizesTask(len(self.hass.states.async_entity_ids()))
+        )
+
     @callback
     def async_nightly_tasks(self, now: datetime) -> None:
         """Trigger the purge."""
@@ -435,9 +550,12 @@ class Recorder(threading.Thread):
             # until after the database is vacuumed
             repack = self.auto_repack and is_second_sunday(now)
             purge_before = dt_util.utcnow() - timedelta(days=self.keep_days)
-            self.queue_task(PurgeTask(purge_before, repack=repack, apply_filter=False))
+            self.async_queue_task_after_spool(
+                PurgeTask(purge_before, repack=repack, apply_filter=False)
+            )
         else:
-            self.queue_task(PerodicCleanupTask())
+            self.async_queue_task_after_spool(PerodicCleanupTask())
+        self._async_adjust_id_cache_sizes()
 
     @callback
     def async_periodic_statistics(self, now: datetime) -> None:
@@ -446,7 +564,7 @@ class Recorder(threading.Thread):
         Short term statistics run every 5 minutes
         """
         start = statistics.get_start_time()
-        self.queue_task(StatisticsTask(start))
+        self.async_queue_task_after_spool(StatisticsTask(start))
 
     @callback
     def async_adjust_statistics(
@@ -659,6 +777,7 @@ class Recorder(threading.Thread):
             _LOGGER.exception("Error during schema migration")
             return False
         else:
+            self.schema_version = SCHEMA_VERSION
             self._setup_run()
             return True
         finally:
@@ -689,9 +808,17 @@ class Recorder(threading.Thread):
         )
 
     def _process_one_event(self, event: Event) -> None:
+        if event.event_type == EVENT_STATE_CHANGED:
+            for process_state_changed in self.state_changed_processors:
+                process_state_changed(self.hass, event)
         if not self.enabled:
             return
-        if event.event_type == EVENT_STATE_CHANGED:
+        if self._bulk_insert is not None:
+            if event.event_type == EVENT_STATE_CHANGED:
+                self._process_state_changed_event_into_bulk_insert(event)
+            else:
+                self._process_non_state_changed_event_into_bulk_insert(event)
+        elif event.event_type == EVENT_STATE_CHANGED:
             self._process_state_changed_event_into_session(event)
         else:
             self._process_non_state_changed_event_into_session(event)
@@ -735,6 +862,16 @@ class Recorder(threading.Thread):
                 return cast(int, data_id[0])
         return None
 
+    def _find_states_metadata_id_in_db(self, entity_id: str) -> int | None:
+        """Find the states_meta metadata_id in the db from the entity_id."""
+        assert self.event_session is not None
+        with self.event_session.no_autoflush:
+            if metadata_id := self.event_session.execute(
+                find_states_metadata_id(entity_id)
+            ).first():
+                return cast(int, metadata_id[0])
+        return None
+
     def _process_non_state_changed_event_into_session(self, event: Event) -> None:
         """Process any event into the session except state changed."""
         assert self.event_session is not None
@@ -770,14 +907,47 @@ class Recorder(threading.Thread):
 
         self.event_session.add(dbevent)
 
+    def _shared_attrs_from_event(self, event: Event) -> tuple[str | None, str]:
+        """Return the static and the other shared_attrs of a state_changed event.
+
+        The static shared_attrs are always None unless they are stored apart.
+        """
+        if self._split_static_attributes:
+            return StateAttributes.split_shared_attrs_from_event(
+                event, self._exclude_attributes_by_domain
+            )
+        return None, StateAttributes.shared_attrs_from_event(
+            event, self._exclude_attributes_by_domain
+        )
+
+    def _state_attributes_for_session(
+        self, shared_attrs: str
+    ) -> tuple[int | None, StateAttributes | None]:
+        """Return the attributes_id or the pending StateAttributes for shared_attrs."""
+        assert self.event_session is not None
+        # Matching attributes found in the pending commit
+        if pending_attributes := self._pending_state_attributes.get(shared_attrs):
+            return None, pending_attributes
+        # Matching attributes id found in the cache
+        if attributes_id := self._state_attributes_ids.get(shared_attrs):
+            return attributes_id, None
+        attr_hash = StateAttributes.hash_shared_attrs(shared_attrs)
+        # Matching attributes found in the database
+        if attributes_id := self._find_shared_attr_in_db(attr_hash, shared_attrs):
+            self._state_attributes_ids[shared_attrs] = attributes_id
+            return attributes_id, None
+        # No matching attributes found, save them in the DB
+        dbstate_attributes = StateAttributes(shared_attrs=shared_attrs, hash=attr_hash)
+        self._pending_state_attributes[shared_attrs] = dbstate_attributes
+        self.event_session.add(dbstate_attributes)
+        return None, dbstate_attributes
+
     def _process_state_changed_event_into_session(self, event: Event) -> None:
         """Process a state_changed event into the session."""
         assert self.event_session is not None
         try:
             dbstate = States.from_event(event)
-            shared_attrs = StateAttributes.shared_attrs_from_event(
-                event, self._exclude_attributes_by_domain
-            )
+            static_shared_attrs, shared_attrs = self._shared_attrs_from_event(event)
         except (TypeError, ValueError) as ex:
             _LOGGER.warning(
                 "State is not JSON serializable: %s: %s",
@@ -787,39 +957,149 @@ class Recorder(threading.Thread):
             return
 
         dbstate.attributes = None
-        # Matching attributes found in the pending commit
-        if pending_attributes := self._pending_state_attributes.get(shared_attrs):
-            dbstate.state_attributes = pending_attributes
-        # Matching attributes id found in the cache
-        elif attributes_id := self._state_attributes_ids.get(shared_attrs):
-            dbstate.attributes_id = attributes_id
+        attributes_id, dbstate_attributes = self._state_attributes_for_session(
+            shared_attrs
+        )
+        if dbstate_attributes is not None:
+            dbstate.state_attributes = dbstate_attributes
         else:
-            attr_hash = StateAttributes.hash_shared_attrs(shared_attrs)
-            # Matching attributes found in the database
-            if attributes_id := self._find_shared_attr_in_db(attr_hash, shared_attrs):
-                dbstate.attributes_id = attributes_id
-                self._state_attributes_ids[shared_attrs] = attributes_id
-            # No matching attributes found, save them in the DB
+            dbstate.attributes_id = attributes_id
+        if static_shared_attrs is not None:
+            attributes_id, dbstate_attributes = self._state_attributes_for_session(
+                static_shared_attrs
+            )
+            if dbstate_attributes is not None:
+                dbstate.static_state_attributes = dbstate_attributes
             else:
-                dbstate_attributes = StateAttributes(
-                    shared_attrs=shared_attrs, hash=attr_hash
-                )
-                dbstate.state_attributes = dbstate_attributes
-                self._pending_state_attributes[shared_attrs] = dbstate_attributes
-                self.event_session.add(dbstate_attributes)
+                dbstate.static_attributes_id = attributes_id
+
+        entity_id: str = event.data["entity_id"]
+        # Matching states_meta found in the pending commit
+        if pending_states_meta := self._pending_states_meta.get(entity_id):
+            dbstate.states_meta_rel = pending_states_meta
+        # Matching metadata_id found in the cache
+        elif metadata_id := self._states_meta_ids.get(entity_id):
+            dbstate.metadata_id = metadata_id
+        # Matching metadata_id found in the database
+        elif metadata_id := self._find_states_metadata_id_in_db(entity_id):
+            dbstate.metadata_id = metadata_id
+            self._states_meta_ids[entity_id] = metadata_id
+        # No matching states_meta found, save it in the DB
+        else:
+            dbstates_meta = StatesMeta(entity_id=entity_id)
+            dbstate.states_meta_rel = dbstates_meta
+            self._pending_states_meta[entity_id] = dbstates_meta
+            self.event_session.add(dbstates_meta)
 
-        if old_state := self._old_states.pop(dbstate.entity_id, None):
+        if old_state := self._old_states.pop(entity_id, None):
             if old_state.state_id:
                 dbstate.old_state_id = old_state.state_id
             else:
                 dbstate.old_state = old_state
         if event.data.get("new_state"):
-            self._old_states[dbstate.entity_id] = dbstate
+            self._old_states[entity_id] = dbstate
             self._pending_expunge.append(dbstate)
         else:
             dbstate.state = None
         self.event_session.add(dbstate)
 
+    def _process_non_state_changed_event_into_bulk_insert(self, event: Event) -> None:
+        """Buffer any event except state changed for the next bulk insert."""
+        assert self._bulk_insert is not None
+        if not event.data:
+            self._bulk_insert.add_event(PendingEvent.from_event(event, None, None))
+            return
+
+        try:
+            shared_data = EventData.shared_data_from_event(event)
+        except (TypeError, ValueError) as ex:
+            _LOGGER.warning("Event is not JSON serializable: %s: %s", event, ex)
+            return
+
+        pending_data = self._bulk_insert.pending_data
+        # Matching data found in the pending bulk insert
+        if shared_data in pending_data:
+            data_id = None
+        # Matching data id found in the cache
+        elif not (data_id := self._event_data_ids.get(shared_data)):
+            data_hash = EventData.hash_shared_data(shared_data)
+            # Matching data found in the database
+            if data_id := self._find_shared_data_in_db(data_hash, shared_data):
+                self._event_data_ids[shared_data] = data_id
+            # No matching data found, insert it with the bulk insert
+            else:
+                pending_data[shared_data] = data_hash
+
+        self._bulk_insert.add_event(
+            PendingEvent.from_event(
+                event, data_id, None if data_id is not None else shared_data
+            )
+        )
+
+    def _process_state_changed_event_into_bulk_insert(self, event: Event) -> None:
+        """Buffer a state_changed event for the next bulk insert."""
+        assert self._bulk_insert is not None
+        try:
+            static_shared_attrs, shared_attrs = self._shared_attrs_from_event(event)
+        except (TypeError, ValueError) as ex:
+            _LOGGER.warning(
+                "State is not JSON serializable: %s: %s",
+                event.data.get("new_state"),
+                ex,
+            )
+            return
+
+        attributes_id = self._state_attributes_id_for_bulk_insert(shared_attrs)
+        static_attributes_id = (
+            None
+            if static_shared_attrs is None
+            else self._state_attributes_id_for_bulk_insert(static_shared_attrs)
+        )
+
+        entity_id: str = event.data["entity_id"]
+        pending_states_meta = self._bulk_insert.pending_states_meta
+        # Matching states_meta found in the pending bulk insert
+        if entity_id in pending_states_meta:
+            metadata_id = None
+        # Matching metadata_id found in the cache
+        elif not (metadata_id := self._states_meta_ids.get(entity_id)):
+            # Matching metadata_id found in the database
+            if metadata_id := self._find_states_metadata_id_in_db(entity_id):
+                self._states_meta_ids[entity_id] = metadata_id
+            # No matching states_meta found, insert it with the bulk insert
+            else:
+                pending_states_meta.add(entity_id)
+
+        self._bulk_insert.add_state(
+            PendingState.from_event(
+                event,
+                attributes_id,
+                None if attributes_id is not None else shared_attrs,
+                metadata_id,
+                static_attributes_id,
+                None if static_attributes_id is not None else static_shared_attrs,
+            )
+        )
+
+    def _state_attributes_id_for_bulk_insert(self, shared_attrs: str) -> int | None:
+        """Return the attributes_id for shared_attrs or None if they are pending."""
+        assert self._bulk_insert is not None
+        pending_attributes = self._bulk_insert.pending_attributes
+        # Matching attributes found in the pending bulk insert
+        if shared_attrs in pending_attributes:
+            return None
+        # Matching attributes id found in the cache
+        if attributes_id := self._state_attributes_ids.get(shared_attrs):
+            return attributes_id
+        attr_hash = StateAttributes.hash_shared_attrs(shared_attrs)
+        # Matching attributes found in the database
+        if attributes_id := self._find_shared_attr_in_db(attr_hash, shared_attrs):
+            self._state_attributes_ids[shared_attrs] = attributes_id
+            return attributes_id
+        # No matching attributes found, insert them with the bulk insert
+        pending_attributes[shared_attrs] = attr_hash
+        return None
+
     def _handle_database_error(self, err: Exception) -> bool:
         """Handle a database error that may result in moving away the corrupt db."""
         if isinstance(err.__cause__, sqlite3.DatabaseError):
@@ -831,6 +1111,8 @@ class Recorder(threading.Thread):
         return False
 
     def _event_session_has_pending_writes(self) -> bool:
+        if self._bulk_insert is not None and self._bulk_insert.has_pending_writes:
+            return True
         return bool(
             self.event_session and (self.event_session.new or self.event_session.dirty)
         )
@@ -861,7 +1143,10 @@ class Recorder(threading.Thread):
         assert self.event_session is not None
         self._commits_without_expire += 1
 
-        self.event_session.commit()
+        if self._bulk_insert is not None:
+            self._commit_bulk_insert()
+        else:
+            self.event_session.commit()
         if self._pending_expunge:
             for dbstate in self._pending_expunge:
                 # Expunge the state so its not expired
@@ -882,6 +1167,9 @@ class Recorder(threading.Thread):
         for event_data in self._pending_event_data.values():
             self._event_data_ids[event_data.shared_data] = event_data.data_id
         self._pending_event_data = {}
+        for states_meta in self._pending_states_meta.values():
+            self._states_meta_ids[states_meta.entity_id] = states_meta.metadata_id
+        self._pending_states_meta = {}
 
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
@@ -890,6 +1178,25 @@ class Recorder(threading.Thread):
             self._commits_without_expire = 0
             self.event_session.expire_all()
 
+    def _commit_bulk_insert(self) -> None:
+        """Insert the buffered rows and commit the event session."""
+        assert self.event_session is not None
+        assert self._bulk_insert is not None
+        try:
+            self._bulk_insert.write(self.event_session, self._old_state_ids)
+            self.event_session.commit()
+        except SQLAlchemyError:
+            # The rows that were already written are part of the failed
+            # transaction so we must rollback before the commit is retried
+            self.event_session.rollback()
+            raise
+        self._bulk_insert.committed(
+            self._state_attributes_ids,
+            self._event_data_ids,
+            self._states_meta_ids,
+            self._old_state_ids,
+        )
+
     def _handle_sqlite_corruption(self) -> None:
         """Handle the sqlite3 database being corrupt."""
         self._close_event_session()
@@ -902,10 +1209,15 @@ class Recorder(threading.Thread):
     def _close_event_session(self) -> None:
         """Close the event session."""
         self._old_states = {}
-        self._state_attributes_ids = {}
-        self._event_data_ids = {}
+        self._old_state_ids = {}
+        if self._bulk_insert is not None:
+            self._bulk_insert.clear()
+        self._state_attributes_ids.clear()
+        self._event_data_ids.clear()
+        self._states_meta_ids = {}
         self._pending_state_attributes = {}
         self._pending_event_data = {}
+        self._pending_states_meta = {}
 
         if not self.event_session:
             return
@@ -937,8 +1249,62 @@ class Recorder(threading.Thread):
     @callback
     def event_listener(self, event: Event) -> None:
         """Listen for new events and put them in the process queue."""
-        if self._async_event_filter(event):
-            self.queue_task(EventTask(event))
+        if not self._async_event_filter(event):
+            return
+        if self._spool is not None and (
+            self._spooling or self.backlog > SPOOL_BACKLOG_THRESHOLD
+        ):
+            self._async_spool_event(event)
+            return
+        self.queue_task(EventTask(event))
+
+    @callback
+    def _async_spool_event(self, event: Event) -> None:
+        """Spool an event to disk while the backlog is too large."""
+        assert self._spool is not None
+        if not self._spooling:
+            _LOGGER.warning(
+                "The recorder backlog queue reached %s events; events will be "
+                "spooled to disk until the database catches up",
+                SPOOL_BACKLOG_THRESHOLD,
+            )
+            self._spooling = True
+            self._spool_flush_listener = async_track_time_interval(
+                self.hass, self._async_flush_spool, SPOOL_FLUSH_INTERVAL
+            )
+        self._spool.add(event)
+
+    @callback
+    def _async_flush_spool(self, now: datetime) -> None:
+        """Write spooled events to disk or replay them once the backlog is low."""
+        assert self._spool is not None
+        if self.backlog > SPOOL_BACKLOG_RESUME:
+            self.hass.async_add_executor_job(self._spool.flush)
+            return
+        _LOGGER.info("The recorder caught up; replaying spooled events")
+        self._spooling = False
+        if self._spool_flush_listener:
+            self._spool_flush_listener()
+            self._spool_flush_listener = None
+        # Events that arrive after this point are queued behind the replay
+        self.queue_task(ReplaySpoolTask(include_pending=True))
+        for task in self._tasks_after_spool:
+            self.queue_task(task)
+        self._tasks_after_spool.clear()
+
+    def _replay_spool(self, include_pending: bool) -> None:
+        """Record the events that were spooled to disk."""
+        assert self._spool is not None
+        replayed = 0
+        for event in self._spool.replay(include_pending):
+            self._process_one_event(event)
+            replayed += 1
+            if not replayed % SPOOL_REPLAY_COMMIT_SIZE:
+                self._commit_event_session_or_retry()
+                self._spool.commit()
+        self._commit_event_session_or_retry()
+        self._spool.commit()
+        _LOGGER.debug("Replayed %s spooled events", replayed)
 
     async def async_block_till_done(self) -> None:
         """Async version of block_till_done."""
@@ -1056,24 +1422,129 @@ class Recorder(threading.Thread):
 
         Base.metadata.create_all(self.engine)
         self._get_session = scoped_session(sessionmaker(bind=self.engine, future=True))
+        self._setup_read_connection()
         _LOGGER.debug("Connected to recorder database")
 
+    def _setup_read_connection(self) -> None:
+        """Set up the read-only connection pool used by the db executors.
+
+        In-memory SQLite databases cannot be shared between connections
+        so reads use the regular connection instead.
+        """
+        kwargs: dict[str, Any] = {}
+
+        def setup_read_connection(
+            dbapi_connection: Any, connection_record: Any
+        ) -> None:
+            """Dbapi specific read-only connection settings."""
+            assert self._read_engine is not None
+            setup_read_only_connection_for_dialect(
+                self._read_engine.dialect.name, dbapi_connection
+            )
+
+        if self.db_url == SQLITE_URL_PREFIX or ":memory:" in self.db_url:
+            return
+        if self.db_url.startswith(SQLITE_URL_PREFIX):
+            # Each db executor gets its own connection which can read
+            # concurrently with the recorder since the database uses WAL
+            kwargs["poolclass"] = RecorderPool
+        else:
+            if self.db_url.startswith(MYSQLDB_URL_PREFIX):
+                with contextlib.suppress(ImportError):
+                    kwargs["connect_args"] = {"conv": build_mysqldb_conv()}
+            # Bound the number of concurrent read queries to the
+            # number of db executors and the recorder thread
+            kwargs["pool_size"] = POOL_SIZE
+            kwargs["max_overflow"] = 0
+
+        self._read_engine = create_engine(self.db_url, **kwargs, future=True)
+        sqlalchemy_event.listen(self._read_engine, "connect", setup_read_connection)
+        self._get_read_session = scoped_session(
+            sessionmaker(bind=self._read_engine, future=True)
+        )
+
     def _close_connection(self) -> None:
         """Close the connection."""
         assert self.engine is not None
         self.engine.dispose()
         self.engine = None
         self._get_session = None
+        if self._read_engine is not None:
+            self._read_engine.dispose()
+            self._read_engine = None
+            self._get_read_session = None
 
     def _setup_run(self) -> None:
         """Log the start of the current run and schedule any needed jobs."""
         with session_scope(session=self.get_session()) as session:
             end_incomplete_runs(session, self.run_history.recording_start)
             self.run_history.start(session)
+            # Events spooled before a restart are replayed before the
+            # statistics and purge runs that are resumed below
+            self._schedule_spool_replay()
             self._schedule_compile_missing_statistics(session)
+            self._schedule_context_id_migration(session)
+            self._schedule_unfinished_purge(session)
+            self._schedule_statistics_rollups_rebuild(session)
+            if self.schema_version >= 27:
+                self._preload_id_caches(session)
 
         self._open_event_session()
 
+    def _preload_id_caches(self, session: Session) -> None:
+        """Load the shared ids of the most recent states and events into the caches.
+
+        Without this every shared row would need its own select
+        the first time it is seen after a restart.
+        """
+        for attributes_id, shared_attrs in session.execute(
+            find_recent_shared_attributes(self._state_attributes_ids.size)
+        ):
+            self._state_attributes_ids[shared_attrs] = attributes_id
+        for data_id, shared_data in session.execute(
+            find_recent_shared_data(self._event_data_ids.size)
+        ):
+            self._event_data_ids[shared_data] = data_id
+
+    def _adjust_id_cache_sizes(self, entity_count: int) -> None:
+        """Resize the shared id caches for the number of entities."""
+        self._state_attributes_ids.adjust_size(entity_count)
+        self._event_data_ids.adjust_size(entity_count)
+
+    def _schedule_context_id_migration(self, session: Session) -> None:
+        """Add a task to convert any string context ids left to binary."""
+        if self.schema_version >= 32 and (
+            session.execute(has_events_context_ids_to_migrate()).first()
+            or session.execute(has_states_context_ids_to_migrate()).first()
+        ):
+            self.queue_task(ContextIDMigrationTask())
+
+    def _schedule_spool_replay(self) -> None:
+        """Add a task to replay events spooled before a restart."""
+        if self._spool is not None and not self._spooling and self._spool.has_events():
+            self.queue_task(ReplaySpoolTask())
+
+    def _schedule_unfinished_purge(self, session: Session) -> None:
+        """Add a task to resume a purge that was interrupted by a restart."""
+        if self.schema_version >= 33 and (
+            purge_run := session.execute(find_unfinished_purge_run()).scalar()
+        ):
+            _LOGGER.debug("Resuming purge run %s", purge_run.run_id)
+            self.queue_task(
+                PurgeTask(
+                    process_timestamp(purge_run.purge_before),
+                    purge_run.repack,
+                    purge_run.apply_filter,
+                )
+            )
+
+    def _schedule_statistics_rollups_rebuild(self, session: Session) -> None:
+        """Add a task to rebuild the statistics rollups if the time zone changed."""
+        if self.schema_version >= 34 and statistics.statistics_rollups_need_rebuild(
+            session
+        ):
+            self.queue_task(RebuildStatisticsRollupsTask())
+
     def _schedule_compile_missing_statistics(self, session: Session) -> None:
         """Add tasks for missing statistics runs."""
         now = dt_util.utcnow()
@@ -1109,6 +1580,9 @@ class Recorder(threading.Thread):
     def _shutdown(self) -> None:
         """Save end time for current run."""
         self.hass.add_job(self._async_stop_listeners)
+        if self._spool is not None:
+            # Keep events that are still spooled for the next start
+            self._spool.flush()
         self._stop_executor()
         self._end_session()
         self._close_connection()
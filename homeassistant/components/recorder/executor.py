@@ -4,6 +4,7 @@ from __future__ import annotations
 from collections.abc import Callable
 from concurrent.futures.thread import _threads_queues, _worker
 import threading
+import time
 from typing import Any
 import weakref
 
@@ -59,3 +60,38 @@ class DBInterruptibleThreadPoolExecutor(InterruptibleThreadPoolExecutor):
             executor_thread.start()
             self._threads.add(executor_thread)  # type: ignore[attr-defined]
             _threads_queues[executor_thread] = self._work_queue  # type: ignore[index]
+
+
+class DBExecutorQueueStats:
+    """Track how long database executor jobs wait for a worker."""
+
+    def __init__(self) -> None:
+        """Init the stats."""
+        self._lock = threading.Lock()
+        self.jobs = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+
+    @property
+    def queue_time_avg(self) -> float | None:
+        """Return the average queue time in seconds or None without jobs."""
+        if not self.jobs:
+            return None
+        return self.queue_time_total / self.jobs
+
+    def wrap_job(self, target: Callable[..., Any], *args: Any) -> Callable[[], Any]:
+        """Wrap a job to record its queue time when a worker picks it up."""
+        queued = time.monotonic()
+
+        def _run_job() -> Any:
+            self.record(time.monotonic() - queued)
+            return target(*args)
+
+        return _run_job
+
+    def record(self, queue_time: float) -> None:
+        """Record the queue time of a job."""
+        with self._lock:
+            self.jobs += 1
+            self.queue_time_total += queue_time
+            self.queue_time_max = max(self.queue_time_max, queue_time)
@@ -12,7 +12,7 @@ from homeassistant.const import CONF_DOMAINS, CONF_ENTITIES, CONF_EXCLUDE, CONF_
 from homeassistant.helpers.entityfilter import CONF_ENTITY_GLOBS
 from homeassistant.helpers.typing import ConfigType
 
-from .models import ENTITY_ID_IN_EVENT, OLD_ENTITY_ID_IN_EVENT, States
+from .models import ENTITY_ID_IN_EVENT, OLD_ENTITY_ID_IN_EVENT, StatesMeta
 
 DOMAIN = "history"
 HISTORY_FILTERS = "history_filters"
@@ -97,14 +97,20 @@ class Filters:
 
         return or_(*includes).self_group() & not_(or_(*excludes).self_group())
 
-    def states_entity_filter(self) -> ClauseList:
-        """Generate the entity filter query."""
+    def states_entity_filter(
+        self, entity_id_column: Column = StatesMeta.entity_id
+    ) -> ClauseList:
+        """Generate the entity filter query.
+
+        The states_meta table must be joined unless another
+        entity_id column is passed.
+        """
 
         def _encoder(data: Any) -> Any:
             """Nothing to encode for states since there is no json."""
             return data
 
-        return self._generate_filter_for_columns((States.entity_id,), _encoder)
+        return self._generate_filter_for_columns((entity_id_column,), _encoder)
 
     def events_entity_filter(self) -> ClauseList:
         """Generate the entity filter query."""
@@ -7,17 +7,20 @@ from datetime import datetime
 from itertools import groupby
 import logging
 import time
-from typing import Any, cast
+from typing import Any, NamedTuple, cast
 
 from sqlalchemy import Column, Text, and_, func, lambda_stmt, or_, select
 from sqlalchemy.engine.row import Row
-from sqlalchemy.orm.query import Query
+from sqlalchemy.orm import aliased
 from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.elements import ClauseList
 from sqlalchemy.sql.expression import literal
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from homeassistant.components import recorder
 from homeassistant.components.websocket_api.const import (
+    COMPRESSED_STATE_ATTRIBUTES,
+    COMPRESSED_STATE_LAST_CHANGED,
     COMPRESSED_STATE_LAST_UPDATED,
     COMPRESSED_STATE_STATE,
 )
@@ -30,9 +33,11 @@ from .models import (
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
+    attributes_source_from_row,
+    decode_attributes_from_row,
     process_datetime_to_timestamp,
     process_timestamp,
-    process_timestamp_to_utc_isoformat,
     row_to_compressed_state,
 )
 from .util import execute_stmt_lambda_element, session_scope
@@ -63,58 +68,227 @@ NEED_ATTRIBUTE_DOMAINS = {
 }
 
 BASE_STATES = [
-    States.entity_id,
+    StatesMeta.entity_id,
     States.state,
-    States.last_changed,
-    States.last_updated,
+    States.last_changed_ts,
+    States.last_updated_ts,
 ]
 BASE_STATES_NO_LAST_CHANGED = [
-    States.entity_id,
+    StatesMeta.entity_id,
     States.state,
-    literal(value=None, type_=Text).label("last_changed"),
-    States.last_updated,
+    literal(value=None).label("last_changed_ts"),
+    States.last_updated_ts,
 ]
 QUERY_STATE_NO_ATTR = [
     *BASE_STATES,
     literal(value=None, type_=Text).label("attributes"),
     literal(value=None, type_=Text).label("shared_attrs"),
+    literal(value=None, type_=Text).label("static_shared_attrs"),
 ]
 QUERY_STATE_NO_ATTR_NO_LAST_CHANGED = [
     *BASE_STATES_NO_LAST_CHANGED,
     literal(value=None, type_=Text).label("attributes"),
     literal(value=None, type_=Text).label("shared_attrs"),
+    literal(value=None, type_=Text).label("static_shared_attrs"),
+]
+# Remove the PRE_SCHEMA_31 queries once schema 32 is created,
+# until the migration to schema 31 is done the entity_id
+# is only in the states table
+BASE_STATES_PRE_SCHEMA_31 = [
+    States.entity_id,
+    States.state,
+    States.last_changed_ts,
+    States.last_updated_ts,
+]
+BASE_STATES_PRE_SCHEMA_31_NO_LAST_CHANGED = [
+    States.entity_id,
+    States.state,
+    literal(value=None).label("last_changed_ts"),
+    States.last_updated_ts,
+]
+QUERY_STATE_NO_ATTR_PRE_SCHEMA_31 = [
+    *BASE_STATES_PRE_SCHEMA_31,
+    literal(value=None, type_=Text).label("attributes"),
+    literal(value=None, type_=Text).label("shared_attrs"),
+    literal(value=None, type_=Text).label("static_shared_attrs"),
+]
+QUERY_STATE_NO_ATTR_PRE_SCHEMA_31_NO_LAST_CHANGED = [
+    *BASE_STATES_PRE_SCHEMA_31_NO_LAST_CHANGED,
+    literal(value=None, type_=Text).label("attributes"),
+    literal(value=None, type_=Text).label("shared_attrs"),
+    literal(value=None, type_=Text).label("static_shared_attrs"),
+]
+# Remove the PRE_SCHEMA_30 queries and _PreSchema30Row
+# once schema 31 is created, until the migration to
+# schema 30 is done the times are only in the DATETIME columns
+BASE_STATES_PRE_SCHEMA_30 = [
+    States.entity_id,
+    States.state,
+    States.last_changed.label("last_changed_ts"),
+    States.last_updated.label("last_updated_ts"),
+]
+BASE_STATES_PRE_SCHEMA_30_NO_LAST_CHANGED = [
+    States.entity_id,
+    States.state,
+    literal(value=None).label("last_changed_ts"),
+    States.last_updated.label("last_updated_ts"),
+]
+QUERY_STATE_NO_ATTR_PRE_SCHEMA_30 = [
+    *BASE_STATES_PRE_SCHEMA_30,
+    literal(value=None, type_=Text).label("attributes"),
+    literal(value=None, type_=Text).label("shared_attrs"),
+    literal(value=None, type_=Text).label("static_shared_attrs"),
+]
+QUERY_STATE_NO_ATTR_PRE_SCHEMA_30_NO_LAST_CHANGED = [
+    *BASE_STATES_PRE_SCHEMA_30_NO_LAST_CHANGED,
+    literal(value=None, type_=Text).label("attributes"),
+    literal(value=None, type_=Text).label("shared_attrs"),
+    literal(value=None, type_=Text).label("static_shared_attrs"),
 ]
 # Remove QUERY_STATES_PRE_SCHEMA_25
 # and the migration_in_progress check
 # once schema 26 is created
 QUERY_STATES_PRE_SCHEMA_25 = [
-    *BASE_STATES,
+    *BASE_STATES_PRE_SCHEMA_30,
     States.attributes,
     literal(value=None, type_=Text).label("shared_attrs"),
+    literal(value=None, type_=Text).label("static_shared_attrs"),
 ]
 QUERY_STATES_PRE_SCHEMA_25_NO_LAST_CHANGED = [
-    *BASE_STATES_NO_LAST_CHANGED,
+    *BASE_STATES_PRE_SCHEMA_30_NO_LAST_CHANGED,
     States.attributes,
     literal(value=None, type_=Text).label("shared_attrs"),
+    literal(value=None, type_=Text).label("static_shared_attrs"),
+]
+QUERY_STATES_PRE_SCHEMA_30 = [
+    *BASE_STATES_PRE_SCHEMA_30,
+    States.attributes,
+    StateAttributes.shared_attrs,
+    literal(value=None, type_=Text).label("static_shared_attrs"),
+]
+QUERY_STATES_PRE_SCHEMA_30_NO_LAST_CHANGED = [
+    *BASE_STATES_PRE_SCHEMA_30_NO_LAST_CHANGED,
+    States.attributes,
+    StateAttributes.shared_attrs,
+    literal(value=None, type_=Text).label("static_shared_attrs"),
+]
+QUERY_STATES_PRE_SCHEMA_31 = [
+    *BASE_STATES_PRE_SCHEMA_31,
+    # Remove States.attributes once all attributes are in StateAttributes.shared_attrs
+    States.attributes,
+    StateAttributes.shared_attrs,
+    literal(value=None, type_=Text).label("static_shared_attrs"),
+]
+QUERY_STATES_PRE_SCHEMA_31_NO_LAST_CHANGED = [
+    *BASE_STATES_PRE_SCHEMA_31_NO_LAST_CHANGED,
+    # Remove States.attributes once all attributes are in StateAttributes.shared_attrs
+    States.attributes,
+    StateAttributes.shared_attrs,
+    literal(value=None, type_=Text).label("static_shared_attrs"),
+]
+QUERY_STATES_PRE_SCHEMA_35 = [
+    *BASE_STATES,
+    # Remove States.attributes once all attributes are in StateAttributes.shared_attrs
+    States.attributes,
+    StateAttributes.shared_attrs,
+    literal(value=None, type_=Text).label("static_shared_attrs"),
+]
+QUERY_STATES_PRE_SCHEMA_35_NO_LAST_CHANGED = [
+    *BASE_STATES_NO_LAST_CHANGED,
+    # Remove States.attributes once all attributes are in StateAttributes.shared_attrs
+    States.attributes,
+    StateAttributes.shared_attrs,
+    literal(value=None, type_=Text).label("static_shared_attrs"),
 ]
+_StaticStateAttributes = aliased(StateAttributes)
+# The static attributes are only stored apart for some states, selecting
+# them with a correlated subquery avoids a second join in every query
+STATIC_SHARED_ATTRS = (
+    select(_StaticStateAttributes.shared_attrs)
+    .where(_StaticStateAttributes.attributes_id == States.static_attributes_id)
+    .scalar_subquery()
+    .label("static_shared_attrs")
+)
 QUERY_STATES = [
     *BASE_STATES,
     # Remove States.attributes once all attributes are in StateAttributes.shared_attrs
     States.attributes,
     StateAttributes.shared_attrs,
+    STATIC_SHARED_ATTRS,
 ]
 QUERY_STATES_NO_LAST_CHANGED = [
     *BASE_STATES_NO_LAST_CHANGED,
     # Remove States.attributes once all attributes are in StateAttributes.shared_attrs
     States.attributes,
     StateAttributes.shared_attrs,
+    STATIC_SHARED_ATTRS,
 ]
 
 
+class _PreSchema30Row(NamedTuple):
+    """A states row with the DATETIME columns converted to timestamps."""
+
+    entity_id: str
+    state: str
+    last_changed_ts: float | None
+    last_updated_ts: float
+    attributes: str | None
+    shared_attrs: str | None
+    static_shared_attrs: str | None
+
+
 def _schema_version(hass: HomeAssistant) -> int:
     return recorder.get_instance(hass).schema_version
 
 
+def _time_columns(schema_version: int) -> tuple[Column, Column]:
+    """Return the last_updated and last_changed columns to filter on."""
+    if schema_version < 30:
+        return States.last_updated, States.last_changed
+    return States.last_updated_ts, States.last_changed_ts
+
+
+def _entity_id_columns(schema_version: int) -> tuple[Column, Column]:
+    """Return the entity_id column and the column to group the states by."""
+    if schema_version < 31:
+        return States.entity_id, States.entity_id
+    return StatesMeta.entity_id, States.metadata_id
+
+
+def _db_time(schema_version: int, time_: datetime) -> datetime | float:
+    """Convert a time to compare with the columns from _time_columns."""
+    if schema_version < 30:
+        return time_
+    return process_datetime_to_timestamp(time_)
+
+
+def _execute_states_stmt(
+    schema_version: int,
+    session: Session,
+    stmt: StatementLambdaElement,
+    start_time: datetime | None = None,
+    end_time: datetime | None = None,
+) -> Iterable[Row]:
+    """Execute a states query and convert the times of older schemas."""
+    rows = execute_stmt_lambda_element(session, stmt, start_time, end_time)
+    if schema_version >= 30:
+        return rows
+    return [
+        _PreSchema30Row(
+            row.entity_id,
+            row.state,
+            process_datetime_to_timestamp(row.last_changed_ts)
+            if row.last_changed_ts
+            else None,
+            process_datetime_to_timestamp(row.last_updated_ts),
+            row.attributes,
+            row.shared_attrs,
+            row.static_shared_attrs,
+        )
+        for row in rows
+    ]
+
+
 def lambda_stmt_and_join_attributes(
     schema_version: int, no_attributes: bool, include_last_changed: bool = True
 ) -> tuple[StatementLambdaElement, bool]:
@@ -122,15 +296,53 @@ def lambda_stmt_and_join_attributes(
 
     Because these are lambda_stmt the values inside the lambdas need
     to be explicitly written out to avoid caching the wrong values.
+
+    From schema 31 the states_meta table is always joined to
+    get the entity_id of the states.
     """
     # If no_attributes was requested we do the query
     # without the attributes fields and do not join the
     # state_attributes table
     if no_attributes:
+        if schema_version < 30:
+            if include_last_changed:
+                return (
+                    lambda_stmt(lambda: select(*QUERY_STATE_NO_ATTR_PRE_SCHEMA_30)),
+                    False,
+                )
+            return (
+                lambda_stmt(
+                    lambda: select(*QUERY_STATE_NO_ATTR_PRE_SCHEMA_30_NO_LAST_CHANGED)
+                ),
+                False,
+            )
+        if schema_version < 31:
+            if include_last_changed:
+                return (
+                    lambda_stmt(lambda: select(*QUERY_STATE_NO_ATTR_PRE_SCHEMA_31)),
+                    False,
+                )
+            return (
+                lambda_stmt(
+                    lambda: select(*QUERY_STATE_NO_ATTR_PRE_SCHEMA_31_NO_LAST_CHANGED)
+                ),
+                False,
+            )
         if include_last_changed:
-            return lambda_stmt(lambda: select(*QUERY_STATE_NO_ATTR)), False
+            return (
+                lambda_stmt(
+                    lambda: select(*QUERY_STATE_NO_ATTR)
+                    .select_from(States)
+                    .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+                ),
+                False,
+            )
         return (
-            lambda_stmt(lambda: select(*QUERY_STATE_NO_ATTR_NO_LAST_CHANGED)),
+            lambda_stmt(
+                lambda: select(*QUERY_STATE_NO_ATTR_NO_LAST_CHANGED)
+                .select_from(States)
+                .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            ),
             False,
         )
     # If we in the process of migrating schema we do
@@ -146,12 +358,58 @@ def lambda_stmt_and_join_attributes(
             lambda_stmt(lambda: select(*QUERY_STATES_PRE_SCHEMA_25_NO_LAST_CHANGED)),
             False,
         )
+    if schema_version < 30:
+        if include_last_changed:
+            return lambda_stmt(lambda: select(*QUERY_STATES_PRE_SCHEMA_30)), True
+        return (
+            lambda_stmt(lambda: select(*QUERY_STATES_PRE_SCHEMA_30_NO_LAST_CHANGED)),
+            True,
+        )
+    if schema_version < 31:
+        if include_last_changed:
+            return lambda_stmt(lambda: select(*QUERY_STATES_PRE_SCHEMA_31)), True
+        return (
+            lambda_stmt(lambda: select(*QUERY_STATES_PRE_SCHEMA_31_NO_LAST_CHANGED)),
+            True,
+        )
+    if schema_version < 35:
+        if include_last_changed:
+            return (
+                lambda_stmt(
+                    lambda: select(*QUERY_STATES_PRE_SCHEMA_35)
+                    .select_from(States)
+                    .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+                ),
+                True,
+            )
+        return (
+            lambda_stmt(
+                lambda: select(*QUERY_STATES_PRE_SCHEMA_35_NO_LAST_CHANGED)
+                .select_from(States)
+                .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            ),
+            True,
+        )
     # Finally if no migration is in progress and no_attributes
     # was not requested, we query both attributes columns and
     # join state_attributes
     if include_last_changed:
-        return lambda_stmt(lambda: select(*QUERY_STATES)), True
-    return lambda_stmt(lambda: select(*QUERY_STATES_NO_LAST_CHANGED)), True
+        return (
+            lambda_stmt(
+                lambda: select(*QUERY_STATES)
+                .select_from(States)
+                .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            ),
+            True,
+        )
+    return (
+        lambda_stmt(
+            lambda: select(*QUERY_STATES_NO_LAST_CHANGED)
+            .select_from(States)
+            .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+        ),
+        True,
+    )
 
 
 def get_significant_states(
@@ -167,7 +425,7 @@ def get_significant_states(
     compressed_state_format: bool = False,
 ) -> MutableMapping[str, list[State | dict[str, Any]]]:
     """Wrap get_significant_states_with_session with an sql session."""
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         return get_significant_states_with_session(
             hass,
             session,
@@ -183,15 +441,13 @@ def get_significant_states(
         )
 
 
-def _ignore_domains_filter(query: Query) -> Query:
-    """Add a filter to ignore domains we do not fetch history for."""
-    return query.filter(
-        and_(
-            *[
-                ~States.entity_id.like(entity_domain)
-                for entity_domain in IGNORE_DOMAINS_ENTITY_ID_LIKE
-            ]
-        )
+def _ignore_domains_filter(entity_id_column: Column) -> ClauseList:
+    """Generate a filter to ignore domains we do not fetch history for."""
+    return and_(
+        *[
+            ~entity_id_column.like(entity_domain)
+            for entity_domain in IGNORE_DOMAINS_ENTITY_ID_LIKE
+        ]
     )
 
 
@@ -208,6 +464,8 @@ def _significant_states_stmt(
     stmt, join_attributes = lambda_stmt_and_join_attributes(
         schema_version, no_attributes, include_last_changed=not significant_changes_only
     )
+    last_updated, last_changed = _time_columns(schema_version)
+    entity_id_column, entity_group_column = _entity_id_columns(schema_version)
     if (
         entity_ids
         and len(entity_ids) == 1
@@ -215,39 +473,38 @@ def _significant_states_stmt(
         and split_entity_id(entity_ids[0])[0] not in SIGNIFICANT_DOMAINS
     ):
         stmt += lambda q: q.filter(
-            (States.last_changed == States.last_updated) | States.last_changed.is_(None)
+            (last_changed == last_updated) | last_changed.is_(None)
         )
     elif significant_changes_only:
         stmt += lambda q: q.filter(
             or_(
                 *[
-                    States.entity_id.like(entity_domain)
+                    entity_id_column.like(entity_domain)
                     for entity_domain in SIGNIFICANT_DOMAINS_ENTITY_ID_LIKE
                 ],
-                (
-                    (States.last_changed == States.last_updated)
-                    | States.last_changed.is_(None)
-                ),
+                ((last_changed == last_updated) | last_changed.is_(None)),
             )
         )
 
     if entity_ids:
-        stmt += lambda q: q.filter(States.entity_id.in_(entity_ids))
+        stmt += lambda q: q.filter(entity_id_column.in_(entity_ids))
     else:
-        stmt += _ignore_domains_filter
+        stmt += lambda q: q.filter(_ignore_domains_filter(entity_id_column))
         if filters and filters.has_config:
-            entity_filter = filters.states_entity_filter()
+            entity_filter = filters.states_entity_filter(entity_id_column)
             stmt += lambda q: q.filter(entity_filter)
 
-    stmt += lambda q: q.filter(States.last_updated > start_time)
+    start_time_db = _db_time(schema_version, start_time)
+    stmt += lambda q: q.filter(last_updated > start_time_db)
     if end_time:
-        stmt += lambda q: q.filter(States.last_updated < end_time)
+        end_time_db = _db_time(schema_version, end_time)
+        stmt += lambda q: q.filter(last_updated < end_time_db)
 
     if join_attributes:
         stmt += lambda q: q.outerjoin(
             StateAttributes, States.attributes_id == StateAttributes.attributes_id
         )
-    stmt += lambda q: q.order_by(States.entity_id, States.last_updated)
+    stmt += lambda q: q.order_by(entity_group_column, last_updated)
     return stmt
 
 
@@ -276,8 +533,9 @@ def get_significant_states_with_session(
     as well as all states from certain domains (for instance
     thermostat so that we get current temperature in our graphs).
     """
+    schema_version = _schema_version(hass)
     stmt = _significant_states_stmt(
-        _schema_version(hass),
+        schema_version,
         start_time,
         end_time,
         entity_ids,
@@ -285,8 +543,8 @@ def get_significant_states_with_session(
         significant_changes_only,
         no_attributes,
     )
-    states = execute_stmt_lambda_element(
-        session, stmt, None if entity_ids else start_time, end_time
+    states = _execute_states_stmt(
+        schema_version, session, stmt, None if entity_ids else start_time, end_time
     )
     return _sorted_states_to_dict(
         hass,
@@ -302,6 +560,60 @@ def get_significant_states_with_session(
     )
 
 
+def get_significant_states_columnar(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    filters: Filters | None = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+) -> dict[str, dict[str, list[Any]]]:
+    """Return significant states in a columnar format.
+
+    Instead of a list of states per entity, every entity gets a dict of
+    columns built directly from the database rows:
+
+    {
+        "s": [state,…]
+        "lu": [last_updated,…]
+        "lc": [[index, last_changed],…]
+        "a": [[index, attributes],…]
+    }
+
+    Timestamps are epoch floats. last_changed is only included for the
+    rows where it differs from last_updated and attributes are only
+    included for the rows where they changed. Empty columns are omitted.
+    """
+    schema_version = _schema_version(hass)
+    with session_scope(hass=hass, read_only=True) as session:
+        stmt = _significant_states_stmt(
+            schema_version,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            significant_changes_only,
+            no_attributes,
+        )
+        states = _execute_states_stmt(
+            schema_version, session, stmt, None if entity_ids else start_time, end_time
+        )
+        return _sorted_states_to_columnar_dict(
+            hass,
+            session,
+            states,
+            start_time,
+            entity_ids,
+            filters,
+            include_start_time_state,
+            minimal_response,
+            no_attributes,
+        )
+
+
 def get_full_significant_states_with_session(
     hass: HomeAssistant,
     session: Session,
@@ -343,21 +655,25 @@ def _state_changed_during_period_stmt(
     stmt, join_attributes = lambda_stmt_and_join_attributes(
         schema_version, no_attributes, include_last_changed=False
     )
+    last_updated, last_changed = _time_columns(schema_version)
+    entity_id_column, entity_group_column = _entity_id_columns(schema_version)
+    start_time_db = _db_time(schema_version, start_time)
     stmt += lambda q: q.filter(
-        ((States.last_changed == States.last_updated) | States.last_changed.is_(None))
-        & (States.last_updated > start_time)
+        ((last_changed == last_updated) | last_changed.is_(None))
+        & (last_updated > start_time_db)
     )
     if end_time:
-        stmt += lambda q: q.filter(States.last_updated < end_time)
-    stmt += lambda q: q.filter(States.entity_id == entity_id)
+        end_time_db = _db_time(schema_version, end_time)
+        stmt += lambda q: q.filter(last_updated < end_time_db)
+    stmt += lambda q: q.filter(entity_id_column == entity_id)
     if join_attributes:
         stmt += lambda q: q.outerjoin(
             StateAttributes, States.attributes_id == StateAttributes.attributes_id
         )
     if descending:
-        stmt += lambda q: q.order_by(States.entity_id, States.last_updated.desc())
+        stmt += lambda q: q.order_by(entity_group_column, last_updated.desc())
     else:
-        stmt += lambda q: q.order_by(States.entity_id, States.last_updated)
+        stmt += lambda q: q.order_by(entity_group_column, last_updated)
     if limit:
         stmt += lambda q: q.limit(limit)
     return stmt
@@ -376,9 +692,10 @@ def state_changes_during_period(
     """Return states changes during UTC period start_time - end_time."""
     entity_id = entity_id.lower() if entity_id is not None else None
 
-    with session_scope(hass=hass) as session:
+    schema_version = _schema_version(hass)
+    with session_scope(hass=hass, read_only=True) as session:
         stmt = _state_changed_during_period_stmt(
-            _schema_version(hass),
+            schema_version,
             start_time,
             end_time,
             entity_id,
@@ -386,8 +703,8 @@ def state_changes_during_period(
             descending,
             limit,
         )
-        states = execute_stmt_lambda_element(
-            session, stmt, None if entity_id else start_time, end_time
+        states = _execute_states_stmt(
+            schema_version, session, stmt, None if entity_id else start_time, end_time
         )
         entity_ids = [entity_id] if entity_id is not None else None
 
@@ -410,14 +727,16 @@ def _get_last_state_changes_stmt(
     stmt, join_attributes = lambda_stmt_and_join_attributes(
         schema_version, False, include_last_changed=False
     )
+    last_updated, last_changed = _time_columns(schema_version)
+    entity_id_column, entity_group_column = _entity_id_columns(schema_version)
     stmt += lambda q: q.filter(
-        (States.last_changed == States.last_updated) | States.last_changed.is_(None)
-    ).filter(States.entity_id == entity_id)
+        (last_changed == last_updated) | last_changed.is_(None)
+    ).filter(entity_id_column == entity_id)
     if join_attributes:
         stmt += lambda q: q.outerjoin(
             StateAttributes, States.attributes_id == StateAttributes.attributes_id
         )
-    stmt += lambda q: q.order_by(States.entity_id, States.last_updated.desc()).limit(
+    stmt += lambda q: q.order_by(entity_group_column, last_updated.desc()).limit(
         number_of_states
     )
     return stmt
@@ -430,11 +749,10 @@ def get_last_state_changes(
     start_time = dt_util.utcnow()
     entity_id = entity_id.lower() if entity_id is not None else None
 
-    with session_scope(hass=hass) as session:
-        stmt = _get_last_state_changes_stmt(
-            _schema_version(hass), number_of_states, entity_id
-        )
-        states = list(execute_stmt_lambda_element(session, stmt))
+    schema_version = _schema_version(hass)
+    with session_scope(hass=hass, read_only=True) as session:
+        stmt = _get_last_state_changes_stmt(schema_version, number_of_states, entity_id)
+        states = list(_execute_states_stmt(schema_version, session, stmt))
         entity_ids = [entity_id] if entity_id is not None else None
 
         return cast(
@@ -461,21 +779,45 @@ def _get_states_for_entites_stmt(
     stmt, join_attributes = lambda_stmt_and_join_attributes(
         schema_version, no_attributes, include_last_changed=True
     )
+    last_updated, _ = _time_columns(schema_version)
+    run_start_db = _db_time(schema_version, run_start)
+    utc_point_in_time_db = _db_time(schema_version, utc_point_in_time)
     # We got an include-list of entities, accelerate the query by filtering already
     # in the inner query.
-    stmt += lambda q: q.where(
-        States.state_id
-        == (
-            select(func.max(States.state_id).label("max_state_id"))
-            .filter(
-                (States.last_updated >= run_start)
-                & (States.last_updated < utc_point_in_time)
-            )
-            .filter(States.entity_id.in_(entity_ids))
-            .group_by(States.entity_id)
-            .subquery()
-        ).c.max_state_id
-    )
+    if schema_version < 31:
+        stmt += lambda q: q.where(
+            States.state_id
+            == (
+                select(func.max(States.state_id).label("max_state_id"))
+                .filter(
+                    (last_updated >= run_start_db)
+                    & (last_updated < utc_point_in_time_db)
+                )
+                .filter(States.entity_id.in_(entity_ids))
+                .group_by(States.entity_id)
+                .subquery()
+            ).c.max_state_id
+        )
+    else:
+        stmt += lambda q: q.where(
+            States.state_id
+            == (
+                select(func.max(States.state_id).label("max_state_id"))
+                .filter(
+                    (last_updated >= run_start_db)
+                    & (last_updated < utc_point_in_time_db)
+                )
+                .filter(
+                    States.metadata_id.in_(
+                        select(StatesMeta.metadata_id).filter(
+                            StatesMeta.entity_id.in_(entity_ids)
+                        )
+                    )
+                )
+                .group_by(States.metadata_id)
+                .subquery()
+            ).c.max_state_id
+        )
     if join_attributes:
         stmt += lambda q: q.outerjoin(
             StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
@@ -494,20 +836,21 @@ def _get_states_for_all_stmt(
     stmt, join_attributes = lambda_stmt_and_join_attributes(
         schema_version, no_attributes, include_last_changed=True
     )
+    last_updated, _ = _time_columns(schema_version)
+    entity_id_column, entity_group_column = _entity_id_columns(schema_version)
+    run_start_db = _db_time(schema_version, run_start)
+    utc_point_in_time_db = _db_time(schema_version, utc_point_in_time)
     # We did not get an include-list of entities, query all states in the inner
     # query, then filter out unwanted domains as well as applying the custom filter.
     # This filtering can't be done in the inner query because the domain column is
     # not indexed and we can't control what's in the custom filter.
     most_recent_states_by_date = (
         select(
-            States.entity_id.label("max_entity_id"),
-            func.max(States.last_updated).label("max_last_updated"),
+            entity_group_column.label("max_entity_id"),
+            func.max(last_updated).label("max_last_updated"),
         )
-        .filter(
-            (States.last_updated >= run_start)
-            & (States.last_updated < utc_point_in_time)
-        )
-        .group_by(States.entity_id)
+        .filter((last_updated >= run_start_db) & (last_updated < utc_point_in_time_db))
+        .group_by(entity_group_column)
         .subquery()
     )
     stmt += lambda q: q.where(
@@ -517,18 +860,17 @@ def _get_states_for_all_stmt(
             .join(
                 most_recent_states_by_date,
                 and_(
-                    States.entity_id == most_recent_states_by_date.c.max_entity_id,
-                    States.last_updated
-                    == most_recent_states_by_date.c.max_last_updated,
+                    entity_group_column == most_recent_states_by_date.c.max_entity_id,
+                    last_updated == most_recent_states_by_date.c.max_last_updated,
                 ),
             )
-            .group_by(States.entity_id)
+            .group_by(entity_group_column)
             .subquery()
         ).c.max_state_id,
     )
-    stmt += _ignore_domains_filter
+    stmt += lambda q: q.filter(_ignore_domains_filter(entity_id_column))
     if filters and filters.has_config:
-        entity_filter = filters.states_entity_filter()
+        entity_filter = filters.states_entity_filter(entity_id_column)
         stmt += lambda q: q.filter(entity_filter)
     if join_attributes:
         stmt += lambda q: q.outerjoin(
@@ -549,7 +891,8 @@ def _get_rows_with_session(
     """Return the states at a specific point in time."""
     schema_version = _schema_version(hass)
     if entity_ids and len(entity_ids) == 1:
-        return execute_stmt_lambda_element(
+        return _execute_states_stmt(
+            schema_version,
             session,
             _get_single_entity_states_stmt(
                 schema_version, utc_point_in_time, entity_ids[0], no_attributes
@@ -574,7 +917,7 @@ def _get_rows_with_session(
             schema_version, run.start, utc_point_in_time, filters, no_attributes
         )
 
-    return execute_stmt_lambda_element(session, stmt)
+    return _execute_states_stmt(schema_version, session, stmt)
 
 
 def _get_single_entity_states_stmt(
@@ -588,12 +931,15 @@ def _get_single_entity_states_stmt(
     stmt, join_attributes = lambda_stmt_and_join_attributes(
         schema_version, no_attributes, include_last_changed=True
     )
+    last_updated, _ = _time_columns(schema_version)
+    entity_id_column, _ = _entity_id_columns(schema_version)
+    utc_point_in_time_db = _db_time(schema_version, utc_point_in_time)
     stmt += (
         lambda q: q.filter(
-            States.last_updated < utc_point_in_time,
-            States.entity_id == entity_id,
+            last_updated < utc_point_in_time_db,
+            entity_id_column == entity_id,
         )
-        .order_by(States.last_updated.desc())
+        .order_by(last_updated.desc())
         .limit(1)
     )
     if join_attributes:
@@ -603,6 +949,11 @@ def _get_single_entity_states_stmt(
     return stmt
 
 
+def _timestamp_to_utc_isoformat(timestamp: float) -> str:
+    """Convert a timestamp to UTC isotime."""
+    return dt_util.utc_from_timestamp(timestamp).isoformat()
+
+
 def _sorted_states_to_dict(
     hass: HomeAssistant,
     session: Session,
@@ -620,7 +971,7 @@ def _sorted_states_to_dict(
     This takes our state list and turns it into a JSON friendly data
     structure {'entity_id': [list of states], 'entity_id2': [list of states]}
 
-    States must be sorted by entity_id and last_updated
+    States must be grouped by entity and sorted by last_updated
 
     We also need to go back and create a synthetic zero data point for
     each list of states, otherwise our graphs won't start on the Y
@@ -628,14 +979,12 @@ def _sorted_states_to_dict(
     """
     if compressed_state_format:
         state_class = row_to_compressed_state
-        _process_timestamp: Callable[
-            [datetime], float | str
-        ] = process_datetime_to_timestamp
+        _process_timestamp: Callable[[float], float | str] = float
         attr_time = COMPRESSED_STATE_LAST_UPDATED
         attr_state = COMPRESSED_STATE_STATE
     else:
         state_class = LazyState  # type: ignore[assignment]
-        _process_timestamp = process_timestamp_to_utc_isoformat
+        _process_timestamp = _timestamp_to_utc_isoformat
         attr_time = LAST_CHANGED_KEY
         attr_state = STATE_KEY
 
@@ -709,7 +1058,7 @@ def _sorted_states_to_dict(
                     #
                     # We use last_updated for for last_changed since its the same
                     #
-                    attr_time: _process_timestamp(row.last_updated),
+                    attr_time: _process_timestamp(row.last_updated_ts),
                 }
             )
             prev_state = state
@@ -719,5 +1068,137 @@ def _sorted_states_to_dict(
     for ent_id, row in initial_states.items():
         result[ent_id].append(state_class(row, {}, start_time))
 
+    # The states are grouped by metadata_id so they
+    # need to be sorted if no entity_ids were given
+    if entity_ids is None:
+        return {key: result[key] for key in sorted(result) if result[key]}
+
     # Filter out the empty lists if some states had 0 results.
     return {key: val for key, val in result.items() if val}
+
+
+def _rows_to_columns(
+    rows: Iterable[Row],
+    initial_row: Row | None,
+    start_time: datetime,
+    all_rows_and_attributes: bool,
+    no_attributes: bool,
+) -> dict[str, list[Any]]:
+    """Convert the rows of a single entity to columns.
+
+    Unless all_rows_and_attributes is set, rows that do not change the
+    state are dropped and only the attributes of the first row are kept.
+    """
+    states: list[str] = []
+    last_updated: list[float] = []
+    last_changed: list[list[Any]] = []
+    attributes: list[list[Any]] = []
+    attr_cache: dict[str, dict[str, Any]] = {}
+    prev_state: str | None = None
+    prev_attrs_source: str | None = None
+
+    if initial_row is not None:
+        # The state at the start time is reported at the start time
+        prev_state = initial_row.state
+        states.append(prev_state)
+        last_updated.append(start_time.timestamp())
+        if not no_attributes:
+            prev_attrs_source = attributes_source_from_row(initial_row)
+            attributes.append([0, decode_attributes_from_row(initial_row, attr_cache)])
+
+    for row in rows:
+        state = row.state
+        if not all_rows_and_attributes and states and state == prev_state:
+            continue
+        idx = len(states)
+        states.append(state)
+        row_last_updated_ts: float = row.last_updated_ts
+        last_updated.append(row_last_updated_ts)
+        if (row_last_changed_ts := row.last_changed_ts) and (
+            row_last_changed_ts != row_last_updated_ts
+        ):
+            last_changed.append([idx, row_last_changed_ts])
+        prev_state = state
+        if no_attributes or (idx and not all_rows_and_attributes):
+            continue
+        # Comparing the raw source avoids decoding unchanged attributes
+        attrs_source = attributes_source_from_row(row)
+        if idx == 0 or attrs_source != prev_attrs_source:
+            prev_attrs_source = attrs_source
+            attributes.append([idx, decode_attributes_from_row(row, attr_cache)])
+
+    columns: dict[str, list[Any]] = {
+        COMPRESSED_STATE_STATE: states,
+        COMPRESSED_STATE_LAST_UPDATED: last_updated,
+    }
+    if last_changed:
+        columns[COMPRESSED_STATE_LAST_CHANGED] = last_changed
+    if attributes:
+        columns[COMPRESSED_STATE_ATTRIBUTES] = attributes
+    return columns
+
+
+def _sorted_states_to_columnar_dict(
+    hass: HomeAssistant,
+    session: Session,
+    states: Iterable[Row],
+    start_time: datetime,
+    entity_ids: list[str] | None,
+    filters: Filters | None = None,
+    include_start_time_state: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+) -> dict[str, dict[str, list[Any]]]:
+    """Convert SQL results into columns per entity without creating states.
+
+    States must be grouped by entity and sorted by last_updated
+    """
+    result: dict[str, dict[str, list[Any]]] = {}
+    # Set all entity IDs in the result first to maintain the order
+    if entity_ids is not None:
+        for ent_id in entity_ids:
+            result[ent_id] = {}
+
+    initial_states: dict[str, Row] = {}
+    if include_start_time_state:
+        initial_states = {
+            row.entity_id: row
+            for row in _get_rows_with_session(
+                hass,
+                session,
+                start_time,
+                entity_ids,
+                filters=filters,
+                no_attributes=no_attributes,
+            )
+        }
+
+    if entity_ids and len(entity_ids) == 1:
+        states_iter: Iterable[tuple[str | Column, Iterator[Row]]] = (
+            (entity_ids[0], iter(states)),
+        )
+    else:
+        states_iter = groupby(states, lambda state: state.entity_id)
+
+    for ent_id, group in states_iter:
+        result[ent_id] = _rows_to_columns(
+            group,
+            initial_states.pop(ent_id, None),
+            start_time,
+            not minimal_response
+            or split_entity_id(ent_id)[0] in NEED_ATTRIBUTE_DOMAINS,
+            no_attributes,
+        )
+
+    # If there are no states beyond the initial state,
+    # the state a was never popped from initial_states
+    for ent_id, row in initial_states.items():
+        result[ent_id] = _rows_to_columns((), row, start_time, True, no_attributes)
+
+    # The states are grouped by metadata_id so they
+    # need to be sorted if no entity_ids were given
+    if entity_ids is None:
+        result = {key: result[key] for key in sorted(result)}
+
+    # Filter out the entities without any states
+    return {key: val for key, val in result.items() if val.get(COMPRESSED_STATE_STATE)}
@@ -0,0 +1,87 @@
+"""Cache of the ids of shared rows written by the recorder."""
+from __future__ import annotations
+
+from collections.abc import Iterator, MutableMapping
+from typing import Any
+
+from lru import LRU  # pylint: disable=no-name-in-module
+
+
+class SharedIdCache(MutableMapping[str, int]):
+    """LRU cache of the ids of shared state attributes or event data rows.
+
+    Lookups with get are counted so the hit rate can be reported. The size
+    follows the number of entities but always stays between min_size and
+    max_size.
+    """
+
+    def __init__(self, min_size: int, max_size: int, per_entity: int) -> None:
+        """Initialize the cache."""
+        self._min_size = min_size
+        self._max_size = max_size
+        self._per_entity = per_entity
+        self._lru: LRU = LRU(min_size)
+        self.hits = 0
+        self.misses = 0
+
+    def __getitem__(self, key: str) -> int:
+        """Return the id for key."""
+        return self._lru[key]  # type: ignore[no-any-return]
+
+    def __setitem__(self, key: str, value: int) -> None:
+        """Set the id for key."""
+        self._lru[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        """Remove key from the cache."""
+        del self._lru[key]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the cached keys."""
+        return iter(self._lru.keys())
+
+    def __contains__(self, key: object) -> bool:
+        """Return if key is cached without marking it as recently used."""
+        return key in self._lru
+
+    def __len__(self) -> int:
+        """Return the number of cached ids."""
+        return len(self._lru)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the id for key and count the lookup."""
+        if (value := self._lru.get(key)) is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def items(self) -> list[tuple[str, int]]:  # type: ignore[override]
+        """Return the cached keys and ids without changing their order."""
+        return self._lru.items()  # type: ignore[no-any-return]
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        """Remove key from the cache and return its id."""
+        return self._lru.pop(key, default)
+
+    def clear(self) -> None:
+        """Remove all keys from the cache."""
+        self._lru.clear()
+
+    @property
+    def size(self) -> int:
+        """Return the maximum number of cached ids."""
+        return self._lru.get_size()  # type: ignore[no-any-return]
+
+    @property
+    def hit_rate(self) -> float | None:
+        """Return the fraction of lookups which were answered from the cache."""
+        if not (lookups := self.hits + self.misses):
+            return None
+        return self.hits / lookups
+
+    def adjust_size(self, entity_count: int) -> None:
+        """Resize the cache for the number of entities."""
+        size = min(self._max_size, max(self._min_size, entity_count * self._per_entity))
+        if size != self.size:
+            self._lru.set_size(size)
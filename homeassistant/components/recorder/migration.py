@@ -1,9 +1,11 @@
 """Schema migration helpers."""
+from __future__ import annotations
+
 from collections.abc import Callable, Iterable
 import contextlib
 from datetime import timedelta
 import logging
-from typing import cast
+from typing import TYPE_CHECKING, cast
 
 import sqlalchemy
 from sqlalchemy import ForeignKeyConstraint, MetaData, Table, func, text
@@ -20,28 +22,47 @@ from sqlalchemy.schema import AddConstraint, DropConstraint
 from sqlalchemy.sql.expression import true
 
 from homeassistant.core import HomeAssistant
+from homeassistant.util.ulid import ulid_bytes
 
-from .const import SupportedDialect
+from .const import MAX_ROWS_TO_MIGRATE, SupportedDialect
 from .models import (
     SCHEMA_VERSION,
     TABLE_STATES,
     Base,
+    Events,
+    PurgeRuns,
     SchemaChanges,
+    States,
+    StatesMeta,
     Statistics,
+    StatisticsDaily,
     StatisticsMeta,
+    StatisticsMonthly,
     StatisticsRuns,
     StatisticsShortTerm,
+    context_id_to_bytes_or_none,
     process_timestamp,
+    uuid_hex_to_bytes_or_none,
+)
+from .queries import (
+    find_events_context_ids_to_migrate,
+    find_states_context_ids_to_migrate,
 )
 from .statistics import (
+    compile_statistics_rollups,
     delete_statistics_duplicates,
     delete_statistics_meta_duplicates,
     get_start_time,
 )
-from .util import session_scope
+from .util import retryable_database_job, session_scope
+
+if TYPE_CHECKING:
+    from . import Recorder
 
 _LOGGER = logging.getLogger(__name__)
 
+ENTITY_ID_MIGRATION_CHUNK_SIZE = 250000
+
 
 def raise_if_exception_missing_str(ex: Exception, match_substrs: Iterable[str]) -> None:
     """Raise an exception if the exception and cause do not contain the match substrs."""
@@ -724,10 +745,263 @@ def _apply_update(  # noqa: C901
             _create_index(
                 session_maker, "statistics_meta", "ix_statistics_meta_statistic_id"
             )
+    elif new_version == 30:
+        # Store state and event times as epoch floats, the DATETIME
+        # columns are no longer written for new rows
+        _add_columns(session_maker, "events", ["time_fired_ts DOUBLE PRECISION"])
+        _add_columns(
+            session_maker,
+            "states",
+            ["last_updated_ts DOUBLE PRECISION", "last_changed_ts DOUBLE PRECISION"],
+        )
+        _migrate_columns_to_timestamp(session_maker, engine)
+        _create_index(session_maker, "events", "ix_events_time_fired_ts")
+        _create_index(session_maker, "events", "ix_events_event_type_time_fired_ts")
+        _create_index(session_maker, "states", "ix_states_entity_id_last_updated_ts")
+        _create_index(session_maker, "states", "ix_states_last_updated_ts")
+        # The DATETIME columns are only kept since not all supported
+        # databases can drop columns, but their indexes are no longer used
+        _drop_index(session_maker, "events", "ix_events_time_fired")
+        _drop_index(session_maker, "events", "ix_events_event_type_time_fired")
+        _drop_index(session_maker, "states", "ix_states_entity_id_last_updated")
+        _drop_index(session_maker, "states", "ix_states_last_updated")
+    elif new_version == 31:
+        # Store the entity_ids in the states_meta table and
+        # only link the states to them with metadata_id
+        StatesMeta.__table__.create(engine, checkfirst=True)
+        _add_columns(session_maker, "states", ["metadata_id INTEGER"])
+        _migrate_entity_ids_to_states_meta(session_maker)
+        _create_index(session_maker, "states", "ix_states_metadata_id_last_updated_ts")
+        # The entity_id column is only kept since not all supported
+        # databases can drop columns, but its index is no longer used
+        _drop_index(session_maker, "states", "ix_states_entity_id_last_updated_ts")
+    elif new_version == 32:
+        # Store the context ids as 16 byte binary, the existing rows
+        # are converted in the background by migrate_context_ids
+        context_bin_type = {
+            SupportedDialect.MYSQL: "BINARY(16)",
+            SupportedDialect.POSTGRESQL: "BYTEA",
+        }.get(dialect, "BLOB")
+        for table in ("events", "states"):
+            _add_columns(
+                session_maker,
+                table,
+                [
+                    f"context_id_bin {context_bin_type}",
+                    f"context_user_id_bin {context_bin_type}",
+                    f"context_parent_id_bin {context_bin_type}",
+                ],
+            )
+        _create_index(session_maker, "events", "ix_events_context_id_bin")
+        _create_index(session_maker, "states", "ix_states_context_id_bin")
+    elif new_version == 33:
+        # Keep track of purge runs so an interrupted purge can be resumed
+        PurgeRuns.__table__.create(engine, checkfirst=True)
+    elif new_version == 34:
+        # Keep daily and monthly rollups of the long term statistics,
+        # compiled from the hourly statistics already stored
+        StatisticsDaily.__table__.create(engine, checkfirst=True)
+        StatisticsMonthly.__table__.create(engine, checkfirst=True)
+        with session_scope(session=session_maker()) as session:
+            compile_statistics_rollups(session)
+    elif new_version == 35:
+        # Allow the rarely changing attributes of a state
+        # to be stored apart from the other attributes
+        _add_columns(session_maker, "states", ["static_attributes_id INTEGER"])
+        _create_index(session_maker, "states", "ix_states_static_attributes_id")
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
 
+def _migrate_columns_to_timestamp(
+    session_maker: Callable[[], Session], engine: Engine
+) -> None:
+    """Copy the DATETIME columns of states and events to epoch float columns.
+
+    MySQL and PostgreSQL are updated in chunks to keep the transactions small.
+    Rows without a time get 0 so they are not picked up by the next chunk.
+    """
+    result = None
+    if engine.dialect.name == SupportedDialect.SQLITE:
+        # With SQLite we do this in one go since it is faster, the
+        # datetimes are stored as text with microseconds
+        with session_scope(session=session_maker()) as session:
+            connection = session.connection()
+            connection.execute(
+                text(
+                    "UPDATE events SET time_fired_ts="
+                    "COALESCE(STRFTIME('%s',time_fired)"
+                    "+CAST(SUBSTR(time_fired,20,7) AS REAL),0);"
+                )
+            )
+            connection.execute(
+                text(
+                    "UPDATE states SET last_updated_ts="
+                    "COALESCE(STRFTIME('%s',last_updated)"
+                    "+CAST(SUBSTR(last_updated,20,7) AS REAL),0),"
+                    "last_changed_ts=STRFTIME('%s',last_changed)"
+                    "+CAST(SUBSTR(last_changed,20,7) AS REAL);"
+                )
+            )
+    elif engine.dialect.name == SupportedDialect.MYSQL:
+        # TIMESTAMPDIFF does not depend on the session time zone
+        # unlike UNIX_TIMESTAMP
+        while result is None or result.rowcount > 0:
+            with session_scope(session=session_maker()) as session:
+                result = session.connection().execute(
+                    text(
+                        "UPDATE events SET time_fired_ts=COALESCE("
+                        "TIMESTAMPDIFF(MICROSECOND,'1970-01-01',time_fired)/1000000,0) "
+                        "WHERE time_fired_ts IS NULL LIMIT 250000;"
+                    )
+                )
+        result = None
+        while result is None or result.rowcount > 0:
+            with session_scope(session=session_maker()) as session:
+                result = session.connection().execute(
+                    text(
+                        "UPDATE states SET last_updated_ts=COALESCE("
+                        "TIMESTAMPDIFF(MICROSECOND,'1970-01-01',last_updated)/1000000,0),"
+                        "last_changed_ts="
+                        "TIMESTAMPDIFF(MICROSECOND,'1970-01-01',last_changed)/1000000 "
+                        "WHERE last_updated_ts IS NULL LIMIT 250000;"
+                    )
+                )
+    elif engine.dialect.name == SupportedDialect.POSTGRESQL:
+        while result is None or result.rowcount > 0:
+            with session_scope(session=session_maker()) as session:
+                result = session.connection().execute(
+                    text(
+                        "UPDATE events SET time_fired_ts="
+                        "COALESCE(EXTRACT(EPOCH FROM time_fired),0) "
+                        "WHERE event_id IN (SELECT event_id FROM events "
+                        "WHERE time_fired_ts IS NULL LIMIT 250000);"
+                    )
+                )
+        result = None
+        while result is None or result.rowcount > 0:
+            with session_scope(session=session_maker()) as session:
+                result = session.connection().execute(
+                    text(
+                        "UPDATE states SET last_updated_ts="
+                        "COALESCE(EXTRACT(EPOCH FROM last_updated),0),"
+                        "last_changed_ts=EXTRACT(EPOCH FROM last_changed) "
+                        "WHERE state_id IN (SELECT state_id FROM states "
+                        "WHERE last_updated_ts IS NULL LIMIT 250000);"
+                    )
+                )
+
+
+def _migrate_entity_ids_to_states_meta(session_maker: Callable[[], Session]) -> None:
+    """Move the entity_ids of the states to the states_meta table.
+
+    The states are updated in chunks of state_ids to keep the transactions
+    small, the entity_id of the migrated rows is cleared to free up space.
+    """
+    with session_scope(session=session_maker()) as session:
+        connection = session.connection()
+        # Entities that are already in states_meta are skipped in case
+        # a previous migration was interrupted
+        connection.execute(
+            text(
+                "INSERT INTO states_meta (entity_id) "
+                "SELECT DISTINCT entity_id FROM states "
+                "WHERE entity_id IS NOT NULL AND entity_id NOT IN "
+                "(SELECT entity_id FROM states_meta);"
+            )
+        )
+        max_state_id: int = (
+            connection.execute(text("SELECT MAX(state_id) FROM states;")).scalar() or 0
+        )
+
+    for start_state_id in range(0, max_state_id, ENTITY_ID_MIGRATION_CHUNK_SIZE):
+        with session_scope(session=session_maker()) as session:
+            # The metadata_id must be set first as MySQL uses the
+            # updated values of the columns that are assigned before
+            session.connection().execute(
+                text(
+                    "UPDATE states SET metadata_id=(SELECT metadata_id "
+                    "FROM states_meta WHERE states_meta.entity_id=states.entity_id),"
+                    "entity_id=NULL "
+                    "WHERE entity_id IS NOT NULL "
+                    "AND state_id > :start_state_id AND state_id <= :end_state_id;"
+                ),
+                {
+                    "start_state_id": start_state_id,
+                    "end_state_id": start_state_id + ENTITY_ID_MIGRATION_CHUNK_SIZE,
+                },
+            )
+
+
+def _context_id_bin_for_row(context_id: str | None, timestamp: float | None) -> bytes:
+    """Convert a string context id, or make up one if it can not be converted."""
+    if context_id_bin := context_id_to_bytes_or_none(context_id):
+        return context_id_bin
+    # Rows without a usable context id get a new one from the time
+    # of the row so they are not picked up by the next batch
+    return ulid_bytes(timestamp)
+
+
+@retryable_database_job("migrate context ids")
+def migrate_context_ids(instance: Recorder) -> bool:
+    """Convert a batch of string context ids to binary.
+
+    Returns True when there are no more rows to convert.
+    """
+    with session_scope(session=instance.get_session()) as session:
+        if events := session.execute(find_events_context_ids_to_migrate()).all():
+            session.bulk_update_mappings(
+                Events,
+                [
+                    {
+                        "event_id": event_id,
+                        "context_id": None,
+                        "context_id_bin": _context_id_bin_for_row(
+                            context_id, time_fired_ts
+                        ),
+                        "context_user_id": None,
+                        "context_user_id_bin": uuid_hex_to_bytes_or_none(
+                            context_user_id
+                        ),
+                        "context_parent_id": None,
+                        "context_parent_id_bin": context_id_to_bytes_or_none(
+                            context_parent_id
+                        ),
+                    }
+                    for event_id, time_fired_ts, context_id, context_user_id, context_parent_id in events
+                ],
+            )
+        if states := session.execute(find_states_context_ids_to_migrate()).all():
+            session.bulk_update_mappings(
+                States,
+                [
+                    {
+                        "state_id": state_id,
+                        "context_id": None,
+                        "context_id_bin": _context_id_bin_for_row(
+                            context_id, last_updated_ts
+                        ),
+                        "context_user_id": None,
+                        "context_user_id_bin": uuid_hex_to_bytes_or_none(
+                            context_user_id
+                        ),
+                        "context_parent_id": None,
+                        "context_parent_id_bin": context_id_to_bytes_or_none(
+                            context_parent_id
+                        ),
+                    }
+                    for state_id, last_updated_ts, context_id, context_user_id, context_parent_id in states
+                ],
+            )
+    is_done = len(events) < MAX_ROWS_TO_MIGRATE and len(states) < MAX_ROWS_TO_MIGRATE
+    if is_done:
+        # The string context ids are no longer used for lookups
+        _drop_index(instance.get_session, "events", "ix_events_context_id")
+        _drop_index(instance.get_session, "states", "ix_states_context_id")
+    _LOGGER.debug("Migrating context ids to binary done=%s", is_done)
+    return is_done
+
+
 def _inspect_schema_version(session: Session) -> int:
     """Determine the schema version by inspecting the db structure.
 
@@ -741,7 +1015,7 @@ def _inspect_schema_version(session: Session) -> int:
     indexes = inspector.get_indexes("events")
 
     for index in indexes:
-        if index["column_names"] == ["time_fired"]:
+        if index["column_names"] in (["time_fired"], ["time_fired_ts"]):
             # Schema addition from version 1 detected. New DB.
             session.add(StatisticsRuns(start=get_start_time()))
             session.add(SchemaChanges(schema_version=SCHEMA_VERSION))
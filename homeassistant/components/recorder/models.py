@@ -5,7 +5,9 @@ from collections.abc import Callable
 from datetime import datetime, timedelta
 import json
 import logging
+import time
 from typing import Any, TypedDict, cast, overload
+from uuid import UUID
 
 import ciso8601
 from fnvhash import fnv1a_32
@@ -20,6 +22,7 @@ from sqlalchemy import (
     Identity,
     Index,
     Integer,
+    LargeBinary,
     SmallInteger,
     String,
     Text,
@@ -47,14 +50,15 @@ from homeassistant.const import (
 )
 from homeassistant.core import Context, Event, EventOrigin, State, split_entity_id
 import homeassistant.util.dt as dt_util
+from homeassistant.util.ulid import bytes_to_ulid, ulid_to_bytes
 
-from .const import ALL_DOMAIN_EXCLUDE_ATTRS, JSON_DUMP
+from .const import ALL_DOMAIN_EXCLUDE_ATTRS, JSON_DUMP, STATIC_ATTRIBUTES
 
 # SQLAlchemy Schema
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 29
+SCHEMA_VERSION = 35
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -63,6 +67,7 @@ DB_TIMEZONE = "+00:00"
 TABLE_EVENTS = "events"
 TABLE_EVENT_DATA = "event_data"
 TABLE_STATES = "states"
+TABLE_STATES_META = "states_meta"
 TABLE_STATE_ATTRIBUTES = "state_attributes"
 TABLE_RECORDER_RUNS = "recorder_runs"
 TABLE_SCHEMA_CHANGES = "schema_changes"
@@ -70,9 +75,13 @@ TABLE_STATISTICS = "statistics"
 TABLE_STATISTICS_META = "statistics_meta"
 TABLE_STATISTICS_RUNS = "statistics_runs"
 TABLE_STATISTICS_SHORT_TERM = "statistics_short_term"
+TABLE_STATISTICS_DAILY = "statistics_daily"
+TABLE_STATISTICS_MONTHLY = "statistics_monthly"
+TABLE_PURGE_RUNS = "purge_runs"
 
 ALL_TABLES = [
     TABLE_STATES,
+    TABLE_STATES_META,
     TABLE_STATE_ATTRIBUTES,
     TABLE_EVENTS,
     TABLE_EVENT_DATA,
@@ -82,6 +91,9 @@ ALL_TABLES = [
     TABLE_STATISTICS_META,
     TABLE_STATISTICS_RUNS,
     TABLE_STATISTICS_SHORT_TERM,
+    TABLE_STATISTICS_DAILY,
+    TABLE_STATISTICS_MONTHLY,
+    TABLE_PURGE_RUNS,
 ]
 
 TABLES_TO_CHECK = [
@@ -91,8 +103,8 @@ TABLES_TO_CHECK = [
     TABLE_SCHEMA_CHANGES,
 ]
 
-LAST_UPDATED_INDEX = "ix_states_last_updated"
-ENTITY_ID_LAST_UPDATED_INDEX = "ix_states_entity_id_last_updated"
+LAST_UPDATED_INDEX_TS = "ix_states_last_updated_ts"
+METADATA_ID_LAST_UPDATED_INDEX_TS = "ix_states_metadata_id_last_updated_ts"
 
 EMPTY_JSON_OBJECT = "{}"
 
@@ -122,6 +134,13 @@ DOUBLE_TYPE = (
     .with_variant(oracle.DOUBLE_PRECISION(), "oracle")
     .with_variant(postgresql.DOUBLE_PRECISION(), "postgresql")
 )
+TIMESTAMP_TYPE = DOUBLE_TYPE
+CONTEXT_ID_BIN_MAX_LENGTH = 16
+CONTEXT_BINARY_TYPE = (
+    LargeBinary(CONTEXT_ID_BIN_MAX_LENGTH)
+    .with_variant(mysql.BINARY(CONTEXT_ID_BIN_MAX_LENGTH), "mysql")
+    .with_variant(oracle.RAW(CONTEXT_ID_BIN_MAX_LENGTH), "oracle")
+)
 
 
 class JSONLiteral(JSON):  # type: ignore[misc]
@@ -151,7 +170,7 @@ class Events(Base):  # type: ignore[misc,valid-type]
     __table_args__ = (
         # Used for fetching events at a specific time
         # see logbook
-        Index("ix_events_event_type_time_fired", "event_type", "time_fired"),
+        Index("ix_events_event_type_time_fired_ts", "event_type", "time_fired_ts"),
         {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
     )
     __tablename__ = TABLE_EVENTS
@@ -160,10 +179,20 @@ class Events(Base):  # type: ignore[misc,valid-type]
     event_data = Column(Text().with_variant(mysql.LONGTEXT, "mysql"))
     origin = Column(String(MAX_LENGTH_EVENT_ORIGIN))  # no longer used for new rows
     origin_idx = Column(SmallInteger)
-    time_fired = Column(DATETIME_TYPE, index=True)
-    context_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID), index=True)
-    context_user_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID))
-    context_parent_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID))
+    time_fired = Column(DATETIME_TYPE)  # no longer used for new rows
+    time_fired_ts = Column(TIMESTAMP_TYPE, index=True)
+    context_id = Column(  # no longer used for new rows
+        String(MAX_LENGTH_EVENT_CONTEXT_ID)
+    )
+    context_user_id = Column(  # no longer used for new rows
+        String(MAX_LENGTH_EVENT_CONTEXT_ID)
+    )
+    context_parent_id = Column(  # no longer used for new rows
+        String(MAX_LENGTH_EVENT_CONTEXT_ID)
+    )
+    context_id_bin = Column(CONTEXT_BINARY_TYPE, index=True)
+    context_user_id_bin = Column(CONTEXT_BINARY_TYPE)
+    context_parent_id_bin = Column(CONTEXT_BINARY_TYPE)
     data_id = Column(Integer, ForeignKey("event_data.data_id"), index=True)
     event_data_rel = relationship("EventData")
 
@@ -172,7 +201,8 @@ class Events(Base):  # type: ignore[misc,valid-type]
         return (
             f"<recorder.Events("
             f"id={self.event_id}, type='{self.event_type}', "
-            f"origin_idx='{self.origin_idx}', time_fired='{self.time_fired}'"
+            f"origin_idx='{self.origin_idx}', "
+            f"time_fired='{dt_util.utc_from_timestamp(self.time_fired_ts or 0)}'"
             f", data_id={self.data_id})>"
         )
 
@@ -183,18 +213,24 @@ class Events(Base):  # type: ignore[misc,valid-type]
             event_type=event.event_type,
             event_data=None,
             origin_idx=EVENT_ORIGIN_TO_IDX.get(event.origin),
-            time_fired=event.time_fired,
-            context_id=event.context.id,
-            context_user_id=event.context.user_id,
-            context_parent_id=event.context.parent_id,
+            time_fired=None,
+            time_fired_ts=event.time_fired.timestamp(),
+            context_id=None,
+            context_id_bin=context_id_to_bytes_or_none(event.context.id),
+            context_user_id=None,
+            context_user_id_bin=uuid_hex_to_bytes_or_none(event.context.user_id),
+            context_parent_id=None,
+            context_parent_id_bin=context_id_to_bytes_or_none(event.context.parent_id),
         )
 
     def to_native(self, validate_entity_id: bool = True) -> Event | None:
         """Convert to a native HA Event."""
         context = Context(
-            id=self.context_id,
-            user_id=self.context_user_id,
-            parent_id=self.context_parent_id,
+            id=bytes_to_context_id_or_none(self.context_id_bin) or self.context_id,
+            user_id=bytes_to_uuid_hex_or_none(self.context_user_id_bin)
+            or self.context_user_id,
+            parent_id=bytes_to_context_id_or_none(self.context_parent_id_bin)
+            or self.context_parent_id,
         )
         try:
             return Event(
@@ -203,7 +239,7 @@ class Events(Base):  # type: ignore[misc,valid-type]
                 EventOrigin(self.origin)
                 if self.origin
                 else EVENT_ORIGIN_ORDER[self.origin_idx],
-                process_timestamp(self.time_fired),
+                dt_util.utc_from_timestamp(self.time_fired_ts or 0),
                 context=context,
             )
         except ValueError:
@@ -265,12 +301,14 @@ class States(Base):  # type: ignore[misc,valid-type]
     __table_args__ = (
         # Used for fetching the state of entities at a specific time
         # (get_states in history.py)
-        Index(ENTITY_ID_LAST_UPDATED_INDEX, "entity_id", "last_updated"),
+        Index(METADATA_ID_LAST_UPDATED_INDEX_TS, "metadata_id", "last_updated_ts"),
         {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
     )
     __tablename__ = TABLE_STATES
     state_id = Column(Integer, Identity(), primary_key=True)
-    entity_id = Column(String(MAX_LENGTH_STATE_ENTITY_ID))
+    entity_id = Column(
+        String(MAX_LENGTH_STATE_ENTITY_ID)
+    )  # no longer used for new rows
     state = Column(String(MAX_LENGTH_STATE_STATE))
     attributes = Column(
         Text().with_variant(mysql.LONGTEXT, "mysql")
@@ -278,18 +316,38 @@ class States(Base):  # type: ignore[misc,valid-type]
     event_id = Column(  # no longer used for new rows
         Integer, ForeignKey("events.event_id", ondelete="CASCADE"), index=True
     )
-    last_changed = Column(DATETIME_TYPE)
-    last_updated = Column(DATETIME_TYPE, default=dt_util.utcnow, index=True)
+    last_changed = Column(DATETIME_TYPE)  # no longer used for new rows
+    last_changed_ts = Column(TIMESTAMP_TYPE)
+    last_updated = Column(DATETIME_TYPE)  # no longer used for new rows
+    last_updated_ts = Column(TIMESTAMP_TYPE, default=time.time, index=True)
     old_state_id = Column(Integer, ForeignKey("states.state_id"), index=True)
     attributes_id = Column(
         Integer, ForeignKey("state_attributes.attributes_id"), index=True
     )
-    context_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID), index=True)
-    context_user_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID))
-    context_parent_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID))
+    # Only set when the static attributes are stored apart
+    static_attributes_id = Column(
+        Integer, ForeignKey("state_attributes.attributes_id"), index=True
+    )
+    context_id = Column(  # no longer used for new rows
+        String(MAX_LENGTH_EVENT_CONTEXT_ID)
+    )
+    context_user_id = Column(  # no longer used for new rows
+        String(MAX_LENGTH_EVENT_CONTEXT_ID)
+    )
+    context_parent_id = Column(  # no longer used for new rows
+        String(MAX_LENGTH_EVENT_CONTEXT_ID)
+    )
+    context_id_bin = Column(CONTEXT_BINARY_TYPE, index=True)
+    context_user_id_bin = Column(CONTEXT_BINARY_TYPE)
+    context_parent_id_bin = Column(CONTEXT_BINARY_TYPE)
     origin_idx = Column(SmallInteger)  # 0 is local, 1 is remote
+    metadata_id = Column(Integer, ForeignKey("states_meta.metadata_id"))
     old_state = relationship("States", remote_side=[state_id])
-    state_attributes = relationship("StateAttributes")
+    state_attributes = relationship("StateAttributes", foreign_keys=[attributes_id])
+    static_state_attributes = relationship(
+        "StateAttributes", foreign_keys=[static_attributes_id]
+    )
+    states_meta_rel = relationship("StatesMeta")
 
     def __repr__(self) -> str:
         """Return string representation of instance for debugging."""
@@ -297,47 +355,55 @@ class States(Base):  # type: ignore[misc,valid-type]
             f"<recorder.States("
             f"id={self.state_id}, entity_id='{self.entity_id}', "
             f"state='{self.state}', event_id='{self.event_id}', "
-            f"last_updated='{self.last_updated.isoformat(sep=' ', timespec='seconds')}', "
+            f"last_updated='{dt_util.utc_from_timestamp(self.last_updated_ts or 0).isoformat(sep=' ', timespec='seconds')}', "
             f"old_state_id={self.old_state_id}, attributes_id={self.attributes_id}"
             f")>"
         )
 
     @staticmethod
     def from_event(event: Event) -> States:
-        """Create object from a state_changed event."""
-        entity_id = event.data["entity_id"]
+        """Create object from a state_changed event.
+
+        The entity_id is stored in the states_meta table, the
+        recorder links the row to it with metadata_id.
+        """
         state: State | None = event.data.get("new_state")
         dbstate = States(
-            entity_id=entity_id,
+            entity_id=None,
             attributes=None,
-            context_id=event.context.id,
-            context_user_id=event.context.user_id,
-            context_parent_id=event.context.parent_id,
+            context_id=None,
+            context_id_bin=context_id_to_bytes_or_none(event.context.id),
+            context_user_id=None,
+            context_user_id_bin=uuid_hex_to_bytes_or_none(event.context.user_id),
+            context_parent_id=None,
+            context_parent_id_bin=context_id_to_bytes_or_none(event.context.parent_id),
             origin_idx=EVENT_ORIGIN_TO_IDX.get(event.origin),
         )
 
         # None state means the state was removed from the state machine
         if state is None:
             dbstate.state = ""
-            dbstate.last_updated = event.time_fired
-            dbstate.last_changed = None
+            dbstate.last_updated_ts = event.time_fired.timestamp()
+            dbstate.last_changed_ts = None
             return dbstate
 
         dbstate.state = state.state
-        dbstate.last_updated = state.last_updated
+        dbstate.last_updated_ts = state.last_updated.timestamp()
         if state.last_updated == state.last_changed:
-            dbstate.last_changed = None
+            dbstate.last_changed_ts = None
         else:
-            dbstate.last_changed = state.last_changed
+            dbstate.last_changed_ts = state.last_changed.timestamp()
 
         return dbstate
 
     def to_native(self, validate_entity_id: bool = True) -> State | None:
         """Convert to an HA state object."""
         context = Context(
-            id=self.context_id,
-            user_id=self.context_user_id,
-            parent_id=self.context_parent_id,
+            id=bytes_to_context_id_or_none(self.context_id_bin) or self.context_id,
+            user_id=bytes_to_uuid_hex_or_none(self.context_user_id_bin)
+            or self.context_user_id,
+            parent_id=bytes_to_context_id_or_none(self.context_parent_id_bin)
+            or self.context_parent_id,
         )
         try:
             attrs = json.loads(self.attributes) if self.attributes else {}
@@ -345,13 +411,19 @@ class States(Base):  # type: ignore[misc,valid-type]
             # When json.loads fails
             _LOGGER.exception("Error converting row to state: %s", self)
             return None
-        if self.last_changed is None or self.last_changed == self.last_updated:
-            last_changed = last_updated = process_timestamp(self.last_updated)
+        if self.last_changed_ts is None or self.last_changed_ts == self.last_updated_ts:
+            last_changed = last_updated = dt_util.utc_from_timestamp(
+                self.last_updated_ts or 0
+            )
         else:
-            last_updated = process_timestamp(self.last_updated)
-            last_changed = process_timestamp(self.last_changed)
+            last_updated = dt_util.utc_from_timestamp(self.last_updated_ts or 0)
+            last_changed = dt_util.utc_from_timestamp(self.last_changed_ts)
+        entity_id = self.entity_id
+        # Newer states only have the entity_id in the states_meta table
+        if entity_id is None and self.states_meta_rel is not None:
+            entity_id = self.states_meta_rel.entity_id
         return State(
-            self.entity_id,
+            entity_id,
             self.state,
             # Join the state_attributes table on attributes_id to get the attributes
             # for newer states
@@ -363,6 +435,25 @@ class States(Base):  # type: ignore[misc,valid-type]
         )
 
 
+class StatesMeta(Base):  # type: ignore[misc,valid-type]
+    """Metadata for states."""
+
+    __table_args__ = (
+        {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
+    )
+    __tablename__ = TABLE_STATES_META
+    metadata_id = Column(Integer, Identity(), primary_key=True)
+    entity_id = Column(String(MAX_LENGTH_STATE_ENTITY_ID), index=True, unique=True)
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            "<recorder.StatesMeta("
+            f"id={self.metadata_id}, entity_id='{self.entity_id}'"
+            ")>"
+        )
+
+
 class StateAttributes(Base):  # type: ignore[misc,valid-type]
     """State attribute change history."""
 
@@ -411,6 +502,37 @@ class StateAttributes(Base):  # type: ignore[misc,valid-type]
             {k: v for k, v in state.attributes.items() if k not in exclude_attrs}
         )
 
+    @staticmethod
+    def split_shared_attrs_from_event(
+        event: Event, exclude_attrs_by_domain: dict[str, set[str]]
+    ) -> tuple[str | None, str]:
+        """Create the static and the other shared_attrs from a state_changed event.
+
+        The static shared_attrs are None when the state has none of
+        the STATIC_ATTRIBUTES.
+        """
+        state: State | None = event.data.get("new_state")
+        # None state means the state was removed from the state machine
+        if state is None:
+            return None, "{}"
+        domain = split_entity_id(state.entity_id)[0]
+        exclude_attrs = (
+            exclude_attrs_by_domain.get(domain, set()) | ALL_DOMAIN_EXCLUDE_ATTRS
+        )
+        static_attrs: dict[str, Any] = {}
+        volatile_attrs: dict[str, Any] = {}
+        for key, value in state.attributes.items():
+            if key in exclude_attrs:
+                continue
+            if key in STATIC_ATTRIBUTES:
+                static_attrs[key] = value
+            else:
+                volatile_attrs[key] = value
+        return (
+            JSON_DUMP(static_attrs) if static_attrs else None,
+            JSON_DUMP(volatile_attrs),
+        )
+
     @staticmethod
     def hash_shared_attrs(shared_attrs: str) -> int:
         """Return the hash of json encoded shared attributes."""
@@ -514,6 +636,48 @@ class StatisticsShortTerm(Base, StatisticsBase):  # type: ignore[misc,valid-type
     __tablename__ = TABLE_STATISTICS_SHORT_TERM
 
 
+class StatisticsDaily(Base, StatisticsBase):  # type: ignore[misc,valid-type]
+    """Long term statistics rolled up per local day.
+
+    The rows are compiled from the hourly statistics, start is the start of the
+    day in the configured time zone.
+    """
+
+    __table_args__ = (
+        # Used for fetching statistics for a certain entity at a specific time
+        Index(
+            "ix_statistics_daily_statistic_id_start",
+            "metadata_id",
+            "start",
+            unique=True,
+        ),
+    )
+    __tablename__ = TABLE_STATISTICS_DAILY
+
+
+class StatisticsMonthly(Base, StatisticsBase):  # type: ignore[misc,valid-type]
+    """Long term statistics rolled up per local month.
+
+    The rows are compiled from the hourly statistics, start is the start of the
+    month in the configured time zone. mean_count is the number of hourly means
+    the mean was computed from, so the row of the current month can be updated
+    with each compiled hour.
+    """
+
+    __table_args__ = (
+        # Used for fetching statistics for a certain entity at a specific time
+        Index(
+            "ix_statistics_monthly_statistic_id_start",
+            "metadata_id",
+            "start",
+            unique=True,
+        ),
+    )
+    __tablename__ = TABLE_STATISTICS_MONTHLY
+
+    mean_count = Column(Integer)
+
+
 class StatisticMetaData(TypedDict):
     """Statistic meta data class."""
 
@@ -580,14 +744,20 @@ class RecorderRuns(Base):  # type: ignore[misc,valid-type]
 
         assert session is not None, "RecorderRuns need to be persisted"
 
-        query = session.query(distinct(States.entity_id)).filter(
-            States.last_updated >= self.start
+        query = (
+            session.query(distinct(StatesMeta.entity_id))
+            .join(States, States.metadata_id == StatesMeta.metadata_id)
+            .filter(States.last_updated_ts >= process_datetime_to_timestamp(self.start))
         )
 
         if point_in_time is not None:
-            query = query.filter(States.last_updated < point_in_time)
+            query = query.filter(
+                States.last_updated_ts < process_datetime_to_timestamp(point_in_time)
+            )
         elif self.end is not None:
-            query = query.filter(States.last_updated < self.end)
+            query = query.filter(
+                States.last_updated_ts < process_datetime_to_timestamp(self.end)
+            )
 
         return [row[0] for row in query]
 
@@ -614,6 +784,40 @@ class SchemaChanges(Base):  # type: ignore[misc,valid-type]
         )
 
 
+class PurgeRuns(Base):  # type: ignore[misc,valid-type]
+    """Representation of a purge run.
+
+    A purge is done in many small steps, the run keeps track of the
+    target and the progress so an interrupted purge can be resumed.
+    """
+
+    __tablename__ = TABLE_PURGE_RUNS
+    run_id = Column(Integer, Identity(), primary_key=True)
+    purge_before = Column(DateTime(timezone=True))
+    repack = Column(Boolean, default=False)
+    apply_filter = Column(Boolean, default=False)
+    start = Column(DateTime(timezone=True), default=dt_util.utcnow)
+    end = Column(DateTime(timezone=True), index=True)
+    steps = Column(Integer, default=0)
+    states_purged = Column(Integer, default=0)
+    events_purged = Column(Integer, default=0)
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        end = (
+            f"'{self.end.isoformat(sep=' ', timespec='seconds')}'" if self.end else None
+        )
+        return (
+            f"<recorder.PurgeRuns("
+            f"id={self.run_id}, "
+            f"purge_before='{self.purge_before.isoformat(sep=' ', timespec='seconds')}', "
+            f"start='{self.start.isoformat(sep=' ', timespec='seconds')}', "
+            f"end={end}, steps={self.steps}, states_purged={self.states_purged}, "
+            f"events_purged={self.events_purged}"
+            f")>"
+        )
+
+
 class StatisticsRuns(Base):  # type: ignore[misc,valid-type]
     """Representation of statistics run."""
 
@@ -702,6 +906,46 @@ def process_datetime_to_timestamp(ts: datetime) -> float:
     return ts.timestamp()
 
 
+def context_id_to_bytes_or_none(context_id: str | None) -> bytes | None:
+    """Convert a context id to its compact 16 byte form.
+
+    Context ids are ULIDs, older ones are uuid hex strings which
+    fit in the same 16 bytes. None is returned for anything else.
+    """
+    if context_id is None:
+        return None
+    if len(context_id) == 32:
+        return uuid_hex_to_bytes_or_none(context_id)
+    try:
+        return ulid_to_bytes(context_id)
+    except ValueError:
+        return None
+
+
+def bytes_to_context_id_or_none(context_id_bin: bytes | None) -> str | None:
+    """Convert the 16 byte form of a context id to a ULID."""
+    if context_id_bin is None:
+        return None
+    return bytes_to_ulid(context_id_bin)
+
+
+def uuid_hex_to_bytes_or_none(uuid_hex: str | None) -> bytes | None:
+    """Convert a uuid hex string, like a user id, to its 16 byte form."""
+    if uuid_hex is None or len(uuid_hex) != 32:
+        return None
+    try:
+        return UUID(hex=uuid_hex).bytes
+    except ValueError:
+        return None
+
+
+def bytes_to_uuid_hex_or_none(uuid_bin: bytes | None) -> str | None:
+    """Convert the 16 byte form of a uuid to a hex string."""
+    if uuid_bin is None:
+        return None
+    return uuid_bin.hex()
+
+
 class LazyState(State):
     """A lazy version of core State."""
 
@@ -758,8 +1002,8 @@ class LazyState(State):
     def last_changed(self) -> datetime:  # type: ignore[override]
         """Last changed datetime."""
         if self._last_changed is None:
-            if (last_changed := self._row.last_changed) is not None:
-                self._last_changed = process_timestamp(last_changed)
+            if (last_changed_ts := self._row.last_changed_ts) is not None:
+                self._last_changed = dt_util.utc_from_timestamp(last_changed_ts)
             else:
                 self._last_changed = self.last_updated
         return self._last_changed
@@ -773,7 +1017,7 @@ class LazyState(State):
     def last_updated(self) -> datetime:  # type: ignore[override]
         """Last updated datetime."""
         if self._last_updated is None:
-            self._last_updated = process_timestamp(self._row.last_updated)
+            self._last_updated = dt_util.utc_from_timestamp(self._row.last_updated_ts)
         return self._last_updated
 
     @last_updated.setter
@@ -789,18 +1033,18 @@ class LazyState(State):
         To be used for JSON serialization.
         """
         if self._last_changed is None and self._last_updated is None:
-            last_updated_isoformat = process_timestamp_to_utc_isoformat(
-                self._row.last_updated
-            )
+            last_updated_ts: float = self._row.last_updated_ts
+            last_updated_isoformat = dt_util.utc_from_timestamp(
+                last_updated_ts
+            ).isoformat()
             if (
-                self._row.last_changed is None
-                or self._row.last_changed == self._row.last_updated
-            ):
+                last_changed_ts := self._row.last_changed_ts
+            ) is None or last_changed_ts == last_updated_ts:
                 last_changed_isoformat = last_updated_isoformat
             else:
-                last_changed_isoformat = process_timestamp_to_utc_isoformat(
-                    self._row.last_changed
-                )
+                last_changed_isoformat = dt_util.utc_from_timestamp(
+                    last_changed_ts
+                ).isoformat()
         else:
             last_updated_isoformat = self.last_updated.isoformat()
             if self.last_changed == self.last_updated:
@@ -825,20 +1069,35 @@ class LazyState(State):
         )
 
 
+def attributes_source_from_row(row: Row) -> str:
+    """Return the encoded attributes of a database row.
+
+    When the static attributes are stored apart they are prepended,
+    the result is only meant to compare or cache the attributes.
+    """
+    source: str = row.shared_attrs or row.attributes
+    if static_source := row.static_shared_attrs:
+        return static_source + (source or EMPTY_JSON_OBJECT)
+    return source
+
+
 def decode_attributes_from_row(
     row: Row, attr_cache: dict[str, dict[str, Any]]
 ) -> dict[str, Any]:
     """Decode attributes from a database row."""
-    source: str = row.shared_attrs or row.attributes
+    source = attributes_source_from_row(row)
     if (attributes := attr_cache.get(source)) is not None:
         return attributes
     if not source or source == EMPTY_JSON_OBJECT:
         return {}
     try:
-        attr_cache[source] = attributes = json.loads(source)
+        attributes = json.loads(row.shared_attrs or row.attributes or "{}")
+        if static_source := row.static_shared_attrs:
+            attributes = json.loads(static_source) | attributes
     except ValueError:
         _LOGGER.exception("Error converting row to state attributes: %s", source)
-        attr_cache[source] = attributes = {}
+        attributes = {}
+    attr_cache[source] = attributes
     return attributes
 
 
@@ -855,14 +1114,10 @@ def row_to_compressed_state(
     if start_time:
         comp_state[COMPRESSED_STATE_LAST_UPDATED] = start_time.timestamp()
     else:
-        row_last_updated: datetime = row.last_updated
-        comp_state[COMPRESSED_STATE_LAST_UPDATED] = process_datetime_to_timestamp(
-            row_last_updated
-        )
+        row_last_updated_ts: float = row.last_updated_ts
+        comp_state[COMPRESSED_STATE_LAST_UPDATED] = row_last_updated_ts
         if (
-            row_changed_changed := row.last_changed
-        ) and row_last_updated != row_changed_changed:
-            comp_state[COMPRESSED_STATE_LAST_CHANGED] = process_datetime_to_timestamp(
-                row_changed_changed
-            )
+            row_last_changed_ts := row.last_changed_ts
+        ) and row_last_updated_ts != row_last_changed_ts:
+            comp_state[COMPRESSED_STATE_LAST_CHANGED] = row_last_changed_ts
     return comp_state
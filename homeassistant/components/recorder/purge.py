@@ -2,19 +2,22 @@
 from __future__ import annotations
 
 from collections.abc import Callable, Iterable
+from dataclasses import dataclass
 from datetime import datetime
 from functools import partial
 from itertools import islice, zip_longest
 import logging
+import time
 from typing import TYPE_CHECKING, Any
 
 from sqlalchemy.orm.session import Session
 from sqlalchemy.sql.expression import distinct
 
 from homeassistant.const import EVENT_STATE_CHANGED
+import homeassistant.util.dt as dt_util
 
 from .const import MAX_ROWS_TO_PURGE, SupportedDialect
-from .models import Events, StateAttributes, States
+from .models import Events, PurgeRuns, StateAttributes, States, process_timestamp
 from .queries import (
     attributes_ids_exist_in_states,
     attributes_ids_exist_in_states_sqlite,
@@ -22,8 +25,10 @@ from .queries import (
     data_ids_exist_in_events_sqlite,
     delete_event_data_rows,
     delete_event_rows,
+    delete_purge_runs_rows,
     delete_recorder_runs_rows,
     delete_states_attributes_rows,
+    delete_states_meta_rows,
     delete_states_rows,
     delete_statistics_runs_rows,
     delete_statistics_short_term_rows,
@@ -33,8 +38,12 @@ from .queries import (
     find_legacy_event_state_and_attributes_and_data_ids_to_purge,
     find_legacy_row,
     find_short_term_statistics_to_purge,
+    find_states_meta,
     find_states_to_purge,
     find_statistics_runs_to_purge,
+    find_unfinished_purge_run,
+    find_unused_states_meta,
+    static_attributes_ids_exist_in_states,
 )
 from .repack import repack_database
 from .util import retryable_database_job, session_scope
@@ -47,6 +56,7 @@ _LOGGER = logging.getLogger(__name__)
 
 DEFAULT_STATES_BATCHES_PER_PURGE = 20  # We expect ~95% de-dupe rate
 DEFAULT_EVENTS_BATCHES_PER_PURGE = 15  # We expect ~92% de-dupe rate
+DEFAULT_PURGE_TIME_BUDGET = 1.0  # Seconds of purge work per task
 
 
 def take(take_num: int, iterable: Iterable) -> list[Any]:
@@ -65,6 +75,19 @@ def chunked(iterable: Iterable, chunked_num: int) -> Iterable[Any]:
     return iter(partial(take, chunked_num, iter(iterable)), [])
 
 
+@dataclass(frozen=True)
+class PurgeProgress:
+    """Progress of the current or last purge run."""
+
+    run_id: int
+    purge_before: datetime
+    start: datetime
+    end: datetime | None
+    steps: int
+    states_purged: int
+    events_purged: int
+
+
 @retryable_database_job("purge")
 def purge_old_data(
     instance: Recorder,
@@ -73,18 +96,25 @@ def purge_old_data(
     apply_filter: bool = False,
     events_batch_size: int = DEFAULT_EVENTS_BATCHES_PER_PURGE,
     states_batch_size: int = DEFAULT_STATES_BATCHES_PER_PURGE,
+    time_budget: float = DEFAULT_PURGE_TIME_BUDGET,
 ) -> bool:
     """Purge events and states older than purge_before.
 
     Cleans up an timeframe of an hour, based on the oldest record.
+    Stops early once time_budget seconds are used up so the purge
+    does not hold up the recorder queue. The progress is stored in
+    the purge_runs table with every step.
     """
     _LOGGER.debug(
         "Purging states and events before target %s",
         purge_before.isoformat(sep=" ", timespec="seconds"),
     )
     using_sqlite = instance.dialect_name == SupportedDialect.SQLITE
+    deadline = time.monotonic() + time_budget
 
     with session_scope(session=instance.get_session()) as session:
+        purge_run = _get_or_start_purge_run(session, purge_before, repack, apply_filter)
+        purge_run.steps += 1
         # Purge a max of MAX_ROWS_TO_PURGE, based on the oldest states or events record
         has_more_to_purge = False
         if _purging_legacy_format(session):
@@ -92,7 +122,7 @@ def purge_old_data(
                 "Purge running in legacy format as there are states with event_id remaining"
             )
             has_more_to_purge |= _purge_legacy_format(
-                instance, session, purge_before, using_sqlite
+                instance, session, purge_run, using_sqlite
             )
         else:
             _LOGGER.debug(
@@ -100,11 +130,19 @@ def purge_old_data(
             )
             # Once we are done purging legacy rows, we use the new method
             has_more_to_purge |= _purge_states_and_attributes_ids(
-                instance, session, states_batch_size, purge_before, using_sqlite
-            )
-            has_more_to_purge |= _purge_events_and_data_ids(
-                instance, session, events_batch_size, purge_before, using_sqlite
+                instance, session, purge_run, states_batch_size, using_sqlite, deadline
             )
+            if has_more_to_purge and time.monotonic() >= deadline:
+                _LOGGER.debug("Purge time budget used up by states")
+            else:
+                has_more_to_purge |= _purge_events_and_data_ids(
+                    instance,
+                    session,
+                    purge_run,
+                    events_batch_size,
+                    using_sqlite,
+                    deadline,
+                )
 
         statistics_runs = _select_statistics_runs_to_purge(session, purge_before)
         short_term_statistics = _select_short_term_statistics_to_purge(
@@ -115,29 +153,72 @@ def purge_old_data(
 
         if short_term_statistics:
             _purge_short_term_statistics(session, short_term_statistics)
+            instance.statistics_query_cache.invalidate(None, None)
 
         if has_more_to_purge or statistics_runs or short_term_statistics:
             # Return false, as we might not be done yet.
             _LOGGER.debug("Purging hasn't fully completed yet")
+            _update_purge_progress(instance, purge_run)
             return False
 
         if apply_filter and _purge_filtered_data(instance, session) is False:
             _LOGGER.debug("Cleanup filtered data hasn't fully completed yet")
+            _update_purge_progress(instance, purge_run)
             return False
 
+        _purge_unused_states_meta(instance, session)
         _purge_old_recorder_runs(instance, session, purge_before)
+        _purge_old_purge_runs(session, purge_run)
+        purge_run.end = dt_util.utcnow()
+        _update_purge_progress(instance, purge_run)
     if repack:
         repack_database(instance)
     return True
 
 
+def _get_or_start_purge_run(
+    session: Session, purge_before: datetime, repack: bool, apply_filter: bool
+) -> PurgeRuns:
+    """Return the unfinished purge run or start a new one.
+
+    An unfinished run is picked up again after a restart, or when
+    another purge is requested before it is done, in which case the
+    newest request sets the target.
+    """
+    if purge_run := session.execute(find_unfinished_purge_run()).scalar():
+        _LOGGER.debug("Continuing purge run %s", purge_run.run_id)
+    else:
+        purge_run = PurgeRuns(
+            start=dt_util.utcnow(), steps=0, states_purged=0, events_purged=0
+        )
+        session.add(purge_run)
+    purge_run.purge_before = purge_before
+    purge_run.repack = repack
+    purge_run.apply_filter = apply_filter
+    session.flush()
+    return purge_run
+
+
+def _update_purge_progress(instance: Recorder, purge_run: PurgeRuns) -> None:
+    """Publish the progress of the purge run on the recorder."""
+    instance.purge_progress = PurgeProgress(
+        run_id=purge_run.run_id,
+        purge_before=purge_run.purge_before,
+        start=process_timestamp(purge_run.start),
+        end=purge_run.end,
+        steps=purge_run.steps,
+        states_purged=purge_run.states_purged,
+        events_purged=purge_run.events_purged,
+    )
+
+
 def _purging_legacy_format(session: Session) -> bool:
     """Check if there are any legacy event_id linked states rows remaining."""
     return bool(session.execute(find_legacy_row()).scalar())
 
 
 def _purge_legacy_format(
-    instance: Recorder, session: Session, purge_before: datetime, using_sqlite: bool
+    instance: Recorder, session: Session, purge_run: PurgeRuns, using_sqlite: bool
 ) -> bool:
     """Purge rows that are still linked by the event_ids."""
     (
@@ -146,13 +227,15 @@ def _purge_legacy_format(
         attributes_ids,
         data_ids,
     ) = _select_legacy_event_state_and_attributes_and_data_ids_to_purge(
-        session, purge_before
+        session, purge_run.purge_before
     )
     if state_ids:
         _purge_state_ids(instance, session, state_ids)
+        purge_run.states_purged += len(state_ids)
     _purge_unused_attributes_ids(instance, session, attributes_ids, using_sqlite)
     if event_ids:
         _purge_event_ids(session, event_ids)
+        purge_run.events_purged += len(event_ids)
     _purge_unused_data_ids(instance, session, data_ids, using_sqlite)
     return bool(event_ids or state_ids or attributes_ids or data_ids)
 
@@ -160,9 +243,10 @@ def _purge_legacy_format(
 def _purge_states_and_attributes_ids(
     instance: Recorder,
     session: Session,
+    purge_run: PurgeRuns,
     states_batch_size: int,
-    purge_before: datetime,
     using_sqlite: bool,
+    deadline: float,
 ) -> bool:
     """Purge states and linked attributes id in a batch.
 
@@ -176,13 +260,16 @@ def _purge_states_and_attributes_ids(
     attributes_ids_batch: set[int] = set()
     for _ in range(states_batch_size):
         state_ids, attributes_ids = _select_state_attributes_ids_to_purge(
-            session, purge_before
+            session, purge_run.purge_before
         )
         if not state_ids:
             has_remaining_state_ids_to_purge = False
             break
         _purge_state_ids(instance, session, state_ids)
+        purge_run.states_purged += len(state_ids)
         attributes_ids_batch = attributes_ids_batch | attributes_ids
+        if time.monotonic() >= deadline:
+            break
 
     _purge_unused_attributes_ids(instance, session, attributes_ids_batch, using_sqlite)
     _LOGGER.debug(
@@ -195,9 +282,10 @@ def _purge_states_and_attributes_ids(
 def _purge_events_and_data_ids(
     instance: Recorder,
     session: Session,
+    purge_run: PurgeRuns,
     events_batch_size: int,
-    purge_before: datetime,
     using_sqlite: bool,
+    deadline: float,
 ) -> bool:
     """Purge states and linked attributes id in a batch.
 
@@ -210,12 +298,17 @@ def _purge_events_and_data_ids(
     # MAX_ROWS_TO_PURGE
     data_ids_batch: set[int] = set()
     for _ in range(events_batch_size):
-        event_ids, data_ids = _select_event_data_ids_to_purge(session, purge_before)
+        event_ids, data_ids = _select_event_data_ids_to_purge(
+            session, purge_run.purge_before
+        )
         if not event_ids:
             has_remaining_event_ids_to_purge = False
             break
         _purge_event_ids(session, event_ids)
+        purge_run.events_purged += len(event_ids)
         data_ids_batch = data_ids_batch | data_ids
+        if time.monotonic() >= deadline:
+            break
 
     _purge_unused_data_ids(instance, session, data_ids_batch, using_sqlite)
     _LOGGER.debug(
@@ -231,10 +324,12 @@ def _select_state_attributes_ids_to_purge(
     """Return sets of state and attribute ids to purge."""
     state_ids = set()
     attributes_ids = set()
-    for state in session.execute(find_states_to_purge(purge_before)).all():
+    for state in session.execute(find_states_to_purge(purge_before.timestamp())).all():
         state_ids.add(state.state_id)
         if state.attributes_id:
             attributes_ids.add(state.attributes_id)
+        if state.static_attributes_id:
+            attributes_ids.add(state.static_attributes_id)
     _LOGGER.debug(
         "Selected %s state ids and %s attributes_ids to remove",
         len(state_ids),
@@ -249,7 +344,7 @@ def _select_event_data_ids_to_purge(
     """Return sets of event and data ids to purge."""
     event_ids = set()
     data_ids = set()
-    for event in session.execute(find_events_to_purge(purge_before)).all():
+    for event in session.execute(find_events_to_purge(purge_before.timestamp())).all():
         event_ids.add(event.event_id)
         if event.data_id:
             data_ids.add(event.data_id)
@@ -320,6 +415,17 @@ def _select_unused_attributes_ids(
                 if attrs_id[0] is not None
             }
     to_remove = attributes_ids - seen_ids
+    # The static attributes are shared by far fewer rows
+    # so the simple query is fast enough for all databases
+    static_seen_ids: set[int] = set()
+    for attr_ids_chunk in chunked(to_remove, MAX_ROWS_TO_PURGE):
+        static_seen_ids |= {
+            attrs_id[0]
+            for attrs_id in session.execute(
+                static_attributes_ids_exist_in_states(attr_ids_chunk)
+            ).all()
+        }
+    to_remove -= static_seen_ids
     _LOGGER.debug(
         "Selected %s shared attributes to remove",
         len(to_remove),
@@ -418,7 +524,9 @@ def _select_legacy_event_state_and_attributes_and_data_ids_to_purge(
     still need to be able to purge them.
     """
     events = session.execute(
-        find_legacy_event_state_and_attributes_and_data_ids_to_purge(purge_before)
+        find_legacy_event_state_and_attributes_and_data_ids_to_purge(
+            purge_before.timestamp()
+        )
     ).all()
     _LOGGER.debug("Selected %s event ids to remove", len(events))
     event_ids = set()
@@ -469,6 +577,52 @@ def _evict_purged_states_from_old_states_cache(
     for purged_state_id in purged_state_ids.intersection(old_state_reversed):
         old_states.pop(old_state_reversed[purged_state_id], None)
 
+    # Evict any purged state from the old state ids cache used by bulk inserts
+    old_state_ids = instance._old_state_ids  # pylint: disable=protected-access
+    for entity_id in [
+        entity_id
+        for entity_id, state_id in old_state_ids.items()
+        if state_id in purged_state_ids
+    ]:
+        del old_state_ids[entity_id]
+
+
+def _purge_unused_states_meta(instance: Recorder, session: Session) -> None:
+    """Delete the states_meta of entities that no longer have any states."""
+    unused_metadata_ids = {
+        metadata_id for metadata_id, _ in session.execute(find_unused_states_meta())
+    }
+    for metadata_ids_chunk in chunked(unused_metadata_ids, MAX_ROWS_TO_PURGE):
+        _purge_states_meta_ids(instance, session, set(metadata_ids_chunk))
+
+
+def _purge_states_meta_ids(
+    instance: Recorder, session: Session, metadata_ids: set[int]
+) -> None:
+    """Delete states_meta by metadata_id."""
+    deleted_rows = session.execute(delete_states_meta_rows(metadata_ids))
+    _LOGGER.debug("Deleted %s states_meta", deleted_rows)
+
+    # Evict any entries in the states_meta_ids cache referring to a purged entity
+    _evict_purged_states_meta_from_states_meta_cache(instance, metadata_ids)
+
+
+def _evict_purged_states_meta_from_states_meta_cache(
+    instance: Recorder, purged_metadata_ids: set[int]
+) -> None:
+    """Evict purged metadata ids from the states_meta ids cache."""
+    # Make a map from metadata_id to the entity_id
+    states_meta_ids = instance._states_meta_ids  # pylint: disable=protected-access
+    states_meta_ids_reversed = {
+        metadata_id: entity_id for entity_id, metadata_id in states_meta_ids.items()
+    }
+
+    # Evict any purged entity from the states_meta_ids cache
+    for purged_metadata_id in purged_metadata_ids.intersection(
+        states_meta_ids_reversed
+    ):
+        states_meta_ids.pop(states_meta_ids_reversed[purged_metadata_id], None)
+
 
 def _evict_purged_data_from_data_cache(
     instance: Recorder, purged_data_ids: set[int]
@@ -566,19 +720,27 @@ def _purge_old_recorder_runs(
     _LOGGER.debug("Deleted %s recorder_runs", deleted_rows)
 
 
+def _purge_old_purge_runs(session: Session, purge_run: PurgeRuns) -> None:
+    """Purge the purge runs that finished before the purge target."""
+    deleted_rows = session.execute(
+        delete_purge_runs_rows(purge_run.purge_before, purge_run.run_id)
+    )
+    _LOGGER.debug("Deleted %s purge_runs", deleted_rows)
+
+
 def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
     """Remove filtered states and events that shouldn't be in the database."""
     _LOGGER.debug("Cleanup filtered data")
     using_sqlite = instance.dialect_name == SupportedDialect.SQLITE
 
     # Check if excluded entity_ids are in database
-    excluded_entity_ids: list[str] = [
-        entity_id
-        for (entity_id,) in session.query(distinct(States.entity_id)).all()
+    excluded_metadata_ids: list[int] = [
+        metadata_id
+        for (metadata_id, entity_id) in session.execute(find_states_meta())
         if not instance.entity_filter(entity_id)
     ]
-    if len(excluded_entity_ids) > 0:
-        _purge_filtered_states(instance, session, excluded_entity_ids, using_sqlite)
+    if len(excluded_metadata_ids) > 0:
+        _purge_filtered_states(instance, session, excluded_metadata_ids, using_sqlite)
         return False
 
     # Check if excluded event_types are in database
@@ -597,21 +759,33 @@ def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
 def _purge_filtered_states(
     instance: Recorder,
     session: Session,
-    excluded_entity_ids: list[str],
+    excluded_metadata_ids: list[int],
     using_sqlite: bool,
 ) -> None:
-    """Remove filtered states and linked events."""
+    """Remove filtered states and linked events.
+
+    Once all the states of the entities are removed their
+    states_meta is removed as well.
+    """
     state_ids: list[int]
     attributes_ids: list[int]
     event_ids: list[int]
-    state_ids, attributes_ids, event_ids = zip(
-        *(
-            session.query(States.state_id, States.attributes_id, States.event_id)
-            .filter(States.entity_id.in_(excluded_entity_ids))
-            .limit(MAX_ROWS_TO_PURGE)
-            .all()
+    static_attributes_ids: list[int]
+    rows_to_purge = (
+        session.query(
+            States.state_id,
+            States.attributes_id,
+            States.event_id,
+            States.static_attributes_id,
         )
+        .filter(States.metadata_id.in_(excluded_metadata_ids))
+        .limit(MAX_ROWS_TO_PURGE)
+        .all()
     )
+    if not rows_to_purge:
+        _purge_states_meta_ids(instance, session, set(excluded_metadata_ids))
+        return
+    state_ids, attributes_ids, event_ids, static_attributes_ids = zip(*rows_to_purge)
     event_ids = [id_ for id_ in event_ids if id_ is not None]
     _LOGGER.debug(
         "Selected %s state_ids to remove that should be filtered", len(state_ids)
@@ -619,7 +793,9 @@ def _purge_filtered_states(
     _purge_state_ids(instance, session, set(state_ids))
     _purge_event_ids(session, event_ids)
     unused_attribute_ids_set = _select_unused_attributes_ids(
-        session, {id_ for id_ in attributes_ids if id_ is not None}, using_sqlite
+        session,
+        {id_ for id_ in (*attributes_ids, *static_attributes_ids) if id_ is not None},
+        using_sqlite,
     )
     _purge_batch_attributes_ids(instance, session, unused_attribute_ids_set)
 
@@ -652,7 +828,7 @@ def _purge_filtered_events(
         _purge_batch_data_ids(instance, session, unused_data_ids_set)
     if EVENT_STATE_CHANGED in excluded_event_types:
         session.query(StateAttributes).delete(synchronize_session=False)
-        instance._state_attributes_ids = {}  # pylint: disable=protected-access
+        instance._state_attributes_ids.clear()  # pylint: disable=protected-access
 
 
 @retryable_database_job("purge")
@@ -660,15 +836,19 @@ def purge_entity_data(instance: Recorder, entity_filter: Callable[[str], bool])
     """Purge states and events of specified entities."""
     using_sqlite = instance.dialect_name == SupportedDialect.SQLITE
     with session_scope(session=instance.get_session()) as session:
-        selected_entity_ids: list[str] = [
-            entity_id
-            for (entity_id,) in session.query(distinct(States.entity_id)).all()
+        selected_metadata_ids: dict[int, str] = {
+            metadata_id: entity_id
+            for (metadata_id, entity_id) in session.execute(find_states_meta())
             if entity_filter(entity_id)
-        ]
-        _LOGGER.debug("Purging entity data for %s", selected_entity_ids)
-        if len(selected_entity_ids) > 0:
+        }
+        _LOGGER.debug(
+            "Purging entity data for %s", list(selected_metadata_ids.values())
+        )
+        if len(selected_metadata_ids) > 0:
             # Purge a max of MAX_ROWS_TO_PURGE, based on the oldest states or events record
-            _purge_filtered_states(instance, session, selected_entity_ids, using_sqlite)
+            _purge_filtered_states(
+                instance, session, list(selected_metadata_ids), using_sqlite
+            )
             _LOGGER.debug("Purging entity data hasn't fully completed yet")
             return False
 
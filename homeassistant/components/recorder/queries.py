@@ -8,13 +8,15 @@ from sqlalchemy import delete, distinct, func, lambda_stmt, select, union_all, u
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 from sqlalchemy.sql.selectable import Select
 
-from .const import MAX_ROWS_TO_PURGE
+from .const import MAX_ROWS_TO_MIGRATE, MAX_ROWS_TO_PURGE
 from .models import (
     EventData,
     Events,
+    PurgeRuns,
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
     StatisticsRuns,
     StatisticsShortTerm,
 )
@@ -40,6 +42,49 @@ def find_shared_data_id(attr_hash: int, shared_data: str) -> StatementLambdaElem
     )
 
 
+def find_recent_shared_attributes(limit: int) -> StatementLambdaElement:
+    """Find the shared attributes of the most recent states."""
+    return lambda_stmt(
+        lambda: select(
+            StateAttributes.attributes_id, StateAttributes.shared_attrs
+        ).filter(
+            StateAttributes.attributes_id.in_(
+                select(
+                    select(States.attributes_id)
+                    .order_by(States.state_id.desc())
+                    .limit(limit)
+                    .subquery()
+                    .c.attributes_id
+                )
+            )
+        )
+    )
+
+
+def find_recent_shared_data(limit: int) -> StatementLambdaElement:
+    """Find the shared data of the most recent events."""
+    return lambda_stmt(
+        lambda: select(EventData.data_id, EventData.shared_data).filter(
+            EventData.data_id.in_(
+                select(
+                    select(Events.data_id)
+                    .order_by(Events.event_id.desc())
+                    .limit(limit)
+                    .subquery()
+                    .c.data_id
+                )
+            )
+        )
+    )
+
+
+def find_states_metadata_id(entity_id: str) -> StatementLambdaElement:
+    """Find a states_meta metadata_id by entity_id."""
+    return lambda_stmt(
+        lambda: select(StatesMeta.metadata_id).filter(StatesMeta.entity_id == entity_id)
+    )
+
+
 def _state_attrs_exist(attr: int | None) -> Select:
     """Check if a state attributes id exists in the states table."""
     return select(func.min(States.attributes_id)).where(States.attributes_id == attr)
@@ -56,6 +101,17 @@ def attributes_ids_exist_in_states_sqlite(
     )
 
 
+def static_attributes_ids_exist_in_states(
+    attributes_ids: Iterable[int],
+) -> StatementLambdaElement:
+    """Find attributes ids that are used as static attributes in the states table."""
+    return lambda_stmt(
+        lambda: select(distinct(States.static_attributes_id)).filter(
+            States.static_attributes_id.in_(attributes_ids)
+        )
+    )
+
+
 def attributes_ids_exist_in_states(
     attr1: int,
     attr2: int | None,
@@ -578,20 +634,69 @@ def delete_recorder_runs_rows(
     )
 
 
-def find_events_to_purge(purge_before: datetime) -> StatementLambdaElement:
+def find_unfinished_purge_run() -> StatementLambdaElement:
+    """Find the newest purge run that has not finished."""
+    return lambda_stmt(
+        lambda: select(PurgeRuns)
+        .filter(PurgeRuns.end.is_(None))
+        .order_by(PurgeRuns.run_id.desc())
+        .limit(1)
+    )
+
+
+def delete_purge_runs_rows(
+    purge_before: datetime, current_run_id: int
+) -> StatementLambdaElement:
+    """Delete purge_runs rows."""
+    return lambda_stmt(
+        lambda: delete(PurgeRuns)
+        .filter(PurgeRuns.end < purge_before)
+        .filter(PurgeRuns.run_id != current_run_id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def find_events_to_purge(purge_before: float) -> StatementLambdaElement:
     """Find events to purge."""
     return lambda_stmt(
         lambda: select(Events.event_id, Events.data_id)
-        .filter(Events.time_fired < purge_before)
+        .filter(Events.time_fired_ts < purge_before)
         .limit(MAX_ROWS_TO_PURGE)
     )
 
 
-def find_states_to_purge(purge_before: datetime) -> StatementLambdaElement:
+def find_states_meta() -> StatementLambdaElement:
+    """Find the metadata_id and entity_id of all states_meta rows."""
+    return lambda_stmt(lambda: select(StatesMeta.metadata_id, StatesMeta.entity_id))
+
+
+def find_unused_states_meta() -> StatementLambdaElement:
+    """Find the states_meta rows that are no longer used by any state."""
+    return lambda_stmt(
+        lambda: select(StatesMeta.metadata_id, StatesMeta.entity_id).filter(
+            ~select(States.state_id)
+            .filter(States.metadata_id == StatesMeta.metadata_id)
+            .exists()
+        )
+    )
+
+
+def delete_states_meta_rows(metadata_ids: Iterable[int]) -> StatementLambdaElement:
+    """Delete states_meta rows."""
+    return lambda_stmt(
+        lambda: delete(StatesMeta)
+        .where(StatesMeta.metadata_id.in_(metadata_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def find_states_to_purge(purge_before: float) -> StatementLambdaElement:
     """Find states to purge."""
     return lambda_stmt(
-        lambda: select(States.state_id, States.attributes_id)
-        .filter(States.last_updated < purge_before)
+        lambda: select(
+            States.state_id, States.attributes_id, States.static_attributes_id
+        )
+        .filter(States.last_updated_ts < purge_before)
         .limit(MAX_ROWS_TO_PURGE)
     )
 
@@ -624,7 +729,7 @@ def find_latest_statistics_runs_run_id() -> StatementLambdaElement:
 
 
 def find_legacy_event_state_and_attributes_and_data_ids_to_purge(
-    purge_before: datetime,
+    purge_before: float,
 ) -> StatementLambdaElement:
     """Find the latest row in the legacy format to purge."""
     return lambda_stmt(
@@ -632,7 +737,7 @@ def find_legacy_event_state_and_attributes_and_data_ids_to_purge(
             Events.event_id, Events.data_id, States.state_id, States.attributes_id
         )
         .join(States, Events.event_id == States.event_id)
-        .filter(Events.time_fired < purge_before)
+        .filter(Events.time_fired_ts < purge_before)
         .limit(MAX_ROWS_TO_PURGE)
     )
 
@@ -640,3 +745,105 @@ def find_legacy_event_state_and_attributes_and_data_ids_to_purge(
 def find_legacy_row() -> StatementLambdaElement:
     """Check if there are still states in the table with an event_id."""
     return lambda_stmt(lambda: select(func.max(States.event_id)))
+
+
+def find_max_state_id() -> StatementLambdaElement:
+    """Find the highest state_id."""
+    return lambda_stmt(lambda: select(func.max(States.state_id)))
+
+
+def find_states_inserted_after(state_id: int) -> StatementLambdaElement:
+    """Find the state_id and metadata_id of states inserted after state_id."""
+    return lambda_stmt(
+        lambda: select(States.state_id, States.metadata_id).filter(
+            States.state_id > state_id
+        )
+    )
+
+
+def find_max_states_meta_id() -> StatementLambdaElement:
+    """Find the highest states_meta metadata_id."""
+    return lambda_stmt(lambda: select(func.max(StatesMeta.metadata_id)))
+
+
+def find_states_meta_inserted_after(metadata_id: int) -> StatementLambdaElement:
+    """Find the metadata_id and entity_id of states_meta inserted after metadata_id."""
+    return lambda_stmt(
+        lambda: select(StatesMeta.metadata_id, StatesMeta.entity_id).filter(
+            StatesMeta.metadata_id > metadata_id
+        )
+    )
+
+
+def find_max_attributes_id() -> StatementLambdaElement:
+    """Find the highest attributes_id."""
+    return lambda_stmt(lambda: select(func.max(StateAttributes.attributes_id)))
+
+
+def find_state_attributes_inserted_after(
+    attributes_id: int,
+) -> StatementLambdaElement:
+    """Find the attributes_id and shared_attrs inserted after attributes_id."""
+    return lambda_stmt(
+        lambda: select(
+            StateAttributes.attributes_id, StateAttributes.shared_attrs
+        ).filter(StateAttributes.attributes_id > attributes_id)
+    )
+
+
+def find_max_data_id() -> StatementLambdaElement:
+    """Find the highest data_id."""
+    return lambda_stmt(lambda: select(func.max(EventData.data_id)))
+
+
+def find_event_data_inserted_after(data_id: int) -> StatementLambdaElement:
+    """Find the data_id and shared_data inserted after data_id."""
+    return lambda_stmt(
+        lambda: select(EventData.data_id, EventData.shared_data).filter(
+            EventData.data_id > data_id
+        )
+    )
+
+
+def find_events_context_ids_to_migrate() -> StatementLambdaElement:
+    """Find events that still have string context ids."""
+    return lambda_stmt(
+        lambda: select(
+            Events.event_id,
+            Events.time_fired_ts,
+            Events.context_id,
+            Events.context_user_id,
+            Events.context_parent_id,
+        )
+        .filter(Events.context_id_bin.is_(None))
+        .limit(MAX_ROWS_TO_MIGRATE)
+    )
+
+
+def find_states_context_ids_to_migrate() -> StatementLambdaElement:
+    """Find states that still have string context ids."""
+    return lambda_stmt(
+        lambda: select(
+            States.state_id,
+            States.last_updated_ts,
+            States.context_id,
+            States.context_user_id,
+            States.context_parent_id,
+        )
+        .filter(States.context_id_bin.is_(None))
+        .limit(MAX_ROWS_TO_MIGRATE)
+    )
+
+
+def has_events_context_ids_to_migrate() -> StatementLambdaElement:
+    """Check if there are events that still have string context ids."""
+    return lambda_stmt(
+        lambda: select(Events.event_id).filter(Events.context_id_bin.is_(None)).limit(1)
+    )
+
+
+def has_states_context_ids_to_migrate() -> StatementLambdaElement:
+    """Check if there are states that still have string context ids."""
+    return lambda_stmt(
+        lambda: select(States.state_id).filter(States.context_id_bin.is_(None)).limit(1)
+    )
@@ -54,7 +54,9 @@ def _async_register_purge_service(hass: HomeAssistant, instance: Recorder) -> No
         repack = cast(bool, kwargs[ATTR_REPACK])
         apply_filter = cast(bool, kwargs[ATTR_APPLY_FILTER])
         purge_before = dt_util.utcnow() - timedelta(days=keep_days)
-        instance.queue_task(PurgeTask(purge_before, repack, apply_filter))
+        instance.async_queue_task_after_spool(
+            PurgeTask(purge_before, repack, apply_filter)
+        )
 
     hass.services.async_register(
         DOMAIN, SERVICE_PURGE, async_handle_purge_service, schema=SERVICE_PURGE_SCHEMA
@@ -71,7 +73,7 @@ def _async_register_purge_entities_service(
         domains = service.data.get(ATTR_DOMAINS, [])
         entity_globs = service.data.get(ATTR_ENTITY_GLOBS, [])
         entity_filter = generate_filter(domains, list(entity_ids), [], [], entity_globs)
-        instance.queue_task(PurgeEntitiesTask(entity_filter))
+        instance.async_queue_task_after_spool(PurgeEntitiesTask(entity_filter))
 
     hass.services.async_register(
         DOMAIN,
@@ -0,0 +1,185 @@
+"""On-disk spool for events that arrive while the database is stalled."""
+from __future__ import annotations
+
+from collections.abc import Generator
+from contextlib import suppress
+import json
+import logging
+import os
+import threading
+from typing import Any
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Context, Event, EventOrigin, State
+from homeassistant.helpers.json import json_bytes
+import homeassistant.util.dt as dt_util
+from homeassistant.util.file import WriteError, write_utf8_file
+
+_LOGGER = logging.getLogger(__name__)
+
+SPOOL_FILE = "home-assistant_v2.spool"
+
+
+def _event_to_spool_dict(event: Event) -> dict[str, Any]:
+    """Convert an event to a dict that can be written to the spool."""
+    return {
+        "event_type": event.event_type,
+        "data": event.data,
+        "origin": event.origin.value,
+        "time_fired": event.time_fired,
+        "context": event.context.as_dict(),
+    }
+
+
+def _event_from_spool_dict(spooled: dict[str, Any]) -> Event:
+    """Convert a dict read from the spool back to an event."""
+    data = spooled["data"]
+    if spooled["event_type"] == EVENT_STATE_CHANGED:
+        data["old_state"] = State.from_dict(data.get("old_state"))
+        data["new_state"] = State.from_dict(data.get("new_state"))
+    context = spooled["context"]
+    return Event(
+        spooled["event_type"],
+        data,
+        EventOrigin(spooled["origin"]),
+        dt_util.parse_datetime(spooled["time_fired"]),
+        Context(
+            user_id=context["user_id"],
+            parent_id=context["parent_id"],
+            id=context["id"],
+        ),
+    )
+
+
+class EventSpool:
+    """Append-only JSON lines spool of events.
+
+    Events are added from the event loop and kept in memory until
+    flush writes them to disk from an executor. The recorder thread
+    replays the spool once the database has caught up.
+
+    The offset of the events committed during a replay is kept in a
+    second file, so a replay interrupted by a crash resumes after them.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the spool."""
+        self.path = path
+        self.offset_path = f"{path}.offset"
+        self._pending: list[Event] = []
+        self._pending_lock = threading.Lock()
+        self._file_lock = threading.RLock()
+        self._replayed_offset = 0
+        self._replay_done = False
+
+    def add(self, event: Event) -> None:
+        """Add an event to the spool."""
+        with self._pending_lock:
+            self._pending.append(event)
+
+    def _take_pending(self) -> list[Event]:
+        """Take the events that have not been written to disk yet."""
+        with self._pending_lock:
+            pending = self._pending
+            self._pending = []
+        return pending
+
+    def _read_committed_offset(self) -> int:
+        """Return the offset of the events already committed by a replay."""
+        try:
+            with open(self.offset_path, encoding="utf8") as offset_file:
+                return int(offset_file.read())
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Replaying the whole recorder spool: %s", err)
+            return 0
+
+    def has_events(self) -> bool:
+        """Return if there are any spooled events."""
+        with self._pending_lock:
+            if self._pending:
+                return True
+        with self._file_lock:
+            return (
+                os.path.exists(self.path)
+                and os.path.getsize(self.path) > self._read_committed_offset()
+            )
+
+    def flush(self) -> None:
+        """Write the pending events to disk."""
+        with self._file_lock:
+            if not (pending := self._take_pending()):
+                return
+            lines: list[bytes] = []
+            for event in pending:
+                try:
+                    lines.append(json_bytes(_event_to_spool_dict(event)))
+                except (TypeError, ValueError) as err:
+                    _LOGGER.warning(
+                        "Event is not JSON serializable and will not be spooled: %s: %s",
+                        event,
+                        err,
+                    )
+            if not lines:
+                return
+            if not os.path.exists(self.path) and os.path.exists(self.offset_path):
+                # Left behind by a crash after the spool was removed
+                os.unlink(self.offset_path)
+            with open(self.path, "ab") as spool_file:
+                spool_file.write(b"\n".join(lines) + b"\n")
+                spool_file.flush()
+                os.fsync(spool_file.fileno())
+
+    def replay(self, include_pending: bool = False) -> Generator[Event, None, None]:
+        """Yield the spooled events in the order they were added.
+
+        Events committed by an earlier replay are skipped. Call commit
+        each time the yielded events have been committed to the database.
+        Events not written to disk yet are only yielded with include_pending,
+        which must only be set once no more events are being spooled.
+        """
+        with self._file_lock:
+            self._replay_done = False
+            offset = self._read_committed_offset()
+            if os.path.exists(self.path) and offset > os.path.getsize(self.path):
+                offset = 0
+            self._replayed_offset = offset
+            if os.path.exists(self.path):
+                with open(self.path, "rb") as spool_file:
+                    spool_file.seek(offset)
+                    for line in spool_file:
+                        self._replayed_offset = offset = offset + len(line)
+                        if not line.strip():
+                            continue
+                        try:
+                            event = _event_from_spool_dict(json.loads(line))
+                        except (ValueError, KeyError, TypeError) as err:
+                            _LOGGER.warning(
+                                "Skipping corrupt event in recorder spool: %s", err
+                            )
+                            continue
+                        yield event
+            if include_pending:
+                yield from self._take_pending()
+            self._replay_done = True
+
+    def commit(self) -> None:
+        """Remember that the events replayed so far are in the database.
+
+        The spool is removed once a finished replay has been committed.
+        """
+        with self._file_lock:
+            if not os.path.exists(self.path):
+                return
+            if self._replay_done and self._replayed_offset >= os.path.getsize(
+                self.path
+            ):
+                os.unlink(self.path)
+                with suppress(FileNotFoundError):
+                    os.unlink(self.offset_path)
+                self._replayed_offset = 0
+                return
+            # Failing to save the offset only means events are replayed again
+            with suppress(WriteError):
+                write_utf8_file(self.offset_path, str(self._replayed_offset))
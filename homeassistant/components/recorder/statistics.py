@@ -1,7 +1,7 @@
 """Statistics helper."""
 from __future__ import annotations
 
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from collections.abc import Callable, Iterable
 import contextlib
 import dataclasses
@@ -11,7 +11,8 @@ import json
 import logging
 import os
 import re
-from statistics import mean
+from statistics import fmean
+import threading
 from typing import TYPE_CHECKING, Any, Literal, overload
 
 from sqlalchemy import bindparam, func, lambda_stmt, select
@@ -46,7 +47,9 @@ from .models import (
     StatisticMetaData,
     StatisticResult,
     Statistics,
+    StatisticsDaily,
     StatisticsMeta,
+    StatisticsMonthly,
     StatisticsRuns,
     StatisticsShortTerm,
     process_timestamp,
@@ -84,6 +87,28 @@ QUERY_STATISTICS_SHORT_TERM = [
     StatisticsShortTerm.sum,
 ]
 
+QUERY_STATISTICS_DAILY = [
+    StatisticsDaily.metadata_id,
+    StatisticsDaily.start,
+    StatisticsDaily.mean,
+    StatisticsDaily.min,
+    StatisticsDaily.max,
+    StatisticsDaily.last_reset,
+    StatisticsDaily.state,
+    StatisticsDaily.sum,
+]
+
+QUERY_STATISTICS_MONTHLY = [
+    StatisticsMonthly.metadata_id,
+    StatisticsMonthly.start,
+    StatisticsMonthly.mean,
+    StatisticsMonthly.min,
+    StatisticsMonthly.max,
+    StatisticsMonthly.last_reset,
+    StatisticsMonthly.state,
+    StatisticsMonthly.sum,
+]
+
 QUERY_STATISTICS_SUMMARY_MEAN = [
     StatisticsShortTerm.metadata_id,
     func.avg(StatisticsShortTerm.mean),
@@ -105,6 +130,27 @@ QUERY_STATISTICS_SUMMARY_SUM = [
     .label("rownum"),
 ]
 
+QUERY_STATISTICS_ROLLUP_MEAN = [
+    Statistics.metadata_id,
+    func.avg(Statistics.mean),
+    func.min(Statistics.min),
+    func.max(Statistics.max),
+    func.count(Statistics.mean),
+]
+
+QUERY_STATISTICS_ROLLUP_SUM = [
+    Statistics.metadata_id,
+    Statistics.last_reset,
+    Statistics.state,
+    Statistics.sum,
+    func.row_number()
+    .over(
+        partition_by=Statistics.metadata_id,
+        order_by=Statistics.start.desc(),
+    )
+    .label("rownum"),
+]
+
 QUERY_STATISTICS_SUMMARY_SUM_LEGACY = [
     StatisticsShortTerm.metadata_id,
     StatisticsShortTerm.last_reset,
@@ -159,6 +205,11 @@ DISPLAY_UNIT_TO_STATISTIC_UNIT_CONVERSIONS: dict[
     ),
 }
 
+# Bounds for the cache of statistics_during_period results, the number of rows
+# is the total number of statistics in all cached results
+STATISTICS_QUERY_CACHE_MAX_ENTRIES = 64
+STATISTICS_QUERY_CACHE_MAX_ROWS = 100000
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -170,6 +221,119 @@ class PlatformCompiledStatistics:
     current_metadata: dict[str, tuple[int, StatisticMetaData]]
 
 
+@dataclasses.dataclass
+class _StatisticsQueryCacheEntry:
+    """A cached statistics_during_period result."""
+
+    statistic_ids: frozenset[str] | None
+    end_time: datetime | None
+    rows: int
+    result: dict[str, list[dict[str, Any]]]
+
+
+class StatisticsQueryCache:
+    """Cache of statistics_during_period results.
+
+    Results are cached per statistic_ids, period, start, end, time zone and unit
+    system.
+    Writes to the statistics tables invalidate the results which include the
+    written statistic_ids and end after the written start. Results are only
+    added if nothing was invalidated while they were queried, since the query
+    may have read the rows from before the write.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = STATISTICS_QUERY_CACHE_MAX_ENTRIES,
+        max_rows: int = STATISTICS_QUERY_CACHE_MAX_ROWS,
+    ) -> None:
+        """Initialize the cache."""
+        self._entries: OrderedDict[tuple, _StatisticsQueryCacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self._max_rows = max_rows
+        self._rows = 0
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached results."""
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float | None:
+        """Return the fraction of lookups which were answered from the cache."""
+        if not (lookups := self.hits + self.misses):
+            return None
+        return self.hits / lookups
+
+    def get(self, key: tuple) -> dict[str, list[dict[str, Any]]] | None:
+        """Return a cached result and mark it as recently used."""
+        with self._lock:
+            if (entry := self._entries.get(key)) is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry.result
+
+    def add(
+        self,
+        key: tuple,
+        generation: int,
+        statistic_ids: list[str] | None,
+        end_time: datetime | None,
+        result: dict[str, list[dict[str, Any]]],
+    ) -> None:
+        """Add a result which was queried when the cache had generation."""
+        rows = sum(len(stats) for stats in result.values())
+        if rows > self._max_rows:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            if (old_entry := self._entries.pop(key, None)) is not None:
+                self._rows -= old_entry.rows
+            self._entries[key] = _StatisticsQueryCacheEntry(
+                None if statistic_ids is None else frozenset(statistic_ids),
+                end_time,
+                rows,
+                result,
+            )
+            self._rows += rows
+            while len(self._entries) > self._max_entries or self._rows > self._max_rows:
+                _, old_entry = self._entries.popitem(last=False)
+                self._rows -= old_entry.rows
+
+    def invalidate(
+        self, statistic_ids: Iterable[str] | None, start: datetime | None
+    ) -> None:
+        """Invalidate the results affected by a write to the statistics tables.
+
+        statistic_ids is None when any statistic may have been written, and
+        start is None when statistics of any time may have been written.
+        """
+        ids = None if statistic_ids is None else set(statistic_ids)
+        with self._lock:
+            self.generation += 1
+            for key, entry in list(self._entries.items()):
+                if (
+                    ids is not None
+                    and entry.statistic_ids is not None
+                    and ids.isdisjoint(entry.statistic_ids)
+                ):
+                    continue
+                if (
+                    start is not None
+                    and entry.end_time is not None
+                    and entry.end_time <= start
+                ):
+                    continue
+                del self._entries[key]
+                self._rows -= entry.rows
+
+
 def split_statistic_id(entity_id: str) -> list[str]:
     """Split a state entity ID into domain and object ID."""
     return entity_id.split(":", 1)
@@ -507,7 +671,7 @@ def compile_hourly_statistics(
     end_time = start_time + timedelta(hours=1)
 
     # Compute last hour's average, min, max
-    summary: dict[str, StatisticData] = {}
+    summary: dict[int, StatisticData] = {}
     stmt = _compile_hourly_statistics_summary_mean_stmt(start_time, end_time)
     stats = execute_stmt_lambda_element(session, stmt)
 
@@ -558,6 +722,196 @@ def compile_hourly_statistics(
     for metadata_id, stat in summary.items():
         session.add(Statistics.from_stats(metadata_id, stat))
 
+    # Update the daily and monthly rollups of the compiled hour, the daily
+    # rollup is compiled again while the monthly rollup is only updated
+    session.flush()
+    _compile_statistics_rollup(
+        session, StatisticsDaily, *_local_day_start_end(start_time)
+    )
+    _update_monthly_statistics_rollups(session, start_time, summary)
+
+
+def _update_monthly_statistics_rollups(
+    session: Session, start_time: datetime, summary: dict[int, StatisticData]
+) -> None:
+    """Update the monthly rollups with the hourly statistics compiled for an hour.
+
+    When the compiled hour is the last hour of the month with statistics, the
+    sum is taken from it and its mean is added to the running mean of the month.
+    Months without a rollup, or with statistics after the compiled hour, are
+    compiled again.
+    """
+    if not summary:
+        return
+    month_start, month_end = month_start_end(start_time)
+    metadata_ids = list(summary)
+    rollups: dict[int, StatisticsMonthly] = {
+        rollup.metadata_id: rollup
+        for rollup in session.query(StatisticsMonthly)
+        .filter(StatisticsMonthly.start == month_start)
+        .filter(StatisticsMonthly.metadata_id.in_(metadata_ids))
+    }
+    # An earlier hour compiled again must not be merged into the rollup
+    # after the hours that follow it
+    later: set[int] = {
+        metadata_id
+        for (metadata_id,) in session.query(Statistics.metadata_id)
+        .filter(Statistics.metadata_id.in_(metadata_ids))
+        .filter(Statistics.start > start_time)
+        .filter(Statistics.start < month_end)
+        .distinct()
+    }
+    recompile: list[int] = []
+    for metadata_id, stat in summary.items():
+        if (rollup := rollups.get(metadata_id)) is None or metadata_id in later:
+            recompile.append(metadata_id)
+            continue
+        if (_mean := stat.get("mean")) is not None:
+            if not rollup.mean_count:
+                rollup.mean, rollup.mean_count = _mean, 1
+            else:
+                rollup.mean = (rollup.mean * rollup.mean_count + _mean) / (
+                    rollup.mean_count + 1
+                )
+                rollup.mean_count += 1
+        if (_min := stat.get("min")) is not None:
+            rollup.min = _min if rollup.min is None else min(rollup.min, _min)
+        if (_max := stat.get("max")) is not None:
+            rollup.max = _max if rollup.max is None else max(rollup.max, _max)
+        rollup.last_reset = stat.get("last_reset")
+        rollup.state = stat.get("state")
+        rollup.sum = stat.get("sum")
+    if recompile:
+        _compile_statistics_rollup(
+            session, StatisticsMonthly, month_start, month_end, recompile
+        )
+
+
+def _compile_statistics_rollup(
+    session: Session,
+    table: type[StatisticsDaily | StatisticsMonthly],
+    start_time: datetime,
+    end_time: datetime,
+    metadata_ids: Iterable[int] | None = None,
+) -> None:
+    """Compile a daily or monthly rollup of the hourly statistics.
+
+    Any rollup already stored for the period is replaced. Like the hourly
+    statistics, average, min and max are computed by a database query and the
+    sum is taken from the last hourly entry during the period.
+    """
+    delete_query = (
+        session.query(table)
+        .filter(table.start >= start_time)
+        .filter(table.start < end_time)
+    )
+    mean_query = (
+        session.query(*QUERY_STATISTICS_ROLLUP_MEAN)
+        .filter(Statistics.start >= start_time)
+        .filter(Statistics.start < end_time)
+    )
+    sum_query = (
+        session.query(*QUERY_STATISTICS_ROLLUP_SUM)
+        .filter(Statistics.start >= start_time)
+        .filter(Statistics.start < end_time)
+    )
+    if metadata_ids is not None:
+        metadata_ids = list(metadata_ids)
+        delete_query = delete_query.filter(table.metadata_id.in_(metadata_ids))
+        mean_query = mean_query.filter(Statistics.metadata_id.in_(metadata_ids))
+        sum_query = sum_query.filter(Statistics.metadata_id.in_(metadata_ids))
+    delete_query.delete(synchronize_session=False)
+
+    summary: dict[int, StatisticData] = {}
+    mean_counts: dict[int, int] = {}
+    for stat in execute(mean_query.group_by(Statistics.metadata_id)):
+        _metadata_id, _mean, _min, _max, mean_counts[_metadata_id] = stat
+        summary[_metadata_id] = {
+            "start": start_time,
+            "mean": _mean,
+            "min": _min,
+            "max": _max,
+        }
+
+    subquery = sum_query.subquery()
+    for stat in execute(session.query(subquery).filter(subquery.c.rownum == 1)):
+        _metadata_id, last_reset, state, _sum, _ = stat
+        summary[_metadata_id].update(
+            {
+                "last_reset": process_timestamp(last_reset),
+                "state": state,
+                "sum": _sum,
+            }
+        )
+
+    for _metadata_id, stat in summary.items():
+        rollup = table.from_stats(_metadata_id, stat)
+        if table == StatisticsMonthly:
+            rollup.mean_count = mean_counts[_metadata_id]
+        session.add(rollup)
+
+
+def _compile_statistics_rollups_for_periods(
+    session: Session, starts: Iterable[datetime], metadata_id: int | None = None
+) -> None:
+    """Recompile the daily and monthly rollups of the periods containing starts."""
+    # The rollups are computed from the hourly statistics added in this session
+    session.flush()
+    days = {_local_day_start_end(start) for start in starts}
+    months = {month_start_end(start) for start, _ in days}
+    metadata_ids = None if metadata_id is None else (metadata_id,)
+    for start_time, end_time in sorted(days):
+        _compile_statistics_rollup(
+            session, StatisticsDaily, start_time, end_time, metadata_ids
+        )
+    for start_time, end_time in sorted(months):
+        _compile_statistics_rollup(
+            session, StatisticsMonthly, start_time, end_time, metadata_ids
+        )
+
+
+def compile_statistics_rollups(session: Session) -> None:
+    """Compile the daily and monthly rollups of all hourly statistics.
+
+    The rollups are aligned to days and months in the configured time zone,
+    this is used to create them during migration and after the time zone
+    has been changed.
+    """
+    session.query(StatisticsDaily).delete(synchronize_session=False)
+    session.query(StatisticsMonthly).delete(synchronize_session=False)
+    first_start, last_start = session.query(
+        func.min(Statistics.start), func.max(Statistics.start)
+    ).one()
+    if first_start is None:
+        return
+    first_start = process_timestamp(first_start)
+    last_start = process_timestamp(last_start)
+    for table, period_start_end in (
+        (StatisticsDaily, _local_day_start_end),
+        (StatisticsMonthly, month_start_end),
+    ):
+        start_time, end_time = period_start_end(first_start)
+        while start_time <= last_start:
+            _compile_statistics_rollup(session, table, start_time, end_time)
+            start_time, end_time = period_start_end(end_time)
+
+
+def statistics_rollups_need_rebuild(session: Session) -> bool:
+    """Return True if the rollups were compiled for another time zone."""
+    if (start := session.query(func.max(StatisticsDaily.start)).scalar()) is None:
+        return False
+    start = process_timestamp(start)
+    return bool(day_start_end(start)[0] != start)
+
+
+@retryable_database_job("rebuild statistics rollups")
+def rebuild_statistics_rollups(instance: Recorder) -> bool:
+    """Process a rebuild statistics rollups job."""
+    with session_scope(session=instance.get_session()) as session:
+        compile_statistics_rollups(session)
+    instance.statistics_query_cache.invalidate(None, None)
+    return True
+
 
 @retryable_database_job("statistics")
 def compile_statistics(instance: Recorder, start: datetime) -> bool:
@@ -616,12 +970,20 @@ def compile_statistics(instance: Recorder, start: datetime) -> bool:
 
         session.add(StatisticsRuns(start=start))
 
+    if start.minute == 55:
+        # The hour may also be compiled for statistics no longer reported
+        instance.statistics_query_cache.invalidate(None, start.replace(minute=0))
+    elif platform_stats:
+        instance.statistics_query_cache.invalidate(
+            (stats["meta"]["statistic_id"] for stats in platform_stats), start
+        )
+
     return True
 
 
 def _adjust_sum_statistics(
     session: Session,
-    table: type[Statistics | StatisticsShortTerm],
+    table: type[Statistics | StatisticsShortTerm | StatisticsDaily | StatisticsMonthly],
     metadata_id: int,
     start_time: datetime,
     adj: float,
@@ -751,7 +1113,7 @@ def get_metadata(
     statistic_source: str | None = None,
 ) -> dict[str, tuple[int, StatisticMetaData]]:
     """Return metadata for statistic_ids."""
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         return get_metadata_with_session(
             hass,
             session,
@@ -790,6 +1152,7 @@ def clear_statistics(instance: Recorder, statistic_ids: list[str]) -> None:
         session.query(StatisticsMeta).filter(
             StatisticsMeta.statistic_id.in_(statistic_ids)
         ).delete(synchronize_session=False)
+    instance.statistics_query_cache.invalidate(statistic_ids, None)
 
 
 def update_statistics_metadata(
@@ -813,6 +1176,10 @@ def update_statistics_metadata(
                 (StatisticsMeta.statistic_id == statistic_id)
                 & (StatisticsMeta.source == DOMAIN)
             ).update({StatisticsMeta.statistic_id: new_statistic_id})
+    statistic_ids = [statistic_id]
+    if isinstance(new_statistic_id, str):
+        statistic_ids.append(new_statistic_id)
+    instance.statistics_query_cache.invalidate(statistic_ids, None)
 
 
 def list_statistic_ids(
@@ -830,7 +1197,7 @@ def list_statistic_ids(
     result = {}
 
     # Query the database
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         metadata = get_metadata_with_session(
             hass, session, statistic_type=statistic_type, statistic_ids=statistic_ids
         )
@@ -884,51 +1251,96 @@ def list_statistic_ids(
 
 
 def _reduce_statistics(
-    stats: dict[str, list[dict[str, Any]]],
+    hass: HomeAssistant,
+    session: Session,
+    stats: list[Row],
+    statistic_ids: list[str] | None,
+    _metadata: dict[str, tuple[int, StatisticMetaData]],
+    start_time: datetime | None,
     same_period: Callable[[datetime, datetime], bool],
     period_start_end: Callable[[datetime], tuple[datetime, datetime]],
-    period: timedelta,
+    min_period: timedelta,
 ) -> dict[str, list[dict[str, Any]]]:
-    """Reduce hourly statistics to daily or monthly statistics."""
-    result: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    for statistic_id, stat_list in stats.items():
+    """Reduce hourly statistics to daily or monthly statistics.
+
+    The rows are reduced as they are read, so a dict is only created per period
+    and not per hourly statistic. Rows less than min_period after the start of
+    the period are known to be in it without converting them to local time.
+    """
+    result: dict = defaultdict(list)
+    units = hass.config.units
+    metadata = dict(_metadata.values())
+
+    # Set all statistic IDs to empty lists in result set to maintain the order
+    if statistic_ids is not None:
+        for stat_id in statistic_ids:
+            result[stat_id] = []
+
+    stats_at_start_time = _statistics_at_start_time(
+        session, stats, Statistics, start_time
+    )
+
+    for meta_id, group in groupby(stats, lambda stat: stat.metadata_id):  # type: ignore[no-any-return]
+        unit = metadata[meta_id]["unit_of_measurement"]
+        statistic_id = metadata[meta_id]["statistic_id"]
+        convert: Callable[[Any, Any], float | None]
+        convert = STATISTIC_UNIT_TO_DISPLAY_UNIT_CONVERSIONS.get(unit, lambda x, units: x)  # type: ignore[arg-type,no-any-return]
+        ent_results = result[meta_id]
         max_values: list[float] = []
         mean_values: list[float] = []
         min_values: list[float] = []
-        prev_stat: dict[str, Any] = stat_list[0]
-
-        # Loop over the hourly statistics + a fake entry to end the period
-        for statistic in chain(
-            stat_list, ({"start": stat_list[-1]["start"] + period},)
-        ):
-            if not same_period(prev_stat["start"], statistic["start"]):
-                start, end = period_start_end(prev_stat["start"])
+        same_period_before: datetime | None = None
+        prev_start: datetime | None = None
+        prev_stat: Row | None = None
+
+        # Loop over the hourly statistics + a fake entry to end the last period
+        for db_state in chain(stats_at_start_time.get(meta_id, ()), group, (None,)):
+            start = None if db_state is None else process_timestamp(db_state.start)
+            if prev_stat is not None and (
+                start is None
+                or (
+                    start >= same_period_before  # type: ignore[operator]
+                    and not same_period(prev_start, start)  # type: ignore[arg-type]
+                )
+            ):
+                period_start, period_end = period_start_end(prev_start)  # type: ignore[arg-type]
                 # The previous statistic was the last entry of the period
-                result[statistic_id].append(
+                ent_results.append(
                     {
                         "statistic_id": statistic_id,
-                        "start": start.isoformat(),
-                        "end": end.isoformat(),
-                        "mean": mean(mean_values) if mean_values else None,
-                        "min": min(min_values) if min_values else None,
-                        "max": max(max_values) if max_values else None,
-                        "last_reset": prev_stat.get("last_reset"),
-                        "state": prev_stat.get("state"),
-                        "sum": prev_stat["sum"],
+                        "start": period_start.isoformat(),
+                        "end": period_end.isoformat(),
+                        "mean": convert(fmean(mean_values), units)
+                        if mean_values
+                        else None,
+                        "min": convert(min(min_values), units) if min_values else None,
+                        "max": convert(max(max_values), units) if max_values else None,
+                        "last_reset": process_timestamp_to_utc_isoformat(
+                            prev_stat.last_reset
+                        ),
+                        "state": convert(prev_stat.state, units),
+                        "sum": convert(prev_stat.sum, units),
                     }
                 )
                 max_values = []
                 mean_values = []
                 min_values = []
-            if statistic.get("max") is not None:
-                max_values.append(statistic["max"])
-            if statistic.get("mean") is not None:
-                mean_values.append(statistic["mean"])
-            if statistic.get("min") is not None:
-                min_values.append(statistic["min"])
-            prev_stat = statistic
+                same_period_before = None
+            if db_state is None:
+                break
+            if same_period_before is None:
+                same_period_before = period_start_end(start)[0] + min_period  # type: ignore[arg-type]
+            if (value := db_state.max) is not None:
+                max_values.append(value)
+            if (value := db_state.mean) is not None:
+                mean_values.append(value)
+            if (value := db_state.min) is not None:
+                min_values.append(value)
+            prev_start = start
+            prev_stat = db_state
 
-    return result
+    # Filter out the empty lists if some states had 0 results.
+    return {metadata[key]["statistic_id"]: val for key, val in result.items() if val}
 
 
 def same_day(time1: datetime, time2: datetime) -> bool:
@@ -947,12 +1359,40 @@ def day_start_end(time: datetime) -> tuple[datetime, datetime]:
     return (start, end)
 
 
+def _local_day_start_end(time: datetime) -> tuple[datetime, datetime]:
+    """Return the start and end of the day time is within.
+
+    Unlike day_start_end, the end is the start of the next day also when the
+    day is shorter or longer than 24 hours because of DST.
+    """
+    date = dt_util.as_local(time).date()
+    start = dt_util.as_utc(dt_util.start_of_local_day(date))
+    end = dt_util.as_utc(dt_util.start_of_local_day(date + timedelta(days=1)))
+    return (start, end)
+
+
 def _reduce_statistics_per_day(
-    stats: dict[str, list[dict[str, Any]]]
+    hass: HomeAssistant,
+    session: Session,
+    stats: list[Row],
+    statistic_ids: list[str] | None,
+    metadata: dict[str, tuple[int, StatisticMetaData]],
+    start_time: datetime | None,
 ) -> dict[str, list[dict[str, Any]]]:
     """Reduce hourly statistics to daily statistics."""
 
-    return _reduce_statistics(stats, same_day, day_start_end, timedelta(days=1))
+    return _reduce_statistics(
+        hass,
+        session,
+        stats,
+        statistic_ids,
+        metadata,
+        start_time,
+        same_day,
+        day_start_end,
+        # The shortest day is 23 hours, when DST starts
+        timedelta(hours=23),
+    )
 
 
 def same_month(time1: datetime, time2: datetime) -> bool:
@@ -974,11 +1414,27 @@ def month_start_end(time: datetime) -> tuple[datetime, datetime]:
 
 
 def _reduce_statistics_per_month(
-    stats: dict[str, list[dict[str, Any]]],
+    hass: HomeAssistant,
+    session: Session,
+    stats: list[Row],
+    statistic_ids: list[str] | None,
+    metadata: dict[str, tuple[int, StatisticMetaData]],
+    start_time: datetime | None,
 ) -> dict[str, list[dict[str, Any]]]:
     """Reduce hourly statistics to monthly statistics."""
 
-    return _reduce_statistics(stats, same_month, month_start_end, timedelta(days=31))
+    return _reduce_statistics(
+        hass,
+        session,
+        stats,
+        statistic_ids,
+        metadata,
+        start_time,
+        same_month,
+        month_start_end,
+        # The shortest month is February, which may start DST
+        timedelta(days=28) - timedelta(hours=1),
+    )
 
 
 def _statistics_during_period_stmt(
@@ -986,7 +1442,7 @@ def _statistics_during_period_stmt(
     end_time: datetime | None,
     statistic_ids: list[str] | None,
     metadata_ids: list[int] | None,
-    table: type[Statistics | StatisticsShortTerm],
+    table: type[Statistics | StatisticsShortTerm | StatisticsDaily | StatisticsMonthly],
 ) -> StatementLambdaElement:
     """Prepare a database query for statistics during a given period.
 
@@ -994,6 +1450,10 @@ def _statistics_during_period_stmt(
     """
     if table == StatisticsShortTerm:
         stmt = lambda_stmt(lambda: select(*QUERY_STATISTICS_SHORT_TERM))
+    elif table == StatisticsDaily:
+        stmt = lambda_stmt(lambda: select(*QUERY_STATISTICS_DAILY))
+    elif table == StatisticsMonthly:
+        stmt = lambda_stmt(lambda: select(*QUERY_STATISTICS_MONTHLY))
     else:
         stmt = lambda_stmt(lambda: select(*QUERY_STATISTICS))
 
@@ -1009,6 +1469,117 @@ def _statistics_during_period_stmt(
     return stmt
 
 
+def _rollup_statistics_at_start_time(
+    session: Session, stats: Iterable[Row], start_time: datetime
+) -> dict[int, tuple[Row]]:
+    """Return the last known hourly statistics for ids without data at start_time.
+
+    This matches what _statistics_at_start_time finds for the hourly statistics
+    the rollups were compiled from.
+    """
+    metadata_ids = {stat.metadata_id for stat in stats}
+    query = (
+        session.query(Statistics.metadata_id)
+        .filter(Statistics.start == dt_util.as_utc(start_time))
+        .filter(Statistics.metadata_id.in_(metadata_ids))
+    )
+    metadata_ids.difference_update(stat.metadata_id for stat in execute(query))
+    if not metadata_ids:
+        return {}
+    stats_at_start_time = {}
+    if tmp := _statistics_at_time(session, metadata_ids, Statistics, start_time):
+        for stat in tmp:
+            stats_at_start_time[stat.metadata_id] = (stat,)
+    return stats_at_start_time
+
+
+def _statistics_during_period_from_rollups(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    statistic_ids: list[str] | None,
+    metadata_ids: list[int] | None,
+    _metadata: dict[str, tuple[int, StatisticMetaData]],
+    period: Literal["day", "month"],
+) -> dict[str, list[dict[str, Any]]] | None:
+    """Return daily or monthly statistics from the rollup tables.
+
+    Returns None if the rollups can't be used, because the requested period does
+    not start and end at the start of a day or month, or because the rollups
+    were compiled for another time zone and have not been rebuilt yet.
+    """
+    table: type[StatisticsDaily | StatisticsMonthly]
+    if period == "day":
+        table, period_start_end = StatisticsDaily, day_start_end
+    else:
+        table, period_start_end = StatisticsMonthly, month_start_end
+
+    if period_start_end(start_time)[0] != start_time or (
+        end_time is not None and period_start_end(end_time)[0] != end_time
+    ):
+        return None
+
+    stmt = _statistics_during_period_stmt(
+        start_time, end_time, statistic_ids, metadata_ids, table
+    )
+    stats = execute_stmt_lambda_element(session, stmt)
+    if not stats:
+        return None
+
+    periods: list[tuple[datetime, datetime]] = []
+    for stat in stats:
+        start = process_timestamp(stat.start)
+        periods.append(start_end := period_start_end(start))
+        if start_end[0] != start:
+            return None
+
+    result: dict = defaultdict(list)
+    units = hass.config.units
+    metadata = dict(_metadata.values())
+
+    # Set all statistic IDs to empty lists in result set to maintain the order
+    if statistic_ids is not None:
+        for stat_id in statistic_ids:
+            result[stat_id] = []
+
+    stats_at_start_time = _rollup_statistics_at_start_time(session, stats, start_time)
+
+    periods_iter = iter(periods)
+    for meta_id, group in groupby(stats, lambda stat: stat.metadata_id):  # type: ignore[no-any-return]
+        unit = metadata[meta_id]["unit_of_measurement"]
+        statistic_id = metadata[meta_id]["statistic_id"]
+        convert: Callable[[Any, Any], float | None]
+        convert = STATISTIC_UNIT_TO_DISPLAY_UNIT_CONVERSIONS.get(unit, lambda x, units: x)  # type: ignore[arg-type,no-any-return]
+        ent_results = result[meta_id]
+        # A statistic from before start_time is reported as its own period
+        for db_state, (period_start, period_end) in chain(
+            (
+                (db_state, period_start_end(process_timestamp(db_state.start)))
+                for db_state in stats_at_start_time.get(meta_id, ())
+            ),
+            zip(group, periods_iter),
+        ):
+            ent_results.append(
+                {
+                    "statistic_id": statistic_id,
+                    "start": period_start.isoformat(),
+                    "end": period_end.isoformat(),
+                    "mean": convert(db_state.mean, units),
+                    "min": convert(db_state.min, units),
+                    "max": convert(db_state.max, units),
+                    "last_reset": process_timestamp_to_utc_isoformat(
+                        db_state.last_reset
+                    ),
+                    "state": convert(db_state.state, units),
+                    "sum": convert(db_state.sum, units),
+                }
+            )
+
+    # Filter out the empty lists if some states had 0 results.
+    return {metadata[key]["statistic_id"]: val for key, val in result.items() if val}
+
+
 def statistics_during_period(
     hass: HomeAssistant,
     start_time: datetime,
@@ -1021,9 +1592,44 @@ def statistics_during_period(
 
     If end_time is omitted, returns statistics newer than or equal to start_time.
     If statistic_ids is omitted, returns statistics for all statistics ids.
+    Daily and monthly statistics are read from the rollup tables when the period
+    starts and ends at the start of a day or month, else they are reduced from
+    the hourly statistics.
+
+    Results are cached until the statistics they include are written, the
+    returned dict is shared with other callers and must not be modified.
     """
+    cache: StatisticsQueryCache = hass.data[DATA_INSTANCE].statistics_query_cache
+    key = (
+        None if statistic_ids is None else tuple(statistic_ids),
+        period,
+        start_time,
+        end_time,
+        dt_util.DEFAULT_TIME_ZONE,
+        hass.config.units.name,
+        start_time_as_datetime,
+    )
+    if (result := cache.get(key)) is not None:
+        return result
+    generation = cache.generation
+    result = _statistics_during_period(
+        hass, start_time, end_time, statistic_ids, period, start_time_as_datetime
+    )
+    cache.add(key, generation, statistic_ids, end_time, result)
+    return result
+
+
+def _statistics_during_period(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None,
+    statistic_ids: list[str] | None,
+    period: Literal["5minute", "day", "hour", "month"],
+    start_time_as_datetime: bool,
+) -> dict[str, list[dict[str, Any]]]:
+    """Query the database for statistics_during_period."""
     metadata = None
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         # Fetch metadata for the given (or all) statistic_ids
         metadata = get_metadata_with_session(hass, session, statistic_ids=statistic_ids)
         if not metadata:
@@ -1033,6 +1639,25 @@ def statistics_during_period(
         if statistic_ids is not None:
             metadata_ids = [metadata_id for metadata_id, _ in metadata.values()]
 
+        if (
+            period in ("day", "month")
+            and hass.data[DATA_INSTANCE].schema_version >= 34
+            and (
+                result := _statistics_during_period_from_rollups(
+                    hass,
+                    session,
+                    start_time,
+                    end_time,
+                    statistic_ids,
+                    metadata_ids,
+                    metadata,
+                    period,
+                )
+            )
+            is not None
+        ):
+            return result
+
         if period == "5minute":
             table = StatisticsShortTerm
         else:
@@ -1059,14 +1684,14 @@ def statistics_during_period(
                 start_time_as_datetime,
             )
 
-        result = _sorted_statistics_to_dict(
-            hass, session, stats, statistic_ids, metadata, True, table, start_time, True
-        )
-
         if period == "day":
-            return _reduce_statistics_per_day(result)
+            return _reduce_statistics_per_day(
+                hass, session, stats, statistic_ids, metadata, start_time
+            )
 
-        return _reduce_statistics_per_month(result)
+        return _reduce_statistics_per_month(
+            hass, session, stats, statistic_ids, metadata, start_time
+        )
 
 
 def _get_last_statistics_stmt(
@@ -1096,7 +1721,7 @@ def _get_last_statistics(
 ) -> dict[str, list[dict]]:
     """Return the last number_of_stats statistics for a given statistic_id."""
     statistic_ids = [statistic_id]
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         # Fetch metadata for the given statistic_id
         metadata = get_metadata_with_session(hass, session, statistic_ids=statistic_ids)
         if not metadata:
@@ -1169,7 +1794,7 @@ def get_latest_short_term_statistics(
     metadata: dict[str, tuple[int, StatisticMetaData]] | None = None,
 ) -> dict[str, list[dict]]:
     """Return the latest short term statistics for a list of statistic_ids."""
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         # Fetch metadata for the given statistic_ids
         if not metadata:
             metadata = get_metadata_with_session(
@@ -1232,6 +1857,32 @@ def _statistics_at_time(
     return execute(query)
 
 
+def _statistics_at_start_time(
+    session: Session,
+    stats: Iterable[Row],
+    table: type[Statistics | StatisticsShortTerm],
+    start_time: datetime | None,
+) -> dict[int, tuple[Row]]:
+    """Return the last known statistics for ids without data at start_time."""
+    need_stat_at_start_time: set[int] = set()
+    stats_at_start_time = {}
+
+    # Identify metadata IDs for which no data was available at the requested start time
+    for meta_id, group in groupby(stats, lambda stat: stat.metadata_id):  # type: ignore[no-any-return]
+        first_start_time = process_timestamp(next(group).start)
+        if start_time and first_start_time > start_time:
+            need_stat_at_start_time.add(meta_id)
+
+    # Fetch last known statistics for the needed metadata IDs
+    if need_stat_at_start_time:
+        assert start_time  # Can not be None if need_stat_at_start_time is not empty
+        tmp = _statistics_at_time(session, need_stat_at_start_time, table, start_time)
+        if tmp:
+            for stat in tmp:
+                stats_at_start_time[stat.metadata_id] = (stat,)
+    return stats_at_start_time
+
+
 def _sorted_statistics_to_dict(
     hass: HomeAssistant,
     session: Session,
@@ -1247,8 +1898,6 @@ def _sorted_statistics_to_dict(
     result: dict = defaultdict(list)
     units = hass.config.units
     metadata = dict(_metadata.values())
-    need_stat_at_start_time: set[int] = set()
-    stats_at_start_time = {}
 
     def no_conversion(val: Any, _: Any) -> float | None:
         """Return x."""
@@ -1259,19 +1908,7 @@ def _sorted_statistics_to_dict(
         for stat_id in statistic_ids:
             result[stat_id] = []
 
-    # Identify metadata IDs for which no data was available at the requested start time
-    for meta_id, group in groupby(stats, lambda stat: stat.metadata_id):  # type: ignore[no-any-return]
-        first_start_time = process_timestamp(next(group).start)
-        if start_time and first_start_time > start_time:
-            need_stat_at_start_time.add(meta_id)
-
-    # Fetch last known statistics for the needed metadata IDs
-    if need_stat_at_start_time:
-        assert start_time  # Can not be None if need_stat_at_start_time is not empty
-        tmp = _statistics_at_time(session, need_stat_at_start_time, table, start_time)
-        if tmp:
-            for stat in tmp:
-                stats_at_start_time[stat.metadata_id] = (stat,)
+    stats_at_start_time = _statistics_at_start_time(session, stats, table, start_time)
 
     # Append all statistic entries, and optionally do unit conversion
     for meta_id, group in groupby(stats, lambda stat: stat.metadata_id):  # type: ignore[no-any-return]
@@ -1418,6 +2055,7 @@ def add_external_statistics(
             instance.hass, session, statistic_ids=[metadata["statistic_id"]]
         )
         metadata_id = _update_or_add_metadata(session, metadata, old_metadata_dict)
+        starts: list[datetime] = []
         for stat in statistics:
             if stat_id := _statistics_exists(
                 session, Statistics, metadata_id, stat["start"]
@@ -1425,7 +2063,13 @@ def add_external_statistics(
                 _update_statistics(session, Statistics, stat_id, stat)
             else:
                 _insert_statistics(session, Statistics, metadata_id, stat)
+            starts.append(stat["start"])
+        _compile_statistics_rollups_for_periods(session, starts, metadata_id)
 
+    if starts:
+        instance.statistics_query_cache.invalidate(
+            (metadata["statistic_id"],), min(starts)
+        )
     return True
 
 
@@ -1467,4 +2111,24 @@ def adjust_statistics(
             sum_adjustment,
         )
 
+        # The rollups of the period start_time is in are compiled again, the
+        # rollups of later periods only need the same adjustment
+        _compile_statistics_rollups_for_periods(
+            session, (start_time,), metadata[statistic_id][0]
+        )
+        for table, period_start_end in (
+            (StatisticsDaily, _local_day_start_end),
+            (StatisticsMonthly, month_start_end),
+        ):
+            _adjust_sum_statistics(
+                session,
+                table,
+                metadata[statistic_id][0],
+                period_start_end(start_time)[1],
+                sum_adjustment,
+            )
+
+    instance.statistics_query_cache.invalidate(
+        (statistic_id,), start_time.replace(minute=0)
+    )
     return True
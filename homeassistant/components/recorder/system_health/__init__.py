@@ -55,6 +55,52 @@ def _async_get_db_engine_info(instance: Recorder) -> dict[str, Any]:
     return db_engine_info
 
 
+@callback
+def _async_get_purge_info(instance: Recorder) -> dict[str, Any]:
+    """Get info about the current or last purge run."""
+    purge_info: dict[str, Any] = {}
+    if purge_progress := instance.purge_progress:
+        purge_info["purge_in_progress"] = purge_progress.end is None
+        purge_info["purge_states_deleted"] = purge_progress.states_purged
+        purge_info["purge_events_deleted"] = purge_progress.events_purged
+    return purge_info
+
+
+@callback
+def _async_get_statistics_cache_info(instance: Recorder) -> dict[str, Any]:
+    """Get info about the statistics query cache."""
+    cache_info: dict[str, Any] = {}
+    cache = instance.statistics_query_cache
+    if (hit_rate := cache.hit_rate) is not None:
+        cache_info["statistics_cache_hit_rate"] = f"{hit_rate * 100:.1f} %"
+        cache_info["statistics_cache_entries"] = len(cache)
+    return cache_info
+
+
+@callback
+def _async_get_executor_queue_info(instance: Recorder) -> dict[str, Any]:
+    """Get info about how long database executor jobs wait for a worker."""
+    queue_info: dict[str, Any] = {}
+    stats = instance.executor_queue_stats
+    if (queue_time_avg := stats.queue_time_avg) is not None:
+        queue_info["executor_queue_time_avg"] = f"{queue_time_avg * 1000:.1f} ms"
+        queue_info["executor_queue_time_max"] = f"{stats.queue_time_max * 1000:.1f} ms"
+    return queue_info
+
+
+@callback
+def _async_get_id_cache_info(instance: Recorder) -> dict[str, Any]:
+    """Get info about the state attributes and event data id caches."""
+    attributes_cache = instance.state_attributes_id_cache
+    data_cache = instance.event_data_id_cache
+    return {
+        "attributes_id_cache_hits": attributes_cache.hits,
+        "attributes_id_cache_misses": attributes_cache.misses,
+        "event_data_id_cache_hits": data_cache.hits,
+        "event_data_id_cache_misses": data_cache.misses,
+    }
+
+
 async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     """Get info for the info page."""
     instance = get_instance(hass)
@@ -62,6 +108,10 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     run_history = instance.run_history
     database_name = URL(instance.db_url).path.lstrip("/")
     db_engine_info = _async_get_db_engine_info(instance)
+    purge_info = _async_get_purge_info(instance)
+    cache_info = _async_get_statistics_cache_info(instance)
+    queue_info = _async_get_executor_queue_info(instance)
+    id_cache_info = _async_get_id_cache_info(instance)
     db_stats: dict[str, Any] = {}
 
     if instance.async_db_ready.done():
@@ -72,4 +122,12 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
             "oldest_recorder_run": run_history.first.start,
             "current_recorder_run": run_history.current.start,
         }
-    return db_runs | db_stats | db_engine_info
+    return (
+        db_runs
+        | db_stats
+        | db_engine_info
+        | purge_info
+        | cache_info
+        | queue_info
+        | id_cache_info
+    )
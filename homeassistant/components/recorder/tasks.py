@@ -12,7 +12,7 @@ from typing import TYPE_CHECKING, Any
 from homeassistant.core import Event
 from homeassistant.helpers.typing import UndefinedType
 
-from . import purge, statistics
+from . import migration, purge, statistics
 from .const import DOMAIN, EXCLUDE_ATTRIBUTES
 from .models import StatisticData, StatisticMetaData
 from .util import periodic_db_cleanups
@@ -163,6 +163,31 @@ class AdjustStatisticsTask(RecorderTask):
         )
 
 
+@dataclass
+class RebuildStatisticsRollupsTask(RecorderTask):
+    """An object to insert into the recorder queue to rebuild the statistics rollups."""
+
+    def run(self, instance: Recorder) -> None:
+        """Run statistics rollups task."""
+        if statistics.rebuild_statistics_rollups(instance):
+            return
+        # Schedule a new rebuild task if this one didn't finish
+        instance.queue_task(RebuildStatisticsRollupsTask())
+
+
+@dataclass
+class ContextIDMigrationTask(RecorderTask):
+    """An object to insert into the recorder queue to migrate context ids."""
+
+    commit_before = False
+
+    def run(self, instance: Recorder) -> None:
+        """Run context id migration task."""
+        if not migration.migrate_context_ids(instance):
+            # Schedule a new migration task if this one didn't finish
+            instance.queue_task(ContextIDMigrationTask())
+
+
 @dataclass
 class WaitTask(RecorderTask):
     """An object to insert into the recorder queue to tell it set the _queue_watch event."""
@@ -211,6 +236,35 @@ class EventTask(RecorderTask):
         instance._process_one_event(self.event)
 
 
+@dataclass
+class ReplaySpoolTask(RecorderTask):
+    """Replay the events spooled to disk while the database was stalled.
+
+    Events still held in memory are only replayed when spooling
+    stopped before the task was queued.
+    """
+
+    include_pending: bool = False
+
+    def run(self, instance: Recorder) -> None:
+        """Handle the task."""
+        # pylint: disable-next=[protected-access]
+        instance._replay_spool(self.include_pending)
+
+
+@dataclass
+class AdjustIdCacheSizesTask(RecorderTask):
+    """Resize the shared id caches for the number of entities."""
+
+    entity_count: int
+    commit_before = False
+
+    def run(self, instance: Recorder) -> None:
+        """Handle the task."""
+        # pylint: disable-next=[protected-access]
+        instance._adjust_id_cache_sizes(self.entity_count)
+
+
 @dataclass
 class KeepAliveTask(RecorderTask):
     """A keep alive to be sent."""
@@ -253,6 +307,10 @@ class AddRecorderPlatformTask(RecorderTask):
         platforms[domain] = platform
         if hasattr(self.platform, "exclude_attributes"):
             hass.data[EXCLUDE_ATTRIBUTES][domain] = platform.exclude_attributes(hass)
+        if hasattr(self.platform, "process_state_changed_event"):
+            instance.state_changed_processors.append(
+                platform.process_state_changed_event
+            )
 
 
 @dataclass
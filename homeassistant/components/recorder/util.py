@@ -78,10 +78,16 @@ def session_scope(
     hass: HomeAssistant | None = None,
     session: Session | None = None,
     exception_filter: Callable[[Exception], bool] | None = None,
+    read_only: bool = False,
 ) -> Generator[Session, None, None]:
-    """Provide a transactional scope around a series of operations."""
+    """Provide a transactional scope around a series of operations.
+
+    Pass read_only to use a connection from the read-only pool when
+    a session is created from hass.
+    """
     if session is None and hass is not None:
-        session = hass.data[DATA_INSTANCE].get_session()
+        instance = hass.data[DATA_INSTANCE]
+        session = instance.get_read_session() if read_only else instance.get_session()
 
     if session is None:
         raise RuntimeError("Session required")
@@ -469,6 +475,26 @@ def setup_connection_for_dialect(
     return version
 
 
+def setup_read_only_connection_for_dialect(
+    dialect_name: str, dbapi_connection: Any
+) -> None:
+    """Execute statements needed for a read-only dialect connection."""
+    if dialect_name == SupportedDialect.SQLITE:
+        # The upper bound on the cache size is approximately 16MiB of memory
+        execute_on_connection(dbapi_connection, "PRAGMA cache_size = -16384")
+        execute_on_connection(dbapi_connection, "PRAGMA query_only=ON")
+    elif dialect_name == SupportedDialect.MYSQL:
+        execute_on_connection(dbapi_connection, "SET session wait_timeout=28800")
+        execute_on_connection(dbapi_connection, "SET SESSION TRANSACTION READ ONLY")
+    elif dialect_name == SupportedDialect.POSTGRESQL:
+        execute_on_connection(
+            dbapi_connection,
+            "SET SESSION CHARACTERISTICS AS TRANSACTION READ ONLY",
+        )
+    else:
+        _fail_unsupported_dialect(dialect_name)
+
+
 def end_incomplete_runs(session: Session, start_time: datetime) -> None:
     """End any incomplete recorder runs."""
     for run in session.query(RecorderRuns).filter_by(end=None):
@@ -44,7 +44,7 @@ from homeassistant.const import (
     VOLUME_CUBIC_FEET,
     VOLUME_CUBIC_METERS,
 )
-from homeassistant.core import HomeAssistant, State
+from homeassistant.core import Event, HomeAssistant, State, split_entity_id
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity import entity_sources
 import homeassistant.util.dt as dt_util
@@ -127,6 +127,112 @@ WARN_UNSUPPORTED_UNIT = "sensor_warn_unsupported_unit"
 WARN_UNSTABLE_UNIT = "sensor_warn_unstable_unit"
 # Link to dev statistics where issues around LTS can be fixed
 LINK_DEV_STATISTICS = "https://my.home-assistant.io/redirect/developer_statistics"
+# Sensor states buffered for compiling the short term statistics
+STATISTICS_STATES_BUFFER = "sensor_statistics_states_buffer"
+
+
+class StatisticsStatesBuffer:
+    """Sensor states recorded since the statistics were last compiled.
+
+    The recorder feeds the buffer with every recorded sensor state change, so the
+    5-minute statistics can be compiled without reading the states back from the
+    database. State changes fired before the buffer was created are not known,
+    and states before a compiled period are dropped, so periods starting before
+    either are compiled from the database instead.
+    """
+
+    def __init__(self, created: datetime.datetime) -> None:
+        """Initialize the buffer."""
+        self.created = created
+        # The earliest period start the buffered states can answer for
+        self._earliest_start = created
+        self._states: dict[str, list[State]] = {}
+
+    def add(
+        self, entity_id: str, old_state: State | None, new_state: State | None
+    ) -> None:
+        """Add a state change."""
+        if new_state is None:
+            self._states.pop(entity_id, None)
+            return
+        if (states := self._states.get(entity_id)) is None:
+            if new_state.attributes.get(ATTR_STATE_CLASS) not in STATE_CLASSES:
+                return
+            # Keep the old state as it is the state at the start of the period
+            states = self._states[entity_id] = [old_state] if old_state else []
+        states.append(new_state)
+
+    def get_history(
+        self,
+        sensor_states: list[State],
+        wanted_statistics: dict[str, set[str]],
+        start: datetime.datetime,
+        end: datetime.datetime,
+    ) -> dict[str, list[State]]:
+        """Return the history of the sensors during start-end.
+
+        The history matches what the recorder returns, including the state at the
+        start of the period. Sensors that the buffer can't answer for are left out.
+        States before the period are dropped, apart from the state at its start.
+        """
+        history_list: dict[str, list[State]] = {}
+        if start < self._earliest_start:
+            return history_list
+        self._earliest_start = start
+
+        wanted_entity_ids = {state.entity_id for state in sensor_states}
+        for entity_id in self._states.keys() - wanted_entity_ids:
+            del self._states[entity_id]
+
+        for state in sensor_states:
+            entity_id = state.entity_id
+            if (states := self._states.get(entity_id)) is None:
+                # The sensor has not changed since the buffer was created
+                if state.last_updated < start:
+                    history_list[entity_id] = [state]
+                continue
+
+            period_start_idx = 0
+            for idx, buffered_state in enumerate(states):
+                if buffered_state.last_updated >= start:
+                    break
+                period_start_idx = idx
+            del states[:period_start_idx]
+
+            significant_changes_only = "sum" not in wanted_statistics[entity_id]
+            entity_history = []
+            for buffered_state in states:
+                if buffered_state.last_updated >= end:
+                    break
+                if (
+                    buffered_state.last_updated < start
+                    or not significant_changes_only
+                    or buffered_state.last_changed == buffered_state.last_updated
+                ):
+                    entity_history.append(buffered_state)
+            if entity_history:
+                history_list[entity_id] = entity_history
+
+        return history_list
+
+
+def process_state_changed_event(hass: HomeAssistant, event: Event) -> None:
+    """Buffer a recorded sensor state change for compiling statistics.
+
+    Note: This is called from the recorder thread.
+    """
+    entity_id: str = event.data["entity_id"]
+    if split_entity_id(entity_id)[0] != DOMAIN:
+        return
+    if (states_buffer := hass.data.get(STATISTICS_STATES_BUFFER)) is None:
+        # Events may be processed long after they were fired when the
+        # recorder is behind, the buffer only knows the changes from then on
+        states_buffer = hass.data[STATISTICS_STATES_BUFFER] = StatisticsStatesBuffer(
+            event.time_fired
+        )
+    states_buffer.add(
+        entity_id, event.data.get("old_state"), event.data.get("new_state")
+    )
 
 
 def _get_sensor_states(hass: HomeAssistant) -> list[State]:
@@ -412,13 +518,20 @@ def _compile_statistics(  # noqa: C901
         hass, session, statistic_ids=[i.entity_id for i in sensor_states]
     )
 
-    # Get history between start and end
+    # Get history between start and end, from the states buffered while
+    # recording if possible
+    history_list: MutableMapping[str, list[State]] = {}
+    if (states_buffer := hass.data.get(STATISTICS_STATES_BUFFER)) is not None:
+        history_list = states_buffer.get_history(
+            sensor_states, wanted_statistics, start, end
+        )
     entities_full_history = [
-        i.entity_id for i in sensor_states if "sum" in wanted_statistics[i.entity_id]
+        i.entity_id
+        for i in sensor_states
+        if "sum" in wanted_statistics[i.entity_id] and i.entity_id not in history_list
     ]
-    history_list: MutableMapping[str, list[State]] = {}
     if entities_full_history:
-        history_list = history.get_full_significant_states_with_session(
+        _history_list = history.get_full_significant_states_with_session(
             hass,
             session,
             start - datetime.timedelta.resolution,
@@ -426,10 +539,12 @@ def _compile_statistics(  # noqa: C901
             entity_ids=entities_full_history,
             significant_changes_only=False,
         )
+        history_list = {**history_list, **_history_list}
     entities_significant_history = [
         i.entity_id
         for i in sensor_states
         if "sum" not in wanted_statistics[i.entity_id]
+        and i.entity_id not in history_list
     ]
     if entities_significant_history:
         _history_list = history.get_full_significant_states_with_session(
@@ -226,8 +226,6 @@ class BinarySensorTemplate(TemplateEntity, BinarySensorEntity, RestoreEntity):
         ):
             self._state = last_state.state == STATE_ON
 
-        self.add_template_attribute("_state", self._template, None, self._update_state)
-
         if self._delay_on_raw is not None:
             try:
                 self._delay_on = cv.positive_time_period(self._delay_on_raw)
@@ -244,6 +242,10 @@ class BinarySensorTemplate(TemplateEntity, BinarySensorEntity, RestoreEntity):
                     "_delay_off", self._delay_off_raw, cv.positive_time_period
                 )
 
+        # The delays are registered first so a state change rendered in the
+        # same refresh as a new delay uses that delay
+        self.add_template_attribute("_state", self._template, None, self._update_state)
+
         await super().async_added_to_hass()
 
     @callback
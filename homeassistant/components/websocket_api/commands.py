@@ -41,6 +41,7 @@ from homeassistant.util.json import (
 from . import const, decorators, messages
 from .connection import ActiveConnection
 from .const import ERR_NOT_FOUND
+from .entity_subscriptions import async_subscribe_entities
 
 
 @callback
@@ -280,26 +281,12 @@ def handle_subscribe_entities(
     """Handle subscribe entities command."""
     entity_ids = set(msg.get("entity_ids", []))
 
-    @callback
-    def forward_entity_changes(event: Event) -> None:
-        """Forward entity state changed events to websocket."""
-        if not connection.user.permissions.check_entity(
-            event.data["entity_id"], POLICY_READ
-        ):
-            return
-        if entity_ids and event.data["entity_id"] not in entity_ids:
-            return
-
-        connection.send_message(
-            lambda: messages.cached_state_diff_message(msg["id"], event)
-        )
-
     # We must never await between sending the states and listening for
     # state changed events or we will introduce a race condition
     # where some states are missed
     states = _async_get_allowed_states(hass, connection)
-    connection.subscriptions[msg["id"]] = hass.bus.async_listen(
-        EVENT_STATE_CHANGED, forward_entity_changes, run_immediately=True
+    connection.subscriptions[msg["id"]] = async_subscribe_entities(
+        hass, connection, msg["id"], entity_ids
     )
     connection.send_result(msg["id"])
     data: dict[str, dict[str, dict]] = {
@@ -30,7 +30,9 @@ class ActiveConnection:
         self,
         logger: WebSocketAdapter,
         hass: HomeAssistant,
-        send_message: Callable[[str | dict[str, Any] | Callable[[], str]], None],
+        send_message: Callable[
+            [str | bytes | dict[str, Any] | Callable[[], str | bytes]], None
+        ],
         user: User,
         refresh_token: RefreshToken,
     ) -> None:
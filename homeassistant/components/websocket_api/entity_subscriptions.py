@@ -0,0 +1,184 @@
+"""Indexed state changed dispatch for entity subscriptions."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from functools import partial
+
+from homeassistant.auth.models import User
+from homeassistant.auth.permissions import AbstractPermissions
+from homeassistant.auth.permissions.const import POLICY_READ
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.device_registry import EVENT_DEVICE_REGISTRY_UPDATED
+from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
+
+from . import messages
+from .connection import ActiveConnection
+from .const import DATA_ENTITY_SUBSCRIPTIONS
+
+
+class _EntitySubscription:
+    """A single subscribe_entities subscription."""
+
+    __slots__ = ("connection", "msg_id")
+
+    def __init__(self, connection: ActiveConnection, msg_id: int) -> None:
+        """Initialize the subscription."""
+        self.connection = connection
+        self.msg_id = msg_id
+
+
+class _UserPermissionCache:
+    """Read permission decisions of a user."""
+
+    __slots__ = ("permissions", "all_entities", "entities")
+
+    def __init__(self, permissions: AbstractPermissions) -> None:
+        """Initialize the cache."""
+        self.permissions = permissions
+        self.all_entities = permissions.access_all_entities(POLICY_READ)
+        self.entities: dict[str, bool] = {}
+
+
+class EntitySubscriptions:
+    """Dispatch state changed events to subscribe_entities subscriptions.
+
+    A single state changed listener is shared by the subscriptions for all
+    entities, subscriptions for specific entities listen with the entity_ids
+    so the event bus only runs them for those entities. The cost of a state
+    change only depends on the number of subscriptions interested in it.
+    Read permission decisions are cached per user and
+    dropped when the user's permissions object is replaced or when the
+    entity or device registry changes, since policies can be based on
+    areas and devices.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the subscriptions."""
+        self.hass = hass
+        self._all_entities: tuple[_EntitySubscription, ...] = ()
+        self._entity_subscriptions = 0
+        self._permission_cache: dict[str, _UserPermissionCache] = {}
+        self._unsub_listeners: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_subscribe(
+        self,
+        connection: ActiveConnection,
+        msg_id: int,
+        entity_ids: Iterable[str] | None,
+    ) -> CALLBACK_TYPE:
+        """Subscribe a connection to state changes of entity_ids or all entities."""
+        if not self._unsub_listeners:
+            self._async_start_listeners()
+
+        subscription = _EntitySubscription(connection, msg_id)
+        unsub_state_changed: CALLBACK_TYPE | None = None
+        if not entity_ids:
+            self._all_entities = (*self._all_entities, subscription)
+        else:
+
+            @callback
+            def _async_state_changed(event: Event) -> None:
+                """Forward a state changed event of the subscribed entities."""
+                self._async_forward(subscription, event)
+
+            unsub_state_changed = self.hass.bus.async_listen(
+                EVENT_STATE_CHANGED,
+                _async_state_changed,
+                run_immediately=True,
+                entity_ids=entity_ids,
+            )
+            self._entity_subscriptions += 1
+
+        @callback
+        def _async_unsubscribe() -> None:
+            """Remove the subscription."""
+            if unsub_state_changed is None:
+                self._all_entities = tuple(
+                    sub for sub in self._all_entities if sub is not subscription
+                )
+            else:
+                unsub_state_changed()
+                self._entity_subscriptions -= 1
+            if not self._all_entities and not self._entity_subscriptions:
+                self._async_stop_listeners()
+
+        return _async_unsubscribe
+
+    @callback
+    def _async_start_listeners(self) -> None:
+        """Start listening for state changes and registry updates."""
+        bus = self.hass.bus
+        self._unsub_listeners = [
+            bus.async_listen(
+                EVENT_STATE_CHANGED, self._async_state_changed, run_immediately=True
+            ),
+            bus.async_listen(
+                EVENT_ENTITY_REGISTRY_UPDATED,
+                self._async_registry_updated,
+                run_immediately=True,
+            ),
+            bus.async_listen(
+                EVENT_DEVICE_REGISTRY_UPDATED,
+                self._async_registry_updated,
+                run_immediately=True,
+            ),
+        ]
+
+    @callback
+    def _async_stop_listeners(self) -> None:
+        """Stop listening and drop the cached permission decisions."""
+        for unsub in self._unsub_listeners:
+            unsub()
+        self._unsub_listeners = []
+        self._permission_cache = {}
+
+    @callback
+    def _async_registry_updated(self, event: Event) -> None:
+        """Drop the cached permission decisions."""
+        self._permission_cache = {}
+
+    @callback
+    def _async_can_read(self, user: User, entity_id: str) -> bool:
+        """Return if a user can read an entity."""
+        permissions = user.permissions
+        cache = self._permission_cache.get(user.id)
+        if cache is None or cache.permissions is not permissions:
+            cache = self._permission_cache[user.id] = _UserPermissionCache(permissions)
+        if cache.all_entities:
+            return True
+        if (allowed := cache.entities.get(entity_id)) is None:
+            allowed = cache.entities[entity_id] = permissions.check_entity(
+                entity_id, POLICY_READ
+            )
+        return allowed
+
+    @callback
+    def _async_forward(self, subscription: _EntitySubscription, event: Event) -> None:
+        """Forward a state changed event to a subscription the user can read."""
+        connection = subscription.connection
+        if not self._async_can_read(connection.user, event.data["entity_id"]):
+            return
+        connection.send_message(
+            partial(messages.cached_state_diff_message, subscription.msg_id, event)
+        )
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Forward a state changed event to the subscriptions for all entities."""
+        for subscription in self._all_entities:
+            self._async_forward(subscription, event)
+
+
+@callback
+def async_subscribe_entities(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg_id: int,
+    entity_ids: Iterable[str] | None,
+) -> Callable[[], None]:
+    """Subscribe a connection to state changes."""
+    if (subscriptions := hass.data.get(DATA_ENTITY_SUBSCRIPTIONS)) is None:
+        subscriptions = hass.data[DATA_ENTITY_SUBSCRIPTIONS] = EntitySubscriptions(hass)
+    return subscriptions.async_subscribe(connection, msg_id, entity_ids)
@@ -2,9 +2,10 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from contextlib import suppress
 import datetime as dt
+from functools import partial
 import logging
 from typing import Any, Final
 
@@ -72,16 +73,21 @@ class WebSocketHandler:
         """Write outgoing messages."""
         # Exceptions if Socket disconnected or cancelled by connection handler
         with suppress(RuntimeError, ConnectionResetError, *CANCELLATION_ERRORS):
-            while not self.wsock.closed:
+            wsock = self.wsock
+            send_bytes_text = self._async_get_send_bytes_text()
+            while not wsock.closed:
                 if (process := await self._to_write.get()) is None:
                     break
 
-                if not isinstance(process, str):
-                    message: str = process()
+                if not isinstance(process, (str, bytes)):
+                    message: str | bytes = process()
                 else:
                     message = process
                 self._logger.debug("Sending %s", message)
-                await self.wsock.send_str(message)
+                if isinstance(message, str):
+                    await wsock.send_str(message)
+                else:
+                    await send_bytes_text(message)
 
         # Clean up the peaker checker when we shut down the writer
         if self._peak_checker_unsub is not None:
@@ -89,7 +95,29 @@ class WebSocketHandler:
             self._peak_checker_unsub = None
 
     @callback
-    def _send_message(self, message: str | dict[str, Any] | Callable[[], str]) -> None:
+    def _async_get_send_bytes_text(self) -> Callable[[bytes], Awaitable[None]]:
+        """Return a function that sends encoded JSON as a text frame.
+
+        Messages that are already encoded are written by the frame writer
+        directly so they do not need to be decoded to be sent. Fall back
+        to send_str if the frame writer of aiohttp is not available.
+        """
+        frame_writer = getattr(self.wsock, "_writer", None)
+        if frame_writer is not None and hasattr(frame_writer, "send"):
+            return partial(frame_writer.send, binary=False)
+
+        send_str = self.wsock.send_str
+
+        async def _send_bytes_as_str(message: bytes) -> None:
+            """Decode the message and send it as a text frame."""
+            await send_str(message.decode("utf-8"))
+
+        return _send_bytes_as_str
+
+    @callback
+    def _send_message(
+        self, message: str | bytes | dict[str, Any] | Callable[[], str | bytes]
+    ) -> None:
         """Send a message to the client.
 
         Closes connection if the client is not reading the messages.
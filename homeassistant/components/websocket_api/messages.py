@@ -66,7 +66,7 @@ def event_message(iden: JSON_TYPE | int, event: Any) -> dict[str, Any]:
     return {"id": iden, "type": "event", "event": event}
 
 
-def cached_event_message(iden: int, event: Event) -> str:
+def cached_event_message(iden: int, event: Event) -> bytes:
     """Return an event message.
 
     Serialize to json once per message.
@@ -75,20 +75,20 @@ def cached_event_message(iden: int, event: Event) -> str:
     all getting many of the same events (mostly state changed)
     we can avoid serializing the same data for each connection.
     """
-    return _cached_event_message(event).replace(IDEN_JSON_TEMPLATE, str(iden), 1)
+    return _splice_iden(iden, _cached_event_message(event))
 
 
 @lru_cache(maxsize=128)
-def _cached_event_message(event: Event) -> str:
+def _cached_event_message(event: Event) -> tuple[bytes, bytes]:
     """Cache and serialize the event to json.
 
     The IDEN_TEMPLATE is used which will be replaced
     with the actual iden in cached_event_message
     """
-    return message_to_json(event_message(IDEN_TEMPLATE, event))
+    return _split_iden_template(message_to_json(event_message(IDEN_TEMPLATE, event)))
 
 
-def cached_state_diff_message(iden: int, event: Event) -> str:
+def cached_state_diff_message(iden: int, event: Event) -> bytes:
     """Return an event message.
 
     Serialize to json once per message.
@@ -97,17 +97,34 @@ def cached_state_diff_message(iden: int, event: Event) -> str:
     all getting many of the same events (mostly state changed)
     we can avoid serializing the same data for each connection.
     """
-    return _cached_state_diff_message(event).replace(IDEN_JSON_TEMPLATE, str(iden), 1)
+    return _splice_iden(iden, _cached_state_diff_message(event))
 
 
 @lru_cache(maxsize=128)
-def _cached_state_diff_message(event: Event) -> str:
+def _cached_state_diff_message(event: Event) -> tuple[bytes, bytes]:
     """Cache and serialize the event to json.
 
     The IDEN_TEMPLATE is used which will be replaced
-    with the actual iden in cached_event_message
+    with the actual iden in cached_state_diff_message
     """
-    return message_to_json(event_message(IDEN_TEMPLATE, _state_diff_event(event)))
+    return _split_iden_template(
+        message_to_json(event_message(IDEN_TEMPLATE, _state_diff_event(event)))
+    )
+
+
+def _split_iden_template(json_message: str) -> tuple[bytes, bytes]:
+    """Encode a json message and split it around the IDEN_JSON_TEMPLATE.
+
+    The id is always the first key of a message, so
+    the template is the first match.
+    """
+    prefix, _, suffix = json_message.partition(IDEN_JSON_TEMPLATE)
+    return prefix.encode(), suffix.encode()
+
+
+def _splice_iden(iden: int, template: tuple[bytes, bytes]) -> bytes:
+    """Build the encoded message for an iden from a split template."""
+    return b"%b%d%b" % (template[0], iden, template[1])
 
 
 def _state_diff_event(event: Event) -> dict:
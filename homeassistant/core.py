@@ -808,12 +808,87 @@ class _FilterableJob(NamedTuple):
     run_immediately: bool
 
 
+def _lower_set(keys: str | Iterable[str] | None) -> set[str]:
+    """Return a set of lowercased keys from a key or an iterable of keys."""
+    if keys is None:
+        return set()
+    if isinstance(keys, str):
+        return {keys.lower()}
+    return {key.lower() for key in keys}
+
+
+class _IndexedListeners:
+    """Listeners of an event type indexed by the entity_id in the event data."""
+
+    __slots__ = ("entity_ids", "domains")
+
+    def __init__(self) -> None:
+        """Initialize the index."""
+        self.entity_ids: dict[str, list[_FilterableJob]] = {}
+        self.domains: dict[str, list[_FilterableJob]] = {}
+
+    def __bool__(self) -> bool:
+        """Return if any listeners are indexed."""
+        return bool(self.entity_ids or self.domains)
+
+    def __len__(self) -> int:
+        """Return the number of indexed listeners."""
+        return len(
+            {
+                id(filterable_job)
+                for index in (self.entity_ids, self.domains)
+                for filterable_jobs in index.values()
+                for filterable_job in filterable_jobs
+            }
+        )
+
+    def jobs_for_entity_id(self, entity_id: str) -> list[_FilterableJob]:
+        """Return the listeners for entity_id in the order they were added."""
+        filterable_jobs = list(self.entity_ids.get(entity_id, ()))
+        if domain_jobs := self.domains.get(entity_id.partition(".")[0]):
+            filterable_jobs.extend(
+                filterable_job
+                for filterable_job in domain_jobs
+                if filterable_job not in filterable_jobs
+            )
+        return filterable_jobs
+
+
+# Listeners which share an event filter, in the order they were added
+_FilterGroup = tuple[Optional[Callable[[Event], bool]], tuple[_FilterableJob, ...]]
+
+
+def _group_filterable_jobs(
+    listeners: list[_FilterableJob],
+) -> tuple[_FilterGroup, ...]:
+    """Group adjacent listeners with the same event filter.
+
+    The filter of a group only runs once per event.
+    """
+    groups: list[tuple[Callable[[Event], bool] | None, list[_FilterableJob]]] = []
+    for filterable_job in listeners:
+        if groups and groups[-1][0] is filterable_job.event_filter:
+            groups[-1][1].append(filterable_job)
+        else:
+            groups.append((filterable_job.event_filter, [filterable_job]))
+    return tuple(
+        (event_filter, tuple(filterable_jobs))
+        for event_filter, filterable_jobs in groups
+    )
+
+
 class EventBus:
     """Allow the firing of and listening for events."""
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: dict[str, list[_FilterableJob]] = {}
+        # The listeners to run for each fired event_type with listeners,
+        # including the MATCH_ALL listeners. Other event types only run the
+        # MATCH_ALL listeners. Rebuilt after listeners are added or removed.
+        self._dispatch: dict[str, tuple[_FilterGroup, ...]] = {}
+        self._match_all_dispatch: tuple[_FilterGroup, ...] | None = None
+        self._indexed_listeners: dict[str, _IndexedListeners] = {}
         self._hass = hass
 
     @callback
@@ -822,7 +897,10 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(listeners) for key, listeners in self._listeners.items()}
+        listeners = {key: len(listeners) for key, listeners in self._listeners.items()}
+        for key, indexed_listeners in self._indexed_listeners.items():
+            listeners[key] = listeners.get(key, 0) + len(indexed_listeners)
+        return listeners
 
     @property
     def listeners(self) -> dict[str, int]:
@@ -859,12 +937,8 @@ class EventBus:
                 event_type, "event_type", MAX_LENGTH_EVENT_EVENT_TYPE
             )
 
-        listeners = self._listeners.get(event_type, [])
-
-        # EVENT_HOMEASSISTANT_CLOSE should go only to this listeners
-        match_all_listeners = self._listeners.get(MATCH_ALL)
-        if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
-            listeners = match_all_listeners + listeners
+        if (filter_groups := self._dispatch.get(event_type)) is None:
+            filter_groups = self._async_build_dispatch(event_type)
 
         event = Event(event_type, event_data, origin, time_fired, context)
         if not event.context.origin_event:
@@ -872,10 +946,42 @@ class EventBus:
 
         _LOGGER.debug("Bus:Handling %s", event)
 
-        if not listeners:
+        indexed_listeners = self._indexed_listeners.get(event_type)
+        if not filter_groups and indexed_listeners is None:
             return
 
-        for job, event_filter, run_immediately in listeners:
+        for event_filter, filterable_jobs in filter_groups:
+            if event_filter is not None:
+                try:
+                    if not event_filter(event):
+                        continue
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Error in event filter")
+                    continue
+            for job, _, run_immediately in filterable_jobs:
+                if run_immediately:
+                    try:
+                        job.target(event)
+                    except Exception:  # pylint: disable=broad-except
+                        _LOGGER.exception("Error running job: %s", job)
+                else:
+                    self._hass.async_add_hass_job(job, event)
+
+        if (
+            indexed_listeners is not None
+            and event_data
+            and isinstance(entity_id := event_data.get("entity_id"), str)
+        ):
+            self._async_run_indexed_listeners(
+                event, indexed_listeners.jobs_for_entity_id(entity_id)
+            )
+
+    @callback
+    def _async_run_indexed_listeners(
+        self, event: Event, filterable_jobs: list[_FilterableJob]
+    ) -> None:
+        """Run the listeners indexed by the entity_id of the event."""
+        for job, event_filter, run_immediately in filterable_jobs:
             if event_filter is not None:
                 try:
                     if not event_filter(event):
@@ -891,6 +997,43 @@ class EventBus:
             else:
                 self._hass.async_add_hass_job(job, event)
 
+    @callback
+    def _async_build_dispatch(self, event_type: str) -> tuple[_FilterGroup, ...]:
+        """Build and cache the listeners to run for an event_type.
+
+        Only event types with listeners are cached, so firing many event
+        types without listeners does not grow the cache.
+        """
+        listeners = self._listeners.get(event_type)
+
+        # EVENT_HOMEASSISTANT_CLOSE should go only to this listeners
+        if event_type == EVENT_HOMEASSISTANT_CLOSE:
+            match_all_listeners = None
+        else:
+            match_all_listeners = self._listeners.get(MATCH_ALL)
+
+        if listeners is None:
+            if match_all_listeners is None:
+                return ()
+            if self._match_all_dispatch is None:
+                self._match_all_dispatch = _group_filterable_jobs(match_all_listeners)
+            return self._match_all_dispatch
+
+        if match_all_listeners is not None:
+            listeners = match_all_listeners + listeners
+        filter_groups = _group_filterable_jobs(listeners)
+        self._dispatch[event_type] = filter_groups
+        return filter_groups
+
+    @callback
+    def _async_invalidate_dispatch(self, event_type: str) -> None:
+        """Drop the cached listeners after the listeners of event_type changed."""
+        if event_type == MATCH_ALL:
+            self._dispatch.clear()
+            self._match_all_dispatch = None
+        else:
+            self._dispatch.pop(event_type, None)
+
     def listen(
         self,
         event_type: str,
@@ -918,6 +1061,8 @@ class EventBus:
         listener: Callable[[Event], None | Awaitable[None]],
         event_filter: Callable[[Event], bool] | None = None,
         run_immediately: bool = False,
+        entity_ids: str | Iterable[str] | None = None,
+        domains: str | Iterable[str] | None = None,
     ) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
 
@@ -932,21 +1077,82 @@ class EventBus:
         right away instead of using call_soon. Only use this if
         the callback results in scheduling another task.
 
+        If entity_ids or domains are passed, the listener only runs for
+        events with a matching entity_id in the event data. These listeners
+        are looked up by entity_id, so they do not slow down the events
+        of other entities.
+
         This method must be run in the event loop.
         """
         if event_filter is not None and not is_callback(event_filter):
             raise HomeAssistantError(f"Event filter {event_filter} is not a callback")
         if run_immediately and not is_callback(listener):
             raise HomeAssistantError(f"Event listener {listener} is not a callback")
-        return self._async_listen_filterable_job(
-            event_type, _FilterableJob(HassJob(listener), event_filter, run_immediately)
+        filterable_job = _FilterableJob(
+            HassJob(listener), event_filter, run_immediately
         )
+        if entity_ids is None and domains is None:
+            return self._async_listen_filterable_job(event_type, filterable_job)
+        if event_type == MATCH_ALL:
+            raise HomeAssistantError(
+                "Listeners for all events can not be limited to entity_ids or domains"
+            )
+        entity_ids_set = _lower_set(entity_ids)
+        domains_set = _lower_set(domains)
+        if not entity_ids_set and not domains_set:
+            raise HomeAssistantError(
+                f"Event listener {listener} is limited to no entity_ids or domains"
+            )
+        return self._async_listen_indexed_filterable_job(
+            event_type, filterable_job, entity_ids_set, domains_set
+        )
+
+    @callback
+    def _async_listen_indexed_filterable_job(
+        self,
+        event_type: str,
+        filterable_job: _FilterableJob,
+        entity_ids: set[str],
+        domains: set[str],
+    ) -> CALLBACK_TYPE:
+        indexed_listeners = self._indexed_listeners.setdefault(
+            event_type, _IndexedListeners()
+        )
+        for index, keys in (
+            (indexed_listeners.entity_ids, entity_ids),
+            (indexed_listeners.domains, domains),
+        ):
+            for key in keys:
+                index.setdefault(key, []).append(filterable_job)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the listener."""
+            try:
+                for index, keys in (
+                    (indexed_listeners.entity_ids, entity_ids),
+                    (indexed_listeners.domains, domains),
+                ):
+                    for key in keys:
+                        filterable_jobs = index[key]
+                        filterable_jobs.remove(filterable_job)
+                        if not filterable_jobs:
+                            del index[key]
+            except (KeyError, ValueError):
+                _LOGGER.exception(
+                    "Unable to remove unknown job listener %s", filterable_job
+                )
+            if not indexed_listeners:
+                self._indexed_listeners.pop(event_type, None)
+
+        return remove_listener
 
     @callback
     def _async_listen_filterable_job(
         self, event_type: str, filterable_job: _FilterableJob
     ) -> CALLBACK_TYPE:
         self._listeners.setdefault(event_type, []).append(filterable_job)
+        self._async_invalidate_dispatch(event_type)
 
         def remove_listener() -> None:
             """Remove the listener."""
@@ -1023,6 +1229,7 @@ class EventBus:
         """
         try:
             self._listeners[event_type].remove(filterable_job)
+            self._async_invalidate_dispatch(event_type)
 
             # delete event_type list if empty
             if not self._listeners[event_type]:
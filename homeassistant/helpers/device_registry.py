@@ -49,6 +49,9 @@ RUNTIME_ONLY_ATTRS = {"suggested_area"}
 class _DeviceIndex(NamedTuple):
     identifiers: dict[tuple[str, str], str]
     connections: dict[tuple[str, str], str]
+    # Only registered devices are indexed by area and config entry
+    area_ids: dict[str, dict[str, None]]
+    config_entries: dict[str, dict[str, None]]
 
 
 class DeviceEntryDisabler(StrEnum):
@@ -287,13 +290,23 @@ class DeviceRegistry:
         self.devices[new_device.id] = new_device
 
         devices_index = self._registered_index
-        _remove_device_from_index(devices_index, old_device)
-        _add_device_to_index(devices_index, new_device)
+        _remove_device_from_index(devices_index, old_device, new_device)
+        _add_device_to_index(devices_index, new_device, old_device)
 
     def _clear_index(self) -> None:
         """Clear the index."""
-        self._registered_index = _DeviceIndex(identifiers={}, connections={})
-        self._deleted_index = _DeviceIndex(identifiers={}, connections={})
+        self._registered_index = _DeviceIndex(
+            identifiers={}, connections={}, area_ids={}, config_entries={}
+        )
+        self._deleted_index = _DeviceIndex(
+            identifiers={}, connections={}, area_ids={}, config_entries={}
+        )
+
+    def _async_devices_for_index(
+        self, index: dict[str, dict[str, None]], key: str
+    ) -> list[DeviceEntry]:
+        """Return the registered devices indexed under key."""
+        return [self.devices[device_id] for device_id in index.get(key, ())]
 
     def _rebuild_index(self) -> None:
         """Create the index after loading devices."""
@@ -655,7 +668,7 @@ class DeviceRegistry:
     def async_clear_config_entry(self, config_entry_id: str) -> None:
         """Clear config entry from registry entries."""
         now_time = time.time()
-        for device in list(self.devices.values()):
+        for device in async_entries_for_config_entry(self, config_entry_id):
             self.async_update_device(device.id, remove_config_entry_id=config_entry_id)
         for deleted_device in list(self.deleted_devices.values()):
             config_entries = deleted_device.config_entries
@@ -668,8 +681,8 @@ class DeviceRegistry:
                 )
             else:
                 config_entries = config_entries - {config_entry_id}
-                # No need to reindex here since we currently
-                # do not have a lookup by config entry
+                # No need to reindex here since deleted devices
+                # are not indexed by config entry
                 self.deleted_devices[deleted_device.id] = attr.evolve(
                     deleted_device, config_entries=config_entries
                 )
@@ -696,9 +709,8 @@ class DeviceRegistry:
     @callback
     def async_clear_area_id(self, area_id: str) -> None:
         """Clear area id from registry entries."""
-        for dev_id, device in self.devices.items():
-            if area_id == device.area_id:
-                self.async_update_device(dev_id, area_id=None)
+        for device in async_entries_for_area(self, area_id):
+            self.async_update_device(device.id, area_id=None)
 
 
 @callback
@@ -729,7 +741,10 @@ async def async_get_registry(hass: HomeAssistant) -> DeviceRegistry:
 @callback
 def async_entries_for_area(registry: DeviceRegistry, area_id: str) -> list[DeviceEntry]:
     """Return entries that match an area."""
-    return [device for device in registry.devices.values() if device.area_id == area_id]
+    # pylint: disable-next=protected-access
+    return registry._async_devices_for_index(
+        registry._registered_index.area_ids, area_id
+    )
 
 
 @callback
@@ -737,11 +752,10 @@ def async_entries_for_config_entry(
     registry: DeviceRegistry, config_entry_id: str
 ) -> list[DeviceEntry]:
     """Return entries that match a config entry."""
-    return [
-        device
-        for device in registry.devices.values()
-        if config_entry_id in device.config_entries
-    ]
+    # pylint: disable-next=protected-access
+    return registry._async_devices_for_index(
+        registry._registered_index.config_entries, config_entry_id
+    )
 
 
 @callback
@@ -880,25 +894,69 @@ def _normalize_connections(connections: set[tuple[str, str]]) -> set[tuple[str,
     }
 
 
+def _area_and_config_entries(
+    device: DeviceEntry | DeletedDeviceEntry | None,
+) -> tuple[str | None, set[str]]:
+    """Return the area and config entries a device is indexed under."""
+    if not isinstance(device, DeviceEntry):
+        return None, set()
+    return device.area_id, device.config_entries
+
+
 def _add_device_to_index(
     devices_index: _DeviceIndex,
     device: DeviceEntry | DeletedDeviceEntry,
+    old_device: DeviceEntry | None = None,
 ) -> None:
-    """Add a device to the index."""
+    """Add a device to the index.
+
+    The area and config entries it shares with old_device, which was
+    just removed from the index, are not indexed again.
+    """
     for identifier in device.identifiers:
         devices_index.identifiers[identifier] = device.id
     for connection in device.connections:
         devices_index.connections[connection] = device.id
 
+    area_id, config_entries = _area_and_config_entries(device)
+    old_area_id, old_config_entries = _area_and_config_entries(old_device)
+    if area_id is not None and area_id != old_area_id:
+        devices_index.area_ids.setdefault(area_id, {})[device.id] = None
+    for config_entry_id in config_entries - old_config_entries:
+        devices_index.config_entries.setdefault(config_entry_id, {})[device.id] = None
+
 
 def _remove_device_from_index(
     devices_index: _DeviceIndex,
     device: DeviceEntry | DeletedDeviceEntry,
+    new_device: DeviceEntry | None = None,
 ) -> None:
-    """Remove a device from the index."""
+    """Remove a device from the index.
+
+    The area and config entries it shares with new_device, which is
+    added to the index next, stay indexed so lookups keep their order.
+    """
     for identifier in device.identifiers:
         if identifier in devices_index.identifiers:
             del devices_index.identifiers[identifier]
     for connection in device.connections:
         if connection in devices_index.connections:
             del devices_index.connections[connection]
+
+    area_id, config_entries = _area_and_config_entries(device)
+    new_area_id, new_config_entries = _area_and_config_entries(new_device)
+    if area_id is not None and area_id != new_area_id:
+        _remove_from_lookup(devices_index.area_ids, area_id, device.id)
+    for config_entry_id in config_entries - new_config_entries:
+        _remove_from_lookup(devices_index.config_entries, config_entry_id, device.id)
+
+
+def _remove_from_lookup(
+    lookup: dict[str, dict[str, None]], key: str, device_id: str
+) -> None:
+    """Remove a device id from a lookup."""
+    if (device_ids := lookup.get(key)) is None:
+        return
+    device_ids.pop(device_id, None)
+    if not device_ids:
+        del lookup[key]
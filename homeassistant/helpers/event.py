@@ -54,6 +54,10 @@ TRACK_STATE_REMOVED_DOMAIN_LISTENER = "track_state_removed_domain_listener"
 TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS = "track_entity_registry_updated_callbacks"
 TRACK_ENTITY_REGISTRY_UPDATED_LISTENER = "track_entity_registry_updated_listener"
 
+TRACK_TEMPLATE_REFRESH_BATCH = "track_template_refresh_batch"
+
+TRACK_TIME_TIMER_WHEEL = "track_time_timer_wheel"
+
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
 _ENTITIES_LISTENER = "entities"
@@ -790,6 +794,52 @@ def async_track_template(
 track_template = threaded_listener_factory(async_track_template)
 
 
+class _TemplateRefreshBatch:
+    """Re-render the templates invalidated by state changes in one go.
+
+    State changes that land in the same event loop iteration are collected
+    and each template tracker refreshes once with the final states.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the batch."""
+        self.hass = hass
+        self._pending: dict[_TrackTemplateResultInfo, None] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    @callback
+    def async_add(self, tracker: _TrackTemplateResultInfo) -> None:
+        """Refresh a tracker with the next batch."""
+        self._pending[tracker] = None
+        if self._task is None:
+            self._task = self.hass.async_create_task(self._async_refresh())
+
+    @callback
+    def async_discard(self, tracker: _TrackTemplateResultInfo) -> None:
+        """Stop a removed tracker from being refreshed."""
+        self._pending.pop(tracker, None)
+
+    async def _async_refresh(self) -> None:
+        """Refresh the trackers invalidated since the batch was scheduled."""
+        self._task = None
+        pending = self._pending
+        self._pending = {}
+        for tracker in pending:
+            # A failing tracker must not stop the others from refreshing
+            try:
+                tracker.async_refresh_pending()
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error while refreshing template tracker")
+
+
+@callback
+def _async_get_template_refresh_batch(hass: HomeAssistant) -> _TemplateRefreshBatch:
+    """Return the batch that refreshes template trackers."""
+    if (batch := hass.data.get(TRACK_TEMPLATE_REFRESH_BATCH)) is None:
+        batch = hass.data[TRACK_TEMPLATE_REFRESH_BATCH] = _TemplateRefreshBatch(hass)
+    return cast(_TemplateRefreshBatch, batch)
+
+
 class _TrackTemplateResultInfo:
     """Handle removal / refresh of tracker."""
 
@@ -815,6 +865,8 @@ class _TrackTemplateResultInfo:
         self._info: dict[Template, RenderInfo] = {}
         self._track_state_changes: _TrackStateChangeFiltered | None = None
         self._time_listeners: dict[Template, Callable[[], None]] = {}
+        self._batch = _async_get_template_refresh_batch(hass)
+        self._pending_events: list[Event] = []
 
     def async_setup(self, raise_on_template_error: bool, strict: bool = False) -> None:
         """Activation of template tracking."""
@@ -860,7 +912,9 @@ class _TrackTemplateResultInfo:
                 )
 
         self._track_state_changes = async_track_state_change_filtered(
-            self.hass, _render_infos_to_track_states(self._info.values()), self._refresh
+            self.hass,
+            _render_infos_to_track_states(self._info.values()),
+            self._async_state_changed,
         )
         self._update_time_listeners()
         _LOGGER.debug(
@@ -917,20 +971,41 @@ class _TrackTemplateResultInfo:
         self._rate_limit.async_remove()
         for template in list(self._time_listeners):
             self._time_listeners.pop(template)()
+        self._batch.async_discard(self)
+        self._pending_events.clear()
 
     @callback
     def async_refresh(self) -> None:
         """Force recalculate the template."""
         self._refresh(None)
 
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Queue a refresh for a state change."""
+        if not self._pending_events:
+            self._batch.async_add(self)
+        self._pending_events.append(event)
+
+    @callback
+    def async_refresh_pending(self) -> None:
+        """Refresh the templates for the state changes since the last batch."""
+        if not (events := self._pending_events):
+            return
+        self._pending_events = []
+        self._refresh(events[-1], events=events)
+
     def _render_template_if_ready(
         self,
         track_template_: TrackTemplate,
         now: datetime,
         event: Event | None,
+        events: Sequence[Event] | None = None,
     ) -> bool | TrackTemplateResult:
         """Re-render the template if conditions match.
 
+        events are the state changes coalesced into event, which
+        is the last of them.
+
         Returns False if the template was not re-rendered.
 
         Returns True if the template re-rendered and did not
@@ -944,14 +1019,27 @@ class _TrackTemplateResultInfo:
         if event:
             info = self._info[template]
 
-            if not _event_triggers_rerender(event, info):
+            triggering_events = [
+                event_
+                for event_ in events or (event,)
+                if _event_triggers_rerender(event_, info)
+            ]
+            if not triggering_events:
                 return False
 
+            event = triggering_events[-1]
+            # An entity referenced by the template is never rate limited
+            rate_limits = [
+                _rate_limit_for_event(event_, info, track_template_)
+                for event_ in triggering_events
+            ]
+            rate_limit = None if None in rate_limits else rate_limits[-1]
+
             had_timer = self._rate_limit.async_has_timer(template)
 
             if self._rate_limit.async_schedule_action(
                 template,
-                _rate_limit_for_event(event, info, track_template_),
+                rate_limit,
                 now,
                 self._refresh,
                 event,
@@ -1001,12 +1089,16 @@ class _TrackTemplateResultInfo:
         event: Event | None,
         track_templates: Iterable[TrackTemplate] | None = None,
         replayed: bool | None = False,
+        events: Sequence[Event] | None = None,
     ) -> None:
         """Refresh the template.
 
         The event is the state_changed event that caused the refresh
         to be considered.
 
+        events is an optional list of the state_changed events
+        coalesced into the refresh, ending with event.
+
         track_templates is an optional list of TrackTemplate objects
         to refresh.  If not provided, all tracked templates will be
         considered.
@@ -1039,7 +1131,7 @@ class _TrackTemplateResultInfo:
 
         # Update the super template first
         if super_template is not None:
-            update = self._render_template_if_ready(super_template, now, event)
+            update = self._render_template_if_ready(super_template, now, event, events)
             info_changed |= _apply_update(update, super_template.template)
 
             if isinstance(update, TrackTemplateResult):
@@ -1070,7 +1162,9 @@ class _TrackTemplateResultInfo:
                 if track_template_ == super_template:
                     continue
 
-                update = self._render_template_if_ready(track_template_, now, event)
+                update = self._render_template_if_ready(
+                    track_template_, now, event, events
+                )
                 info_changed |= _apply_update(update, track_template_.template)
 
         if info_changed:
@@ -1245,6 +1339,177 @@ def async_track_same_state(
 track_same_state = threaded_listener_factory(async_track_same_state)
 
 
+class _Timer:
+    """A timer waiting in the timer wheel."""
+
+    __slots__ = ("timestamp", "utc_point_in_time", "job", "owner", "cancelled")
+
+    def __init__(
+        self,
+        utc_point_in_time: datetime,
+        job: HassJob[Awaitable[None] | None],
+        owner: str,
+    ) -> None:
+        """Initialize the timer."""
+        self.timestamp = utc_point_in_time.timestamp()
+        self.utc_point_in_time = utc_point_in_time
+        self.job = job
+        self.owner = owner
+        self.cancelled = False
+
+
+class _TimerBucket:
+    """The timers due within one second and the loop handle that runs them."""
+
+    __slots__ = ("second", "timers", "handle", "handle_timestamp")
+
+    def __init__(self, second: int) -> None:
+        """Initialize the bucket."""
+        self.second = second
+        self.timers: dict[_Timer, None] = {}
+        self.handle: asyncio.TimerHandle | None = None
+        self.handle_timestamp = 0.0
+
+
+class _TimerWheel:
+    """Schedule timers on the event loop grouped into one second buckets.
+
+    All timers due within the same second share one loop handle, armed for
+    the earliest of them, so the loop holds a handle per second with timers
+    instead of one per timer. Cancelling a timer removes it from its bucket
+    and only cancels the loop handle once the bucket is empty.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the timer wheel."""
+        self.hass = hass
+        self._buckets: dict[int, _TimerBucket] = {}
+
+    @callback
+    def async_add(
+        self,
+        job: HassJob[Awaitable[None] | None],
+        utc_point_in_time: datetime,
+        owner: str,
+    ) -> _Timer:
+        """Add a timer that runs job at utc_point_in_time."""
+        timer = _Timer(utc_point_in_time, job, owner)
+        second = int(timer.timestamp)
+        if (bucket := self._buckets.get(second)) is None:
+            bucket = self._buckets[second] = _TimerBucket(second)
+        bucket.timers[timer] = None
+        if bucket.handle is None or timer.timestamp < bucket.handle_timestamp:
+            self._arm(bucket, timer.timestamp, timer.timestamp - time.time())
+        return timer
+
+    @callback
+    def async_cancel(self, timer: _Timer) -> None:
+        """Cancel a timer if it has not run yet."""
+        # A due timer is no longer in its bucket but may still be waiting
+        # for an earlier timer of the same run
+        timer.cancelled = True
+        bucket = self._buckets.get(int(timer.timestamp))
+        if bucket is None or timer not in bucket.timers:
+            return
+        del bucket.timers[timer]
+        if bucket.timers:
+            return
+        del self._buckets[bucket.second]
+        if bucket.handle is not None:
+            bucket.handle.cancel()
+
+    @callback
+    def async_pending_timers(self) -> dict[str, int]:
+        """Return the number of pending timers per owner."""
+        counts: dict[str, int] = {}
+        for bucket in self._buckets.values():
+            for timer in bucket.timers:
+                counts[timer.owner] = counts.get(timer.owner, 0) + 1
+        return counts
+
+    def _arm(self, bucket: _TimerBucket, timestamp: float, delay: float) -> None:
+        """Arm the loop handle of a bucket."""
+        if bucket.handle is not None:
+            bucket.handle.cancel()
+        bucket.handle_timestamp = timestamp
+        bucket.handle = self.hass.loop.call_later(delay, self._run_bucket, bucket)
+
+    @callback
+    def _run_bucket(self, bucket: _TimerBucket) -> None:
+        """Run the timers of a bucket which are due."""
+        if self._buckets.get(bucket.second) is not bucket:
+            return
+        bucket.handle = None
+        now = time_tracker_utcnow().timestamp()
+        due = [timer for timer in bucket.timers if timer.timestamp <= now]
+        for timer in due:
+            del bucket.timers[timer]
+
+        if bucket.timers:
+            # Depending on the available clock support (including timer hardware
+            # and the OS kernel) it can happen that we fire a little bit too early
+            # as measured by utcnow(). That is bad when callbacks have assumptions
+            # about the current time. Thus, we rearm the timer for the remaining
+            # time.
+            earliest = min(timer.timestamp for timer in bucket.timers)
+            if not due:
+                _LOGGER.debug("Called %f seconds too early, rearming", earliest - now)
+            self._arm(bucket, earliest, earliest - now)
+        else:
+            del self._buckets[bucket.second]
+
+        due.sort(key=lambda timer: timer.timestamp)
+        for timer in due:
+            if timer.cancelled:
+                continue
+            try:
+                self.hass.async_run_hass_job(timer.job, timer.utc_point_in_time)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running timer job %s", timer.job)
+
+
+@callback
+def _async_get_timer_wheel(hass: HomeAssistant) -> _TimerWheel:
+    """Return the timer wheel of hass."""
+    if (wheel := hass.data.get(TRACK_TIME_TIMER_WHEEL)) is None:
+        wheel = hass.data[TRACK_TIME_TIMER_WHEEL] = _TimerWheel(hass)
+    return cast(_TimerWheel, wheel)
+
+
+def _timer_owner(target: Any) -> str:
+    """Return the module which owns a timer running target."""
+    while isinstance(target, ft.partial):
+        target = target.func
+    return getattr(target, "__module__", None) or "unknown"
+
+
+@callback
+@bind_hass
+def async_get_pending_timers(hass: HomeAssistant) -> dict[str, int]:
+    """Return the number of pending time listeners per owning module."""
+    return _async_get_timer_wheel(hass).async_pending_timers()
+
+
+@callback
+def _async_track_point_in_utc_time(
+    hass: HomeAssistant,
+    job: HassJob[Awaitable[None] | None],
+    point_in_time: datetime,
+    owner: str,
+) -> CALLBACK_TYPE:
+    """Add a listener for a point in UTC time on behalf of owner."""
+    wheel = _async_get_timer_wheel(hass)
+    # Ensure point_in_time is UTC
+    timer = wheel.async_add(job, dt_util.as_utc(point_in_time), owner)
+
+    @callback
+    def unsub_point_in_time_listener() -> None:
+        """Cancel the timer."""
+        wheel.async_cancel(timer)
+
+    return unsub_point_in_time_listener
+
+
 @callback
 @bind_hass
 def async_track_point_in_time(
@@ -1261,7 +1526,9 @@ def async_track_point_in_time(
         """Convert passed in UTC now to local now."""
         hass.async_run_hass_job(job, dt_util.as_local(utc_now))
 
-    return async_track_point_in_utc_time(hass, utc_converter, point_in_time)
+    return _async_track_point_in_utc_time(
+        hass, HassJob(utc_converter), point_in_time, _timer_owner(job.target)
+    )
 
 
 track_point_in_time = threaded_listener_factory(async_track_point_in_time)
@@ -1276,44 +1543,12 @@ def async_track_point_in_utc_time(
     point_in_time: datetime,
 ) -> CALLBACK_TYPE:
     """Add a listener that fires once after a specific point in UTC time."""
-    # Ensure point_in_time is UTC
-    utc_point_in_time = dt_util.as_utc(point_in_time)
-
     # Since this is called once, we accept a HassJob so we can avoid
     # having to figure out how to call the action every time its called.
-    cancel_callback: asyncio.TimerHandle | None = None
-
-    @callback
-    def run_action(job: HassJob[Awaitable[None] | None]) -> None:
-        """Call the action."""
-        nonlocal cancel_callback
-
-        now = time_tracker_utcnow()
-
-        # Depending on the available clock support (including timer hardware
-        # and the OS kernel) it can happen that we fire a little bit too early
-        # as measured by utcnow(). That is bad when callbacks have assumptions
-        # about the current time. Thus, we rearm the timer for the remaining
-        # time.
-        if (delta := (utc_point_in_time - now).total_seconds()) > 0:
-            _LOGGER.debug("Called %f seconds too early, rearming", delta)
-
-            cancel_callback = hass.loop.call_later(delta, run_action, job)
-            return
-
-        hass.async_run_hass_job(job, utc_point_in_time)
-
     job = action if isinstance(action, HassJob) else HassJob(action)
-    delta = utc_point_in_time.timestamp() - time.time()
-    cancel_callback = hass.loop.call_later(delta, run_action, job)
-
-    @callback
-    def unsub_point_in_time_listener() -> None:
-        """Cancel the call_later."""
-        assert cancel_callback is not None
-        cancel_callback.cancel()
-
-    return unsub_point_in_time_listener
+    return _async_track_point_in_utc_time(
+        hass, job, point_in_time, _timer_owner(job.target)
+    )
 
 
 track_point_in_utc_time = threaded_listener_factory(async_track_point_in_utc_time)
@@ -1359,13 +1594,16 @@ def async_track_time_interval(
         nonlocal remove
         nonlocal interval_listener_job
 
-        remove = async_track_point_in_utc_time(
-            hass, interval_listener_job, next_interval()
+        remove = _async_track_point_in_utc_time(
+            hass, interval_listener_job, next_interval(), owner
         )
         hass.async_run_hass_job(job, now)
 
+    owner = _timer_owner(action)
     interval_listener_job = HassJob(interval_listener)
-    remove = async_track_point_in_utc_time(hass, interval_listener_job, next_interval())
+    remove = _async_track_point_in_utc_time(
+        hass, interval_listener_job, next_interval(), owner
+    )
 
     def remove_listener() -> None:
         """Remove interval listener."""
@@ -1415,10 +1653,11 @@ class SunListener:
         """Set up the sun event listener."""
         assert self._unsub_sun is None
 
-        self._unsub_sun = async_track_point_in_utc_time(
+        self._unsub_sun = _async_track_point_in_utc_time(
             self.hass,
-            self._handle_sun_event,
+            HassJob(self._handle_sun_event),
             get_astral_event_next(self.hass, self.event, offset=self.offset),
+            _timer_owner(self.job.target),
         )
 
     @callback
@@ -1502,6 +1741,7 @@ def async_track_utc_time_change(
         )
 
     time_listener: CALLBACK_TYPE | None = None
+    owner = _timer_owner(action)
 
     @callback
     def pattern_time_change_listener(_: datetime) -> None:
@@ -1511,14 +1751,19 @@ def async_track_utc_time_change(
         now = time_tracker_utcnow()
         hass.async_run_hass_job(job, dt_util.as_local(now) if local else now)
 
-        time_listener = async_track_point_in_utc_time(
+        time_listener = _async_track_point_in_utc_time(
             hass,
-            pattern_time_change_listener,
+            pattern_time_change_listener_job,
             calculate_next(now + timedelta(seconds=1)),
+            owner,
         )
 
-    time_listener = async_track_point_in_utc_time(
-        hass, pattern_time_change_listener, calculate_next(dt_util.utcnow())
+    pattern_time_change_listener_job = HassJob(pattern_time_change_listener)
+    time_listener = _async_track_point_in_utc_time(
+        hass,
+        pattern_time_change_listener_job,
+        calculate_next(dt_util.utcnow()),
+        owner,
     )
 
     @callback
@@ -1591,8 +1836,9 @@ def _render_infos_needs_all_listener(render_infos: Iterable[RenderInfo]) -> bool
 
         # Previous call had an exception
         # so we do not know which states
-        # to track
-        if render_info.exception:
+        # to track unless they were found
+        # from the template source
+        if render_info.exception and not render_info.dependencies_from_source:
             return True
 
     return False
@@ -9,22 +9,26 @@ from collections.abc import Callable, Generator, Iterable
 from contextlib import contextmanager, suppress
 from contextvars import ContextVar
 from datetime import datetime, timedelta
-from functools import partial, wraps
+from functools import lru_cache, partial, wraps
 import json
 import logging
+import marshal
 import math
 from operator import attrgetter
+import os
 import random
 import re
 import statistics
 from struct import error as StructError, pack, unpack_from
 import sys
-from typing import Any, cast
+import threading
+from types import CodeType
+from typing import Any, NamedTuple, cast
 from urllib.parse import urlencode as urllib_urlencode
-import weakref
 
 import jinja2
-from jinja2 import pass_context, pass_environment
+from jinja2 import nodes, pass_context, pass_environment
+from jinja2.bccache import bc_magic
 from jinja2.sandbox import ImmutableSandboxedEnvironment
 from jinja2.utils import Namespace
 import voluptuous as vol
@@ -35,10 +39,14 @@ from homeassistant.const import (
     ATTR_LONGITUDE,
     ATTR_PERSONS,
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
+    EVENT_HOMEASSISTANT_STARTED,
     LENGTH_METERS,
     STATE_UNKNOWN,
+    __version__ as HA_VERSION,
 )
 from homeassistant.core import (
+    Event,
     HomeAssistant,
     State,
     callback,
@@ -57,6 +65,7 @@ from homeassistant.util.async_ import run_callback_threadsafe
 from homeassistant.util.thread import ThreadWithException
 
 from . import area_registry, device_registry, entity_registry, location as loc_helper
+from .storage import STORAGE_DIR
 from .typing import TemplateVarsType
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
@@ -69,6 +78,15 @@ _RENDER_INFO = "template.render_info"
 _ENVIRONMENT = "template.environment"
 _ENVIRONMENT_LIMITED = "template.environment_limited"
 _ENVIRONMENT_STRICT = "template.environment_strict"
+_BYTECODE_CACHE = "template.bytecode_cache"
+
+BYTECODE_CACHE_FILE = "template.bytecode_cache"
+BYTECODE_CACHE_SIZE = 4096
+# The compiled code can only be loaded by the same Python and Jinja versions,
+# and Home Assistant version since filters can be folded into it at compile time
+_BYTECODE_CACHE_MAGIC = (
+    bc_magic + jinja2.__version__.encode() + b"-" + HA_VERSION.encode() + b"\n"
+)
 
 _RE_JINJA_DELIMITERS = re.compile(r"\{%|\{\{|\{#")
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
@@ -221,6 +239,143 @@ def _false(arg: str) -> bool:
     return False
 
 
+# Functions which look up the states of the entity ids passed to them
+_STATE_FUNCTIONS = {"states", "is_state", "is_state_attr", "state_attr"}
+# Names which read states in ways the source does not reveal
+_DYNAMIC_STATE_NAMES = {"states", "expand", "closest", "distance"}
+_TIME_FUNCTIONS = {"now", "utcnow"}
+
+
+class SourceDependencies(NamedTuple):
+    """The states a template depends on according to its source."""
+
+    entities: frozenset[str]
+    domains: frozenset[str]
+    expand: tuple[str, ...]
+    has_time: bool
+
+
+class _SourceDependencyCollector:
+    """Collect the states referenced by a template from its syntax tree."""
+
+    def __init__(self) -> None:
+        """Initialize the collector."""
+        self.entities: set[str] = set()
+        self.domains: set[str] = set()
+        self.expand: list[str] = []
+        self.has_time = False
+        self.complete = True
+
+    @staticmethod
+    def _const_str(node: nodes.Node) -> str | None:
+        """Return the value of a string constant node."""
+        if isinstance(node, nodes.Const) and isinstance(node.value, str):
+            return node.value.lower()
+        return None
+
+    @staticmethod
+    def _key(node: nodes.Getattr | nodes.Getitem) -> str | None:
+        """Return the attribute or constant item looked up by a node."""
+        if isinstance(node, nodes.Getattr):
+            return cast(str, node.attr).lower()
+        return _SourceDependencyCollector._const_str(node.arg)
+
+    @staticmethod
+    def _is_states(node: nodes.Node) -> bool:
+        """Return if the node is the states object."""
+        return isinstance(node, nodes.Name) and node.name == "states"
+
+    def _visit_lookup(self, node: nodes.Getattr | nodes.Getitem) -> bool:
+        """Collect a states.domain or states.domain.object_id lookup."""
+        if self._is_states(node.node):
+            if (key := self._key(node)) is None:
+                self.complete = False
+            elif "." in key:
+                self.entities.add(key)
+            else:
+                self.domains.add(key)
+            return True
+        if isinstance(node.node, (nodes.Getattr, nodes.Getitem)) and self._is_states(
+            node.node.node
+        ):
+            domain = self._key(node.node)
+            object_id = self._key(node)
+            if domain is None or object_id is None:
+                self.complete = False
+            else:
+                self.entities.add(f"{domain}.{object_id}")
+            return True
+        return False
+
+    def _visit_call(self, node: nodes.Call) -> bool:
+        """Collect a call of a function which looks up states."""
+        if not isinstance(node.node, nodes.Name) or node.dyn_args or node.dyn_kwargs:
+            return False
+        name = node.node.name
+        if name == "expand":
+            values = [self._const_str(arg) for arg in node.args]
+            if node.kwargs or None in values:
+                return False
+            self.expand.extend(cast(list[str], values))
+            return True
+        if name not in _STATE_FUNCTIONS or not node.args:
+            return False
+        if (entity_id := self._const_str(node.args[0])) is None:
+            return False
+        self.entities.add(entity_id)
+        for child in (*node.args[1:], *node.kwargs):
+            self.visit(child)
+        return True
+
+    def visit(self, node: nodes.Node) -> None:
+        """Collect the states referenced by a node and its children."""
+        if not self.complete:
+            return
+        if isinstance(node, (nodes.Getattr, nodes.Getitem)):
+            if self._visit_lookup(node):
+                return
+        elif isinstance(node, nodes.Call):
+            if self._visit_call(node):
+                return
+        elif isinstance(node, nodes.Filter) and node.name == "expand":
+            if (entity_id := self._const_str(node.node)) is None or node.args:
+                self.complete = False
+                return
+            self.expand.append(entity_id)
+            return
+        elif isinstance(node, nodes.Name):
+            if node.name in _DYNAMIC_STATE_NAMES or node.name in _STATE_FUNCTIONS:
+                self.complete = False
+            elif node.name in _TIME_FUNCTIONS:
+                self.has_time = True
+            return
+        for child in node.iter_child_nodes():
+            self.visit(child)
+
+
+@lru_cache(maxsize=BYTECODE_CACHE_SIZE)
+def source_dependencies(source: str) -> SourceDependencies | None:
+    """Return the states a template depends on according to its source.
+
+    Only constant entity ids and domains can be found, so None is returned
+    when a template reads states which can only be known by rendering it.
+    """
+    try:
+        tree = _NO_HASS_ENV.parse(source)
+    except jinja2.TemplateSyntaxError:
+        return None
+    collector = _SourceDependencyCollector()
+    collector.visit(tree)
+    if not collector.complete:
+        return None
+    return SourceDependencies(
+        frozenset(collector.entities),
+        frozenset(collector.domains),
+        tuple(collector.expand),
+        collector.has_time,
+    )
+
+
 class RenderInfo:
     """Holds information about a template render."""
 
@@ -240,6 +395,8 @@ class RenderInfo:
         self.entities: collections.abc.Set[str] = set()
         self.rate_limit: timedelta | None = None
         self.has_time = False
+        # The render failed but the states it depends on are known
+        self.dependencies_from_source = False
 
     def __repr__(self) -> str:
         """Representation of RenderInfo."""
@@ -278,13 +435,17 @@ class RenderInfo:
     def _freeze(self) -> None:
         self._freeze_sets()
 
+        unknown_dependencies = (
+            self.exception is not None and not self.dependencies_from_source
+        )
+
         if self.rate_limit is None:
-            if self.all_states or self.exception:
+            if self.all_states or unknown_dependencies:
                 self.rate_limit = ALL_STATES_RATE_LIMIT
             elif self.domains or self.domains_lifecycle:
                 self.rate_limit = DOMAIN_STATES_RATE_LIMIT
 
-        if self.exception:
+        if unknown_dependencies:
             return
 
         if not self.all_states_lifecycle:
@@ -525,12 +686,38 @@ class Template:
             render_info._result = self.async_render(variables, strict=strict, **kwargs)
         except TemplateError as ex:
             render_info.exception = ex
+            render_info.dependencies_from_source = self._async_collect_from_source()
         finally:
             del self.hass.data[_RENDER_INFO]
 
         render_info._freeze()
         return render_info
 
+    @callback
+    def _async_collect_from_source(self) -> bool:
+        """Collect the states the template depends on from its source.
+
+        Used when a render fails before it reached all the states the
+        template reads. Returns False if they can not be found without
+        rendering.
+        """
+        render_info: RenderInfo = self.hass.data[_RENDER_INFO]
+        if (
+            render_info.all_states
+            or render_info.all_states_lifecycle
+            or (dependencies := source_dependencies(self.template)) is None
+        ):
+            return False
+        render_info.entities.update(dependencies.entities)
+        render_info.domains.update(dependencies.domains)
+        render_info.domains_lifecycle.update(dependencies.domains)
+        if dependencies.expand:
+            # Collects the expanded entities and the groups themselves
+            expand(self.hass, *dependencies.expand)
+        if dependencies.has_time:
+            render_info.has_time = True
+        return True
+
     def render_with_possible_json_value(self, value, error_value=_SENTINEL):
         """Render template with value exposed.
 
@@ -1883,6 +2070,141 @@ class LoggingUndefined(jinja2.Undefined):
         return super().__bool__()
 
 
+class TemplateBytecodeCache:
+    """Bounded cache of compiled template code.
+
+    The code is cached per environment type and template source, and is
+    shared by the template environments of an instance. The cache can be
+    saved to disk so templates do not have to be compiled again after a
+    restart.
+    """
+
+    def __init__(self, max_size: int = BYTECODE_CACHE_SIZE) -> None:
+        """Initialize the cache."""
+        self._code: collections.OrderedDict[
+            tuple[str, str], CodeType
+        ] = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._max_size = max_size
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached templates."""
+        return len(self._code)
+
+    @property
+    def hit_rate(self) -> float | None:
+        """Return the fraction of compiles which were answered from the cache."""
+        if not (lookups := self.hits + self.misses):
+            return None
+        return self.hits / lookups
+
+    def get(self, key: tuple[str, str]) -> CodeType | None:
+        """Return the cached code and mark it as recently used."""
+        with self._lock:
+            if (code := self._code.get(key)) is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._code.move_to_end(key)
+            return code
+
+    def add(self, key: tuple[str, str], code: CodeType) -> None:
+        """Add compiled code to the cache."""
+        with self._lock:
+            self._code[key] = code
+            if len(self._code) > self._max_size:
+                self._code.popitem(last=False)
+            self.dirty = True
+
+    def load(self, path: str) -> None:
+        """Load the compiled code saved by a previous run.
+
+        The loaded code is older than anything compiled since startup
+        so it is evicted first.
+        """
+        try:
+            with open(path, "rb") as cache_file:
+                if cache_file.read(len(_BYTECODE_CACHE_MAGIC)) != _BYTECODE_CACHE_MAGIC:
+                    return
+                saved: dict[tuple[str, str], CodeType] = marshal.load(cache_file)
+        except FileNotFoundError:
+            return
+        except (OSError, EOFError, ValueError, TypeError) as err:
+            _LOGGER.warning("Unable to load template cache %s: %s", path, err)
+            return
+        with self._lock:
+            for key, code in saved.items():
+                if len(self._code) >= self._max_size:
+                    break
+                if key not in self._code:
+                    self._code[key] = code
+                    self._code.move_to_end(key, last=False)
+
+    def save(self, path: str) -> None:
+        """Save the compiled code to disk."""
+        with self._lock:
+            code = dict(self._code)
+            self.dirty = False
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "wb") as cache_file:
+                cache_file.write(_BYTECODE_CACHE_MAGIC)
+                marshal.dump(code, cache_file)
+            os.replace(tmp_path, path)
+        except OSError as err:
+            _LOGGER.warning("Unable to save template cache %s: %s", path, err)
+            return
+        _LOGGER.debug(
+            "Saved %s compiled templates to %s, %s compiles answered from the "
+            "cache and %s missed",
+            len(code),
+            path,
+            self.hits,
+            self.misses,
+        )
+
+
+@callback
+def _async_get_bytecode_cache(hass: HomeAssistant) -> TemplateBytecodeCache:
+    """Return the compiled template code cache of an instance."""
+    cache: TemplateBytecodeCache | None = hass.data.get(_BYTECODE_CACHE)
+    if cache is None:
+        cache = hass.data[_BYTECODE_CACHE] = TemplateBytecodeCache()
+    return cache
+
+
+@callback
+def async_get_bytecode_cache_info(hass: HomeAssistant) -> dict[str, int]:
+    """Return how many template compiles were answered from the code cache."""
+    cache = _async_get_bytecode_cache(hass)
+    return {
+        "template_cache_hits": cache.hits,
+        "template_cache_misses": cache.misses,
+    }
+
+
+async def async_load_bytecode_cache(hass: HomeAssistant) -> None:
+    """Load the compiled template code saved by the previous run.
+
+    The cache is saved again once Home Assistant has started and when it
+    stops, if templates were compiled in the meantime.
+    """
+    cache = _async_get_bytecode_cache(hass)
+    path = hass.config.path(STORAGE_DIR, BYTECODE_CACHE_FILE)
+    await hass.async_add_executor_job(cache.load, path)
+
+    async def _async_save(_event: Event) -> None:
+        if cache.dirty:
+            await hass.async_add_executor_job(cache.save, path)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _async_save)
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_FINAL_WRITE, _async_save)
+
+
 class TemplateEnvironment(ImmutableSandboxedEnvironment):
     """The Home Assistant template environment."""
 
@@ -1894,7 +2216,15 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             undefined = jinja2.StrictUndefined
         super().__init__(undefined=undefined)
         self.hass = hass
-        self.template_cache = weakref.WeakValueDictionary()
+        if limited:
+            self.env_type = "limited"
+        elif strict:
+            self.env_type = "strict"
+        else:
+            self.env_type = "normal"
+        self.template_cache = (
+            TemplateBytecodeCache() if hass is None else _async_get_bytecode_cache(hass)
+        )
         self.filters["round"] = forgiving_round
         self.filters["multiply"] = multiply
         self.filters["log"] = logarithm
@@ -2082,14 +2412,17 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             or filename is not None
             or raw is not False
             or defer_init is not False
+            or not isinstance(source, str)
         ):
-            # If there are any non-default keywords args, we do
-            # not cache.  In prodution we currently do not have
-            # any instance of this.
+            # If there are any non-default keywords args or the
+            # source is already parsed, we do not cache.  In prodution
+            # we currently do not have any instance of this.
             return super().compile(source, name, filename, raw, defer_init)
 
-        if (cached := self.template_cache.get(source)) is None:
-            cached = self.template_cache[source] = super().compile(source)
+        key = (self.env_type, source)
+        if (cached := self.template_cache.get(key)) is None:
+            cached = super().compile(source)
+            self.template_cache.add(key, cached)
 
         return cached
 
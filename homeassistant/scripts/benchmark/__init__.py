@@ -8,18 +8,22 @@ from collections.abc import Callable
 from contextlib import suppress
 import json
 import logging
+import tempfile
 from timeit import default_timer as timer
 from typing import TypeVar
 
 from homeassistant import core
 from homeassistant.components.websocket_api.const import JSON_DUMP
-from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.const import EVENT_STATE_CHANGED, MATCH_ALL
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
 from homeassistant.helpers.event import (
+    TrackTemplate,
     async_track_state_change,
     async_track_state_change_event,
+    async_track_template_result,
 )
 from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.template import Template
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
 # mypy: no-warn-return-any
@@ -121,6 +125,72 @@ async def fire_events_with_filter(hass):
     return timer() - start
 
 
+@benchmark
+async def fire_events_with_match_all(hass):
+    """Fire a million events with a match all listener and a filtered listener."""
+    count = 0
+    event_name = "benchmark_event"
+    events_to_fire = 10**6
+
+    @core.callback
+    def event_filter(event):
+        """Filter event."""
+        return False
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+    hass.bus.async_listen(MATCH_ALL, listener)
+    hass.bus.async_listen(event_name, listener, event_filter=event_filter)
+
+    start = timer()
+
+    for _ in range(events_to_fire):
+        hass.bus.async_fire(event_name)
+
+    await hass.async_block_till_done()
+
+    assert count == events_to_fire
+
+    return timer() - start
+
+
+@benchmark
+async def fire_events_with_shared_filter(hass):
+    """Fire a million events to 50 listeners sharing a filter that rejects them."""
+    count = 0
+    event_name = "benchmark_event"
+    events_to_fire = 10**6
+
+    @core.callback
+    def event_filter(event):
+        """Filter event."""
+        return False
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+    for _ in range(50):
+        hass.bus.async_listen(event_name, listener, event_filter=event_filter)
+
+    start = timer()
+
+    for _ in range(events_to_fire):
+        hass.bus.async_fire(event_name)
+
+    await hass.async_block_till_done()
+
+    assert count == 0
+
+    return timer() - start
+
+
 @benchmark
 async def state_changed_helper(hass):
     """Run a million events through state changed helper with 1000 entities."""
@@ -290,6 +360,42 @@ async def filtering_entity_id(hass):
     return timer() - start
 
 
+@benchmark
+async def template_state_change_bursts(hass):
+    """Run 1000 state changes in bursts of 10 through 500 tracked templates."""
+    source_count = 10
+    bursts = 100
+    renders = 0
+    template_str = " + ".join(
+        f"(states('sensor.source_{idx}') | float(0))" for idx in range(source_count)
+    )
+
+    @core.callback
+    def listener(event, updates):
+        """Handle template results."""
+        nonlocal renders
+        renders += len(updates)
+
+    for idx in range(500):
+        async_track_template_result(
+            hass,
+            [TrackTemplate(Template(f"{{{{ {template_str} + {idx} }}}}", hass), None)],
+            listener,
+        )
+    await hass.async_block_till_done()
+
+    start = timer()
+
+    for value in range(bursts):
+        for idx in range(source_count):
+            hass.states.async_set(f"sensor.source_{idx}", str(value))
+        await hass.async_block_till_done()
+
+    runtime = timer() - start
+    print(f"Delivered {renders} template results")
+    return runtime
+
+
 @benchmark
 async def valid_entity_id(hass):
     """Run valid entity ID a million times."""
@@ -312,6 +418,68 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+async def _recorder_write_states(hass, bulk_insert):
+    """Record 30k state changes from 3000 entities, committing every 3000."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.recorder.core import Recorder
+
+    entity_count = 3000
+    rounds = 10
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        hass.state = core.CoreState.running
+        instance = Recorder(
+            hass,
+            auto_purge=False,
+            auto_repack=False,
+            keep_days=10,
+            commit_interval=1,
+            uri=f"sqlite:///{tmpdir}/benchmark.db",
+            db_max_retries=10,
+            db_retry_wait=3,
+            entity_filter=lambda entity_id: True,
+            exclude_t=[],
+            exclude_attributes_by_domain={},
+            bulk_insert=bulk_insert,
+        )
+        instance.async_initialize()
+        instance.async_register()
+        instance.start()
+        assert await instance.async_db_ready
+        await instance.async_recorder_ready.wait()
+
+        start = timer()
+
+        for idx in range(rounds):
+            for entity_idx in range(entity_count):
+                hass.states.async_set(
+                    f"sensor.benchmark_{entity_idx}",
+                    str(idx),
+                    {
+                        "unit_of_measurement": "W",
+                        "friendly_name": f"Power {entity_idx}",
+                    },
+                )
+            await instance.async_block_till_done()
+
+        runtime = timer() - start
+        print(f"Recorded {int(entity_count * rounds / runtime)} events/s")
+        await hass.async_stop()
+        return runtime
+
+
+@benchmark
+async def recorder_write_states(hass):
+    """Record 30k state changes with the ORM write path."""
+    return await _recorder_write_states(hass, False)
+
+
+@benchmark
+async def recorder_bulk_write_states(hass):
+    """Record 30k state changes with the bulk insert write path."""
+    return await _recorder_write_states(hass, True)
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
@@ -327,9 +495,10 @@ def _create_state_changed_event_from_old_new(
         [
             "event_type"
             "event_data"
-            "time_fired"
-            "context_id"
-            "context_user_id"
+            "time_fired_ts"
+            "context_id_bin"
+            "context_user_id_bin"
+            "context_parent_id_bin"
             "state"
             "entity_id"
             "domain"
@@ -342,12 +511,13 @@ def _create_state_changed_event_from_old_new(
     row.event_type = EVENT_STATE_CHANGED
     row.event_data = "{}"
     row.attributes = attributes_json
-    row.time_fired = event_time_fired
+    row.time_fired_ts = event_time_fired.timestamp()
     row.state = new_state and new_state.get("state")
     row.entity_id = entity_id
     row.domain = entity_id and core.split_entity_id(entity_id)[0]
-    row.context_id = None
-    row.context_user_id = None
+    row.context_id_bin = None
+    row.context_user_id_bin = None
+    row.context_parent_id_bin = None
     row.old_state_id = old_state and 1
     row.state_id = new_state and 1
 
@@ -3,6 +3,8 @@ from __future__ import annotations
 
 from collections import deque
 from collections.abc import Callable
+import datetime
+from functools import partial
 import json
 import logging
 from typing import Any
@@ -12,9 +14,109 @@ from homeassistant.exceptions import HomeAssistantError
 
 from .file import write_utf8_file, write_utf8_file_atomic
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
 _LOGGER = logging.getLogger(__name__)
 
 
+class JSONEncoder(json.JSONEncoder):
+    """JSONEncoder that supports Home Assistant objects."""
+
+    def default(self, o: Any) -> Any:
+        """Convert Home Assistant objects.
+
+        Hand other objects to the original method.
+        """
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        if isinstance(o, set):
+            return list(o)
+        if hasattr(o, "as_dict"):
+            return o.as_dict()
+
+        return json.JSONEncoder.default(self, o)
+
+
+def json_encoder_default(obj: Any) -> Any:
+    """Convert Home Assistant objects for orjson.
+
+    orjson serializes datetimes natively, so only the objects
+    that JSONEncoder handles beyond that are converted here.
+    """
+    if isinstance(obj, set):
+        return list(obj)
+    if hasattr(obj, "as_dict"):
+        return obj.as_dict()
+    # Named tuples are serialized as lists by the json module
+    if isinstance(obj, tuple):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _orjson_bytes(data: Any) -> bytes:
+    """Serialize data to JSON bytes with orjson."""
+    return orjson.dumps(
+        data, option=orjson.OPT_NON_STR_KEYS, default=json_encoder_default
+    )
+
+
+def _orjson_bytes_pretty(
+    data: Any, default: Callable[[Any], Any] | None = json_encoder_default
+) -> bytes:
+    """Serialize data to JSON bytes indented by 2 with orjson."""
+    return orjson.dumps(
+        data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=default
+    )
+
+
+_json_dumps_compact: Callable[[Any], str] = partial(
+    json.dumps, cls=JSONEncoder, allow_nan=False, separators=(",", ":")
+)
+
+
+def _stdlib_bytes(data: Any) -> bytes:
+    """Serialize data to JSON bytes with the json module."""
+    return _json_dumps_compact(data).encode("utf-8")
+
+
+def _stdlib_bytes_pretty(
+    data: Any, default: Callable[[Any], Any] | None = json_encoder_default
+) -> bytes:
+    """Serialize data to JSON bytes indented by 4 with the json module."""
+    return json.dumps(
+        data, indent=4, cls=JSONEncoder if default is not None else None
+    ).encode("utf-8")
+
+
+if orjson is not None:
+    json_bytes = _orjson_bytes
+    json_bytes_pretty = _orjson_bytes_pretty
+else:  # pragma: no cover
+    json_bytes = _stdlib_bytes
+    json_bytes_pretty = _stdlib_bytes_pretty
+
+
+def json_dumps(data: Any) -> str:
+    """Serialize data to a JSON string.
+
+    Uses orjson when it is installed and the json module otherwise.
+    """
+    return json_bytes(data).decode("utf-8")
+
+
+def json_dumps_pretty(
+    data: Any, default: Callable[[Any], Any] | None = json_encoder_default
+) -> str:
+    """Serialize data to an indented JSON string for files.
+
+    Pass None as default to only serialize native JSON types.
+    """
+    return json_bytes_pretty(data, default).decode("utf-8")
+
+
 class SerializationError(HomeAssistantError):
     """Error serializing the data to JSON."""
 
@@ -53,12 +155,23 @@ def save_json(
 ) -> None:
     """Save JSON data to a file.
 
+    Data is serialized with orjson when it is installed, unless a custom
+    encoder is passed.
+
     Returns True on success.
     """
+    dump: Callable[[Any], str] = partial(json_dumps_pretty, default=None)
     try:
-        json_data = json.dumps(data, indent=4, cls=encoder)
+        if encoder is None:
+            json_data = dump(data)
+        elif encoder is JSONEncoder:
+            dump = json_dumps_pretty
+            json_data = dump(data)
+        else:
+            dump = partial(json.dumps, indent=4, cls=encoder)
+            json_data = dump(data)
     except TypeError as error:
-        msg = f"Failed to serialize to JSON: {filename}. Bad data at {format_unserializable_data(find_paths_unserializable_data(data))}"
+        msg = f"Failed to serialize to JSON: {filename}. Bad data at {format_unserializable_data(find_paths_unserializable_data(data, dump=dump))}"
         _LOGGER.error(msg)
         raise SerializationError(msg) from error
 
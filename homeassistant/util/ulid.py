@@ -4,6 +4,12 @@ from __future__ import annotations
 from random import getrandbits
 import time
 
+_CROCKFORD_BASE32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_CROCKFORD_BASE32_DECODE = {
+    **{char: idx for idx, char in enumerate(_CROCKFORD_BASE32)},
+    **{char.lower(): idx for idx, char in enumerate(_CROCKFORD_BASE32)},
+}
+
 
 def ulid_hex() -> str:
     """Generate a ULID in lowercase hex that will work for a UUID.
@@ -35,41 +41,67 @@ def ulid(timestamp: float | None = None) -> str:
     import ulid
     ulid.parse(ulid_util.ulid())
     """
-    ulid_bytes = int((timestamp or time.time()) * 1000).to_bytes(
-        6, byteorder="big"
-    ) + int(getrandbits(80)).to_bytes(10, byteorder="big")
+    return bytes_to_ulid(ulid_bytes(timestamp))
+
+
+def ulid_bytes(timestamp: float | None = None) -> bytes:
+    """Generate a ULID in its compact 16 byte form."""
+    return int((timestamp or time.time()) * 1000).to_bytes(6, byteorder="big") + int(
+        getrandbits(80)
+    ).to_bytes(10, byteorder="big")
+
 
+def bytes_to_ulid(value: bytes) -> str:
+    """Convert the 16 byte form of a ULID to its string form."""
     # This is base32 crockford encoding with the loop unrolled for performance
     #
     # This code is adapted from:
     # https://github.com/ahawker/ulid/blob/06289583e9de4286b4d80b4ad000d137816502ca/ulid/base32.py#L102
     #
-    enc = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+    enc = _CROCKFORD_BASE32
     return (
-        enc[(ulid_bytes[0] & 224) >> 5]
-        + enc[ulid_bytes[0] & 31]
-        + enc[(ulid_bytes[1] & 248) >> 3]
-        + enc[((ulid_bytes[1] & 7) << 2) | ((ulid_bytes[2] & 192) >> 6)]
-        + enc[((ulid_bytes[2] & 62) >> 1)]
-        + enc[((ulid_bytes[2] & 1) << 4) | ((ulid_bytes[3] & 240) >> 4)]
-        + enc[((ulid_bytes[3] & 15) << 1) | ((ulid_bytes[4] & 128) >> 7)]
-        + enc[(ulid_bytes[4] & 124) >> 2]
-        + enc[((ulid_bytes[4] & 3) << 3) | ((ulid_bytes[5] & 224) >> 5)]
-        + enc[ulid_bytes[5] & 31]
-        + enc[(ulid_bytes[6] & 248) >> 3]
-        + enc[((ulid_bytes[6] & 7) << 2) | ((ulid_bytes[7] & 192) >> 6)]
-        + enc[(ulid_bytes[7] & 62) >> 1]
-        + enc[((ulid_bytes[7] & 1) << 4) | ((ulid_bytes[8] & 240) >> 4)]
-        + enc[((ulid_bytes[8] & 15) << 1) | ((ulid_bytes[9] & 128) >> 7)]
-        + enc[(ulid_bytes[9] & 124) >> 2]
-        + enc[((ulid_bytes[9] & 3) << 3) | ((ulid_bytes[10] & 224) >> 5)]
-        + enc[ulid_bytes[10] & 31]
-        + enc[(ulid_bytes[11] & 248) >> 3]
-        + enc[((ulid_bytes[11] & 7) << 2) | ((ulid_bytes[12] & 192) >> 6)]
-        + enc[(ulid_bytes[12] & 62) >> 1]
-        + enc[((ulid_bytes[12] & 1) << 4) | ((ulid_bytes[13] & 240) >> 4)]
-        + enc[((ulid_bytes[13] & 15) << 1) | ((ulid_bytes[14] & 128) >> 7)]
-        + enc[(ulid_bytes[14] & 124) >> 2]
-        + enc[((ulid_bytes[14] & 3) << 3) | ((ulid_bytes[15] & 224) >> 5)]
-        + enc[ulid_bytes[15] & 31]
+        enc[(value[0] & 224) >> 5]
+        + enc[value[0] & 31]
+        + enc[(value[1] & 248) >> 3]
+        + enc[((value[1] & 7) << 2) | ((value[2] & 192) >> 6)]
+        + enc[((value[2] & 62) >> 1)]
+        + enc[((value[2] & 1) << 4) | ((value[3] & 240) >> 4)]
+        + enc[((value[3] & 15) << 1) | ((value[4] & 128) >> 7)]
+        + enc[(value[4] & 124) >> 2]
+        + enc[((value[4] & 3) << 3) | ((value[5] & 224) >> 5)]
+        + enc[value[5] & 31]
+        + enc[(value[6] & 248) >> 3]
+        + enc[((value[6] & 7) << 2) | ((value[7] & 192) >> 6)]
+        + enc[(value[7] & 62) >> 1]
+        + enc[((value[7] & 1) << 4) | ((value[8] & 240) >> 4)]
+        + enc[((value[8] & 15) << 1) | ((value[9] & 128) >> 7)]
+        + enc[(value[9] & 124) >> 2]
+        + enc[((value[9] & 3) << 3) | ((value[10] & 224) >> 5)]
+        + enc[value[10] & 31]
+        + enc[(value[11] & 248) >> 3]
+        + enc[((value[11] & 7) << 2) | ((value[12] & 192) >> 6)]
+        + enc[(value[12] & 62) >> 1]
+        + enc[((value[12] & 1) << 4) | ((value[13] & 240) >> 4)]
+        + enc[((value[13] & 15) << 1) | ((value[14] & 128) >> 7)]
+        + enc[(value[14] & 124) >> 2]
+        + enc[((value[14] & 3) << 3) | ((value[15] & 224) >> 5)]
+        + enc[value[15] & 31]
     )
+
+
+def ulid_to_bytes(ulid_str: str) -> bytes:
+    """Convert a ULID string to its compact 16 byte form.
+
+    Raises ValueError if the string is not a valid ULID.
+    """
+    if len(ulid_str) != 26:
+        raise ValueError(f"ULID must be 26 characters: {ulid_str}")
+    value = 0
+    try:
+        for char in ulid_str:
+            value = (value << 5) | _CROCKFORD_BASE32_DECODE[char]
+    except KeyError as err:
+        raise ValueError(f"ULID has an invalid character: {ulid_str}") from err
+    if value >> 128:
+        raise ValueError(f"ULID is out of range: {ulid_str}")
+    return value.to_bytes(16, byteorder="big")
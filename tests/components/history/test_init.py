@@ -1543,3 +1543,67 @@ async def test_history_during_period_with_use_include_order(
         *sort_order,
         "sensor.three",
     ]
+
+
+async def test_history_during_period_columnar(hass, hass_ws_client, recorder_mock):
+    """Test history_during_period with the columnar format."""
+    now = dt_util.utcnow()
+
+    await async_setup_component(hass, "history", {})
+    await async_setup_component(hass, "sensor", {})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "on", attributes={"any": "attr"})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "off", attributes={"any": "attr"})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "off", attributes={"any": "changed"})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", "on", attributes={"any": "attr"})
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/history_during_period",
+            "start_time": now.isoformat(),
+            "entity_ids": ["sensor.test"],
+            "significant_changes_only": False,
+            "columnar": True,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["id"] == 1
+
+    sensor_test_history = response["result"]["sensor.test"]
+    assert sensor_test_history["s"] == ["on", "off", "off", "on"]
+    assert len(sensor_test_history["lu"]) == 4
+    assert all(isinstance(lu, float) for lu in sensor_test_history["lu"])
+    assert sensor_test_history["lc"] == [[2, sensor_test_history["lu"][1]]]
+    assert sensor_test_history["a"] == [
+        [0, {"any": "attr"}],
+        [2, {"any": "changed"}],
+        [3, {"any": "attr"}],
+    ]
+
+    await client.send_json(
+        {
+            "id": 2,
+            "type": "history/history_during_period",
+            "start_time": now.isoformat(),
+            "entity_ids": ["sensor.test"],
+            "significant_changes_only": False,
+            "minimal_response": True,
+            "no_attributes": True,
+            "columnar": True,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["id"] == 2
+
+    sensor_test_history = response["result"]["sensor.test"]
+    assert sensor_test_history["s"] == ["on", "off", "on"]
+    assert len(sensor_test_history["lu"]) == 3
+    assert "a" not in sensor_test_history
@@ -0,0 +1,177 @@
+"""The tests for the history websocket stream."""
+import asyncio
+from datetime import timedelta
+from unittest.mock import patch
+
+from homeassistant.components.websocket_api.const import TYPE_RESULT
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
+
+from tests.components.recorder.common import (
+    async_recorder_block_till_done,
+    async_wait_recording_done,
+)
+
+
+async def test_history_stream_historical_only(hass, recorder_mock, hass_ws_client):
+    """Test history stream with an end time in the past."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    hass.states.async_set("sensor.one", "on", attributes={"any": "attr"})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.two", "off", attributes={"any": "attr"})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.three", "off", attributes={"any": "changed"})
+    sensor_three_last_updated = hass.states.get("sensor.three").last_updated
+    await async_wait_recording_done(hass)
+    end_time = dt_util.utcnow()
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "entity_ids": ["sensor.one", "sensor.three"],
+            "start_time": now.isoformat(),
+            "end_time": end_time.isoformat(),
+            "include_start_time_state": True,
+            "significant_changes_only": False,
+            "no_attributes": True,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["id"] == 1
+    assert response["type"] == TYPE_RESULT
+
+    response = await client.receive_json()
+    assert response["id"] == 1
+    assert response["type"] == "event"
+    assert "partial" not in response["event"]
+    assert response["event"]["start_time"] == now.timestamp()
+    assert response["event"]["end_time"] == end_time.timestamp()
+    assert response["event"]["states"] == {
+        "sensor.one": [
+            {
+                "a": {},
+                "lu": hass.states.get("sensor.one").last_updated.timestamp(),
+                "s": "on",
+            }
+        ],
+        "sensor.three": [
+            {"a": {}, "lu": sensor_three_last_updated.timestamp(), "s": "off"}
+        ],
+    }
+
+
+@patch("homeassistant.components.history.websocket_stream.STATE_COALESCE_TIME", 0)
+async def test_history_stream_live(hass, recorder_mock, hass_ws_client):
+    """Test history stream sends historical states and then live states."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    hass.states.async_set("sensor.one", "on", attributes={"any": "attr"})
+    sensor_one_last_updated = hass.states.get("sensor.one").last_updated
+    hass.states.async_set("sensor.other", "on")
+    await async_wait_recording_done(hass)
+    init_count = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "entity_ids": ["sensor.one", "sensor.two"],
+            "start_time": now.isoformat(),
+            "include_start_time_state": True,
+            "significant_changes_only": True,
+            "minimal_response": True,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+
+    response = await asyncio.wait_for(client.receive_json(), 2)
+    assert response["id"] == 1
+    assert response["type"] == "event"
+    assert response["event"]["partial"] is True
+    assert response["event"]["start_time"] == now.timestamp()
+    assert response["event"]["states"] == {
+        "sensor.one": [
+            {"a": {"any": "attr"}, "lu": sensor_one_last_updated.timestamp(), "s": "on"}
+        ]
+    }
+    # The states that were not committed at the time of the first query
+    response = await asyncio.wait_for(client.receive_json(), 2)
+    assert response["id"] == 1
+    assert "partial" not in response["event"]
+    assert response["event"]["states"] == {}
+
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == init_count + 1
+
+    hass.states.async_set("sensor.one", "on", attributes={"any": "changed"})
+    hass.states.async_set("sensor.other", "off")
+    hass.states.async_set("sensor.two", "off", attributes={"any": "attr"})
+    sensor_two_last_updated = hass.states.get("sensor.two").last_updated
+    hass.states.async_set("sensor.one", "off", attributes={"any": "changed"})
+    sensor_one_last_updated = hass.states.get("sensor.one").last_updated
+
+    response = await asyncio.wait_for(client.receive_json(), 2)
+    assert response["id"] == 1
+    assert response["type"] == "event"
+    assert response["event"] == {
+        "states": {
+            "sensor.two": [
+                {
+                    "a": {"any": "attr"},
+                    "lu": sensor_two_last_updated.timestamp(),
+                    "s": "off",
+                }
+            ],
+            "sensor.one": [{"lu": sensor_one_last_updated.timestamp(), "s": "off"}],
+        }
+    }
+
+    await client.send_json({"id": 2, "type": "unsubscribe_events", "subscription": 1})
+    response = await client.receive_json()
+    assert response["id"] == 2
+    assert response["success"]
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == init_count
+
+
+async def test_history_stream_bad_start_time(hass, recorder_mock, hass_ws_client):
+    """Test history stream with a start time in the future."""
+    await async_setup_component(hass, "history", {})
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "entity_ids": ["sensor.one"],
+            "start_time": (dt_util.utcnow() + timedelta(hours=1)).isoformat(),
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_start_time"
+
+
+async def test_history_stream_bad_end_time(hass, recorder_mock, hass_ws_client):
+    """Test history stream with an end time before the start time."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "entity_ids": ["sensor.one"],
+            "start_time": now.isoformat(),
+            "end_time": (now - timedelta(hours=1)).isoformat(),
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_end_time"
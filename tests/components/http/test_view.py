@@ -1,5 +1,6 @@
 """Tests for Home Assistant View."""
 from http import HTTPStatus
+import json
 from unittest.mock import AsyncMock, Mock
 
 from aiohttp.web_exceptions import (
@@ -34,9 +35,15 @@ async def test_invalid_json(caplog):
     view = HomeAssistantView()
 
     with pytest.raises(HTTPInternalServerError):
-        view.json(float("NaN"))
+        view.json(object)
 
-    assert str(float("NaN")) in caplog.text
+    assert str(object) in caplog.text
+
+
+async def test_nan_serialized_to_null():
+    """Test nan serialized to null JSON."""
+    response = HomeAssistantView.json(float("NaN"))
+    assert json.loads(response.body.decode("utf-8")) is None
 
 
 async def test_handling_unauthorized(mock_request):
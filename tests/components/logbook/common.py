@@ -6,7 +6,10 @@ from typing import Any
 
 from homeassistant.components import logbook
 from homeassistant.components.logbook import processor
-from homeassistant.components.recorder.models import process_timestamp_to_utc_isoformat
+from homeassistant.components.recorder.models import (
+    context_id_to_bytes_or_none,
+    uuid_hex_to_bytes_or_none,
+)
 from homeassistant.core import Context
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.json import JSONEncoder
@@ -26,10 +29,16 @@ class MockRow:
         self.event_type = event_type
         self.shared_data = json.dumps(data, cls=JSONEncoder)
         self.data = data
-        self.time_fired = dt_util.utcnow()
-        self.context_parent_id = context.parent_id if context else None
-        self.context_user_id = context.user_id if context else None
-        self.context_id = context.id if context else None
+        self.time_fired_ts = dt_util.utc_to_timestamp(dt_util.utcnow())
+        self.context_parent_id_bin = (
+            context_id_to_bytes_or_none(context.parent_id) if context else None
+        )
+        self.context_user_id_bin = (
+            uuid_hex_to_bytes_or_none(context.user_id) if context else None
+        )
+        self.context_id_bin = (
+            context_id_to_bytes_or_none(context.id) if context else None
+        )
         self.state = None
         self.entity_id = None
         self.state_id = None
@@ -41,12 +50,12 @@ class MockRow:
     @property
     def time_fired_minute(self):
         """Minute the event was fired."""
-        return self.time_fired.minute
+        return dt_util.utc_from_timestamp(self.time_fired_ts).minute
 
     @property
     def time_fired_isoformat(self):
         """Time event was fired in utc isoformat."""
-        return process_timestamp_to_utc_isoformat(self.time_fired)
+        return dt_util.utc_from_timestamp(self.time_fired_ts).isoformat()
 
 
 def mock_humanify(hass_, rows):
@@ -11,12 +11,14 @@ from unittest.mock import Mock, patch
 import pytest
 import voluptuous as vol
 
-from homeassistant.components import logbook
+from homeassistant.components import logbook, recorder
 from homeassistant.components.alexa.smart_home import EVENT_ALEXA_SMART_HOME
 from homeassistant.components.automation import EVENT_AUTOMATION_TRIGGERED
 from homeassistant.components.logbook.models import LazyEventPartialState
 from homeassistant.components.logbook.processor import EventProcessor
 from homeassistant.components.logbook.queries.common import PSUEDO_EVENT_STATE_CHANGED
+from homeassistant.components.recorder.models import States
+from homeassistant.components.recorder.util import session_scope
 from homeassistant.components.script import EVENT_SCRIPT_STARTED
 from homeassistant.components.sensor import SensorStateClass
 from homeassistant.const import (
@@ -315,10 +317,10 @@ def create_state_changed_event_from_old_new(
         [
             "event_type"
             "event_data"
-            "time_fired"
-            "context_id"
-            "context_user_id"
-            "context_parent_id"
+            "time_fired_ts"
+            "context_id_bin"
+            "context_user_id_bin"
+            "context_parent_id_bin"
             "state"
             "entity_id"
             "domain"
@@ -336,17 +338,17 @@ def create_state_changed_event_from_old_new(
     row.shared_data = "{}"
     row.attributes = attributes_json
     row.shared_attrs = attributes_json
-    row.time_fired = event_time_fired
+    row.time_fired_ts = dt_util.utc_to_timestamp(event_time_fired)
     row.state = new_state and new_state.get("state")
     row.entity_id = entity_id
     row.domain = entity_id and ha.split_entity_id(entity_id)[0]
     row.context_only = False
-    row.context_id = None
+    row.context_id_bin = None
     row.friendly_name = None
     row.icon = None
     row.old_format_icon = None
-    row.context_user_id = None
-    row.context_parent_id = None
+    row.context_user_id_bin = None
+    row.context_parent_id_bin = None
     row.old_state_id = old_state and 1
     row.state_id = new_state and 1
     return LazyEventPartialState(row, {})
@@ -1051,7 +1053,7 @@ async def test_logbook_context_id_automation_script_started_manually(
     # An Automation
     automation_entity_id_test = "automation.alarm"
     automation_context = ha.Context(
-        id="fc5bd62de45711eaaeb351041eec8dd9",
+        id="01GTDGKBCH00GW0X476W5TVAAA",
         user_id="f400facee45711eaa9308bfd3d19e474",
     )
     hass.bus.async_fire(
@@ -1060,7 +1062,7 @@ async def test_logbook_context_id_automation_script_started_manually(
         context=automation_context,
     )
     script_context = ha.Context(
-        id="ac5bd62de45711eaaeb351041eec8dd9",
+        id="01GTDGKBCH00GW0X476W5TVDDD",
         user_id="b400facee45711eaa9308bfd3d19e474",
     )
     hass.bus.async_fire(
@@ -1072,7 +1074,7 @@ async def test_logbook_context_id_automation_script_started_manually(
     hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
 
     script_2_context = ha.Context(
-        id="1234",
+        id="01GTDGKBCH00GW0X476W5TV111",
         user_id="b400facee45711eaa9308bfd3d19e474",
     )
     hass.bus.async_fire(
@@ -1103,12 +1105,12 @@ async def test_logbook_context_id_automation_script_started_manually(
     assert json_dict[0]["entity_id"] == "automation.alarm"
     assert "context_entity_id" not in json_dict[0]
     assert json_dict[0]["context_user_id"] == "f400facee45711eaa9308bfd3d19e474"
-    assert json_dict[0]["context_id"] == "fc5bd62de45711eaaeb351041eec8dd9"
+    assert json_dict[0]["context_id"] == "01GTDGKBCH00GW0X476W5TVAAA"
 
     assert json_dict[1]["entity_id"] == "script.mock_script"
     assert "context_entity_id" not in json_dict[1]
     assert json_dict[1]["context_user_id"] == "b400facee45711eaa9308bfd3d19e474"
-    assert json_dict[1]["context_id"] == "ac5bd62de45711eaaeb351041eec8dd9"
+    assert json_dict[1]["context_id"] == "01GTDGKBCH00GW0X476W5TVDDD"
 
     assert json_dict[2]["domain"] == "homeassistant"
 
@@ -1116,7 +1118,7 @@ async def test_logbook_context_id_automation_script_started_manually(
     assert json_dict[3]["name"] == "Mock script"
     assert "context_entity_id" not in json_dict[1]
     assert json_dict[3]["context_user_id"] == "b400facee45711eaa9308bfd3d19e474"
-    assert json_dict[3]["context_id"] == "1234"
+    assert json_dict[3]["context_id"] == "01GTDGKBCH00GW0X476W5TV111"
 
     assert json_dict[4]["entity_id"] == "switch.new"
     assert json_dict[4]["state"] == "off"
@@ -1751,6 +1753,45 @@ async def test_icon_and_state(hass, hass_client, recorder_mock):
     assert response_json[2]["state"] == STATE_OFF
 
 
+@pytest.mark.parametrize(
+    "recorder_config", [{recorder.CONF_SPLIT_STATIC_ATTRIBUTES: True}]
+)
+async def test_icon_from_static_attributes(hass, hass_client, recorder_mock):
+    """Test icons stored with the static attributes are returned."""
+    await asyncio.gather(
+        *[
+            async_setup_component(hass, comp, {})
+            for comp in ("homeassistant", "logbook")
+        ]
+    )
+
+    await async_recorder_block_till_done(hass)
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+
+    hass.states.async_set("light.kitchen", STATE_OFF, {"icon": "mdi:lamp"})
+    hass.states.async_set(
+        "light.kitchen", STATE_ON, {"brightness": 100, "icon": "mdi:lamp"}
+    )
+    hass.states.async_set("light.kitchen", STATE_OFF, {"icon": "mdi:lamp-outline"})
+
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert all(db_state.static_attributes_id for db_state in session.query(States))
+
+    client = await hass_client()
+    response_json = await _async_fetch_logbook(client)
+
+    assert len(response_json) == 3
+    assert response_json[1]["entity_id"] == "light.kitchen"
+    assert response_json[1]["icon"] == "mdi:lamp"
+    assert response_json[1]["state"] == STATE_ON
+    assert response_json[2]["entity_id"] == "light.kitchen"
+    assert response_json[2]["icon"] == "mdi:lamp-outline"
+    assert response_json[2]["state"] == STATE_OFF
+
+
 async def test_fire_logbook_entries(hass, hass_client, recorder_mock):
     """Test many logbook entry calls."""
     await async_setup_component(hass, "logbook", {})
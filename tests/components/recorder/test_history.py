@@ -18,6 +18,7 @@ from homeassistant.components.recorder.models import (
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
     process_timestamp,
 )
 from homeassistant.components.recorder.util import session_scope
@@ -75,6 +76,7 @@ def _add_db_entries(
                     event_data="{}",
                     origin="LOCAL",
                     time_fired=point,
+                    time_fired_ts=point.timestamp(),
                 )
             )
             session.add(
@@ -84,8 +86,10 @@ def _add_db_entries(
                     attributes='{"name":"the light"}',
                     last_changed=None,
                     last_updated=point,
+                    last_updated_ts=point.timestamp(),
                     event_id=1001 + idx,
                     attributes_id=1002 + idx,
+                    states_meta_rel=StatesMeta(entity_id=entity_id),
                 )
             )
             session.add(
@@ -572,6 +576,94 @@ def test_get_significant_states_only(hass_recorder):
     assert states == hist[entity_id]
 
 
+def _columns_to_compressed_states(columns: dict) -> list[dict]:
+    """Expand the columnar format to a list of compressed states."""
+    last_changed = dict(columns.get("lc", []))
+    attribute_changes = dict(columns.get("a", []))
+    compressed_states = []
+    attributes = {}
+    for idx, (state, last_updated) in enumerate(zip(columns["s"], columns["lu"])):
+        attributes = attribute_changes.get(idx, attributes)
+        compressed_state = {"s": state, "a": attributes, "lu": last_updated}
+        if idx in last_changed:
+            compressed_state["lc"] = last_changed[idx]
+        compressed_states.append(compressed_state)
+    return compressed_states
+
+
+@pytest.mark.parametrize("significant_changes_only", [True, False])
+@pytest.mark.parametrize("include_start_time_state", [True, False])
+def test_get_significant_states_columnar(
+    hass_recorder, significant_changes_only, include_start_time_state
+):
+    """Test the columnar format matches the compressed state format."""
+    hass = hass_recorder()
+    zero, four, _ = record_states(hass)
+    one = zero + timedelta(seconds=1.5)
+    for start_time in (zero, one):
+        for entity_ids in (None, ["media_player.test"], ["thermostat.test"]):
+            compressed = history.get_significant_states(
+                hass,
+                start_time,
+                four,
+                entity_ids,
+                include_start_time_state=include_start_time_state,
+                significant_changes_only=significant_changes_only,
+                compressed_state_format=True,
+            )
+            columnar = history.get_significant_states_columnar(
+                hass,
+                start_time,
+                four,
+                entity_ids,
+                include_start_time_state=include_start_time_state,
+                significant_changes_only=significant_changes_only,
+            )
+            assert list(columnar) == list(compressed)
+            assert {
+                entity_id: _columns_to_compressed_states(columns)
+                for entity_id, columns in columnar.items()
+            } == compressed
+
+
+def test_get_significant_states_columnar_minimal_response(hass_recorder):
+    """Test the columnar format drops repeated states with minimal_response."""
+    hass = hass_recorder()
+    zero, four, states = record_states(hass)
+    columnar = history.get_significant_states_columnar(
+        hass, zero, four, minimal_response=True, significant_changes_only=False
+    )
+
+    mp_states = states["media_player.test"]
+    assert columnar["media_player.test"] == {
+        "s": ["idle", "YouTube", "Netflix"],
+        "lu": [state.last_updated.timestamp() for state in mp_states],
+        "a": [[0, {"media_title": str(sentinel.mt1)}]],
+    }
+    # Attribute changes are kept for domains that need attributes
+    therm_states = states["thermostat.test"]
+    assert columnar["thermostat.test"] == {
+        "s": ["20", "21", "21"],
+        "lu": [state.last_updated.timestamp() for state in therm_states],
+        "a": [
+            [0, {"current_temperature": 19.5}],
+            [1, {"current_temperature": 19.8}],
+            [2, {"current_temperature": 20}],
+        ],
+        "lc": [[2, therm_states[1].last_changed.timestamp()]],
+    }
+
+    no_attributes = history.get_significant_states_columnar(
+        hass, zero, four, ["media_player.test"], no_attributes=True
+    )
+    assert no_attributes == {
+        "media_player.test": {
+            "s": ["idle", "YouTube", "Netflix"],
+            "lu": [state.last_updated.timestamp() for state in mp_states],
+        }
+    }
+
+
 def record_states(hass) -> tuple[datetime, datetime, dict[str, list[State]]]:
     """Record some test states.
 
@@ -797,6 +889,44 @@ async def test_get_states_query_during_migration_to_schema_25_multiple_entities(
         assert hist[1].attributes == {"name": "the light"}
 
 
+async def test_state_changes_during_period_query_during_migration_to_schema_30(
+    hass: ha.HomeAssistant,
+    async_setup_recorder_instance: SetupRecorderInstanceT,
+):
+    """Test we can query data prior to schema 30 and during migration to schema 30."""
+    instance = await async_setup_recorder_instance(hass, {})
+
+    start = dt_util.utcnow()
+    point = start + timedelta(seconds=1)
+    end = point + timedelta(seconds=1)
+    entity_id = "light.test"
+    await recorder.get_instance(hass).async_add_executor_job(
+        _add_db_entries, hass, point, [entity_id]
+    )
+
+    with instance.engine.connect() as conn:
+        conn.execute(text("update states set last_updated_ts=NULL;"))
+        conn.commit()
+
+    with patch.object(instance, "schema_version", 29):
+        hist = history.state_changes_during_period(
+            hass, start, end, entity_id, include_start_time_state=False
+        )
+        state = hist[entity_id][0]
+        assert state.attributes == {"name": "the shared light"}
+        assert state.last_updated == point
+
+        hist = history.get_significant_states(
+            hass, start, end, [entity_id], compressed_state_format=True
+        )
+        assert hist[entity_id] == [
+            {"s": "on", "a": {"name": "the shared light"}, "lu": point.timestamp()}
+        ]
+
+        hist = await _async_get_states(hass, end, [entity_id])
+        assert hist[0].last_updated == point
+
+
 async def test_get_full_significant_states_handles_empty_last_changed(
     hass: ha.HomeAssistant,
     async_setup_recorder_instance: SetupRecorderInstanceT,
@@ -871,10 +1001,14 @@ async def test_get_full_significant_states_handles_empty_last_changed(
     db_sensor_one_states = await recorder.get_instance(hass).async_add_executor_job(
         _fetch_db_states
     )
-    assert db_sensor_one_states[0].last_changed is None
+    assert db_sensor_one_states[0].last_changed_ts is None
+    assert (
+        dt_util.utc_from_timestamp(db_sensor_one_states[1].last_changed_ts)
+        == state0.last_changed
+    )
+    assert db_sensor_one_states[0].last_updated_ts is not None
+    assert db_sensor_one_states[1].last_updated_ts is not None
     assert (
-        process_timestamp(db_sensor_one_states[1].last_changed) == state0.last_changed
+        db_sensor_one_states[0].last_updated_ts
+        != db_sensor_one_states[1].last_updated_ts
     )
-    assert db_sensor_one_states[0].last_updated is not None
-    assert db_sensor_one_states[1].last_updated is not None
-    assert db_sensor_one_states[0].last_updated != db_sensor_one_states[1].last_updated
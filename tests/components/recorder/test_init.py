@@ -4,6 +4,7 @@ from __future__ import annotations
 # pylint: disable=protected-access
 import asyncio
 from datetime import datetime, timedelta
+import os
 import sqlite3
 import threading
 from typing import cast
@@ -11,6 +12,7 @@ from unittest.mock import Mock, patch
 
 import pytest
 from sqlalchemy.exc import DatabaseError, OperationalError, SQLAlchemyError
+from sqlalchemy.sql import text
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder import (
@@ -24,6 +26,7 @@ from homeassistant.components.recorder import (
     Recorder,
     get_instance,
 )
+from homeassistant.components.recorder import history
 from homeassistant.components.recorder.const import DATA_INSTANCE, KEEPALIVE_TIME
 from homeassistant.components.recorder.models import (
     SCHEMA_VERSION,
@@ -32,6 +35,7 @@ from homeassistant.components.recorder.models import (
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
     StatisticsRuns,
     process_timestamp,
 )
@@ -41,16 +45,26 @@ from homeassistant.components.recorder.services import (
     SERVICE_PURGE,
     SERVICE_PURGE_ENTITIES,
 )
+from homeassistant.components.recorder.spool import EventSpool
+from homeassistant.components.recorder.tasks import RecorderTask
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import (
     EVENT_HOMEASSISTANT_FINAL_WRITE,
     EVENT_HOMEASSISTANT_STARTED,
     EVENT_HOMEASSISTANT_STOP,
+    EVENT_STATE_CHANGED,
     MATCH_ALL,
     STATE_LOCKED,
     STATE_UNLOCKED,
 )
-from homeassistant.core import CoreState, Event, HomeAssistant, callback
+from homeassistant.core import (
+    CoreState,
+    Event,
+    EventOrigin,
+    HomeAssistant,
+    State,
+    callback,
+)
 from homeassistant.setup import async_setup_component, setup_component
 from homeassistant.util import dt as dt_util
 
@@ -84,6 +98,9 @@ def _default_recorder(hass):
         entity_filter=CONFIG_SCHEMA({DOMAIN: {}}),
         exclude_t=[],
         exclude_attributes_by_domain={},
+        bulk_insert=False,
+        spool=False,
+        split_static_attributes=False,
     )
 
 
@@ -143,6 +160,46 @@ async def test_shutdown_closes_connections(hass, recorder_mock):
         assert instance.get_session()
 
 
+async def test_read_only_sessions_use_separate_connections(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT, tmp_path
+):
+    """Test read-only sessions on a file database cannot write."""
+    config = {
+        recorder.CONF_DB_URL: "sqlite:///" + str(tmp_path / "pytest.db"),
+        recorder.CONF_COMMIT_INTERVAL: 0,
+    }
+    await async_setup_recorder_instance(hass, config)
+    hass.states.async_set("test.recorder", "on")
+    await async_wait_recording_done(hass)
+    instance = get_instance(hass)
+
+    def _read_and_write():
+        with session_scope(hass=hass, read_only=True) as session:
+            assert session.bind is not instance.engine
+            assert len(list(session.query(States))) == 1
+        with pytest.raises(OperationalError), session_scope(
+            hass=hass, read_only=True
+        ) as session:
+            session.execute(text("DELETE FROM states"))
+        with session_scope(hass=hass) as session:
+            assert len(list(session.query(States))) == 1
+
+    await instance.async_add_executor_job(_read_and_write)
+    assert instance.executor_queue_stats.jobs == 1
+    assert instance.executor_queue_stats.queue_time_avg is not None
+
+
+async def test_read_only_sessions_in_memory_database(hass, recorder_mock):
+    """Test read-only sessions use the regular connection for in-memory databases."""
+    instance = get_instance(hass)
+
+    def _get_bind():
+        with session_scope(hass=hass, read_only=True) as session:
+            return session.bind
+
+    assert await instance.async_add_executor_job(_get_bind) is instance.engine
+
+
 async def test_state_gets_saved_when_set_before_start_event(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
@@ -611,11 +668,11 @@ def test_saving_state_and_removing_entity(hass, hass_recorder):
     with session_scope(hass=hass) as session:
         states = list(session.query(States))
         assert len(states) == 3
-        assert states[0].entity_id == entity_id
+        assert states[0].states_meta_rel.entity_id == entity_id
         assert states[0].state == STATE_LOCKED
-        assert states[1].entity_id == entity_id
+        assert states[1].states_meta_rel.entity_id == entity_id
         assert states[1].state == STATE_UNLOCKED
-        assert states[2].entity_id == entity_id
+        assert states[2].states_meta_rel.entity_id == entity_id
         assert states[2].state is None
 
 
@@ -1015,10 +1072,10 @@ def test_saving_sets_old_state(hass_recorder):
         states = list(session.query(States))
         assert len(states) == 4
 
-        assert states[0].entity_id == "test.one"
-        assert states[1].entity_id == "test.two"
-        assert states[2].entity_id == "test.one"
-        assert states[3].entity_id == "test.two"
+        assert states[0].states_meta_rel.entity_id == "test.one"
+        assert states[1].states_meta_rel.entity_id == "test.two"
+        assert states[2].states_meta_rel.entity_id == "test.one"
+        assert states[3].states_meta_rel.entity_id == "test.two"
 
         assert states[0].old_state_id is None
         assert states[1].old_state_id is None
@@ -1042,8 +1099,8 @@ def test_saving_state_with_serializable_data(hass_recorder, caplog):
         states = list(session.query(States))
         assert len(states) == 2
 
-        assert states[0].entity_id == "test.two"
-        assert states[1].entity_id == "test.two"
+        assert states[0].states_meta_rel.entity_id == "test.two"
+        assert states[1].states_meta_rel.entity_id == "test.two"
         assert states[0].old_state_id is None
         assert states[1].old_state_id == states[0].state_id
 
@@ -1529,7 +1586,8 @@ def test_deduplication_state_attributes_inside_commit_interval(hass_recorder, ca
     with session_scope(hass=hass) as session:
         states = list(
             session.query(States)
-            .filter(States.entity_id == entity_id)
+            .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .filter(StatesMeta.entity_id == entity_id)
             .outerjoin(
                 StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
             )
@@ -1553,10 +1611,385 @@ async def test_async_block_till_done(hass, async_setup_recorder_instance):
 
     def _fetch_states():
         with session_scope(hass=hass) as session:
-            return list(session.query(States).filter(States.entity_id == entity_id))
+            return list(
+                session.query(States)
+                .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+                .filter(StatesMeta.entity_id == entity_id)
+            )
 
     await async_block_recorder(hass, 0.1)
     await instance.async_block_till_done()
     states = await instance.async_add_executor_job(_fetch_states)
     assert len(states) == 2
     await hass.async_block_till_done()
+
+
+def test_bulk_insert_saves_states_and_old_states(hass_recorder):
+    """Test the bulk insert mode saves states and resolves old states in a batch."""
+    hass = hass_recorder({"bulk_insert": True})
+
+    hass.states.set("test.one", "on", {"de": "dupe"})
+    hass.states.set("test.two", "on", {"de": "dupe"})
+    hass.states.set("test.one", "off", {"de": "dupe"})
+    hass.states.set("test.one", "on", {"other": "attrs"})
+    wait_recording_done(hass)
+    hass.states.set("test.one", "off", {"de": "dupe"})
+    hass.states.remove("test.two")
+    wait_recording_done(hass)
+    hass.states.set("test.two", "on", {"de": "dupe"})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(
+            session.query(States, StateAttributes)
+            .outerjoin(
+                StateAttributes, States.attributes_id == StateAttributes.attributes_id
+            )
+            .order_by(States.state_id)
+        )
+        assert len(states) == 7
+        test_one = [
+            state
+            for state, _ in states
+            if state.states_meta_rel.entity_id == "test.one"
+        ]
+        test_two = [
+            state
+            for state, _ in states
+            if state.states_meta_rel.entity_id == "test.two"
+        ]
+
+        assert [state.state for state in test_one] == ["on", "off", "on", "off"]
+        assert test_one[0].old_state_id is None
+        assert test_one[1].old_state_id == test_one[0].state_id
+        assert test_one[2].old_state_id == test_one[1].state_id
+        assert test_one[3].old_state_id == test_one[2].state_id
+
+        assert [state.state for state in test_two] == ["on", None, "on"]
+        assert test_two[0].old_state_id is None
+        assert test_two[1].old_state_id == test_two[0].state_id
+        assert test_two[2].old_state_id is None
+
+        dupe_attributes_ids = {
+            state.attributes_id
+            for state, attributes in states
+            if attributes.to_native() == {"de": "dupe"}
+        }
+        assert len(dupe_attributes_ids) == 1
+        assert test_one[2].attributes_id not in dupe_attributes_ids
+        assert test_one[2].state_attributes.to_native() == {"other": "attrs"}
+
+        assert hass.data[DATA_INSTANCE]._old_state_ids == {
+            "test.one": test_one[3].state_id,
+            "test.two": test_two[2].state_id,
+        }
+
+
+def test_bulk_insert_saves_events(hass_recorder):
+    """Test the bulk insert mode saves events and deduplicates event data."""
+    hass = hass_recorder({"bulk_insert": True})
+
+    for _ in range(5):
+        hass.bus.fire("this_event", {"de": "dupe"})
+    hass.bus.fire("this_event")
+    wait_recording_done(hass)
+    for _ in range(5):
+        hass.bus.fire("this_event", {"de": "dupe"})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        events = list(
+            session.query(Events, EventData)
+            .filter(Events.event_type == "this_event")
+            .outerjoin(EventData, (Events.data_id == EventData.data_id))
+        )
+        assert len(events) == 11
+        assert len({event.data_id for event, _ in events if event.data_id}) == 1
+        assert [event_data.to_native() for _, event_data in events if event_data] == [
+            {"de": "dupe"}
+        ] * 10
+        native_event = events[0][0].to_native()
+        assert native_event.event_type == "this_event"
+        assert native_event.origin == EventOrigin.local
+
+
+def test_bulk_insert_retries_after_operational_error(hass_recorder, caplog):
+    """Test the bulk insert mode rolls back and retries a failed commit."""
+    hass = hass_recorder({"bulk_insert": True})
+    instance = hass.data[DATA_INSTANCE]
+
+    original_write = instance._bulk_insert.write
+    fail = True
+
+    def _write_then_fail(*args, **kwargs):
+        nonlocal fail
+        original_write(*args, **kwargs)
+        if fail:
+            fail = False
+            raise OperationalError("insert the state", "fake params", "forced to fail")
+
+    with patch("time.sleep"), patch.object(
+        instance._bulk_insert, "write", side_effect=_write_then_fail
+    ):
+        hass.states.set("test.one", "on", {"de": "dupe"})
+        hass.states.set("test.one", "off", {"de": "dupe"})
+        wait_recording_done(hass)
+
+    assert "Error executing query" in caplog.text
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States).order_by(States.state_id))
+        assert len(states) == 2
+        assert states[1].old_state_id == states[0].state_id
+        assert session.query(StateAttributes).count() == 1
+
+
+@pytest.mark.parametrize("bulk_insert", [False, True])
+def test_split_static_attributes(hass_recorder, bulk_insert):
+    """Test static attributes are stored once and merged back in history."""
+    hass = hass_recorder({"split_static_attributes": True, "bulk_insert": bulk_insert})
+
+    static = {"friendly_name": "Outside", "icon": "mdi:thermometer"}
+    for temperature in (20, 21, 22):
+        hass.states.set("sensor.outside", "on", {**static, "temperature": temperature})
+        wait_recording_done(hass)
+    hass.states.set("sensor.plain", "on", {"temperature": 20})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States).order_by(States.state_id))
+        assert len(states) == 4
+        static_ids = {state.static_attributes_id for state in states[:3]}
+        assert len(static_ids) == 1
+        assert None not in static_ids
+        assert states[3].static_attributes_id is None
+        assert states[0].static_state_attributes.to_native() == static
+        assert [state.state_attributes.to_native() for state in states[:3]] == [
+            {"temperature": 20},
+            {"temperature": 21},
+            {"temperature": 22},
+        ]
+        assert states[3].attributes_id == states[0].attributes_id
+        assert session.query(StateAttributes).count() == 4
+
+    hist = history.get_significant_states(
+        hass,
+        dt_util.utcnow() - timedelta(hours=1),
+        None,
+        ["sensor.outside"],
+        significant_changes_only=False,
+    )
+    assert [state.attributes for state in hist["sensor.outside"]] == [
+        {**static, "temperature": 20},
+        {**static, "temperature": 21},
+        {**static, "temperature": 22},
+    ]
+
+
+async def test_spool_events_while_backlog_is_large(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT, tmp_path
+):
+    """Test events are spooled to disk and replayed once the backlog is low."""
+    spool_path = tmp_path / "recorder.spool"
+    with patch(
+        "homeassistant.components.recorder.core.SPOOL_FILE", str(spool_path)
+    ), patch(
+        "homeassistant.components.recorder.core.SPOOL_BACKLOG_THRESHOLD", -1
+    ), patch(
+        "homeassistant.components.recorder.core.SPOOL_BACKLOG_RESUME", -1
+    ):
+        await async_setup_recorder_instance(hass, {recorder.CONF_SPOOL: True})
+        hass.states.async_set("test.spool", "on", {"attr": 1})
+        hass.states.async_set("test.spool", "off", {"attr": 2})
+        await async_wait_recording_done(hass)
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+        await hass.async_block_till_done()
+
+        assert "test.spool" in spool_path.read_text()
+        with session_scope(hass=hass) as session:
+            assert list(session.query(States)) == []
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=4))
+    await async_wait_recording_done(hass)
+
+    assert not spool_path.exists()
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States).order_by(States.state_id))
+        assert [db_state.state for db_state in db_states] == ["on", "off"]
+        assert db_states[1].old_state_id == db_states[0].state_id
+        shared_attrs = [
+            db_attrs.shared_attrs for db_attrs in session.query(StateAttributes)
+        ]
+        assert shared_attrs == ['{"attr":1}', '{"attr":2}']
+
+
+async def test_spooled_events_are_replayed_at_startup(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT, tmp_path
+):
+    """Test events left in the spool by a previous run are recorded at startup."""
+    spool_path = tmp_path / "recorder.spool"
+    spool = EventSpool(str(spool_path))
+    state = State("test.spool", "on", {"attr": 1})
+    spool.add(
+        Event(
+            EVENT_STATE_CHANGED,
+            {"entity_id": "test.spool", "old_state": None, "new_state": state},
+        )
+    )
+    await hass.async_add_executor_job(spool.flush)
+
+    with patch("homeassistant.components.recorder.core.SPOOL_FILE", str(spool_path)):
+        await async_setup_recorder_instance(hass, {recorder.CONF_SPOOL: True})
+        await async_wait_recording_done(hass)
+
+    assert not spool_path.exists()
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States))
+        assert len(db_states) == 1
+        assert db_states[0].state == "on"
+        assert db_states[0].last_updated_ts == state.last_updated.timestamp()
+
+
+async def test_statistics_run_after_spooled_events(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT, tmp_path
+):
+    """Test statistics runs requested while spooling run after the spooled events."""
+    spool_path = tmp_path / "recorder.spool"
+    states_at_compile = []
+
+    def _compile_statistics(instance, start):
+        with session_scope(hass=hass) as session:
+            states_at_compile.append(session.query(States).count())
+        return True
+
+    with patch(
+        "homeassistant.components.recorder.tasks.statistics.compile_statistics",
+        side_effect=_compile_statistics,
+    ):
+        with patch(
+            "homeassistant.components.recorder.core.SPOOL_FILE", str(spool_path)
+        ), patch(
+            "homeassistant.components.recorder.core.SPOOL_BACKLOG_THRESHOLD", -1
+        ), patch(
+            "homeassistant.components.recorder.core.SPOOL_BACKLOG_RESUME", -1
+        ):
+            instance = await async_setup_recorder_instance(
+                hass, {recorder.CONF_SPOOL: True}
+            )
+            states_at_compile.clear()
+            hass.states.async_set("test.spool", "on")
+            instance.async_periodic_statistics(dt_util.utcnow())
+            await async_wait_recording_done(hass)
+            assert states_at_compile == []
+
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=4))
+        await async_wait_recording_done(hass)
+
+    assert states_at_compile == [1]
+
+
+def test_spool_replay_resumes_after_committed_events(tmp_path):
+    """Test a replay interrupted after a commit skips the committed events."""
+    spool_path = tmp_path / "recorder.spool"
+    spool = EventSpool(str(spool_path))
+    for number in range(3):
+        spool.add(Event("test_event", {"number": number}))
+    spool.flush()
+
+    replay = spool.replay()
+    assert next(replay).data == {"number": 0}
+    spool.commit()
+    assert next(replay).data == {"number": 1}
+    # The recorder stops before the second event was committed
+    replay.close()
+
+    spool = EventSpool(str(spool_path))
+    assert spool.has_events()
+    assert [event.data for event in spool.replay()] == [
+        {"number": 1},
+        {"number": 2},
+    ]
+    assert spool_path.exists()
+    spool.commit()
+    assert not spool_path.exists()
+    assert not os.path.exists(spool.offset_path)
+    assert not spool.has_events()
+
+
+def test_spool_replay_leaves_pending_events_while_spooling(tmp_path):
+    """Test events not written to disk yet are only replayed once spooling stopped."""
+    spool_path = tmp_path / "recorder.spool"
+    spool = EventSpool(str(spool_path))
+    spool.add(Event("test_event", {"number": 0}))
+    spool.flush()
+    # Spooling restarted while the events from disk were being replayed
+    spool.add(Event("test_event", {"number": 1}))
+
+    assert [event.data for event in spool.replay()] == [{"number": 0}]
+    spool.commit()
+    assert not spool_path.exists()
+    assert spool.has_events()
+
+    spool.add(Event("test_event", {"number": 2}))
+    assert [event.data for event in spool.replay(include_pending=True)] == [
+        {"number": 1},
+        {"number": 2},
+    ]
+    assert not spool.has_events()
+
+
+async def test_id_caches_are_preloaded(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test the id caches are loaded from the most recent states and events."""
+    instance = await async_setup_recorder_instance(hass)
+    hass.states.async_set("test.one", "on", {"test_attr": 5})
+    hass.bus.async_fire("test_event", {"test_data": 5})
+    await async_wait_recording_done(hass)
+
+    attributes_cache = instance.state_attributes_id_cache
+    data_cache = instance.event_data_id_cache
+
+    class PreloadTask(RecorderTask):
+        """Empty the caches and preload them again in the recorder thread."""
+
+        def run(self, instance: Recorder) -> None:
+            attributes_cache.clear()
+            data_cache.clear()
+            with session_scope(session=instance.get_session()) as session:
+                instance._preload_id_caches(session)
+
+    instance.queue_task(PreloadTask())
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert dict(attributes_cache.items()) == {
+            state_attributes.shared_attrs: state_attributes.attributes_id
+            for state_attributes in session.query(StateAttributes)
+        }
+        assert dict(data_cache.items()) == {
+            event_data.shared_data: event_data.data_id
+            for event_data in session.query(EventData)
+        }
+        assert '{"test_attr":5}' in attributes_cache
+        assert '{"test_data":5}' in data_cache
+
+
+def test_id_cache_sizes_follow_entity_count(hass_recorder):
+    """Test the id caches grow with the number of entities within their bounds."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    attributes_cache = instance.state_attributes_id_cache
+    data_cache = instance.event_data_id_cache
+
+    instance._adjust_id_cache_sizes(10)
+    assert attributes_cache.size == 2048
+    assert data_cache.size == 2048
+
+    instance._adjust_id_cache_sizes(5000)
+    assert attributes_cache.size == 10000
+    assert data_cache.size == 5000
+
+    instance._adjust_id_cache_sizes(100000)
+    assert attributes_cache.size == 32768
+    assert data_cache.size == 16384
@@ -8,14 +8,14 @@ import threading
 from unittest.mock import Mock, PropertyMock, call, patch
 
 import pytest
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.exc import (
     DatabaseError,
     InternalError,
     OperationalError,
     ProgrammingError,
 )
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from homeassistant.bootstrap import async_setup_component
@@ -24,22 +24,34 @@ from homeassistant.components.recorder import migration, models
 from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.models import (
     SCHEMA_VERSION,
+    Events,
     RecorderRuns,
     States,
+    StatesMeta,
+    Statistics,
+    StatisticsDaily,
+    StatisticsMeta,
+    StatisticsMonthly,
 )
 from homeassistant.components.recorder.util import session_scope
 import homeassistant.util.dt as dt_util
+import homeassistant.util.ulid as ulid_util
 
 from .common import async_wait_recording_done, create_engine_test
 
 from tests.common import async_fire_time_changed
 
+SCHEMA_30_MODULE = "tests.components.recorder.models_schema_30"
+SCHEMA_31_MODULE = "tests.components.recorder.models_schema_31"
+
 
 def _get_native_states(hass, entity_id):
     with session_scope(hass=hass) as session:
         return [
             state.to_native()
-            for state in session.query(States).filter(States.entity_id == entity_id)
+            for state in session.query(States)
+            .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .filter(StatesMeta.entity_id == entity_id)
         ]
 
 
@@ -330,6 +342,246 @@ async def test_schema_migrate(hass, start_version):
         assert recorder.util.async_migration_in_progress(hass) is not True
 
 
+def test_migrate_times_to_timestamps(hass):
+    """Test the DATETIME columns are copied to timestamps for schema 30."""
+    module = "tests.components.recorder.models_schema_29"
+    importlib.import_module(module)
+    old_models = sys.modules[module]
+    engine = create_engine("sqlite://")
+    old_models.Base.metadata.create_all(engine)
+    session_maker = scoped_session(sessionmaker(bind=engine))
+
+    now = dt_util.utcnow()
+    one_second_ago = now - datetime.timedelta(seconds=1)
+    with session_scope(session=session_maker()) as session:
+        session.add(
+            old_models.Events(
+                event_type="custom_event", origin_idx=0, time_fired=one_second_ago
+            )
+        )
+        session.add(
+            old_models.States(
+                entity_id="sensor.one",
+                state="on",
+                last_changed=one_second_ago,
+                last_updated=now,
+            )
+        )
+        session.add(
+            old_models.States(
+                entity_id="sensor.two", state="off", last_changed=None, last_updated=now
+            )
+        )
+
+    migration._apply_update(hass, engine, session_maker, 30, 29)
+
+    importlib.import_module(SCHEMA_30_MODULE)
+    models_30 = sys.modules[SCHEMA_30_MODULE]
+    with session_scope(session=session_maker()) as session:
+        assert session.query(models_30.Events.time_fired_ts).all() == [
+            (one_second_ago.timestamp(),)
+        ]
+        assert session.query(
+            models_30.States.entity_id,
+            models_30.States.last_changed_ts,
+            models_30.States.last_updated_ts,
+        ).order_by(models_30.States.entity_id).all() == [
+            ("sensor.one", one_second_ago.timestamp(), now.timestamp()),
+            ("sensor.two", None, now.timestamp()),
+        ]
+        native_state = (
+            session.query(models_30.States).filter_by(entity_id="sensor.one").one()
+        )
+        assert native_state.to_native().last_changed == one_second_ago
+        assert native_state.to_native().last_updated == now
+
+    inspector = inspect(engine)
+    states_indexes = {index["name"] for index in inspector.get_indexes("states")}
+    events_indexes = {index["name"] for index in inspector.get_indexes("events")}
+    assert "ix_states_last_updated_ts" in states_indexes
+    assert "ix_states_last_updated" not in states_indexes
+    assert "ix_states_entity_id_last_updated" not in states_indexes
+    assert "ix_events_time_fired_ts" in events_indexes
+    assert "ix_events_event_type_time_fired_ts" in events_indexes
+    assert "ix_events_time_fired" not in events_indexes
+    assert "ix_events_event_type_time_fired" not in events_indexes
+
+
+def test_migrate_entity_ids(hass):
+    """Test entity_ids are moved to the states_meta table for schema 31."""
+    importlib.import_module(SCHEMA_30_MODULE)
+    old_models = sys.modules[SCHEMA_30_MODULE]
+    engine = create_engine("sqlite://")
+    old_models.Base.metadata.create_all(engine)
+    session_maker = scoped_session(sessionmaker(bind=engine))
+
+    now = dt_util.utcnow().timestamp()
+    with session_scope(session=session_maker()) as session:
+        for entity_id, state in (
+            ("sensor.one", "on"),
+            ("sensor.two", "off"),
+            ("sensor.one", "off"),
+        ):
+            session.add(
+                old_models.States(
+                    entity_id=entity_id,
+                    state=state,
+                    last_changed_ts=now,
+                    last_updated_ts=now,
+                )
+            )
+
+    migration._apply_update(hass, engine, session_maker, 31, 30)
+
+    importlib.import_module(SCHEMA_31_MODULE)
+    models_31 = sys.modules[SCHEMA_31_MODULE]
+    with session_scope(session=session_maker()) as session:
+        assert {
+            states_meta.entity_id for states_meta in session.query(models_31.StatesMeta)
+        } == {
+            "sensor.one",
+            "sensor.two",
+        }
+        assert (
+            session.query(models_31.States)
+            .filter(models_31.States.entity_id.isnot(None))
+            .count()
+            == 0
+        )
+        assert [
+            (state.to_native().entity_id, state.state)
+            for state in session.query(models_31.States).order_by(
+                models_31.States.state_id
+            )
+        ] == [("sensor.one", "on"), ("sensor.two", "off"), ("sensor.one", "off")]
+
+    inspector = inspect(engine)
+    states_indexes = {index["name"] for index in inspector.get_indexes("states")}
+    assert "ix_states_metadata_id_last_updated_ts" in states_indexes
+    assert "ix_states_entity_id_last_updated_ts" not in states_indexes
+
+
+def test_migrate_context_ids(hass):
+    """Test string context ids are converted to binary after schema 32."""
+    importlib.import_module(SCHEMA_31_MODULE)
+    old_models = sys.modules[SCHEMA_31_MODULE]
+    engine = create_engine("sqlite://")
+    old_models.Base.metadata.create_all(engine)
+    session_maker = scoped_session(sessionmaker(bind=engine))
+
+    ulid_context_id = ulid_util.ulid()
+    uuid_context_id = "ac5bd62de45711eaaeb351041eec8dd9"
+    user_id = "b400facee45711eaa9308bfd3d19e474"
+    now = dt_util.utcnow().timestamp()
+    with session_scope(session=session_maker()) as session:
+        session.add_all(
+            (
+                old_models.Events(
+                    event_type="ulid_context",
+                    origin_idx=0,
+                    time_fired_ts=now,
+                    context_id=ulid_context_id,
+                    context_user_id=user_id,
+                    context_parent_id=uuid_context_id,
+                ),
+                old_models.Events(
+                    event_type="invalid_context",
+                    origin_idx=0,
+                    time_fired_ts=now,
+                    context_id="invalid",
+                ),
+                old_models.States(
+                    state="on",
+                    last_updated_ts=now,
+                    context_id=uuid_context_id,
+                    context_user_id=user_id,
+                ),
+            )
+        )
+
+    migration._apply_update(hass, engine, session_maker, 32, 31)
+    instance = Mock(get_session=session_maker)
+    assert migration.migrate_context_ids(instance) is True
+
+    with session_scope(session=session_maker()) as session:
+        ulid_event = session.query(Events).filter_by(event_type="ulid_context").one()
+        assert ulid_event.context_id is None
+        assert ulid_event.context_id_bin == ulid_util.ulid_to_bytes(ulid_context_id)
+        context = ulid_event.to_native().context
+        assert context.id == ulid_context_id
+        assert context.user_id == user_id
+        assert context.parent_id == ulid_util.bytes_to_ulid(
+            bytes.fromhex(uuid_context_id)
+        )
+
+        invalid_event = (
+            session.query(Events).filter_by(event_type="invalid_context").one()
+        )
+        assert invalid_event.context_id is None
+        assert len(invalid_event.context_id_bin) == 16
+        assert invalid_event.context_user_id_bin is None
+
+        # Only query the columns that exist at schema 32
+        state = session.query(States.context_id_bin, States.context_user_id_bin).one()
+        assert state.context_id_bin == bytes.fromhex(uuid_context_id)
+        assert state.context_user_id_bin == bytes.fromhex(user_id)
+
+    inspector = inspect(engine)
+    states_indexes = {index["name"] for index in inspector.get_indexes("states")}
+    events_indexes = {index["name"] for index in inspector.get_indexes("events")}
+    assert "ix_states_context_id_bin" in states_indexes
+    assert "ix_states_context_id" not in states_indexes
+    assert "ix_events_context_id_bin" in events_indexes
+    assert "ix_events_context_id" not in events_indexes
+
+
+def test_migrate_statistics_rollups(hass):
+    """Test daily and monthly statistics rollups are backfilled for schema 34."""
+    engine = create_engine("sqlite://")
+    models.Base.metadata.create_all(engine)
+    StatisticsDaily.__table__.drop(engine)
+    StatisticsMonthly.__table__.drop(engine)
+    session_maker = scoped_session(sessionmaker(bind=engine))
+
+    first_hour = dt_util.as_utc(dt_util.parse_datetime("2021-10-30 22:00:00"))
+    with session_scope(session=session_maker()) as session:
+        session.add(
+            StatisticsMeta(
+                statistic_id="sensor.energy",
+                source="recorder",
+                unit_of_measurement="kWh",
+                has_mean=False,
+                has_sum=True,
+            )
+        )
+        session.add_all(
+            Statistics(
+                metadata_id=1,
+                start=first_hour + datetime.timedelta(hours=hour),
+                state=hour,
+                sum=hour,
+            )
+            for hour in range(4)
+        )
+
+    migration._apply_update(hass, engine, session_maker, 34, 33)
+
+    with session_scope(session=session_maker()) as session:
+        daily = session.query(StatisticsDaily).order_by(StatisticsDaily.start).all()
+        assert [
+            (models.process_timestamp(row.start), row.state, row.sum) for row in daily
+        ] == [
+            (dt_util.as_utc(dt_util.parse_datetime("2021-10-30 00:00:00")), 1, 1),
+            (dt_util.as_utc(dt_util.parse_datetime("2021-10-31 00:00:00")), 3, 3),
+        ]
+        monthly = session.query(StatisticsMonthly).order_by(StatisticsMonthly.start)
+        assert [
+            (models.process_timestamp(row.start), row.state, row.sum) for row in monthly
+        ] == [
+            (dt_util.as_utc(dt_util.parse_datetime("2021-10-01 00:00:00")), 3, 3),
+        ]
+
+
 def test_invalid_update(hass):
     """Test that an invalid new version raises an exception."""
     with pytest.raises(ValueError):
@@ -15,6 +15,7 @@ from homeassistant.components.recorder.models import (
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
     process_datetime_to_timestamp,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
@@ -41,7 +42,37 @@ def test_from_event_to_db_state():
         {"entity_id": "sensor.temperature", "old_state": None, "new_state": state},
         context=state.context,
     )
-    assert state == States.from_event(event).to_native()
+    db_state = States.from_event(event)
+    assert db_state.entity_id is None
+    db_state.states_meta_rel = StatesMeta(entity_id="sensor.temperature")
+    assert state == db_state.to_native()
+
+
+def test_from_event_to_db_event_binary_context():
+    """Test the context of an event is stored as binary and restored."""
+    context = ha.Context(
+        user_id="b400facee45711eaa9308bfd3d19e474", parent_id=ha.Context().id
+    )
+    event = ha.Event("test_event", {"some_data": 15}, context=context)
+    db_event = Events.from_event(event)
+    assert db_event.context_id is None
+    assert db_event.context_user_id is None
+    assert db_event.context_parent_id is None
+    assert len(db_event.context_id_bin) == 16
+    assert db_event.context_user_id_bin == bytes.fromhex(context.user_id)
+    assert len(db_event.context_parent_id_bin) == 16
+    assert db_event.to_native().context == context
+
+    legacy_event = Events(
+        event_type="test_event",
+        origin_idx=0,
+        time_fired_ts=event.time_fired.timestamp(),
+        context_id="legacy",
+        context_user_id="legacy_user",
+    )
+    legacy_context = legacy_event.to_native().context
+    assert legacy_context.id == "legacy"
+    assert legacy_context.user_id == "legacy_user"
 
 
 def test_from_event_to_db_state_attributes():
@@ -77,10 +108,10 @@ def test_from_event_to_delete_state():
     )
     db_state = States.from_event(event)
 
-    assert db_state.entity_id == "sensor.temperature"
+    assert db_state.entity_id is None
     assert db_state.state == ""
-    assert db_state.last_changed is None
-    assert db_state.last_updated == event.time_fired
+    assert db_state.last_changed_ts is None
+    assert db_state.last_updated_ts == event.time_fired.timestamp()
 
 
 def test_entity_ids():
@@ -115,35 +146,35 @@ def test_entity_ids():
 
     session.add(
         States(
-            entity_id="sensor.temperature",
+            states_meta_rel=StatesMeta(entity_id="sensor.temperature"),
             state="20",
-            last_changed=before_run,
-            last_updated=before_run,
+            last_changed_ts=before_run.timestamp(),
+            last_updated_ts=before_run.timestamp(),
         )
     )
     session.add(
         States(
-            entity_id="sensor.sound",
+            states_meta_rel=StatesMeta(entity_id="sensor.sound"),
             state="10",
-            last_changed=after_run,
-            last_updated=after_run,
+            last_changed_ts=after_run.timestamp(),
+            last_updated_ts=after_run.timestamp(),
         )
     )
 
     session.add(
         States(
-            entity_id="sensor.humidity",
+            states_meta_rel=StatesMeta(entity_id="sensor.humidity"),
             state="76",
-            last_changed=in_run,
-            last_updated=in_run,
+            last_changed_ts=in_run.timestamp(),
+            last_updated_ts=in_run.timestamp(),
         )
     )
     session.add(
         States(
-            entity_id="sensor.lux",
+            states_meta_rel=StatesMeta(entity_id="sensor.lux"),
             state="5",
-            last_changed=in_run3,
-            last_updated=in_run3,
+            last_changed_ts=in_run3.timestamp(),
+            last_updated_ts=in_run3.timestamp(),
         )
     )
 
@@ -248,6 +279,7 @@ async def test_lazy_state_handles_include_json(caplog):
     row = PropertyMock(
         entity_id="sensor.invalid",
         shared_attrs="{INVALID_JSON}",
+        static_shared_attrs=None,
     )
     assert LazyState(row, {}).attributes == {}
     assert "Error converting row to state attributes" in caplog.text
@@ -258,6 +290,7 @@ async def test_lazy_state_prefers_shared_attrs_over_attrs(caplog):
     row = PropertyMock(
         entity_id="sensor.invalid",
         shared_attrs='{"shared":true}',
+        static_shared_attrs=None,
         attributes='{"shared":false}',
     )
     assert LazyState(row, {}).attributes == {"shared": True}
@@ -270,8 +303,9 @@ async def test_lazy_state_handles_different_last_updated_and_last_changed(caplog
         entity_id="sensor.valid",
         state="off",
         shared_attrs='{"shared":true}',
-        last_updated=now,
-        last_changed=now - timedelta(seconds=60),
+        static_shared_attrs=None,
+        last_updated_ts=now.timestamp(),
+        last_changed_ts=(now - timedelta(seconds=60)).timestamp(),
     )
     lstate = LazyState(row, {})
     assert lstate.as_dict() == {
@@ -281,8 +315,8 @@ async def test_lazy_state_handles_different_last_updated_and_last_changed(caplog
         "last_updated": "2021-06-12T03:04:01.000323+00:00",
         "state": "off",
     }
-    assert lstate.last_updated == row.last_updated
-    assert lstate.last_changed == row.last_changed
+    assert lstate.last_updated.timestamp() == row.last_updated_ts
+    assert lstate.last_changed.timestamp() == row.last_changed_ts
     assert lstate.as_dict() == {
         "attributes": {"shared": True},
         "entity_id": "sensor.valid",
@@ -299,8 +333,9 @@ async def test_lazy_state_handles_same_last_updated_and_last_changed(caplog):
         entity_id="sensor.valid",
         state="off",
         shared_attrs='{"shared":true}',
-        last_updated=now,
-        last_changed=now,
+        static_shared_attrs=None,
+        last_updated_ts=now.timestamp(),
+        last_changed_ts=now.timestamp(),
     )
     lstate = LazyState(row, {})
     assert lstate.as_dict() == {
@@ -310,8 +345,8 @@ async def test_lazy_state_handles_same_last_updated_and_last_changed(caplog):
         "last_updated": "2021-06-12T03:04:01.000323+00:00",
         "state": "off",
     }
-    assert lstate.last_updated == row.last_updated
-    assert lstate.last_changed == row.last_changed
+    assert lstate.last_updated.timestamp() == row.last_updated_ts
+    assert lstate.last_changed.timestamp() == row.last_changed_ts
     assert lstate.as_dict() == {
         "attributes": {"shared": True},
         "entity_id": "sensor.valid",
@@ -13,9 +13,11 @@ from homeassistant.components.recorder.const import MAX_ROWS_TO_PURGE, Supported
 from homeassistant.components.recorder.models import (
     EventData,
     Events,
+    PurgeRuns,
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
     StatisticsRuns,
     StatisticsShortTerm,
 )
@@ -221,6 +223,50 @@ async def test_purge_old_states_encounters_operational_error(
     assert "Error executing purge" in caplog.text
 
 
+async def test_purge_old_states_keeps_used_static_attributes(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test static attributes are only purged once no state uses them."""
+    instance = await async_setup_recorder_instance(
+        hass, {"split_static_attributes": True}
+    )
+    utcnow = dt_util.utcnow()
+
+    for state_id, timestamp in enumerate(
+        (utcnow - timedelta(days=11), utcnow - timedelta(days=11), utcnow)
+    ):
+        with patch(
+            "homeassistant.components.recorder.core.dt_util.utcnow",
+            return_value=timestamp,
+        ):
+            hass.states.async_set(
+                "test.recorder2",
+                f"state_{state_id}",
+                {"friendly_name": "Recorder", "volatile": state_id},
+            )
+            await hass.async_block_till_done()
+            await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = session.query(States)
+        state_attributes = session.query(StateAttributes)
+        assert states.count() == 3
+        assert state_attributes.count() == 4
+
+        finished = purge_old_data(instance, utcnow - timedelta(days=4), repack=False)
+        assert finished
+        assert states.count() == 1
+        assert state_attributes.count() == 2
+        assert states.one().static_state_attributes.to_native() == {
+            "friendly_name": "Recorder"
+        }
+
+        finished = purge_old_data(instance, utcnow + timedelta(seconds=1), repack=False)
+        assert finished
+        assert states.count() == 0
+        assert state_attributes.count() == 0
+
+
 async def test_purge_old_events(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
@@ -450,7 +496,7 @@ async def test_purge_edge_case(
                     event_type="EVENT_TEST_PURGE",
                     event_data="{}",
                     origin="LOCAL",
-                    time_fired=timestamp,
+                    time_fired_ts=dt_util.utc_to_timestamp(timestamp),
                 )
             )
             session.add(
@@ -458,8 +504,8 @@ async def test_purge_edge_case(
                     entity_id="test.recorder2",
                     state="purgeme",
                     attributes="{}",
-                    last_changed=timestamp,
-                    last_updated=timestamp,
+                    last_changed_ts=dt_util.utc_to_timestamp(timestamp),
+                    last_updated_ts=dt_util.utc_to_timestamp(timestamp),
                     event_id=1001,
                     attributes_id=1002,
                 )
@@ -519,7 +565,7 @@ async def test_purge_cutoff_date(
                     event_type="KEEP",
                     event_data="{}",
                     origin="LOCAL",
-                    time_fired=timestamp_keep,
+                    time_fired_ts=dt_util.utc_to_timestamp(timestamp_keep),
                 )
             )
             session.add(
@@ -527,8 +573,8 @@ async def test_purge_cutoff_date(
                     entity_id="test.cutoff",
                     state="keep",
                     attributes="{}",
-                    last_changed=timestamp_keep,
-                    last_updated=timestamp_keep,
+                    last_changed_ts=dt_util.utc_to_timestamp(timestamp_keep),
+                    last_updated_ts=dt_util.utc_to_timestamp(timestamp_keep),
                     event_id=1000,
                     attributes_id=1000,
                 )
@@ -547,7 +593,7 @@ async def test_purge_cutoff_date(
                         event_type="PURGE",
                         event_data="{}",
                         origin="LOCAL",
-                        time_fired=timestamp_purge,
+                        time_fired_ts=dt_util.utc_to_timestamp(timestamp_purge),
                     )
                 )
                 session.add(
@@ -555,8 +601,8 @@ async def test_purge_cutoff_date(
                         entity_id="test.cutoff",
                         state="purge",
                         attributes="{}",
-                        last_changed=timestamp_purge,
-                        last_updated=timestamp_purge,
+                        last_changed_ts=dt_util.utc_to_timestamp(timestamp_purge),
+                        last_updated_ts=dt_util.utc_to_timestamp(timestamp_purge),
                         event_id=1000 + row,
                         attributes_id=1000 + row,
                     )
@@ -680,8 +726,8 @@ async def test_purge_filtered_states(
                     entity_id="sensor.excluded",
                     state="purgeme",
                     attributes="{}",
-                    last_changed=timestamp,
-                    last_updated=timestamp,
+                    last_changed_ts=dt_util.utc_to_timestamp(timestamp),
+                    last_updated_ts=dt_util.utc_to_timestamp(timestamp),
                 )
             )
             # Add states and state_changed events that should be keeped
@@ -706,8 +752,8 @@ async def test_purge_filtered_states(
                 entity_id="sensor.linked_old_state_id",
                 state="keep",
                 attributes="{}",
-                last_changed=timestamp,
-                last_updated=timestamp,
+                last_changed_ts=dt_util.utc_to_timestamp(timestamp),
+                last_updated_ts=dt_util.utc_to_timestamp(timestamp),
                 old_state_id=1,
                 state_attributes=state_attrs,
             )
@@ -716,8 +762,8 @@ async def test_purge_filtered_states(
                 entity_id="sensor.linked_old_state_id",
                 state="keep",
                 attributes="{}",
-                last_changed=timestamp,
-                last_updated=timestamp,
+                last_changed_ts=dt_util.utc_to_timestamp(timestamp),
+                last_updated_ts=dt_util.utc_to_timestamp(timestamp),
                 old_state_id=2,
                 state_attributes=state_attrs,
             )
@@ -725,8 +771,8 @@ async def test_purge_filtered_states(
                 entity_id="sensor.linked_old_state_id",
                 state="keep",
                 attributes="{}",
-                last_changed=timestamp,
-                last_updated=timestamp,
+                last_changed_ts=dt_util.utc_to_timestamp(timestamp),
+                last_updated_ts=dt_util.utc_to_timestamp(timestamp),
                 old_state_id=62,  # keep
                 state_attributes=state_attrs,
             )
@@ -738,9 +784,10 @@ async def test_purge_filtered_states(
                     event_type="EVENT_KEEP",
                     event_data="{}",
                     origin="LOCAL",
-                    time_fired=timestamp,
+                    time_fired_ts=dt_util.utc_to_timestamp(timestamp),
                 )
             )
+            _convert_pending_states_to_meta(session)
 
     service_data = {"keep_days": 10}
     _add_db_entries(hass)
@@ -794,8 +841,10 @@ async def test_purge_filtered_states(
         events_keep = session.query(Events).filter(Events.event_type == "EVENT_KEEP")
         assert events_keep.count() == 1
 
-        states_sensor_excluded = session.query(States).filter(
-            States.entity_id == "sensor.excluded"
+        states_sensor_excluded = (
+            session.query(States)
+            .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .filter(StatesMeta.entity_id == "sensor.excluded")
         )
         assert states_sensor_excluded.count() == 0
 
@@ -859,6 +908,7 @@ async def test_purge_filtered_states_to_empty(
                         timestamp,
                         event_id * days,
                     )
+            _convert_pending_states_to_meta(session)
 
     service_data = {"keep_days": 10}
     _add_db_entries(hass)
@@ -910,8 +960,8 @@ async def test_purge_without_state_attributes_filtered_states_to_empty(
                     entity_id="sensor.old_format",
                     state=STATE_ON,
                     attributes=json.dumps({"old": "not_using_state_attributes"}),
-                    last_changed=timestamp,
-                    last_updated=timestamp,
+                    last_changed_ts=dt_util.utc_to_timestamp(timestamp),
+                    last_updated_ts=dt_util.utc_to_timestamp(timestamp),
                     event_id=event_id,
                     state_attributes=None,
                 )
@@ -922,9 +972,10 @@ async def test_purge_without_state_attributes_filtered_states_to_empty(
                     event_type=EVENT_STATE_CHANGED,
                     event_data="{}",
                     origin="LOCAL",
-                    time_fired=timestamp,
+                    time_fired_ts=dt_util.utc_to_timestamp(timestamp),
                 )
             )
+            _convert_pending_states_to_meta(session)
 
     service_data = {"keep_days": 10}
     _add_db_entries(hass)
@@ -974,7 +1025,7 @@ async def test_purge_filtered_events(
                             event_type="EVENT_PURGE",
                             event_data="{}",
                             origin="LOCAL",
-                            time_fired=timestamp,
+                            time_fired_ts=dt_util.utc_to_timestamp(timestamp),
                         )
                     )
 
@@ -1074,7 +1125,7 @@ async def test_purge_filtered_events_state_changed(
                         event_type="EVENT_KEEP",
                         event_data="{}",
                         origin="LOCAL",
-                        time_fired=timestamp,
+                        time_fired_ts=dt_util.utc_to_timestamp(timestamp),
                     )
                 )
             # Add states with linked old_state_ids that need to be handled
@@ -1083,8 +1134,8 @@ async def test_purge_filtered_events_state_changed(
                 entity_id="sensor.linked_old_state_id",
                 state="keep",
                 attributes="{}",
-                last_changed=timestamp,
-                last_updated=timestamp,
+                last_changed_ts=dt_util.utc_to_timestamp(timestamp),
+                last_updated_ts=dt_util.utc_to_timestamp(timestamp),
                 old_state_id=1,
             )
             timestamp = dt_util.utcnow() - timedelta(days=4)
@@ -1092,16 +1143,16 @@ async def test_purge_filtered_events_state_changed(
                 entity_id="sensor.linked_old_state_id",
                 state="keep",
                 attributes="{}",
-                last_changed=timestamp,
-                last_updated=timestamp,
+                last_changed_ts=dt_util.utc_to_timestamp(timestamp),
+                last_updated_ts=dt_util.utc_to_timestamp(timestamp),
                 old_state_id=2,
             )
             state_3 = States(
                 entity_id="sensor.linked_old_state_id",
                 state="keep",
                 attributes="{}",
-                last_changed=timestamp,
-                last_updated=timestamp,
+                last_changed_ts=dt_util.utc_to_timestamp(timestamp),
+                last_updated_ts=dt_util.utc_to_timestamp(timestamp),
                 old_state_id=62,  # keep
             )
             session.add_all((state_1, state_2, state_3))
@@ -1197,6 +1248,7 @@ async def test_purge_entities(
                         timestamp,
                         event_id * days,
                     )
+            _convert_pending_states_to_meta(session)
 
     def _add_keep_records(hass: HomeAssistant) -> None:
         with session_scope(hass=hass) as session:
@@ -1210,6 +1262,7 @@ async def test_purge_entities(
                     timestamp,
                     event_id,
                 )
+            _convert_pending_states_to_meta(session)
 
     _add_purge_records(hass)
     _add_keep_records(hass)
@@ -1225,8 +1278,10 @@ async def test_purge_entities(
         states = session.query(States)
         assert states.count() == 10
 
-        states_sensor_kept = session.query(States).filter(
-            States.entity_id == "sensor.keep"
+        states_sensor_kept = (
+            session.query(States)
+            .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .filter(StatesMeta.entity_id == "sensor.keep")
         )
         assert states_sensor_kept.count() == 10
 
@@ -1255,8 +1310,10 @@ async def test_purge_entities(
         states = session.query(States)
         assert states.count() == 10
 
-        states_sensor_kept = session.query(States).filter(
-            States.entity_id == "sensor.keep"
+        states_sensor_kept = (
+            session.query(States)
+            .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .filter(StatesMeta.entity_id == "sensor.keep")
         )
         assert states_sensor_kept.count() == 10
 
@@ -1336,7 +1393,7 @@ async def _add_test_events(hass: HomeAssistant, iterations: int = 1):
                         event_type=event_type,
                         event_data=json.dumps(event_data),
                         origin="LOCAL",
-                        time_fired=timestamp,
+                        time_fired_ts=dt_util.utc_to_timestamp(timestamp),
                     )
                 )
 
@@ -1373,7 +1430,7 @@ async def _add_events_with_event_data(hass: HomeAssistant, iterations: int = 1):
                     Events(
                         event_type=event_type,
                         origin="LOCAL",
-                        time_fired=timestamp,
+                        time_fired_ts=dt_util.utc_to_timestamp(timestamp),
                         event_data_rel=event_data,
                     )
                 )
@@ -1475,8 +1532,8 @@ def _add_state_without_event_linkage(
             entity_id=entity_id,
             state=state,
             attributes=None,
-            last_changed=timestamp,
-            last_updated=timestamp,
+            last_changed_ts=dt_util.utc_to_timestamp(timestamp),
+            last_updated_ts=dt_util.utc_to_timestamp(timestamp),
             event_id=None,
             state_attributes=state_attrs,
         )
@@ -1500,8 +1557,8 @@ def _add_state_and_state_changed_event(
             entity_id=entity_id,
             state=state,
             attributes=None,
-            last_changed=timestamp,
-            last_updated=timestamp,
+            last_changed_ts=dt_util.utc_to_timestamp(timestamp),
+            last_updated_ts=dt_util.utc_to_timestamp(timestamp),
             event_id=event_id,
             state_attributes=state_attrs,
         )
@@ -1512,11 +1569,28 @@ def _add_state_and_state_changed_event(
             event_type=EVENT_STATE_CHANGED,
             event_data="{}",
             origin="LOCAL",
-            time_fired=timestamp,
+            time_fired_ts=dt_util.utc_to_timestamp(timestamp),
         )
     )
 
 
+def _convert_pending_states_to_meta(session: Session) -> None:
+    """Move the entity_id of pending states into the states_meta table."""
+    states_meta_by_entity_id: dict[str, StatesMeta] = {}
+    for obj in session.new:
+        if not isinstance(obj, States) or obj.entity_id is None:
+            continue
+        entity_id = obj.entity_id
+        if entity_id not in states_meta_by_entity_id:
+            states_meta_by_entity_id[entity_id] = (
+                session.query(StatesMeta)
+                .filter(StatesMeta.entity_id == entity_id)
+                .one_or_none()
+            ) or StatesMeta(entity_id=entity_id)
+        obj.states_meta_rel = states_meta_by_entity_id[entity_id]
+        obj.entity_id = None
+
+
 async def test_purge_many_old_events(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
@@ -1570,6 +1644,96 @@ async def test_purge_many_old_events(
         assert event_datas.count() == 0
 
 
+async def test_purge_old_events_time_budget(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test purging in steps limited by the time budget."""
+    instance = await async_setup_recorder_instance(hass)
+
+    await _add_test_events(hass, MAX_ROWS_TO_PURGE)
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+
+    with session_scope(hass=hass) as session:
+        events = session.query(Events).filter(Events.event_type.like("EVENT_TEST%"))
+        assert events.count() == MAX_ROWS_TO_PURGE * 6
+
+        # An exhausted budget still purges one batch per step
+        finished = purge_old_data(instance, purge_before, repack=False, time_budget=0)
+        assert not finished
+        assert events.count() == MAX_ROWS_TO_PURGE * 5
+
+        purge_run = session.query(PurgeRuns).one()
+        assert purge_run.end is None
+        assert purge_run.steps == 1
+        assert purge_run.events_purged == MAX_ROWS_TO_PURGE
+        assert instance.purge_progress.run_id == purge_run.run_id
+        assert instance.purge_progress.end is None
+        assert instance.purge_progress.events_purged == MAX_ROWS_TO_PURGE
+
+    for _ in range(3):
+        assert not purge_old_data(instance, purge_before, repack=False, time_budget=0)
+    assert purge_old_data(instance, purge_before, repack=False, time_budget=0)
+
+    with session_scope(hass=hass) as session:
+        events = session.query(Events).filter(Events.event_type.like("EVENT_TEST%"))
+        assert events.count() == MAX_ROWS_TO_PURGE * 2
+
+        purge_run = session.query(PurgeRuns).one()
+        assert purge_run.end is not None
+        assert purge_run.steps == 5
+        assert purge_run.states_purged == 0
+        assert purge_run.events_purged == MAX_ROWS_TO_PURGE * 4
+        assert instance.purge_progress.end is not None
+
+    # A new purge starts a new run
+    assert purge_old_data(instance, purge_before, repack=False)
+    with session_scope(hass=hass) as session:
+        assert session.query(PurgeRuns).count() == 2
+
+
+async def test_unfinished_purge_is_resumed(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test a purge interrupted by a restart is picked up again."""
+    instance = await async_setup_recorder_instance(hass)
+
+    await _add_test_states(hass)
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    with session_scope(hass=hass) as session:
+        session.add(
+            PurgeRuns(
+                purge_before=purge_before,
+                repack=False,
+                apply_filter=False,
+                start=dt_util.utcnow(),
+                steps=2,
+                states_purged=10,
+                events_purged=0,
+            )
+        )
+
+    with session_scope(hass=hass) as session, patch.object(
+        instance, "queue_task"
+    ) as queue_task:
+        instance._schedule_unfinished_purge(session)
+    assert queue_task.call_args[0][0] == PurgeTask(purge_before, False, False)
+
+    assert purge_old_data(instance, purge_before, repack=False)
+    with session_scope(hass=hass) as session:
+        purge_run = session.query(PurgeRuns).one()
+        assert purge_run.end is not None
+        assert purge_run.steps == 3
+        assert purge_run.states_purged == 14
+
+    with session_scope(hass=hass) as session, patch.object(
+        instance, "queue_task"
+    ) as queue_task:
+        instance._schedule_unfinished_purge(session)
+    assert queue_task.call_count == 0
+
+
 async def test_purge_can_mix_legacy_and_new_format(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
@@ -1581,8 +1745,8 @@ async def test_purge_can_mix_legacy_and_new_format(
         broken_state_no_time = States(
             event_id=None,
             entity_id="orphened.state",
-            last_updated=None,
-            last_changed=None,
+            last_updated_ts=None,
+            last_changed_ts=None,
         )
         session.add(broken_state_no_time)
         start_id = 50000
@@ -2,6 +2,7 @@
 # pylint: disable=protected-access,invalid-name
 from datetime import timedelta
 import importlib
+from statistics import mean
 import sys
 from unittest.mock import patch, sentinel
 
@@ -14,6 +15,9 @@ from homeassistant.components import recorder
 from homeassistant.components.recorder import history, statistics
 from homeassistant.components.recorder.const import DATA_INSTANCE, SQLITE_URL_PREFIX
 from homeassistant.components.recorder.models import (
+    StatisticsDaily,
+    StatisticsMeta,
+    StatisticsMonthly,
     StatisticsShortTerm,
     process_timestamp_to_utc_isoformat,
 )
@@ -27,7 +31,9 @@ from homeassistant.components.recorder.statistics import (
     get_metadata,
     list_statistic_ids,
     statistics_during_period,
+    statistics_rollups_need_rebuild,
 )
+from homeassistant.components.recorder.tasks import RebuildStatisticsRollupsTask
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import TEMP_CELSIUS
 from homeassistant.core import callback
@@ -817,6 +823,496 @@ def test_monthly_statistics(hass_recorder, caplog, timezone):
     dt_util.set_default_time_zone(dt_util.get_time_zone("UTC"))
 
 
+@pytest.mark.parametrize("timezone", ["America/Regina", "Europe/Vienna", "UTC"])
+@pytest.mark.parametrize("first_day", ["2021-03-27", "2021-10-30"])
+def test_daily_statistics(hass_recorder, caplog, timezone, first_day):
+    """Test reducing hourly statistics to days, including DST changes."""
+    dt_util.set_default_time_zone(dt_util.get_time_zone(timezone))
+
+    hass = hass_recorder()
+    wait_recording_done(hass)
+
+    first_hour = dt_util.as_utc(dt_util.parse_datetime(f"{first_day} 00:00:00"))
+    external_statistics = [
+        {
+            "start": first_hour + timedelta(hours=hour),
+            "mean": hour * 1.5,
+            "min": hour - 1.0,
+            "max": hour + 1.0,
+            "last_reset": None,
+            "state": hour,
+            "sum": hour * 2,
+        }
+        for hour in range(24 * 3)
+    ]
+    external_metadata = {
+        "has_mean": True,
+        "has_sum": True,
+        "name": "Outdoor temperature",
+        "source": "test",
+        "statistic_id": "test:outdoor_temperature",
+        "unit_of_measurement": "kWh",
+    }
+
+    async_add_external_statistics(hass, external_metadata, external_statistics)
+    wait_recording_done(hass)
+    stats = statistics_during_period(hass, first_hour, period="day")
+
+    days: dict = {}
+    for stat in external_statistics:
+        days.setdefault(dt_util.as_local(stat["start"]).date(), []).append(stat)
+    expected = []
+    for day, day_stats in days.items():
+        day_start = dt_util.as_utc(dt_util.start_of_local_day(day))
+        expected.append(
+            {
+                "statistic_id": "test:outdoor_temperature",
+                "start": day_start.isoformat(),
+                "end": (day_start + timedelta(days=1)).isoformat(),
+                "mean": approx(mean(stat["mean"] for stat in day_stats)),
+                "min": approx(min(stat["min"] for stat in day_stats)),
+                "max": approx(max(stat["max"] for stat in day_stats)),
+                "last_reset": None,
+                "state": approx(day_stats[-1]["state"]),
+                "sum": approx(day_stats[-1]["sum"]),
+            }
+        )
+    assert stats == {"test:outdoor_temperature": expected}
+
+    dt_util.set_default_time_zone(dt_util.get_time_zone("UTC"))
+
+
+def test_statistics_rollups(hass_recorder):
+    """Test daily and monthly statistics are read from the rollup tables."""
+    dt_util.set_default_time_zone(dt_util.get_time_zone("Europe/Vienna"))
+
+    hass = hass_recorder()
+    wait_recording_done(hass)
+
+    sep_1 = dt_util.as_utc(dt_util.parse_datetime("2021-09-01 00:00:00"))
+    sep_30 = dt_util.as_utc(dt_util.parse_datetime("2021-09-30 00:00:00"))
+    oct_1 = dt_util.as_utc(dt_util.parse_datetime("2021-10-01 00:00:00"))
+    nov_1 = dt_util.as_utc(dt_util.parse_datetime("2021-11-01 00:00:00"))
+
+    first_hour = dt_util.as_utc(dt_util.parse_datetime("2021-09-29 18:00:00"))
+    external_statistics = [
+        {
+            "start": first_hour + timedelta(hours=hour),
+            "mean": hour % 7,
+            "min": hour % 5,
+            "max": hour % 11,
+            "last_reset": None,
+            "state": hour,
+            "sum": hour * 2,
+        }
+        for hour in range(24 * 40)
+        # Leave a gap at the start of october
+        if not oct_1 <= first_hour + timedelta(hours=hour) < oct_1 + timedelta(hours=3)
+    ]
+    external_metadata = {
+        "has_mean": True,
+        "has_sum": True,
+        "name": "Outdoor temperature",
+        "source": "test",
+        "statistic_id": "test:outdoor_temperature",
+        "unit_of_measurement": "kWh",
+    }
+    async_add_external_statistics(hass, external_metadata, external_statistics)
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StatisticsDaily).count() == 41
+        assert session.query(StatisticsMonthly).count() == 3
+
+    def _statistics_during_period(*args, **kwargs):
+        """Return the statistics both from the rollups and the hourly statistics."""
+        cache = recorder.get_instance(hass).statistics_query_cache
+        cache.invalidate(None, None)
+        from_rollups = statistics_during_period(hass, *args, **kwargs)
+        cache.invalidate(None, None)
+        with patch.object(
+            statistics, "_statistics_during_period_from_rollups", return_value=None
+        ):
+            from_hourly = statistics_during_period(hass, *args, **kwargs)
+        return from_rollups, from_hourly
+
+    with patch.object(
+        statistics,
+        "_reduce_statistics",
+        side_effect=AssertionError("Rollups not used"),
+    ):
+        rollup_stats = (
+            statistics_during_period(hass, sep_30, period="day"),
+            statistics_during_period(hass, oct_1, nov_1, period="day"),
+            statistics_during_period(hass, sep_1, period="month"),
+            statistics_during_period(hass, oct_1, nov_1, period="month"),
+        )
+
+    stats, expected = _statistics_during_period(sep_30, period="day")
+    assert stats == rollup_stats[0]
+    assert len(stats["test:outdoor_temperature"]) == 40
+    assert stats == expected
+    stats, expected = _statistics_during_period(oct_1, nov_1, period="day")
+    assert stats == rollup_stats[1]
+    # The last statistics before the gap is included as its own period
+    assert len(stats["test:outdoor_temperature"]) == 32
+    assert stats["test:outdoor_temperature"][0]["start"] == sep_30.isoformat()
+    assert stats["test:outdoor_temperature"][0]["state"] == approx(
+        (oct_1 - timedelta(hours=1) - first_hour) / timedelta(hours=1)
+    )
+    assert stats == expected
+    stats, expected = _statistics_during_period(sep_1, period="month")
+    assert stats == rollup_stats[2]
+    assert len(stats["test:outdoor_temperature"]) == 3
+    assert stats == expected
+    stats, expected = _statistics_during_period(oct_1, nov_1, period="month")
+    assert stats == rollup_stats[3]
+    assert len(stats["test:outdoor_temperature"]) == 2
+    assert stats == expected
+
+    # Periods not aligned to days or months are reduced from the hourly statistics
+    with patch.object(
+        statistics, "_reduce_statistics", wraps=statistics._reduce_statistics
+    ) as reduce_statistics_mock:
+        stats, expected = _statistics_during_period(
+            oct_1 + timedelta(hours=5), period="day"
+        )
+        assert reduce_statistics_mock.call_count == 2
+    assert stats == expected
+
+    # Adjusting the sum updates the rollups
+    recorder.get_instance(hass).async_adjust_statistics(
+        "test:outdoor_temperature", oct_1 + timedelta(days=2, hours=5), 1000.0
+    )
+    wait_recording_done(hass)
+    stats, expected = _statistics_during_period(oct_1, period="day")
+    assert stats == expected
+    assert stats["test:outdoor_temperature"][2]["sum"] < 1000
+    assert stats["test:outdoor_temperature"][3]["sum"] > 1000
+    stats, expected = _statistics_during_period(oct_1, period="month")
+    assert stats == expected
+
+    # The rollups are not used after the time zone was changed until rebuilt
+    dt_util.set_default_time_zone(dt_util.get_time_zone("America/Regina"))
+    with session_scope(hass=hass) as session:
+        assert statistics_rollups_need_rebuild(session)
+    oct_1 = dt_util.as_utc(dt_util.parse_datetime("2021-10-01 00:00:00"))
+    stats, expected = _statistics_during_period(oct_1, period="day")
+    assert stats == expected
+
+    recorder.get_instance(hass).queue_task(RebuildStatisticsRollupsTask())
+    wait_recording_done(hass)
+    with session_scope(hass=hass) as session:
+        assert not statistics_rollups_need_rebuild(session)
+    with patch.object(
+        statistics,
+        "_reduce_statistics",
+        side_effect=AssertionError("Rollups not used"),
+    ):
+        stats = statistics_during_period(hass, oct_1, period="day")
+    assert stats == _statistics_during_period(oct_1, period="day")[1]
+
+    dt_util.set_default_time_zone(dt_util.get_time_zone("UTC"))
+
+
+def test_compile_hourly_statistics_updates_monthly_rollup(hass_recorder):
+    """Test compiling an hour updates the monthly rollup without compiling it."""
+    hass = hass_recorder()
+    instance = recorder.get_instance(hass)
+    wait_recording_done(hass)
+
+    first_hour = dt_util.as_utc(dt_util.parse_datetime("2021-10-10 00:00:00"))
+    with session_scope(hass=hass) as session:
+        session.add(
+            StatisticsMeta(
+                statistic_id="sensor.test",
+                source="recorder",
+                unit_of_measurement="kWh",
+                has_mean=True,
+                has_sum=True,
+            )
+        )
+        session.flush()
+        session.add_all(
+            StatisticsShortTerm(
+                metadata_id=1,
+                start=first_hour + timedelta(minutes=5 * period),
+                mean=period,
+                min=period - 1,
+                max=period + 1,
+                state=period,
+                sum=period * 2,
+            )
+            for period in range(36)
+        )
+
+    with patch.object(
+        statistics,
+        "_compile_statistics_rollup",
+        wraps=statistics._compile_statistics_rollup,
+    ) as compile_rollup_mock:
+        for hour in range(3):
+            with session_scope(hass=hass) as session:
+                statistics.compile_hourly_statistics(
+                    instance, session, first_hour + timedelta(hours=hour)
+                )
+    # The monthly rollup is only compiled when the first hour is added
+    assert [call.args[1] for call in compile_rollup_mock.call_args_list] == [
+        StatisticsDaily,
+        StatisticsMonthly,
+        StatisticsDaily,
+        StatisticsDaily,
+    ]
+
+    with session_scope(hass=hass) as session:
+        rollup = session.query(StatisticsMonthly).one()
+        assert rollup.mean_count == 3
+        assert rollup.mean == approx(mean((5.5, 17.5, 29.5)))
+        assert rollup.min == -1
+        assert rollup.max == 36
+        assert rollup.state == 35
+        assert rollup.sum == 70
+
+        updated = (rollup.mean, rollup.min, rollup.max, rollup.state, rollup.sum)
+
+    # The updated rollup matches a compiled rollup
+    with session_scope(hass=hass) as session:
+        statistics.compile_statistics_rollups(session)
+    with session_scope(hass=hass) as session:
+        rollup = session.query(StatisticsMonthly).one()
+        assert rollup.mean_count == 3
+        assert (
+            rollup.mean,
+            rollup.min,
+            rollup.max,
+            rollup.state,
+            rollup.sum,
+        ) == approx(updated)
+
+
+def test_compile_earlier_hour_recompiles_monthly_rollup(hass_recorder):
+    """Test compiling an hour before the last compiled hour recompiles the month."""
+    hass = hass_recorder()
+    instance = recorder.get_instance(hass)
+    wait_recording_done(hass)
+
+    first_hour = dt_util.as_utc(dt_util.parse_datetime("2021-10-10 00:00:00"))
+    with session_scope(hass=hass) as session:
+        session.add(
+            StatisticsMeta(
+                statistic_id="sensor.test",
+                source="recorder",
+                unit_of_measurement="kWh",
+                has_mean=True,
+                has_sum=True,
+            )
+        )
+        session.flush()
+        session.add_all(
+            StatisticsShortTerm(
+                metadata_id=1,
+                start=first_hour + timedelta(minutes=5 * period),
+                mean=period,
+                min=period - 1,
+                max=period + 1,
+                state=period,
+                sum=period * 2,
+            )
+            for period in range(36)
+        )
+
+    for hour in (1, 2, 0):
+        with session_scope(hass=hass) as session:
+            statistics.compile_hourly_statistics(
+                instance, session, first_hour + timedelta(hours=hour)
+            )
+
+    with session_scope(hass=hass) as session:
+        rollup = session.query(StatisticsMonthly).one()
+        assert rollup.mean_count == 3
+        assert rollup.mean == approx(mean((5.5, 17.5, 29.5)))
+        assert rollup.min == -1
+        assert rollup.max == 36
+        assert rollup.state == 35
+        assert rollup.sum == 70
+
+
+def test_adjust_statistics_rollups_dst(hass_recorder):
+    """Test adjusting the sum on the day DST starts updates the following days."""
+    dt_util.set_default_time_zone(dt_util.get_time_zone("Europe/Vienna"))
+
+    hass = hass_recorder()
+    wait_recording_done(hass)
+
+    first_hour = dt_util.as_utc(dt_util.parse_datetime("2021-03-27 00:00:00"))
+    dst_start = dt_util.as_utc(dt_util.parse_datetime("2021-03-28 00:00:00"))
+    external_statistics = [
+        {
+            "start": first_hour + timedelta(hours=hour),
+            "last_reset": None,
+            "state": hour,
+            "sum": hour,
+        }
+        for hour in range(71)
+    ]
+    external_metadata = {
+        "has_mean": False,
+        "has_sum": True,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": "test:total_energy_import",
+        "unit_of_measurement": "kWh",
+    }
+    async_add_external_statistics(hass, external_metadata, external_statistics)
+    wait_recording_done(hass)
+
+    recorder.get_instance(hass).async_adjust_statistics(
+        "test:total_energy_import", dst_start + timedelta(hours=5), 1000.0
+    )
+    wait_recording_done(hass)
+
+    stats = statistics_during_period(hass, first_hour, period="day")
+    assert [stat["sum"] for stat in stats["test:total_energy_import"]] == [
+        23,
+        46 + 1000,
+        70 + 1000,
+    ]
+    with patch.object(
+        statistics, "_statistics_during_period_from_rollups", return_value=None
+    ):
+        recorder.get_instance(hass).statistics_query_cache.invalidate(None, None)
+        assert statistics_during_period(hass, first_hour, period="day") == stats
+
+    dt_util.set_default_time_zone(dt_util.get_time_zone("UTC"))
+
+
+def test_statistics_query_cache(hass_recorder):
+    """Test statistics_during_period results are cached until invalidated."""
+    hass = hass_recorder()
+    wait_recording_done(hass)
+    cache = recorder.get_instance(hass).statistics_query_cache
+
+    period1 = dt_util.as_utc(dt_util.parse_datetime("2021-09-01 00:00:00"))
+    period2 = dt_util.as_utc(dt_util.parse_datetime("2021-09-02 00:00:00"))
+    external_metadata = {
+        "has_mean": False,
+        "has_sum": True,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": "test:total_energy_import",
+        "unit_of_measurement": "kWh",
+    }
+    other_metadata = {**external_metadata, "statistic_id": "test:other"}
+    async_add_external_statistics(
+        hass, external_metadata, [{"start": period1, "state": 0, "sum": 2}]
+    )
+    wait_recording_done(hass)
+
+    with patch.object(
+        statistics,
+        "_statistics_during_period",
+        wraps=statistics._statistics_during_period,
+    ) as query_mock:
+        stats = statistics_during_period(
+            hass, period1, statistic_ids=["test:total_energy_import"]
+        )
+        assert len(stats["test:total_energy_import"]) == 1
+        assert (
+            statistics_during_period(
+                hass, period1, statistic_ids=["test:total_energy_import"]
+            )
+            is stats
+        )
+        assert query_mock.call_count == 1
+        assert cache.hits == 1
+        assert cache.misses == 1
+        assert cache.hit_rate == 0.5
+
+        ended = statistics_during_period(
+            hass, period1, period2, statistic_ids=["test:total_energy_import"]
+        )
+        assert query_mock.call_count == 2
+
+        # Statistics for other statistic_ids don't invalidate the result
+        async_add_external_statistics(
+            hass, other_metadata, [{"start": period1, "state": 0, "sum": 2}]
+        )
+        wait_recording_done(hass)
+        assert (
+            statistics_during_period(
+                hass, period1, statistic_ids=["test:total_energy_import"]
+            )
+            is stats
+        )
+        assert query_mock.call_count == 2
+
+        # Statistics after the end of a result don't invalidate it
+        async_add_external_statistics(
+            hass, external_metadata, [{"start": period2, "state": 1, "sum": 3}]
+        )
+        wait_recording_done(hass)
+        assert (
+            statistics_during_period(
+                hass, period1, period2, statistic_ids=["test:total_energy_import"]
+            )
+            is ended
+        )
+        stats = statistics_during_period(
+            hass, period1, statistic_ids=["test:total_energy_import"]
+        )
+        assert len(stats["test:total_energy_import"]) == 2
+        assert query_mock.call_count == 3
+
+        # Adjusting the sum invalidates the result
+        recorder.get_instance(hass).async_adjust_statistics(
+            "test:total_energy_import", period2, 10.0
+        )
+        wait_recording_done(hass)
+        stats = statistics_during_period(
+            hass, period1, statistic_ids=["test:total_energy_import"]
+        )
+        assert stats["test:total_energy_import"][1]["sum"] == 13
+        assert query_mock.call_count == 4
+
+
+def test_statistics_query_cache_bounds():
+    """Test the statistics query cache is bounded and invalidated."""
+    period1 = dt_util.as_utc(dt_util.parse_datetime("2021-09-01 00:00:00"))
+    period2 = dt_util.as_utc(dt_util.parse_datetime("2021-09-02 00:00:00"))
+    cache = statistics.StatisticsQueryCache(max_entries=2, max_rows=4)
+
+    cache.add(("a",), 0, ["sensor.a"], period2, {"sensor.a": [{}, {}]})
+    cache.add(("b",), 0, ["sensor.b"], None, {"sensor.b": [{}]})
+    assert cache.get(("a",)) == {"sensor.a": [{}, {}]}
+    cache.add(("c",), 0, None, None, {"sensor.c": [{}]})
+    # The least recently used entry is removed
+    assert len(cache) == 2
+    assert cache.get(("b",)) is None
+    cache.add(("d",), 0, ["sensor.d"], None, {"sensor.d": [{}] * 4})
+    # Too many rows
+    assert len(cache) == 1
+    assert cache.get(("d",)) is not None
+    cache.add(("e",), 0, ["sensor.e"], None, {"sensor.e": [{}] * 5})
+    assert cache.get(("e",)) is None
+
+    cache.add(("a",), 0, ["sensor.a"], period2, {"sensor.a": [{}, {}]})
+    cache.invalidate(["sensor.a"], period2)
+    assert cache.get(("a",)) is not None
+    cache.invalidate(["sensor.b"], period1)
+    assert cache.get(("a",)) is not None
+    cache.invalidate(["sensor.a"], period1)
+    assert cache.get(("a",)) is None
+
+    # Results queried before an invalidation are not added
+    cache.add(("a",), 0, ["sensor.a"], period2, {"sensor.a": [{}, {}]})
+    assert cache.get(("a",)) is None
+    cache.add(("a",), cache.generation, ["sensor.a"], None, {"sensor.a": [{}]})
+    cache.add(("c",), cache.generation, None, None, {"sensor.c": [{}]})
+    cache.invalidate(["sensor.b"], None)
+    assert cache.get(("a",)) is not None
+    assert cache.get(("c",)) is None
+
+
 def test_delete_duplicates_no_duplicates(hass_recorder, caplog):
     """Test removal of duplicated statistics."""
     hass = hass_recorder()
@@ -6,8 +6,10 @@ import pytest
 
 from homeassistant.components.recorder import get_instance
 from homeassistant.components.recorder.const import SupportedDialect
+from homeassistant.components.recorder.purge import PurgeProgress
 from homeassistant.core import HomeAssistant
 from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
 
 from .common import async_wait_recording_done
 
@@ -26,6 +28,10 @@ async def test_recorder_system_health(hass, recorder_mock):
         "estimated_db_size": ANY,
         "database_engine": SupportedDialect.SQLITE.value,
         "database_version": ANY,
+        "attributes_id_cache_hits": ANY,
+        "attributes_id_cache_misses": ANY,
+        "event_data_id_cache_hits": ANY,
+        "event_data_id_cache_misses": ANY,
     }
 
 
@@ -50,6 +56,10 @@ async def test_recorder_system_health_alternate_dbms(hass, recorder_mock, dialec
         "estimated_db_size": "1.00 MiB",
         "database_engine": dialect_name.value,
         "database_version": ANY,
+        "attributes_id_cache_hits": ANY,
+        "attributes_id_cache_misses": ANY,
+        "event_data_id_cache_hits": ANY,
+        "event_data_id_cache_misses": ANY,
     }
 
 
@@ -68,4 +78,101 @@ async def test_recorder_system_health_crashed_recorder_runs_table(
         "estimated_db_size": ANY,
         "database_engine": SupportedDialect.SQLITE.value,
         "database_version": ANY,
+        "attributes_id_cache_hits": ANY,
+        "attributes_id_cache_misses": ANY,
+        "event_data_id_cache_hits": ANY,
+        "event_data_id_cache_misses": ANY,
     }
+
+
+async def test_recorder_system_health_purge_progress(hass, recorder_mock):
+    """Test recorder system health includes the purge progress."""
+    assert await async_setup_component(hass, "system_health", {})
+    await async_wait_recording_done(hass)
+    instance = get_instance(hass)
+    now = dt_util.utcnow()
+    instance.purge_progress = PurgeProgress(
+        run_id=1,
+        purge_before=now,
+        start=now,
+        end=None,
+        steps=3,
+        states_purged=1000,
+        events_purged=50,
+    )
+    info = await get_system_health_info(hass, "recorder")
+    assert info == {
+        "current_recorder_run": instance.run_history.current.start,
+        "oldest_recorder_run": instance.run_history.first.start,
+        "estimated_db_size": ANY,
+        "database_engine": SupportedDialect.SQLITE.value,
+        "database_version": ANY,
+        "purge_in_progress": True,
+        "purge_states_deleted": 1000,
+        "purge_events_deleted": 50,
+        "attributes_id_cache_hits": ANY,
+        "attributes_id_cache_misses": ANY,
+        "event_data_id_cache_hits": ANY,
+        "event_data_id_cache_misses": ANY,
+    }
+
+
+async def test_recorder_system_health_statistics_cache(hass, recorder_mock):
+    """Test recorder system health includes the statistics cache hit rate."""
+    assert await async_setup_component(hass, "system_health", {})
+    await async_wait_recording_done(hass)
+    instance = get_instance(hass)
+    cache = instance.statistics_query_cache
+    cache.add(("key",), cache.generation, None, None, {})
+    cache.get(("key",))
+    cache.get(("key",))
+    cache.get(("other",))
+    info = await get_system_health_info(hass, "recorder")
+    assert info == {
+        "current_recorder_run": instance.run_history.current.start,
+        "oldest_recorder_run": instance.run_history.first.start,
+        "estimated_db_size": ANY,
+        "database_engine": SupportedDialect.SQLITE.value,
+        "database_version": ANY,
+        "statistics_cache_hit_rate": "66.7 %",
+        "statistics_cache_entries": 1,
+        "attributes_id_cache_hits": ANY,
+        "attributes_id_cache_misses": ANY,
+        "event_data_id_cache_hits": ANY,
+        "event_data_id_cache_misses": ANY,
+    }
+
+
+async def test_recorder_system_health_executor_queue_time(hass, recorder_mock):
+    """Test recorder system health includes the executor queue time."""
+    assert await async_setup_component(hass, "system_health", {})
+    await async_wait_recording_done(hass)
+    instance = get_instance(hass)
+    instance.executor_queue_stats.record(0.002)
+    instance.executor_queue_stats.record(0.004)
+    info = await get_system_health_info(hass, "recorder")
+    assert info["executor_queue_time_avg"] == "3.0 ms"
+    assert info["executor_queue_time_max"] == "4.0 ms"
+
+
+async def test_recorder_system_health_id_caches(hass, recorder_mock):
+    """Test recorder system health includes the id cache hits and misses."""
+    assert await async_setup_component(hass, "system_health", {})
+    await async_wait_recording_done(hass)
+    instance = get_instance(hass)
+    attributes_cache = instance.state_attributes_id_cache
+    data_cache = instance.event_data_id_cache
+    attributes_hits = attributes_cache.hits
+    attributes_misses = attributes_cache.misses
+    data_misses = data_cache.misses
+
+    hass.states.async_set("test.one", "on", {"test_attr": 5})
+    await async_wait_recording_done(hass)
+    hass.states.async_set("test.one", "off", {"test_attr": 5})
+    hass.bus.async_fire("test_event", {"test_data": 5})
+    await async_wait_recording_done(hass)
+
+    info = await get_system_health_info(hass, "recorder")
+    assert info["attributes_id_cache_hits"] == attributes_hits + 1
+    assert info["attributes_id_cache_misses"] == attributes_misses + 1
+    assert info["event_data_id_cache_misses"] == data_misses + 1
@@ -21,7 +21,9 @@ from homeassistant.components.recorder.statistics import (
     statistics_during_period,
 )
 from homeassistant.components.recorder.util import session_scope
+from homeassistant.components.sensor.recorder import StatisticsStatesBuffer
 from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import State
 from homeassistant.setup import async_setup_component, setup_component
 import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM
@@ -144,6 +146,86 @@ def test_compile_hourly_statistics(
     assert "Error while processing event StatisticsTask" not in caplog.text
 
 
+def test_compile_hourly_statistics_from_states_buffer(hass_recorder, caplog):
+    """Test compiling statistics from the states buffered while recording."""
+    hass = hass_recorder()
+    setup_component(hass, "sensor", {})
+    wait_recording_done(hass)  # Wait for the sensor recorder platform to be added
+    # The first recorded sensor state change creates the buffer
+    hass.states.set("sensor.test1", "0", attributes=TEMPERATURE_SENSOR_ATTRIBUTES)
+    wait_recording_done(hass)
+
+    zero = dt_util.utcnow() + timedelta(minutes=5)
+    one = zero + timedelta(seconds=1 * 5)
+    two = one + timedelta(seconds=10 * 5)
+    three = two + timedelta(seconds=40 * 5)
+    for now, state in ((one, "-10"), (two, "15"), (three, "30")):
+        with patch("homeassistant.core.dt_util.utcnow", return_value=now):
+            hass.states.set(
+                "sensor.test1", state, attributes=TEMPERATURE_SENSOR_ATTRIBUTES
+            )
+        wait_recording_done(hass)
+
+    with patch(
+        "homeassistant.components.sensor.recorder.history.get_full_significant_states_with_session"
+    ) as get_history:
+        do_adhoc_statistics(hass, start=zero)
+        wait_recording_done(hass)
+    assert get_history.call_count == 0
+
+    stats = statistics_during_period(hass, zero, period="5minute")
+    assert stats == {
+        "sensor.test1": [
+            {
+                "statistic_id": "sensor.test1",
+                "start": process_timestamp_to_utc_isoformat(zero),
+                "end": process_timestamp_to_utc_isoformat(zero + timedelta(minutes=5)),
+                "mean": approx((0 * 5 - 10 * 50 + 15 * 200 + 30 * 45) / 300),
+                "min": approx(-10),
+                "max": approx(30),
+                "last_reset": None,
+                "state": None,
+                "sum": None,
+            }
+        ]
+    }
+    assert "Error while processing event StatisticsTask" not in caplog.text
+
+
+def test_states_buffer_only_answers_periods_it_covers():
+    """Test the states buffer leaves periods it can't answer to the database."""
+    zero = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    period1 = zero + timedelta(minutes=5)
+    period2 = period1 + timedelta(minutes=5)
+    wanted_statistics = {"sensor.test1": {"mean", "min", "max"}}
+    states = [
+        State(
+            "sensor.test1",
+            str(value),
+            TEMPERATURE_SENSOR_ATTRIBUTES,
+            last_updated=zero + timedelta(minutes=minutes),
+        )
+        for value, minutes in ((0, 1), (10, 6), (20, 11))
+    ]
+
+    buffer = StatisticsStatesBuffer(zero + timedelta(minutes=2))
+    buffer.add("sensor.test1", states[0], states[1])
+    buffer.add("sensor.test1", states[1], states[2])
+
+    # The buffer does not know the changes fired before it was created
+    assert buffer.get_history(states[2:], wanted_statistics, zero, period1) == {}
+
+    assert buffer.get_history(states[2:], wanted_statistics, period1, period2) == {
+        "sensor.test1": states[0:2]
+    }
+    assert buffer.get_history(
+        states[2:], wanted_statistics, period2, period2 + timedelta(minutes=5)
+    ) == {"sensor.test1": states[1:3]}
+
+    # The states before the last compiled period have been dropped
+    assert buffer.get_history(states[2:], wanted_statistics, period1, period2) == {}
+
+
 @pytest.mark.parametrize(
     "device_class,unit,native_unit",
     [
@@ -14,7 +14,7 @@ from homeassistant.components.websocket_api.auth import (
     TYPE_AUTH_REQUIRED,
 )
 from homeassistant.components.websocket_api.const import URL
-from homeassistant.const import SIGNAL_BOOTSTRAP_INTEGRATONS
+from homeassistant.const import EVENT_STATE_CHANGED, SIGNAL_BOOTSTRAP_INTEGRATONS
 from homeassistant.core import Context, HomeAssistant, State, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import entity
@@ -618,14 +618,35 @@ async def test_states_filters_visible(hass, hass_admin_user, websocket_client):
     assert msg["result"][0]["entity_id"] == "test.entity"
 
 
-async def test_get_states_not_allows_nan(hass, websocket_client):
-    """Test get_states command not allows NaN floats."""
+async def test_get_states_nan_serialized_to_null(hass, websocket_client):
+    """Test get_states command serializes NaN floats as null."""
     hass.states.async_set("greeting.hello", "world")
     hass.states.async_set("greeting.bad", "data", {"hello": float("NaN")})
     hass.states.async_set("greeting.bye", "universe")
 
     await websocket_client.send_json({"id": 5, "type": "get_states"})
 
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+    bad = dict(hass.states.get("greeting.bad").as_dict())
+    bad["attributes"] = {"hello": None}
+    assert msg["result"] == [
+        hass.states.get("greeting.hello").as_dict(),
+        bad,
+        hass.states.get("greeting.bye").as_dict(),
+    ]
+
+
+async def test_get_states_not_serializable(hass, websocket_client):
+    """Test get_states command drops states that can not be serialized."""
+    hass.states.async_set("greeting.hello", "world")
+    hass.states.async_set("greeting.bad", "data", {"hello": object()})
+    hass.states.async_set("greeting.bye", "universe")
+
+    await websocket_client.send_json({"id": 5, "type": "get_states"})
+
     msg = await websocket_client.receive_json()
     assert msg["id"] == 5
     assert msg["type"] == const.TYPE_RESULT
@@ -1042,6 +1063,80 @@ async def test_subscribe_unsubscribe_entities_specific_entities(
     }
 
 
+async def test_subscribe_entities_listeners(hass, websocket_client, hass_admin_user):
+    """Test subscribe_entities subscriptions for all entities share a listener."""
+    hass.states.async_set("light.permitted", "off")
+    hass.states.async_set("light.other", "off")
+    init_count = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+
+    await websocket_client.send_json(
+        {"id": 7, "type": "subscribe_entities", "entity_ids": ["light.permitted"]}
+    )
+    await websocket_client.send_json({"id": 8, "type": "subscribe_entities"})
+    for msg_id in (7, 7, 8, 8):
+        msg = await websocket_client.receive_json()
+        assert msg["id"] == msg_id
+
+    # The subscription for light.permitted listens with its entity_ids
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == init_count + 2
+
+    hass.states.async_set("light.other", "on")
+    hass.states.async_set("light.permitted", "on")
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 8
+    assert msg["event"] == {
+        "c": {"light.other": {"+": {"c": ANY, "lc": ANY, "s": "on"}}}
+    }
+    received = set()
+    for _ in range(2):
+        msg = await websocket_client.receive_json()
+        received.add(msg["id"])
+        assert msg["event"] == {
+            "c": {"light.permitted": {"+": {"c": ANY, "lc": ANY, "s": "on"}}}
+        }
+    assert received == {7, 8}
+
+    for msg_id, unsub_id in ((9, 7), (10, 8)):
+        await websocket_client.send_json(
+            {"id": msg_id, "type": "unsubscribe_events", "subscription": unsub_id}
+        )
+        msg = await websocket_client.receive_json()
+        assert msg["id"] == msg_id
+        assert msg["success"]
+
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == init_count
+
+
+async def test_subscribe_entities_permission_change(
+    hass, websocket_client, hass_admin_user
+):
+    """Test subscribe_entities picks up changed permissions."""
+    hass.states.async_set("light.permitted", "off")
+    hass.states.async_set("light.not_permitted", "off")
+    hass_admin_user.groups = []
+    hass_admin_user.mock_policy({"entities": {"entity_ids": {"light.permitted": True}}})
+
+    await websocket_client.send_json({"id": 7, "type": "subscribe_entities"})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert list(msg["event"]["a"]) == ["light.permitted"]
+
+    hass.states.async_set("light.not_permitted", "on")
+    hass_admin_user.mock_policy(
+        {"entities": {"entity_ids": {"light.not_permitted": True}}}
+    )
+    hass.states.async_set("light.permitted", "on")
+    hass.states.async_set("light.not_permitted", "off")
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["event"] == {
+        "c": {"light.not_permitted": {"+": {"c": ANY, "lc": ANY, "s": "off"}}}
+    }
+
+
 async def test_render_template_renders_template(hass, websocket_client):
     """Test simple template is rendered and updated."""
     hass.states.async_set("light.test", "on")
@@ -1,7 +1,7 @@
 """Test Websocket API http module."""
 import asyncio
 from datetime import timedelta
-from unittest.mock import patch
+from unittest.mock import AsyncMock, Mock, patch
 
 from aiohttp import ServerDisconnectedError, WSMsgType, web
 import pytest
@@ -93,3 +93,14 @@ async def test_prepare_fail(hass, hass_ws_client, caplog):
         await hass_ws_client(hass)
 
     assert "Timeout preparing request" in caplog.text
+
+
+async def test_send_bytes_text_without_frame_writer(hass):
+    """Test encoded messages are sent with send_str without the frame writer."""
+    handler = http.WebSocketHandler(hass, Mock())
+    handler.wsock = Mock(spec=["send_str"], send_str=AsyncMock())
+
+    send_bytes_text = handler._async_get_send_bytes_text()
+    await send_bytes_text(b'{"id":1}')
+
+    handler.wsock.send_str.assert_awaited_once_with('{"id":1}')
@@ -1,8 +1,11 @@
 """Test Websocket API messages module."""
+import json
 
 from homeassistant.components.websocket_api.messages import (
     _cached_event_message as lru_event_cache,
+    _cached_state_diff_message as lru_state_diff_cache,
     cached_event_message,
+    cached_state_diff_message,
     message_to_json,
 )
 from homeassistant.const import EVENT_STATE_CHANGED
@@ -78,6 +81,53 @@ async def test_cached_event_message_with_different_idens(hass):
     assert cache_info.currsize == 1
 
 
+async def test_cached_state_diff_message_with_different_idens(hass):
+    """Test that state diffs are serialized once for all subscription idens."""
+
+    events = []
+
+    @callback
+    def _event_listener(event):
+        events.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _event_listener)
+
+    hass.states.async_set("light.window", "on")
+    hass.states.async_set("light.window", "off", {"color": "red"})
+    await hass.async_block_till_done()
+
+    assert len(events) == 2
+
+    lru_state_diff_cache.cache_clear()
+
+    msg2 = cached_state_diff_message(2, events[1])
+    msg345 = cached_state_diff_message(345, events[1])
+
+    assert isinstance(msg2, bytes)
+    assert json.loads(msg2) == {
+        "id": 2,
+        "type": "event",
+        "event": {
+            "c": {
+                "light.window": {
+                    "+": {
+                        "a": {"color": "red"},
+                        "c": events[1].data["new_state"].context.id,
+                        "lc": events[1].data["new_state"].last_changed.timestamp(),
+                        "s": "off",
+                    }
+                }
+            }
+        },
+    }
+    assert json.loads(msg345) == {**json.loads(msg2), "id": 345}
+
+    cache_info = lru_state_diff_cache.cache_info()
+    assert cache_info.hits == 1
+    assert cache_info.misses == 1
+    assert cache_info.currsize == 1
+
+
 async def test_message_to_json(caplog):
     """Test we can serialize websocket messages."""
 
@@ -5,6 +5,7 @@ import asyncio
 from collections.abc import AsyncGenerator
 import functools
 import logging
+import sqlite3
 import ssl
 import threading
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
@@ -91,6 +92,12 @@ def pytest_runtest_setup():
     freezegun.api.datetime_to_fakedatetime = ha_datetime_to_fakedatetime
     freezegun.api.FakeDatetime = HAFakeDatetime
 
+    def adapt_datetime(val):
+        return val.isoformat(" ")
+
+    # Setup HAFakeDatetime converter for sqlite3
+    sqlite3.register_adapter(HAFakeDatetime, adapt_datetime)
+
 
 def ha_datetime_to_fakedatetime(datetime):
     """Convert datetime to FakeDatetime.
@@ -1,6 +1,7 @@
 """Tests for the Entity Registry."""
 from unittest.mock import patch
 
+import attr
 import pytest
 import voluptuous as vol
 
@@ -1220,6 +1221,50 @@ def test_entity_registry_items():
     assert entities.get_entry(entry2.id) is None
 
 
+def test_entity_registry_items_lookups():
+    """Test the EntityRegistryItems device, area and config entry lookups."""
+    entities = er.EntityRegistryItems()
+    entry1 = er.RegistryEntry(
+        "test.entity1", "1234", "hue", device_id="device", area_id="area"
+    )
+    entry2 = er.RegistryEntry(
+        "test.entity2",
+        "2345",
+        "hue",
+        device_id="device",
+        config_entry_id="entry",
+        disabled_by=er.RegistryEntryDisabler.USER,
+    )
+    entities["test.entity1"] = entry1
+    entities["test.entity2"] = entry2
+
+    assert entities.get_entries_for_device_id("device") == [entry1]
+    assert entities.get_entries_for_device_id("device", True) == [entry1, entry2]
+    assert entities.get_entries_for_area_id("area") == [entry1]
+    assert entities.get_entries_for_config_entry_id("entry") == [entry2]
+
+    # Entries stay in place when their device is unchanged
+    entry1_moved = attr.evolve(entry1, area_id="other_area", config_entry_id="entry")
+    entities["test.entity1"] = entry1_moved
+    assert entities.get_entries_for_device_id("device", True) == [
+        entry1_moved,
+        entry2,
+    ]
+    assert entities.get_entries_for_area_id("area") == []
+    assert entities.get_entries_for_area_id("other_area") == [entry1_moved]
+    assert entities.get_entries_for_config_entry_id("entry") == [entry2, entry1_moved]
+
+    del entities["test.entity2"]
+    entities.pop("test.entity1")
+
+    assert entities.get_entries_for_device_id("device", True) == []
+    assert entities.get_entries_for_area_id("other_area") == []
+    assert entities.get_entries_for_config_entry_id("entry") == []
+    assert not entities._device_id_index
+    assert not entities._area_id_index
+    assert not entities._config_entry_id_index
+
+
 async def test_disabled_by_str_not_allowed(hass):
     """Test we need to pass entity category type."""
     reg = er.async_get(hass)
@@ -2,6 +2,7 @@
 # pylint: disable=protected-access
 import asyncio
 from datetime import date, datetime, timedelta
+from functools import partial
 from unittest.mock import patch
 
 from astral import LocationInfo
@@ -21,6 +22,7 @@ from homeassistant.helpers.event import (
     TrackTemplate,
     TrackTemplateResult,
     async_call_later,
+    async_get_pending_timers,
     async_track_entity_registry_updated_event,
     async_track_point_in_time,
     async_track_point_in_utc_time,
@@ -123,6 +125,84 @@ async def test_track_point_in_time_drift_rearm(hass):
     assert len(specific_runs) == 1
 
 
+async def test_track_point_in_time_shares_loop_handle(hass):
+    """Test timers due within the same second share one loop handle."""
+    runs = []
+    start = dt_util.utcnow().replace(microsecond=0) + timedelta(seconds=100)
+
+    def _active_handles():
+        return len(
+            [handle for handle in hass.loop._scheduled if not handle.cancelled()]
+        )
+
+    handles = _active_handles()
+    unsubs = [
+        async_track_point_in_utc_time(
+            hass, callback(lambda x: runs.append(x)), start + timedelta(seconds=offset)
+        )
+        for offset in (0.9, 0.1, 0.5, 1.5)
+    ]
+    assert _active_handles() == handles + 2
+    assert async_get_pending_timers(hass) == {__name__: 4}
+
+    async_fire_time_changed(hass, start + timedelta(seconds=0.5))
+    await hass.async_block_till_done()
+    assert runs == [start + timedelta(seconds=0.1), start + timedelta(seconds=0.5)]
+    assert async_get_pending_timers(hass) == {__name__: 2}
+
+    unsubs[0]()
+    assert async_get_pending_timers(hass) == {__name__: 1}
+    assert _active_handles() == handles + 1
+
+    async_fire_time_changed(hass, start + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    assert runs[2:] == [start + timedelta(seconds=1.5)]
+    assert async_get_pending_timers(hass) == {}
+    assert _active_handles() == handles
+
+    # Cancelling after the timer ran does nothing
+    unsubs[3]()
+
+
+async def test_track_point_in_time_cancel_due_timer(hass):
+    """Test a timer can cancel another timer due in the same run."""
+    runs = []
+    point = dt_util.utcnow().replace(microsecond=0) + timedelta(seconds=100)
+    unsubs = {}
+
+    @callback
+    def _run(name, now):
+        runs.append(name)
+        unsubs["b" if name == "a" else "a"]()
+
+    for name in ("a", "b"):
+        unsubs[name] = async_track_point_in_utc_time(hass, partial(_run, name), point)
+
+    async_fire_time_changed(hass, point + timedelta(seconds=0.1))
+    await hass.async_block_till_done()
+    assert len(runs) == 1
+    assert async_get_pending_timers(hass) == {}
+
+
+async def test_track_point_in_time_job_raises(hass, caplog):
+    """Test a timer that raises does not stop the other due timers."""
+    runs = []
+    point = dt_util.utcnow().replace(microsecond=0) + timedelta(seconds=100)
+
+    @callback
+    def _fail(now):
+        raise ValueError("timer failed")
+
+    async_track_point_in_utc_time(hass, _fail, point)
+    async_track_point_in_utc_time(hass, callback(lambda x: runs.append(x)), point)
+
+    async_fire_time_changed(hass, point + timedelta(seconds=0.1))
+    await hass.async_block_till_done()
+    assert runs == [point]
+    assert "Error running timer job" in caplog.text
+    assert async_get_pending_timers(hass) == {}
+
+
 async def test_track_state_change_from_to_state_match(hass):
     """Test track_state_change with from and to state matchers."""
     from_and_to_state_runs = []
@@ -2123,6 +2203,106 @@ async def test_track_template_result_iterator(hass):
     assert filter_runs == ["", "sensor.new"]
 
 
+async def test_track_template_result_error_tracks_source_dependencies(hass):
+    """Test a template that fails to render tracks the entities in its source."""
+    template_error = Template(
+        "{{ states('sensor.a') | float + states.sensor.b.state | float }}", hass
+    )
+    runs = []
+
+    @ha.callback
+    def error_listener(event, updates):
+        runs.append(updates.pop().result)
+
+    info = async_track_template_result(
+        hass, [TrackTemplate(template_error, None)], error_listener
+    )
+    await hass.async_block_till_done()
+
+    assert info.listeners == {
+        "all": False,
+        "domains": set(),
+        "entities": {"sensor.a", "sensor.b"},
+        "time": False,
+    }
+
+    hass.states.async_set("sensor.c", "1")
+    await hass.async_block_till_done()
+    assert runs == []
+
+    hass.states.async_set("sensor.a", "1")
+    await hass.async_block_till_done()
+    assert len(runs) == 1
+    assert isinstance(runs[0], TemplateError)
+
+    hass.states.async_set("sensor.b", "2")
+    await hass.async_block_till_done()
+    assert runs[1:] == [3.0]
+
+
+async def test_track_template_result_coalesces_state_changes(hass):
+    """Test state changes in one loop iteration render the template once."""
+    template_sum = Template(
+        "{{ (states('sensor.a') | int(0)) + (states('sensor.b') | int(0)) }}", hass
+    )
+    runs = []
+
+    @ha.callback
+    def sum_listener(event, updates):
+        runs.append((event.data["entity_id"], updates.pop().result))
+
+    async_track_template_result(hass, [TrackTemplate(template_sum, None)], sum_listener)
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.a", "1")
+    hass.states.async_set("sensor.b", "2")
+    hass.states.async_set("sensor.c", "3")
+    await hass.async_block_till_done()
+
+    assert runs == [("sensor.b", 3)]
+
+    hass.states.async_set("sensor.a", "5")
+    await hass.async_block_till_done()
+
+    assert runs == [("sensor.b", 3), ("sensor.a", 7)]
+
+
+async def test_track_template_result_batch_isolates_failures(hass, caplog):
+    """Test a tracker that raises does not stop the others in the batch."""
+    template_a = Template("{{ states('sensor.a') }}", hass)
+    fail = True
+    runs = []
+
+    @ha.callback
+    def failing_listener(event, updates):
+        if fail:
+            raise ValueError("listener failed")
+
+    @ha.callback
+    def healthy_listener(event, updates):
+        runs.append(updates.pop().result)
+
+    async_track_template_result(
+        hass, [TrackTemplate(template_a, None)], failing_listener
+    )
+    async_track_template_result(
+        hass, [TrackTemplate(template_a, None)], healthy_listener
+    )
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.a", "1")
+    await hass.async_block_till_done()
+
+    assert runs == [1]
+    assert "Error while refreshing template tracker" in caplog.text
+
+    fail = False
+    hass.states.async_set("sensor.a", "2")
+    await hass.async_block_till_done()
+
+    assert runs == [1, 2]
+
+
 async def test_track_template_result_errors(hass, caplog):
     """Test tracking template with errors in the template."""
     template_syntax_error = Template("{{states.switch", hass)
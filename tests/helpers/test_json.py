@@ -1,10 +1,18 @@
 """Test Home Assistant remote methods and classes."""
 import datetime
+import json
 
 import pytest
 
 from homeassistant import core
-from homeassistant.helpers.json import ExtendedJSONEncoder, JSONEncoder
+from homeassistant.helpers.json import (
+    ExtendedJSONEncoder,
+    JSONEncoder,
+    json_bytes,
+    json_dumps,
+    json_dumps_pretty,
+    json_encoder_default,
+)
 from homeassistant.util import dt as dt_util
 
 
@@ -64,3 +72,34 @@ def test_extended_json_encoder(hass):
     # Default method falls back to repr(o)
     o = object()
     assert ha_json_enc.default(o) == {"__type": str(type(o)), "repr": repr(o)}
+
+
+def test_json_dumps(hass):
+    """Test serializing Home Assistant objects with orjson."""
+    now = dt_util.utcnow()
+    state = core.State("test.test", "hello", last_changed=now, last_updated=now)
+
+    assert json.loads(json_dumps({"state": state, "when": now, 1: {"a"}})) == {
+        "state": json.loads(json.dumps(state.as_dict(), cls=JSONEncoder)),
+        "when": now.isoformat(),
+        "1": ["a"],
+    }
+    assert json_bytes([1, "2"]) == b'[1,"2"]'
+    assert json_dumps({"nan": float("nan")}) == '{"nan":null}'
+
+
+def test_json_dumps_raises(hass):
+    """Test orjson serialization raises on unsupported types."""
+    with pytest.raises(TypeError):
+        json_dumps({"bad": object()})
+
+    with pytest.raises(TypeError):
+        json_encoder_default(object())
+
+
+def test_json_dumps_pretty(hass):
+    """Test serializing indented JSON for files."""
+    assert json_dumps_pretty({"a": {"b"}}) == '{\n  "a": [\n    "b"\n  ]\n}'
+
+    with pytest.raises(TypeError):
+        json_dumps_pretty({"a": {"b"}}, default=None)
@@ -6,6 +6,7 @@ import random
 from unittest.mock import patch
 
 from freezegun import freeze_time
+import jinja2
 import pytest
 import voluptuous as vol
 
@@ -13,6 +14,7 @@ from homeassistant.components import group
 from homeassistant.config import async_process_ha_core_config
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_STARTED,
     LENGTH_METERS,
     LENGTH_MILLIMETERS,
     MASS_GRAMS,
@@ -25,6 +27,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers import device_registry as dr, entity, template
 from homeassistant.helpers.entity_platform import EntityPlatform
+from homeassistant.helpers.storage import STORAGE_DIR
 from homeassistant.setup import async_setup_component
 import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import UnitSystem
@@ -161,6 +164,56 @@ def test_raise_exception_on_error(hass):
         template.Template("{{ invalid_syntax").ensure_valid()
 
 
+def test_render_error_collects_dependencies_from_source(hass):
+    """Test a failed render tracks the states referenced in the source."""
+    tmpl_str = "{{ states('sensor.a') | float + states.sensor.b.state | float }}"
+
+    info = render_to_info(hass, tmpl_str)
+    with pytest.raises(TemplateError):
+        info.result()
+    assert info.dependencies_from_source is True
+    assert info.entities == {"sensor.a", "sensor.b"}
+    assert info.filter("sensor.b")
+    assert not info.filter("sensor.c")
+    assert info.rate_limit is None
+
+    info = render_to_info(hass, "{{ (states.light | first).state | float }}")
+    with pytest.raises(TemplateError):
+        info.result()
+    assert info.dependencies_from_source is True
+    assert info.domains == {"light"}
+    assert info.domains_lifecycle == {"light"}
+    assert info.rate_limit == template.DOMAIN_STATES_RATE_LIMIT
+
+    info = render_to_info(hass, "{{ states(entity_id) | float }}", {"entity_id": "a.b"})
+    with pytest.raises(TemplateError):
+        info.result()
+    assert info.dependencies_from_source is False
+    assert info.rate_limit == template.ALL_STATES_RATE_LIMIT
+
+
+def test_source_dependencies():
+    """Test finding the states a template depends on from its source."""
+    deps = template.source_dependencies(
+        "{{ states['light.x'] }}{{ states.switch['y'].state }}"
+        "{{ is_state_attr('sensor.a', 'b', 1) }}{{ expand('group.a') | list }}"
+        "{{ 'group.b' | expand }}{% for s in states.cover %}{{ now() }}{% endfor %}"
+    )
+    assert deps == template.SourceDependencies(
+        frozenset({"light.x", "switch.y", "sensor.a"}),
+        frozenset({"cover"}),
+        ("group.a", "group.b"),
+        True,
+    )
+
+    assert template.source_dependencies("{{ states | count }}") is None
+    assert template.source_dependencies("{{ states(entity_id) }}") is None
+    assert template.source_dependencies("{{ states.light[name] }}") is None
+    assert template.source_dependencies("{{ closest('zone.home') }}") is None
+    assert template.source_dependencies("{% set states = 1 %}{{ states }}") is None
+    assert template.source_dependencies("{{ states(") is None
+
+
 def test_iterating_all_states(hass):
     """Test iterating all states."""
     tmpl_str = "{% for state in states %}{{ state.state }}{% endfor %}"
@@ -3432,34 +3485,32 @@ def test_iif(hass: HomeAssistant) -> None:
     assert tpl.async_render() == "no"
 
 
-async def test_cache_garbage_collection():
+async def test_cache_keeps_compiled_code():
     """Test caching a template."""
     template_string = (
         "{% set dict = {'foo': 'x&y', 'bar': 42} %} {{ dict | urlencode }}"
     )
+    key = ("normal", template_string)
     tpl = template.Template(
         (template_string),
     )
     tpl.ensure_valid()
     assert template._NO_HASS_ENV.template_cache.get(
-        template_string
+        key
     )  # pylint: disable=protected-access
 
     tpl2 = template.Template(
         (template_string),
     )
     tpl2.ensure_valid()
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
+    assert tpl2._compiled_code is tpl._compiled_code
 
+    # The compiled code is kept when the templates are gone
+    # so it can be used again after a reload
     del tpl
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
     del tpl2
-    assert not template._NO_HASS_ENV.template_cache.get(
-        template_string
+    assert template._NO_HASS_ENV.template_cache.get(
+        key
     )  # pylint: disable=protected-access
 
 
@@ -3829,3 +3880,100 @@ async def test_undefined_variable(hass, caplog):
         "Template variable warning: 'no_such_variable' is undefined when rendering '{{ no_such_variable }}'"
         in caplog.text
     )
+
+
+async def test_compiled_code_is_cached(hass):
+    """Test templates with the same source share the compiled code."""
+    cache = template._async_get_bytecode_cache(hass)
+    hits = cache.hits
+
+    tpl = template.Template("{{ 1 + 1 }}", hass)
+    assert tpl.async_render() == 2
+    other = template.Template("{{ 1 + 1 }}", hass)
+    assert other.async_render() == 2
+    assert cache.hits == hits + 1
+
+
+def test_bytecode_cache_is_bounded():
+    """Test the least recently used code is evicted."""
+    cache = template.TemplateBytecodeCache(max_size=2)
+    env = template._NO_HASS_ENV
+    for source in ("{{ 1 }}", "{{ 2 }}"):
+        cache.add(("normal", source), env.compile(source))
+    assert cache.get(("normal", "{{ 1 }}")) is not None
+    cache.add(("normal", "{{ 3 }}"), env.compile("{{ 3 }}"))
+
+    assert len(cache) == 2
+    assert cache.get(("normal", "{{ 2 }}")) is None
+    assert cache.get(("normal", "{{ 1 }}")) is not None
+    assert cache.hit_rate == 2 / 3
+
+
+async def test_bytecode_cache_saved_and_loaded(hass, tmp_path, caplog):
+    """Test the compiled code can be loaded by the next run."""
+    path = str(tmp_path / template.BYTECODE_CACHE_FILE)
+    cache = template._async_get_bytecode_cache(hass)
+    tpl = template.Template("{{ 'saved' }}", hass)
+    assert tpl.async_render() == "saved"
+    assert cache.dirty
+    caplog.set_level(logging.DEBUG)
+    await hass.async_add_executor_job(cache.save, path)
+    assert not cache.dirty
+    assert f"{cache.hits} compiles answered from the cache" in caplog.text
+
+    loaded = template.TemplateBytecodeCache()
+    await hass.async_add_executor_job(loaded.load, path)
+    code = loaded.get(("normal", "{{ 'saved' }}"))
+    assert code is not None
+    assert jinja2.Template.from_code(template._NO_HASS_ENV, code, {}).render() == (
+        "saved"
+    )
+
+    with patch.object(
+        template, "_BYTECODE_CACHE_MAGIC", template._BYTECODE_CACHE_MAGIC + b"next"
+    ):
+        upgraded = template.TemplateBytecodeCache()
+        await hass.async_add_executor_job(upgraded.load, path)
+    assert len(upgraded) == 0
+
+    with open(path, "wb") as cache_file:
+        cache_file.write(b"not a cache")
+    ignored = template.TemplateBytecodeCache()
+    await hass.async_add_executor_job(ignored.load, path)
+    assert len(ignored) == 0
+
+    missing = template.TemplateBytecodeCache()
+    await hass.async_add_executor_job(missing.load, str(tmp_path / "missing"))
+    assert len(missing) == 0
+
+
+async def test_async_load_bytecode_cache(hass, tmp_path):
+    """Test the compiled code is loaded at startup and saved once started."""
+    hass.config.config_dir = str(tmp_path)
+    saved = template.TemplateBytecodeCache()
+    saved.add(
+        ("normal", "{{ 'loaded' }}"), template._NO_HASS_ENV.compile("{{ 'loaded' }}")
+    )
+    saved.save(str(tmp_path / STORAGE_DIR / template.BYTECODE_CACHE_FILE))
+
+    await template.async_load_bytecode_cache(hass)
+    cache = template._async_get_bytecode_cache(hass)
+    assert cache.get(("normal", "{{ 'loaded' }}")) is not None
+
+    template.Template("{{ 'compiled' }}", hass).async_render()
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+    await hass.async_block_till_done()
+
+    reloaded = template.TemplateBytecodeCache()
+    reloaded.load(str(tmp_path / STORAGE_DIR / template.BYTECODE_CACHE_FILE))
+    assert len(reloaded) == 2
+
+
+async def test_bytecode_cache_info(hass):
+    """Test the cache hits and misses are reported."""
+    template.Template("{{ 'info' }}", hass).async_render()
+    template.Template("{{ 'info' }}", hass).async_render()
+    assert template.async_get_bytecode_cache_info(hass) == {
+        "template_cache_hits": 1,
+        "template_cache_misses": 1,
+    }
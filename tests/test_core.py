@@ -446,6 +446,186 @@ async def test_eventbus_filtered_listener(hass):
     unsub()
 
 
+async def test_eventbus_shared_filter_runs_once(hass):
+    """Test a filter shared by adjacent listeners only runs once per event."""
+    filter_calls = []
+    calls = []
+
+    @ha.callback
+    def filter(event):
+        """Mock filter."""
+        filter_calls.append(event)
+        return not event.data["filtered"]
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    unsubs = [
+        hass.bus.async_listen("test", listener, event_filter=filter) for _ in range(3)
+    ]
+
+    hass.bus.async_fire("test", {"filtered": True})
+    hass.bus.async_fire("test", {"filtered": False})
+    await hass.async_block_till_done()
+
+    assert len(filter_calls) == 2
+    assert len(calls) == 3
+
+    for unsub in unsubs:
+        unsub()
+
+
+async def test_eventbus_dispatch_follows_listener_changes(hass):
+    """Test listeners added or removed after a fire are used for the next fire."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(("test", event.event_type))
+
+    @ha.callback
+    def match_all_listener(event):
+        """Mock match all listener."""
+        calls.append((MATCH_ALL, event.event_type))
+
+    unsub = hass.bus.async_listen("test", listener, run_immediately=True)
+    hass.bus.async_fire("test")
+    assert calls == [("test", "test")]
+
+    unsub_match_all = hass.bus.async_listen(
+        MATCH_ALL, match_all_listener, run_immediately=True
+    )
+    calls.clear()
+    hass.bus.async_fire("test")
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    assert calls == [(MATCH_ALL, "test"), ("test", "test")]
+
+    unsub()
+    calls.clear()
+    hass.bus.async_fire("test")
+    assert calls == [(MATCH_ALL, "test")]
+
+    unsub_match_all()
+    calls.clear()
+    hass.bus.async_fire("test")
+    assert calls == []
+
+
+async def test_eventbus_dispatch_only_caches_event_types_with_listeners(hass):
+    """Test firing event types without listeners does not grow the cache."""
+    calls = []
+
+    @ha.callback
+    def match_all_listener(event):
+        """Mock match all listener."""
+        calls.append(event.event_type)
+
+    unsub_match_all = hass.bus.async_listen(
+        MATCH_ALL, match_all_listener, run_immediately=True
+    )
+    unsub = hass.bus.async_listen("test", lambda event: None)
+    dispatch = hass.bus._dispatch
+    hass.bus.async_fire("test")
+    cached = set(dispatch)
+    assert "test" in cached
+
+    for number in range(10):
+        hass.bus.async_fire(f"test_{number}")
+    assert calls == ["test"] + [f"test_{number}" for number in range(10)]
+    assert set(dispatch) == cached
+
+    unsub()
+    unsub_match_all()
+    assert "test" not in dispatch
+
+
+async def test_eventbus_listen_entity_ids_and_domains(hass):
+    """Test listeners can be limited to entity_ids and domains."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event.data["entity_id"])
+
+    old_count = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+    unsub = hass.bus.async_listen(
+        EVENT_STATE_CHANGED,
+        listener,
+        entity_ids=["Light.Kitchen", "switch.porch"],
+        domains="switch",
+    )
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == old_count + 1
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.living_room", "on")
+    hass.states.async_set("switch.porch", "on")
+    hass.states.async_set("switch.garden", "on")
+    hass.bus.async_fire(EVENT_STATE_CHANGED)
+    await hass.async_block_till_done()
+
+    assert calls == ["light.kitchen", "switch.porch", "switch.garden"]
+
+    unsub()
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == old_count
+    hass.states.async_set("light.kitchen", "off")
+    await hass.async_block_till_done()
+    assert len(calls) == 3
+
+
+async def test_eventbus_listen_entity_ids_with_filter(hass):
+    """Test the event filter still applies to listeners limited to entity_ids."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    @ha.callback
+    def filter(event):
+        """Mock filter."""
+        return event.data["new_state"].state == "on"
+
+    unsub = hass.bus.async_listen(
+        EVENT_STATE_CHANGED,
+        listener,
+        event_filter=filter,
+        run_immediately=True,
+        entity_ids="light.kitchen",
+    )
+
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.kitchen", "on")
+    assert len(calls) == 1
+
+    unsub()
+
+
+async def test_eventbus_listen_match_all_entity_ids(hass):
+    """Test listeners for all events can not be limited to entity_ids."""
+    with pytest.raises(ha.HomeAssistantError):
+        hass.bus.async_listen(
+            MATCH_ALL, ha.callback(lambda event: None), entity_ids="light.kitchen"
+        )
+
+
+@pytest.mark.parametrize(
+    "selectors",
+    [{"entity_ids": []}, {"domains": ()}, {"entity_ids": set(), "domains": []}],
+)
+async def test_eventbus_listen_empty_entity_ids_and_domains(hass, selectors):
+    """Test listeners can not be limited to no entity_ids or domains."""
+    with pytest.raises(ha.HomeAssistantError):
+        hass.bus.async_listen(
+            EVENT_STATE_CHANGED, ha.callback(lambda event: None), **selectors
+        )
+    assert EVENT_STATE_CHANGED not in hass.bus.async_listeners()
+
+
 async def test_eventbus_run_immediately(hass):
     """Test we can call events immediately."""
     calls = []
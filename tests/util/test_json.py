@@ -1,7 +1,7 @@
 """Test Home Assistant json utility functions."""
 from datetime import datetime
 from functools import partial
-from json import JSONEncoder, dumps
+from json import JSONEncoder, dumps, loads
 import math
 import os
 from tempfile import mkdtemp
@@ -11,6 +11,8 @@ import pytest
 
 from homeassistant.core import Event, State
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.json import JSONEncoder as HAJSONEncoder
+from homeassistant.util import json as json_util
 from homeassistant.util.json import (
     SerializationError,
     find_paths_unserializable_data,
@@ -102,9 +104,37 @@ def test_custom_encoder():
             return "9"
 
     fname = _path_for("test6")
-    save_json(fname, Mock(), encoder=MockJSONEncoder)
+    save_json(fname, {"a": Mock()}, encoder=MockJSONEncoder)
     data = load_json(fname)
-    assert data == "9"
+    assert data == {"a": "9"}
+    with open(fname, encoding="utf-8") as fh:
+        assert fh.read() == '{\n    "a": "9"\n}'
+
+
+def test_save_json_with_ha_encoder():
+    """Test serializing Home Assistant objects with orjson."""
+    fname = _path_for("test7")
+    state = State("test.test", "hello")
+    save_json(fname, {"state": state, "set": {1}}, encoder=HAJSONEncoder)
+    assert load_json(fname) == {
+        "state": loads(dumps(state.as_dict(), cls=HAJSONEncoder)),
+        "set": [1],
+    }
+
+
+def test_stdlib_fallback():
+    """Test the json module serializes like orjson when orjson is missing."""
+    state = State("test.test", "hello")
+    data = {"state": state, "set": {1}}
+    assert loads(json_util._stdlib_bytes(data)) == loads(json_util.json_bytes(data))
+    assert (
+        json_util._stdlib_bytes_pretty({"a": {1}})
+        == b'{\n    "a": [\n        1\n    ]\n}'
+    )
+    with pytest.raises(TypeError):
+        json_util._stdlib_bytes_pretty({"a": {1}}, default=None)
+    with pytest.raises(ValueError):
+        json_util._stdlib_bytes({"nan": float("nan")})
 
 
 def test_find_unserializable_data():
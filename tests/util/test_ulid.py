@@ -2,6 +2,8 @@
 
 import uuid
 
+import pytest
+
 import homeassistant.util.ulid as ulid_util
 
 
@@ -14,3 +16,22 @@ async def test_ulid_util_uuid_hex():
 async def test_ulid_util_uuid():
     """Verify we can generate a ulid."""
     assert len(ulid_util.ulid()) == 26
+
+
+async def test_ulid_bytes_round_trip():
+    """Verify a ulid can be converted to bytes and back."""
+    ulid = ulid_util.ulid()
+    ulid_bytes = ulid_util.ulid_to_bytes(ulid)
+    assert len(ulid_bytes) == 16
+    assert ulid_util.bytes_to_ulid(ulid_bytes) == ulid
+    assert ulid_util.ulid_to_bytes(ulid.lower()) == ulid_bytes
+
+
+@pytest.mark.parametrize(
+    "invalid",
+    ["", "01AN4Z07BY", "01AN4Z07BY79KA1307SR9X4MVU", "81AN4Z07BY79KA1307SR9X4MV3"],
+)
+async def test_ulid_to_bytes_invalid(invalid):
+    """Verify invalid ulids are rejected."""
+    with pytest.raises(ValueError):
+        ulid_util.ulid_to_bytes(invalid)